@@ -9,25 +9,26 @@ import shutil
 from datetime import datetime
 from typing import List, Optional
 
+from config import STATE_DB_FILE
+from models.state_store import state_store
+
 SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
 BACKUP_DIR = os.path.join(SCRIPT_DIR, "backups")
 
 # Files to backup automatically
+# (profile links, allowed channels, channel log, admins and server invites
+# live in the state database below, not in JSON files)
 CRITICAL_FILES = [
     # Channel & Server configs
-    "allowed_channels_config.json",
     "server_list_config.json",
     "channel_list_config.json",
-    "channel_change_log.json",
     
     # User & Profile data
     "profile_data.json",
-    "admin_list.json",
     
     # Club & Role configs
     "club_roles.json",
     "global_leaderboard_config.json",
-    "server_invites.json",
     
     # System state
     "god_mode_panel_config.json",
@@ -37,6 +38,10 @@ CRITICAL_FILES = [
     "transfer_requests.json",
 ]
 
+# SQLite state database (profile links, channels, admins, invites, tournaments),
+# snapshotted through state_store.backup() under this name
+STATE_DB_FILENAME = os.path.basename(STATE_DB_FILE)
+
 # Maximum number of backup folders to keep
 MAX_BACKUPS = 5
 
@@ -121,6 +126,20 @@ def backup_all_critical_files(reason: str = "scheduled") -> dict:
             results["failed"] += 1
             print(f"❌ Backup failed for {filename}: {e}")
     
+    # Snapshot the state database
+    if os.path.exists(STATE_DB_FILE):
+        try:
+            state_store.backup(os.path.join(backup_folder, STATE_DB_FILENAME))
+            results["success"] += 1
+            results["files"].append(STATE_DB_FILENAME)
+            print(f"💾 Backed up: {STATE_DB_FILENAME}")
+        except Exception as e:
+            results["failed"] += 1
+            print(f"❌ Backup failed for {STATE_DB_FILENAME}: {e}")
+    else:
+        results["skipped"] += 1
+        print(f"⚠️ State database not found, not backed up: {STATE_DB_FILE}")
+
     # Log the backup
     log_backup(folder_name, reason, results)
     
@@ -131,6 +150,10 @@ def backup_all_critical_files(reason: str = "scheduled") -> dict:
     return results
 
 
+def _is_backup_file(filename: str) -> bool:
+    return (filename.endswith('.json') and filename != 'backup_info.json') or filename == STATE_DB_FILENAME
+
+
 def list_backups() -> List[dict]:
     """List all available backup folders with details"""
     folders = get_backup_folders()
@@ -140,7 +163,7 @@ def list_backups() -> List[dict]:
         folder_path = os.path.join(BACKUP_DIR, folder)
         
         # Count files
-        files = [f for f in os.listdir(folder_path) if f.endswith('.json') and f != 'backup_info.json']
+        files = [f for f in os.listdir(folder_path) if _is_backup_file(f)]
         
         # Get folder creation time
         stat = os.stat(folder_path)
@@ -183,7 +206,7 @@ def restore_backup(folder_name: str, files: List[str] = None) -> dict:
     
     # Get files to restore
     if files is None:
-        files = [f for f in os.listdir(folder_path) if f.endswith('.json') and f != 'backup_info.json']
+        files = [f for f in os.listdir(folder_path) if _is_backup_file(f)]
     
     for filename in files:
         source = os.path.join(folder_path, filename)
@@ -194,7 +217,11 @@ def restore_backup(folder_name: str, files: List[str] = None) -> dict:
             continue
         
         try:
-            shutil.copy2(source, dest)
+            if filename == STATE_DB_FILENAME:
+                # Write into the live database so open connections see the restore
+                state_store.restore(source)
+            else:
+                shutil.copy2(source, dest)
             results["restored"] += 1
             results["files"].append(filename)
             print(f"✅ Restored: {filename}")
@@ -7,11 +7,27 @@ import aiohttp
 import asyncio
 from typing import Dict, Optional, List
 
+from models.http_client import http_client
+from utils.single_flight import single_flight
+
 
 async def fetch_circle_data(circle_id: str, timeout: int = 15, proxy_url: str = None) -> Optional[Dict]:
     """
     Fetch circle (club) data from uma.moe API using circle_id
     
+    Concurrent calls for the same circle_id share one request (the first
+    caller's timeout and proxy are used). See _fetch_circle_data_uncached.
+    """
+    return await single_flight.do(
+        "circle", str(circle_id),
+        lambda: _fetch_circle_data_uncached(circle_id, timeout, proxy_url)
+    )
+
+
+async def _fetch_circle_data_uncached(circle_id: str, timeout: int = 15, proxy_url: str = None) -> Optional[Dict]:
+    """
+    Fetch circle (club) data from uma.moe API using circle_id
+    
     Args:
         circle_id: The circle/club ID to fetch
         timeout: Request timeout in seconds
@@ -44,36 +60,35 @@ async def fetch_circle_data(circle_id: str, timeout: int = 15, proxy_url: str =
     url = f"https://uma.moe/api/v4/circles?circle_id={circle_id}"
     
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                url, 
-                timeout=aiohttp.ClientTimeout(total=timeout),
-                proxy=proxy_url
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    # API returns list of circles, find matching one
-                    if isinstance(data, list):
-                        for circle in data:
-                            if str(circle.get('circle_id')) == str(circle_id):
-                                return circle
-                        # If not found by ID, return first circle (user's club)
-                        return data[0] if data else None
-                    elif isinstance(data, dict):
-                        # New format: {"circle": {...}, "members": [...]}
-                        if 'circle' in data:
-                            return data['circle']
-                        return data
-                    
-                    return None
-                elif response.status == 404:
-                    return None
-                else:
-                    print(f"API Error: Status {response.status}")
-                    return None
-                    
-    except aiohttp.ClientTimeout:
+        async with http_client.get(
+            url,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+            proxy_url=proxy_url
+        ) as response:
+            if response.status == 200:
+                data = await response.json()
+
+                # API returns list of circles, find matching one
+                if isinstance(data, list):
+                    for circle in data:
+                        if str(circle.get('circle_id')) == str(circle_id):
+                            return circle
+                    # If not found by ID, return first circle (user's club)
+                    return data[0] if data else None
+                elif isinstance(data, dict):
+                    # New format: {"circle": {...}, "members": [...]}
+                    if 'circle' in data:
+                        return data['circle']
+                    return data
+
+                return None
+            elif response.status == 404:
+                return None
+            else:
+                print(f"API Error: Status {response.status}")
+                return None
+
+    except asyncio.TimeoutError:
         print(f"Timeout fetching circle data for {circle_id}")
         return None
     except aiohttp.ClientError as e:
@@ -152,8 +167,8 @@ async def sync_club_from_api(
             }
         
         # Read current members from sheet
-        members_ws = gs_manager.sh.worksheet(members_sheet)
-        current_data = members_ws.get_all_values()
+        members_ws = await asyncio.to_thread(gs_manager.get_worksheet, members_sheet)
+        current_data = await asyncio.to_thread(members_ws.get_all_values)
         
         # Build current member set (ID -> Name)
         current_members = {}
@@ -182,7 +197,7 @@ async def sync_club_from_api(
             next_row = len(current_data) + 1
             for member_id in new_members:
                 member_name = api_member_set[member_id]
-                members_ws.update(f'A{next_row}:B{next_row}', [[member_id, member_name]])
+                await asyncio.to_thread(members_ws.update, f'A{next_row}:B{next_row}', [[member_id, member_name]])
                 next_row += 1
                 members_added += 1
         
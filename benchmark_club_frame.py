@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""Memory report: processed club frame, legacy dtypes vs compact schema
+
+Usage:
+    python benchmark_club_frame.py [members] [days]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.club_frame import compact_club_frame, select_member_rows, frame_memory_report
+
+
+def make_legacy_frame(rng: np.random.Generator, members: int, days: int) -> pd.DataFrame:
+    """Frame as _prepare_club_dataframe returned it before (int64 + object Name)"""
+    names = [f"Trainer Name {i:03d}" for i in range(members)]
+    daily = rng.integers(0, 3_000_000, size=(members, days))
+    carry = rng.integers(-1_500_000, 1_500_000, size=(members, days))
+    df = pd.DataFrame({
+        'Name': np.repeat(names, days).astype(object),
+        'Day': np.tile(np.arange(1, days + 1), members),
+        'Total Fans': daily.cumsum(axis=1).ravel(),
+        'Daily': daily.ravel(),
+        'Target': np.tile(np.arange(1, days + 1) * 1_000_000, members),
+        'CarryOver': carry.ravel(),
+    })
+    df['is_slightly_behind'] = (df['CarryOver'] < 0) & (df['CarryOver'] >= -700_000)
+    df['consecutive_slight_behind_days'] = df['is_slightly_behind'].astype(np.int64)
+    df['is_behind'] = df['CarryOver'] < -700_000
+    return df
+
+
+def per_call_us(func, calls: int = 200) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main():
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 31
+    rng = np.random.default_rng(42)
+
+    legacy = make_legacy_frame(rng, members, days)
+    compact = compact_club_frame(legacy)
+
+    # Same values, smaller dtypes
+    assert (compact.astype({'Name': object}).astype(legacy.dtypes.to_dict()) == legacy).all().all()
+
+    legacy_report = frame_memory_report(legacy)
+    compact_report = frame_memory_report(compact)
+
+    print(f"Club frame: {members} members x {days} days ({legacy_report['rows']} rows)")
+    print(f"   {'column':32s} {'legacy':>10s} {'compact':>10s}  dtype")
+    for column, size in legacy_report['columns'].items():
+        dtype = compact[column].dtype if column in compact.columns else ''
+        print(f"   {column:32s} {size:10,d} {compact_report['columns'][column]:10,d}  {dtype}")
+    print(f"   {'TOTAL':32s} {legacy_report['bytes']:10,d} {compact_report['bytes']:10,d}  "
+          f"({legacy_report['bytes'] / compact_report['bytes']:.1f}x smaller)")
+
+    name = 'Trainer Name 017'
+    legacy_us = per_call_us(lambda: legacy[legacy['Name'].str.strip() == name].copy())
+    compact_us = per_call_us(lambda: select_member_rows(compact, name))
+    print(f"   Member lookup: {legacy_us:8.1f} µs -> {compact_us:8.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""Micro-benchmark: club_autocomplete scan vs per-guild club index
+
+Usage:
+    python benchmark_club_index.py [clubs] [guilds]
+"""
+
+import sys
+import time
+import random
+import string
+
+from utils.club_index import ClubIndex
+
+
+def legacy_search(config_cache: dict, server_id, current: str) -> list:
+    """The previous club_autocomplete body (full scan per keystroke)"""
+    current_lower = current.lower() if current else ""
+    if not server_id:
+        return [
+            name for name in list(config_cache.keys())[:25]
+            if not current_lower or current_lower in name.lower()
+        ][:25]
+    server_clubs = [
+        name for name, config in config_cache.items()
+        if config.get('Server_ID') == str(server_id) or config.get('Server_ID') == server_id
+    ]
+    if not server_clubs:
+        server_clubs = list(config_cache.keys())
+    return [
+        name for name in server_clubs[:50]
+        if not current_lower or current_lower in name.lower()
+    ][:25]
+
+
+def make_config_cache(rng: random.Random, clubs: int, guilds: int) -> dict:
+    guild_ids = [rng.randint(10**17, 10**18) for _ in range(guilds)]
+    cache = {}
+    while len(cache) < clubs:
+        words = [''.join(rng.choice(string.ascii_letters) for _ in range(rng.randint(3, 8)))
+                 for _ in range(rng.randint(1, 3))]
+        guild_id = rng.choice(guild_ids)
+        # The config sheet holds Server_ID as str or int
+        cache[' '.join(words)] = {'Server_ID': str(guild_id) if rng.random() < 0.5 else guild_id}
+    return cache
+
+
+def per_call_us(func, calls: list) -> float:
+    started = time.perf_counter()
+    for args in calls:
+        func(*args)
+    return (time.perf_counter() - started) / len(calls) * 1e6
+
+
+def main():
+    clubs = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    guilds = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    rng = random.Random(42)
+
+    config_cache = make_config_cache(rng, clubs, guilds)
+    guild_ids = sorted({int(cfg['Server_ID']) for cfg in config_cache.values()})
+
+    started = time.perf_counter()
+    index = ClubIndex()
+    index.build(config_cache)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    # Keystroke sequences: '', 'a', 'ab', ... for club names of the guild
+    calls = []
+    for _ in range(2000):
+        guild_id = rng.choice(guild_ids)
+        name = rng.choice([n for n, cfg in config_cache.items() if int(cfg['Server_ID']) == guild_id])
+        typed = name[:rng.randint(0, min(len(name), 6))]
+        calls.append((guild_id, typed))
+
+    # Sanity: every club is found by its own name prefix in its guild
+    for guild_id, typed in calls:
+        names = index.search(guild_id, typed)
+        assert all(config_cache[n]['Server_ID'] in (guild_id, str(guild_id)) for n in names)
+
+    legacy_us = per_call_us(lambda g, t: legacy_search(config_cache, g, t), calls)
+    index_us = per_call_us(index.search, calls)
+
+    print(f"{clubs} clubs in {guilds} guilds ({len(calls)} keystrokes)")
+    print(f"   Index build:          {build_ms:8.2f} ms")
+    print(f"   Scan per call:        {legacy_us:8.2f} µs")
+    print(f"   Index per call:       {index_us:8.2f} µs")
+    print(f"   ⚡ Speed-up: {legacy_us / index_us:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""Benchmark + equivalence check: vectorized fan engine vs per-member functions
+
+Usage:
+    python benchmark_fan_engine.py [clubs] [members_per_club]
+"""
+
+import sys
+import time
+import random
+import importlib.util
+
+from utils.fan_engine import compute_club_batch, gain_lists, yui_results, data_sheet_rows
+
+
+def load_bot_module():
+    spec = importlib.util.spec_from_file_location("bot_github", "bot-github.py")
+    bot = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(bot)
+    return bot
+
+
+def make_member(rng: random.Random, days: int) -> list:
+    """Synthetic cumulative fans with late joiners, leavers, gaps and drops"""
+    cumulative = []
+    fans = rng.randint(10_000_000, 900_000_000)
+    join_day = rng.choice([0, 0, 0, 0, rng.randint(0, max(days - 1, 0))])
+    leave_day = rng.choice([days, days, days, rng.randint(join_day + 1, days)])
+    for day in range(days):
+        if day < join_day or day >= leave_day:
+            cumulative.append(0)
+            continue
+        roll = rng.random()
+        if roll < 0.03:
+            fans -= rng.randint(1, 1000)  # Invalid negative gain
+        elif roll < 0.08:
+            pass  # Zero gain
+        else:
+            fans += rng.randint(0, 5_000_000)
+        cumulative.append(fans)
+    return cumulative
+
+
+def make_club(rng: random.Random, members: int, days: int) -> list:
+    return [make_member(rng, days) for _ in range(members)]
+
+
+def per_member(bot, club, target, max_days, expected_days_old_month):
+    results = []
+    for cumulative in club:
+        gains = bot.calculate_daily_gains_from_cumulative(cumulative)
+        if expected_days_old_month:
+            last_day_gain = bot.calculate_last_day_gain(cumulative, expected_days_old_month)
+            if last_day_gain is not None:
+                gains.append(last_day_gain)
+        yui = bot.apply_yui_logic(gains, target)
+        rows = bot.calculate_data_sheet_rows("M", gains, cumulative, target, max_days)
+        results.append((gains, yui, rows))
+    return results
+
+
+def batched(club, target, max_days, expected_days_old_month):
+    batch = compute_club_batch(club, target, max_days, expected_days_old_month)
+    names = ["M"] * len(club)
+    return list(zip(gain_lists(batch), yui_results(batch), data_sheet_rows(batch, names)))
+
+
+def main():
+    clubs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    members = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    rng = random.Random(42)
+    target = 1_000_000
+
+    print("Loading bot-github.py...")
+    bot = load_bot_module()
+
+    # ===== EQUIVALENCE =====
+    print("\n1. Checking equivalence...")
+    cases = 0
+    for days, max_days, expected in [(31, 30, None), (31, None, None), (32, 31, 31), (29, 10, None), (2, 1, None), (1, None, None)]:
+        for _ in range(50):
+            club = make_club(rng, members, days) + [[], [0] * days]
+            expected_rows = per_member(bot, club, target, max_days, expected)
+            actual_rows = batched(club, target, max_days, expected)
+            assert expected_rows == actual_rows, f"Mismatch (days={days}, max_days={max_days}, expected={expected})"
+            cases += 1
+    print(f"   ✅ {cases} clubs identical (gains, Yui logic, Data sheet rows)")
+
+    # ===== BENCHMARK =====
+    print(f"\n2. Benchmark: {clubs} clubs × {members} members × 31 days")
+    data = [make_club(rng, members, 31) for _ in range(clubs)]
+
+    started = time.perf_counter()
+    for club in data:
+        per_member(bot, club, target, 30, None)
+    python_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for club in data:
+        batched(club, target, 30, None)
+    numpy_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for club in data:
+        compute_club_batch(club, target, 30, None)
+    core_seconds = time.perf_counter() - started
+
+    print(f"   Per-member Python:            {python_seconds * 1000:8.1f} ms")
+    print(f"   Vectorized NumPy (with rows): {numpy_seconds * 1000:8.1f} ms")
+    print(f"   Vectorized NumPy (arrays):    {core_seconds * 1000:8.1f} ms")
+    print(f"   ⚡ Speed-up: {python_seconds / numpy_seconds:.1f}x end-to-end, "
+          f"{python_seconds / core_seconds:.1f}x for the calculations")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""Benchmark: SmartCache save / startup / load per on-disk format
+
+Usage:
+    python benchmark_smart_cache.py [clubs] [members_per_club]
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from models.cache import SmartCache
+from models.cache_formats import available_formats
+
+
+def make_club_frame(rng: np.random.Generator, members: int, days: int = 31) -> pd.DataFrame:
+    """Processed club frame shaped like _prepare_club_dataframe output"""
+    names = [f"Trainer{i:03d}" for i in range(members)]
+    daily = rng.integers(0, 3_000_000, size=(members, days))
+    total = daily.cumsum(axis=1)
+    carry = rng.integers(-1_500_000, 1_500_000, size=(members, days))
+    df = pd.DataFrame({
+        'Name': np.repeat(names, days),
+        'Day': np.tile(np.arange(1, days + 1), members),
+        'Total Fans': total.ravel(),
+        'Daily': daily.ravel(),
+        'Target': np.full(members * days, 1_000_000),
+        'CarryOver': carry.ravel(),
+    })
+    df['is_slightly_behind'] = (df['CarryOver'] < 0) & (df['CarryOver'] >= -700_000)
+    df['consecutive_slight_behind_days'] = df['is_slightly_behind'].astype(int)
+    df['is_behind'] = df['CarryOver'] < -700_000
+    return df
+
+
+def dir_size_kb(path: str) -> float:
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path)) / 1024
+
+
+def main():
+    clubs = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    members = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    rng = np.random.default_rng(42)
+
+    frames = {f"Club{i:03d}_Club{i:03d}_Data": make_club_frame(rng, members) for i in range(clubs)}
+    print(f"{clubs} clubs x {members} members x 31 days")
+
+    for name in available_formats():
+        cache_dir = tempfile.mkdtemp(prefix=f"smart_cache_{name}_")
+        try:
+            cache = SmartCache(cache_dir, ttl_seconds=86400, cache_format=name)
+
+            started = time.perf_counter()
+            for key, df in frames.items():
+                cache.set(key, df)
+            save_ms = (time.perf_counter() - started) * 1000
+
+            # Startup is lazy; load = reading every entry back from disk
+            started = time.perf_counter()
+            reloaded = SmartCache(cache_dir, ttl_seconds=86400, cache_format=name, max_memory_mb=0)
+            startup_ms = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            for key in frames:
+                reloaded.get(key)
+            load_ms = (time.perf_counter() - started) * 1000
+
+            sample_key = next(iter(frames))
+            sample = reloaded.get(sample_key)[0]
+            dtypes_kept = all(
+                sample[column].dtype == frames[sample_key][column].dtype
+                for column in ('Day', 'Daily', 'Total Fans', 'is_behind')
+            )
+
+            print(f"   {name:8s} save {save_ms:8.1f} ms | startup {startup_ms:6.1f} ms | load {load_ms:8.1f} ms | "
+                  f"disk {dir_size_kb(cache_dir):9.1f} KB | dtypes kept: {dtypes_kept}")
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    # Migration: legacy json files -> default format on first start
+    cache_dir = tempfile.mkdtemp(prefix="smart_cache_migrate_")
+    try:
+        legacy = SmartCache(cache_dir, ttl_seconds=86400, cache_format='json')
+        for key, df in frames.items():
+            legacy.set(key, df)
+        started = time.perf_counter()
+        migrated = SmartCache(cache_dir, ttl_seconds=86400)
+        print(f"   Migration json -> {migrated.format.name}: {(time.perf_counter() - started) * 1000:.1f} ms")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+"""Benchmark: club sync planning, serial vs process pool (no network)
+
+Plans come from tasks/sync_planner.py, the same code the sync runs. Inputs
+are recorded syncs (SYNC_PLAN_RECORD_DIR) or synthetic clubs: a member sheet
+from last month with an archive, and a payload holding Day 1 of this month,
+so rollover, Day 31 backfill and transfer highlighting all run.
+
+Usage:
+    python benchmark_sync_planner.py [clubs] [members_per_club] [processes]
+    python benchmark_sync_planner.py --recorded DIR [processes]
+"""
+
+import os
+import sys
+import glob
+import time
+import random
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+from tasks.sync_planner import (
+    plan_club_sync, load_plan_inputs, month_string, previous_month_string,
+    get_days_in_month, MEMBER_HEADER_SUFFIX,
+)
+
+
+def make_member(rng: random.Random, viewer_id: str, days: int) -> dict:
+    """Synthetic uma.moe member with late joiners and leavers"""
+    fans = rng.randint(10_000_000, 900_000_000)
+    join_day = rng.choice([0, 0, 0, 0, 1, rng.randint(0, days - 1)])
+    leave_day = rng.choice([days, days, days, rng.randint(join_day + 1, days)])
+    cumulative = []
+    for day in range(days):
+        if day < join_day or day >= leave_day:
+            cumulative.append(0)
+            continue
+        fans += rng.randint(0, 5_000_000)
+        cumulative.append(fans)
+    return {'viewer_id': viewer_id, 'trainer_name': f"Trainer {viewer_id}", 'daily_fans': cumulative}
+
+
+def member_sheet(rng: random.Random, ids: list, month: str, archive_month: str) -> list:
+    """Member sheet as read: CURRENT section for `month` + one older archive"""
+    days = get_days_in_month(month)
+    header = ['Trainer ID', 'Name'] + [f'Day {i}' for i in range(1, days)] + MEMBER_HEADER_SUFFIX
+    current = [
+        [viewer_id, f"Trainer {viewer_id}"] + [str(rng.randint(0, 5_000_000)) for _ in range(days - 1)]
+        + ['1', '1000000', 'No', str(rng.randint(10_000_000, 900_000_000)), '']
+        for viewer_id in ids
+    ]
+    archive = [
+        [viewer_id, f"Trainer {viewer_id}"] + [str(rng.randint(0, 5_000_000)) for _ in range(days - 1)]
+        + ['1', '1000000', 'No', str(rng.randint(10_000_000, 900_000_000)), '']
+        for viewer_id in ids if rng.random() < 0.9
+    ]
+    spacer = [[''] * len(header)] * 2
+    return (
+        [[f"=== CURRENT: {month} ==="] + [''] * (len(header) - 1), header] + current + spacer
+        + [[f"=== ARCHIVE: {archive_month} ==="] + [''] * (len(header) - 1), header] + archive
+    )
+
+
+def synthetic_inputs(clubs: int, members: int) -> list:
+    rng = random.Random(42)
+    today = datetime.date.today().replace(day=1)
+    current_month = month_string(today)
+    previous_month = previous_month_string(current_month)
+    days = get_days_in_month(previous_month) + 1  # Payload includes Day 1 of this month
+
+    inputs = []
+    for club in range(clubs):
+        ids = [str(100_000 * club + member) for member in range(members)]
+        club_config = {
+            'Club_Name': f"Club{club:03d}",
+            'Members_Sheet_Name': f"Club{club:03d}_Members",
+            'Data_Sheet_Name': '',
+            'Target_Per_Day': 1_000_000,
+        }
+        api_data = {'members': [make_member(rng, viewer_id, days) for viewer_id in ids]}
+        sheet_values = member_sheet(rng, ids, previous_month, previous_month_string(previous_month))
+        inputs.append((club_config, api_data, sheet_values, today, None))
+    return inputs
+
+
+def plan_args(args: tuple) -> int:
+    """Plan one club (module-level so the process pool can pickle it)"""
+    plan = plan_club_sync(*args)
+    return len(plan.get('member_grid') or [])
+
+
+def main():
+    argv = sys.argv[1:]
+    if argv and argv[0] == '--recorded':
+        paths = sorted(glob.glob(os.path.join(argv[1], '*.json')))
+        inputs = [load_plan_inputs(path) for path in paths]
+        processes = int(argv[2]) if len(argv) > 2 else os.cpu_count()
+        print(f"Loaded {len(inputs)} recorded clubs from {argv[1]}")
+    else:
+        clubs = int(argv[0]) if len(argv) > 0 else 200
+        members = int(argv[1]) if len(argv) > 1 else 30
+        processes = int(argv[2]) if len(argv) > 2 else os.cpu_count()
+        inputs = synthetic_inputs(clubs, members)
+        print(f"Synthetic: {clubs} clubs × {members} members (month rollover)")
+
+    if not inputs:
+        print("Nothing to plan")
+        return
+
+    # ===== CHECK =====
+    statuses = {}
+    for args in inputs:
+        status = plan_club_sync(*args)['status']
+        statuses[status] = statuses.get(status, 0) + 1
+    print(f"   Plans: {statuses}")
+
+    # ===== SERIAL =====
+    started = time.perf_counter()
+    serial_rows = [plan_args(args) for args in inputs]
+    serial_seconds = time.perf_counter() - started
+
+    # ===== PROCESS POOL =====
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        list(pool.map(plan_args, inputs[:processes]))  # Warm up workers (imports)
+        started = time.perf_counter()
+        pool_rows = list(pool.map(plan_args, inputs, chunksize=max(1, len(inputs) // (processes * 4))))
+        pool_seconds = time.perf_counter() - started
+
+    assert serial_rows == pool_rows, "Process pool plans differ from serial plans"
+
+    per_club_ms = serial_seconds / len(inputs) * 1000
+    print(f"   Serial:                 {serial_seconds * 1000:8.1f} ms ({per_club_ms:.2f} ms/club)")
+    print(f"   Process pool ({processes:2d} proc): {pool_seconds * 1000:8.1f} ms")
+    print(f"   ⚡ Speed-up: {serial_seconds / pool_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,9 +20,28 @@ from auto_sync_helpers import (
 # ============================================================================
 # Core modules extracted from monolithic bot code
 from config import config, BotConfig, SCRIPT_DIR
-from models import SmartCache, CROSS_CLUB_CACHE, ProxyManager, gs_manager
+from config import (
+    SYNC_FETCH_CONCURRENCY, SYNC_PLAN_CONCURRENCY, SYNC_WRITE_CONCURRENCY,
+    SYNC_API_RATE_PER_SECOND, SYNC_PLAN_RECORD_DIR, CLUB_SYNC_TIMES_UTC,
+    DATA_CACHE_SOFT_TTL_SECONDS,
+)
+from models import SmartCache, CROSS_CLUB_CACHE, update_cross_club_cache, ProxyManager, gs_manager, get_gs_manager, http_client, ViewerIndex, HistoryStore, GlobalLeaderboard, sync_payload_store, payload_hash, sheets_write_queue, sheet_grid_store, state_store
+from models.sheets_limiter import background_sheets_traffic, to_sheets_thread
 from utils import log_error, format_fans, get_last_update_timestamp, save_last_update_timestamp
-from managers import add_support_footer, maybe_send_promo_message, load_profile_links, save_profile_link, SCHEDULE_COLORS
+from utils.rate_limiter import AsyncRateLimiter
+from utils.single_flight import single_flight
+from utils.config_registry import config_registry
+from utils.member_index import member_index
+from utils.club_index import club_index
+from utils.club_frame import compact_club_frame, is_compact
+from utils.member_stats import member_stats
+from utils.render_cache import render_cache
+from utils.sheet_diff import normalize_grid, grid_hash, diff_grid
+from tasks.sync_pipeline import StagedPipeline, PipelineStage
+from tasks.sync_planner import (
+    plan_club_sync, month_context, record_plan_inputs,
+)
+from managers import add_support_footer, maybe_send_promo_message, save_profile_link, SCHEDULE_COLORS
 
 import aiohttp
 import json
@@ -32,7 +51,7 @@ import sys
 import subprocess
 import random
 import asyncio
-from typing import Tuple, Optional, List
+from typing import Tuple, Optional, List, Dict
 from dataclasses import dataclass
 from collections import Counter
 from dotenv import load_dotenv
@@ -142,10 +161,14 @@ os.makedirs(SMART_CACHE_DIR, exist_ok=True)
 # Initialize smart cache with 24-hour TTL (data updates daily)
 smart_cache = SmartCache(SMART_CACHE_DIR, ttl_seconds=86400)
 
-# Channel management file paths
-ALLOWED_CHANNELS_CONFIG_FILE = os.path.join(SCRIPT_DIR, "allowed_channels_config.json")
-ADMIN_LIST_FILE = os.path.join(SCRIPT_DIR, "admin_list.json")
-CHANNEL_CHANGE_LOG_FILE = os.path.join(SCRIPT_DIR, "channel_change_log.json")
+# Viewer ID -> clubs reverse index (built by update_club_data_task)
+viewer_index = ViewerIndex()
+
+# Columnar monthly history (club/month Arrow partitions, written by the sync)
+history_store = HistoryStore()
+
+# Materialized global leaderboard (per-club rows, updated by the sync)
+global_leaderboard = GlobalLeaderboard()
 
 # Channel IDs - loaded from environment variables with fallback defaults
 LOGGING_CHANNEL_ID = int(os.getenv('LOGGING_CHANNEL_ID', '0'))  # Channel to send successful command logs
@@ -156,9 +179,6 @@ DEBUG_LOG_CHANNEL_ID = int(os.getenv('DEBUG_LOG_CHANNEL_ID', '0'))  # Channel fo
 CHANNEL_LIST_DISPLAY_CHANNEL_ID = int(os.getenv('CHANNEL_LIST_DISPLAY_CHANNEL_ID', '0'))  # Channel for permanent channel list message
 CHANNEL_LIST_CONFIG_FILE = os.path.join(SCRIPT_DIR, "channel_list_config.json")
 
-# Server invite links storage
-SERVER_INVITES_FILE = os.path.join(SCRIPT_DIR, "server_invites.json")
-
 # Global leaderboard display system
 GLOBAL_LEADERBOARD_CONFIG_FILE = os.path.join(SCRIPT_DIR, "global_leaderboard_config.json")
 
@@ -231,7 +251,6 @@ def save_schedule_channel(channel_id: int):
 # PROFILE VERIFICATION SYSTEM
 # ============================================================================
 OCR_SERVICE_URL = os.getenv("OCR_SERVICE_URL", "http://2.56.246.119:30404")
-PROFILE_LINKS_FILE = os.path.join(SCRIPT_DIR, "profile_links.json")
 EXAMPLE_PROFILE_IMAGE = os.path.join(SCRIPT_DIR, "assets", "example_profile.png")
 
 # Pending verification requests: {user_id: {"member_name": str, "club_name": str, "expires": datetime}}
@@ -251,16 +270,15 @@ async def call_ocr_service(image_data: bytes) -> dict:
         import base64
         base64_image = base64.b64encode(image_data).decode('utf-8')
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{OCR_SERVICE_URL}/api/extract",
-                json={"base64Image": f"data:image/png;base64,{base64_image}"},
-                timeout=aiohttp.ClientTimeout(total=60)
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    if result.get('success'):
-                        return result.get('data', {})
+        async with http_client.post(
+            f"{OCR_SERVICE_URL}/api/extract",
+            json={"base64Image": f"data:image/png;base64,{base64_image}"},
+            timeout=aiohttp.ClientTimeout(total=60)
+        ) as response:
+            if response.status == 200:
+                result = await response.json()
+                if result.get('success'):
+                    return result.get('data', {})
         return {}
     except Exception as e:
         print(f"OCR service error: {e}")
@@ -274,7 +292,7 @@ def get_trainer_id_from_sheets(member_name: str, club_name: str) -> str:
         if not members_sheet:
             return None
         
-        ws = gs_manager.sh.worksheet(members_sheet)
+        ws = gs_manager.get_worksheet(members_sheet)
         records = ws.get_all_records()
         
         for record in records:
@@ -300,7 +318,7 @@ def get_viewer_id_from_sheets(member_name: str, club_name: str) -> str:
         if not members_sheet:
             return None
         
-        ws = gs_manager.sh.worksheet(members_sheet)
+        ws = gs_manager.get_worksheet(members_sheet)
         all_values = ws.get_all_values()
         
         if len(all_values) < 2:
@@ -363,7 +381,7 @@ async def find_member_by_viewer_id_in_club(viewer_id: str, club_name: str) -> di
         if not members_sheet:
             return None
         
-        ws = await asyncio.to_thread(gs_manager.sh.worksheet, members_sheet)
+        ws = await asyncio.to_thread(gs_manager.get_worksheet, members_sheet)
         all_values = await asyncio.to_thread(ws.get_all_values)
         
         if len(all_values) < 2:
@@ -430,6 +448,14 @@ async def find_member_across_all_clubs(viewer_id: str) -> dict:
         # No delay needed - using proxy rotation
     return None
 
+def _get_tracked_club_names() -> list:
+    """Names of configured clubs that have a uma.moe Club_ID"""
+    return [
+        club_name for club_name, club_config in client.config_cache.items()
+        if club_config.get('Club_ID')
+    ]
+
+
 async def find_viewer_in_clubs_via_api(viewer_id: str) -> dict:
     """Search all tracked clubs for viewer_id using uma.moe API (real-time data)
     
@@ -451,6 +477,29 @@ async def find_viewer_in_clubs_via_api(viewer_id: str) -> dict:
     current_day = datetime.datetime.now(datetime.timezone.utc).day
     print(f"[API Search] Searching for viewer_id {viewer_id} (current day: {current_day})...")
     
+    # Fast path: the sync-built viewer index answers for every club it has fresh;
+    # only clubs missing from it (or stale) are scanned live
+    tracked_clubs = _get_tracked_club_names()
+    stale_clubs = set(viewer_index.stale_clubs(tracked_clubs))
+    indexed_clubs = [club_name for club_name in tracked_clubs if club_name not in stale_clubs]
+    matches = [
+        {
+            "club_name": entry['club_name'],
+            "member_name": entry['trainer_name'],
+            "viewer_id": viewer_id,
+            "active_days": entry['active_days']
+        }
+        for entry in viewer_index.lookup(viewer_id, indexed_clubs)
+    ]
+    if not stale_clubs or (matches and matches[0]['active_days'] >= current_day - 1):
+        if not matches:
+            print(f"[API Search] viewer_id {viewer_id} not found (viewer index)")
+            return None
+        best_match = matches[0]
+        print(f"[API Search] ✅ Viewer index: '{best_match['club_name']}' with {best_match['active_days']} active days")
+        return best_match
+    print(f"[API Search] Viewer index stale for {len(stale_clubs)} clubs - scanning them via API ({len(matches)} indexed matches)")
+    
     # Helper function to search one club
     async def search_one_club(club_name: str, circle_id: str):
         try:
@@ -477,18 +526,17 @@ async def find_viewer_in_clubs_via_api(viewer_id: str) -> dict:
             print(f"[API Search] Error checking {club_name}: {e}")
             return None
     
-    # Build list of clubs to search
+    # Build list of clubs to search (the ones the index can't answer for)
     club_tasks = []
     for club_name, club_config in client.config_cache.items():
         circle_id = club_config.get('Club_ID')
-        if circle_id:
+        if circle_id and club_name in stale_clubs:
             club_tasks.append((club_name, circle_id))
     
     print(f"[API Search] Searching {len(club_tasks)} clubs concurrently...")
     
     # Process in batches of 10 (proxies help avoid rate limiting)
     batch_size = 10
-    matches = []
     all_results = []  # Track all results for failure statistics
     
     for i in range(0, len(club_tasks), batch_size):
@@ -573,6 +621,26 @@ async def find_all_clubs_for_viewer(viewer_id: str) -> list:
     current_day = datetime.datetime.now(datetime.timezone.utc).day
     print(f"[Transfer Check] Searching ALL clubs for viewer_id {viewer_id}...")
     
+    # Fast path: sync-built viewer index for the clubs it has fresh (sorted by
+    # active_days DESC); only missing / stale clubs are scanned live
+    tracked_clubs = _get_tracked_club_names()
+    stale_clubs = set(viewer_index.stale_clubs(tracked_clubs))
+    indexed_clubs = [club_name for club_name in tracked_clubs if club_name not in stale_clubs]
+    all_matches = [
+        {
+            "club_name": entry['club_name'],
+            "member_name": entry['trainer_name'],
+            "viewer_id": viewer_id,
+            "active_days": entry['active_days'],
+            "daily_fans": entry['daily_fans']
+        }
+        for entry in viewer_index.lookup(viewer_id, indexed_clubs)
+    ]
+    if not stale_clubs:
+        print(f"[Transfer Check] Found {len(all_matches)} clubs for viewer_id {viewer_id} (viewer index)")
+        return all_matches
+    print(f"[Transfer Check] Viewer index stale for {len(stale_clubs)} clubs - scanning them via API")
+    
     async def search_one_club(club_name: str, circle_id: str):
         try:
             api_data = await fetch_circle_data(str(circle_id), timeout=10, proxy_url=proxy_manager.get_next_proxy())
@@ -599,16 +667,15 @@ async def find_all_clubs_for_viewer(viewer_id: str) -> list:
             print(f"[Transfer Check] Error checking {club_name}: {e}")
             return None
     
-    # Build list of clubs to search
+    # Build list of clubs to search (the ones the index can't answer for)
     club_tasks = []
     for club_name, club_config in client.config_cache.items():
         circle_id = club_config.get('Club_ID')
-        if circle_id:
+        if circle_id and club_name in stale_clubs:
             club_tasks.append((club_name, circle_id))
     
     # Process all clubs concurrently
     batch_size = 10
-    all_matches = []
     
     for i in range(0, len(club_tasks), batch_size):
         batch = club_tasks[i:i+batch_size]
@@ -642,23 +709,23 @@ async def send_log_to_web(
 ):
     """Send log entry to web dashboard"""
     try:
-        async with aiohttp.ClientSession() as session:
-            await session.post(
-                f"{OCR_SERVICE_URL}/api/logs",
-                json={
-                    "type": log_type,
-                    "command": command,
-                    "user": user,
-                    "user_id": user_id,
-                    "server": server,
-                    "server_id": server_id,
-                    "channel": channel,
-                    "params": params,
-                    "status": status,
-                    "error": error
-                },
-                timeout=aiohttp.ClientTimeout(total=5)
-            )
+        await http_client.send(
+            "POST",
+            f"{OCR_SERVICE_URL}/api/logs",
+            json={
+                "type": log_type,
+                "command": command,
+                "user": user,
+                "user_id": user_id,
+                "server": server,
+                "server_id": server_id,
+                "channel": channel,
+                "params": params,
+                "status": status,
+                "error": error
+            },
+            timeout=aiohttp.ClientTimeout(total=5)
+        )
     except Exception as e:
         print(f"Log to web error (non-critical): {e}")
 
@@ -667,12 +734,12 @@ async def sync_channels_to_web():
     """Sync channel list to web dashboard"""
     try:
         channels = load_channels_config()
-        async with aiohttp.ClientSession() as session:
-            await session.post(
-                f"{OCR_SERVICE_URL}/api/channels",
-                json={"channels": channels},
-                timeout=aiohttp.ClientTimeout(total=5)
-            )
+        await http_client.send(
+            "POST",
+            f"{OCR_SERVICE_URL}/api/channels",
+            json={"channels": channels},
+            timeout=aiohttp.ClientTimeout(total=5)
+        )
     except Exception as e:
         print(f"Sync channels error (non-critical): {e}")
 
@@ -684,17 +751,17 @@ async def sync_stats_to_web():
         clubs = len(client.config_cache) if hasattr(client, 'config_cache') else 0
         members = sum(len(m) for m in client.member_cache.values()) if hasattr(client, 'member_cache') else 0
         
-        async with aiohttp.ClientSession() as session:
-            await session.post(
-                f"{OCR_SERVICE_URL}/api/stats",
-                json={
-                    "servers": servers,
-                    "clubs": clubs,
-                    "members": members,
-                    "uptime": "99.9%"
-                },
-                timeout=aiohttp.ClientTimeout(total=5)
-            )
+        await http_client.send(
+            "POST",
+            f"{OCR_SERVICE_URL}/api/stats",
+            json={
+                "servers": servers,
+                "clubs": clubs,
+                "members": members,
+                "uptime": "99.9%"
+            },
+            timeout=aiohttp.ClientTimeout(total=5)
+        )
     except Exception as e:
         print(f"Sync stats error (non-critical): {e}")
 
@@ -833,7 +900,11 @@ def invalidate_cache_for_club(club_name: str, data_sheet_name: str = None):
                 data_sheet_name = f"{club_name}_Data"
         
         cache_key = f"{club_name}_{data_sheet_name}"
+        # Stop in-flight refreshes (started before the write) from re-caching old data
+        _data_cache_generation[cache_key] = _data_cache_generation.get(cache_key, 0) + 1
+        single_flight.forget("club_data", cache_key)
         smart_cache.invalidate(cache_key)
+        render_cache.invalidate_club(club_name)
         print(f"✅ Cache invalidated for {club_name}")
         
         return True
@@ -1035,33 +1106,31 @@ def is_god_mode_only():
 # CHANNEL MANAGEMENT HELPER FUNCTIONS
 # ============================================================================
 
+def _parse_channels_config(channels: List[dict]) -> dict:
+    """Registry parser: allowed channels list + set of their IDs"""
+    return {
+        'channels': channels,
+        'channel_ids': frozenset(ch.get('channel_id') for ch in channels),
+    }
+
+
+config_registry.register(
+    'allowed_channels',
+    parser=_parse_channels_config,
+    loader=state_store.list_allowed_channels,
+    signature=lambda: state_store.table_version('allowed_channels'),
+)
+
+
 def load_channels_config() -> List[dict]:
-    """Load list of allowed channels from file"""
-    try:
-        if os.path.exists(ALLOWED_CHANNELS_CONFIG_FILE):
-            with open(ALLOWED_CHANNELS_CONFIG_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            channels = data.get('channels', [])
-            print(f"✅ Loaded {len(channels)} allowed channel(s)")
-            return channels
-    except Exception as e:
-        print(f"⚠️ Error loading channels config: {e}")
-    return []
+    """Load list of allowed channels (served from the config registry)"""
+    return list(config_registry.get('allowed_channels')['channels'])
 
 
 
-def add_channel_to_config(interaction: discord.Interaction) -> dict:
+async def add_channel_to_config(interaction: discord.Interaction) -> dict:
     """Add a channel to the allowed channels list"""
     
-    # Load existing channels
-    existing_channels = load_channels_config()
-    
-    # Check if channel already exists
-    channel_exists = any(ch['channel_id'] == interaction.channel_id for ch in existing_channels)
-    if channel_exists:
-        raise ValueError(f"Channel already in allowed list")
-    
     # Create new channel entry
     new_channel = {
         "channel_id": interaction.channel_id,
@@ -1073,58 +1142,30 @@ def add_channel_to_config(interaction: discord.Interaction) -> dict:
         "added_at": datetime.datetime.now(pytz.timezone('Asia/Ho_Chi_Minh')).strftime("%Y-%m-%d %H:%M:%S")
     }
     
-    # Add to list
-    existing_channels.append(new_channel)
-    
-    # Save to file
-    config_data = {
-        "channels": existing_channels,
-        "last_updated": datetime.datetime.now(pytz.timezone('Asia/Ho_Chi_Minh')).strftime("%Y-%m-%d %H:%M:%S")
-    }
-    
-    with open(ALLOWED_CHANNELS_CONFIG_FILE, 'w', encoding='utf-8') as f:
-        json.dump(config_data, f, indent=2, ensure_ascii=False)
+    # Single-row insert (fails if the channel is already allowed)
+    if not await state_store.aio.add_allowed_channel(new_channel):
+        raise ValueError(f"Channel already in allowed list")
+    await config_registry.reload('allowed_channels')
     
     print(f"💾 Added channel: {new_channel['channel_name']} (ID: {new_channel['channel_id']})")
     return new_channel
 
 
-def remove_channel_from_config(channel_id: int) -> bool:
+async def remove_channel_from_config(channel_id: int) -> bool:
     """Remove a channel from allowed list"""
     
-    # Load existing channels
-    existing_channels = load_channels_config()
-    
-    # Find and remove channel
-    original_count = len(existing_channels)
-    existing_channels = [ch for ch in existing_channels if ch['channel_id'] != channel_id]
-    
-    if len(existing_channels) == original_count:
+    if not await state_store.aio.remove_allowed_channel(channel_id):
         return False  # Channel not found
-    
-    # Save updated list
-    config_data = {
-        "channels": existing_channels,
-        "last_updated": datetime.datetime.now(pytz.timezone('Asia/Ho_Chi_Minh')).strftime("%Y-%m-%d %H:%M:%S")
-    }
-    
-    with open(ALLOWED_CHANNELS_CONFIG_FILE, 'w', encoding='utf-8') as f:
-        json.dump(config_data, f, indent=2, ensure_ascii=False)
+    await config_registry.reload('allowed_channels')
     
     print(f"🗑️ Removed channel ID: {channel_id}")
     return True
 
 
 
-def log_channel_change(action: str, interaction: discord.Interaction, note: str = None):
-    """Log channel configuration changes to history file"""
+async def log_channel_change(action: str, interaction: discord.Interaction, note: str = None):
+    """Log channel configuration changes to the state store"""
     try:
-        # Load existing history
-        history = {"history": []}
-        if os.path.exists(CHANNEL_CHANGE_LOG_FILE):
-            with open(CHANNEL_CHANGE_LOG_FILE, 'r', encoding='utf-8') as f:
-                history = json.load(f)
-        
         # Create log entry
         log_entry = {
             "action": action,
@@ -1144,11 +1185,8 @@ def log_channel_change(action: str, interaction: discord.Interaction, note: str
         if note:
             log_entry["note"] = note
         
-        # Append and save
-        history["history"].insert(0, log_entry)  # Most recent first
-        
-        with open(CHANNEL_CHANGE_LOG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(history, f, indent=2, ensure_ascii=False)
+        # Append-only insert (no rewrite of the whole history)
+        await state_store.aio.log_channel_change(log_entry)
         
         print(f"📝 Logged action: {action}")
     
@@ -1192,31 +1230,27 @@ async def send_debug_log(embed: discord.Embed):
         print(f"❌ Error sending debug log: {e}")
 
 
+config_registry.register(
+    'admin_list',
+    loader=state_store.list_admins,
+    signature=lambda: state_store.table_version('admins'),
+)
+
+
 def load_admin_list() -> List[int]:
-    """Load admin user IDs from file"""
-    try:
-        if os.path.exists(ADMIN_LIST_FILE):
-            with open(ADMIN_LIST_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            admin_ids = data.get("admin_user_ids", [])
-            print(f"✅ Loaded {len(admin_ids)} dynamic admins")
-            return admin_ids
-    except Exception as e:
-        print(f"⚠️ Error loading admin list: {e}")
-    return []
+    """Load admin user IDs (served from the config registry)"""
+    return list(config_registry.get('admin_list'))
 
 
-def save_admin_list(admin_ids: List[int], updated_by: int):
-    """Save admin user IDs to file"""
+async def save_admin_list(admin_ids: List[int], updated_by: int):
+    """Save admin user IDs to the state store"""
     try:
-        admin_data = {
-            "admin_user_ids": admin_ids,
-            "last_updated": datetime.datetime.now(pytz.timezone('Asia/Ho_Chi_Minh')).strftime("%Y-%m-%d %H:%M:%S"),
-            "updated_by": updated_by
-        }
-        
-        with open(ADMIN_LIST_FILE, 'w', encoding='utf-8') as f:
-            json.dump(admin_data, f, indent=2, ensure_ascii=False)
+        await state_store.aio.replace_admins(
+            admin_ids,
+            updated_by=updated_by,
+            updated_at=datetime.datetime.now(pytz.timezone('Asia/Ho_Chi_Minh')).strftime("%Y-%m-%d %H:%M:%S"),
+        )
+        await config_registry.reload('admin_list')
         
         print(f"💾 Saved admin list: {len(admin_ids)} admins")
     
@@ -1262,60 +1296,42 @@ def save_channel_list_message_id(message_id: int):
 # SERVER INVITE LINKS MANAGEMENT
 # ============================================================================
 
+config_registry.register(
+    'server_invites',
+    loader=state_store.get_server_invites,
+    signature=lambda: state_store.table_version('server_invites'),
+)
+
+
 def load_server_invites() -> dict:
-    """Load all server invite links from file"""
-    try:
-        if os.path.exists(SERVER_INVITES_FILE):
-            with open(SERVER_INVITES_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            return data.get('invites', {})
-    except Exception as e:
-        print(f"⚠️ Error loading server invites: {e}")
-    return {}
+    """Load all server invite links (served from the config registry)"""
+    return dict(config_registry.get('server_invites'))
 
 
-def save_server_invite(server_id: int, server_name: str, invite_url: str, member_count: int = 0):
-    """Save a server invite link to file"""
+async def save_server_invite(server_id: int, server_name: str, invite_url: str, member_count: int = 0):
+    """Save a server invite link to the state store"""
     try:
-        invites = load_server_invites()
-        
-        invites[str(server_id)] = {
+        await state_store.aio.save_server_invite(server_id, {
             "server_name": server_name,
             "invite_url": invite_url,
             "member_count": member_count,
             "created_at": datetime.datetime.now(pytz.timezone('Asia/Ho_Chi_Minh')).strftime("%Y-%m-%d %H:%M:%S")
-        }
-        
-        config_data = {
-            "invites": invites,
-            "last_updated": datetime.datetime.now(pytz.timezone('Asia/Ho_Chi_Minh')).strftime("%Y-%m-%d %H:%M:%S")
-        }
-        
-        with open(SERVER_INVITES_FILE, 'w', encoding='utf-8') as f:
-            json.dump(config_data, f, indent=2, ensure_ascii=False)
+        })
+        await config_registry.reload('server_invites')
         
         print(f"💾 Saved invite for {server_name}: {invite_url}")
     except Exception as e:
         print(f"❌ Error saving server invite: {e}")
 
 
-def remove_server_invite(server_id: int):
-    """Remove a server invite from file when bot leaves"""
+async def remove_server_invite(server_id: int):
+    """Remove a server invite when bot leaves"""
     try:
-        invites = load_server_invites()
-        server_id_str = str(server_id)
+        removed = await state_store.aio.delete_server_invite(server_id)
         
-        if server_id_str in invites:
-            server_name = invites[server_id_str].get('server_name', 'Unknown')
-            del invites[server_id_str]
-            
-            config_data = {
-                "invites": invites,
-                "last_updated": datetime.datetime.now(pytz.timezone('Asia/Ho_Chi_Minh')).strftime("%Y-%m-%d %H:%M:%S")
-            }
-            
-            with open(SERVER_INVITES_FILE, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, indent=2, ensure_ascii=False)
+        if removed is not None:
+            server_name = removed.get('server_name', 'Unknown')
+            await config_registry.reload('server_invites')
             
             print(f"🗑️ Removed invite for {server_name}")
     except Exception as e:
@@ -1324,7 +1340,7 @@ def remove_server_invite(server_id: int):
 
 def get_server_invite(server_id: int) -> str:
     """Get invite URL for a specific server"""
-    invites = load_server_invites()
+    invites = config_registry.get('server_invites')
     invite_data = invites.get(str(server_id), {})
     return invite_data.get('invite_url')
 
@@ -1410,9 +1426,21 @@ class OldClubModal(discord.ui.Modal, title="Add Old Club Data"):
         old_club_id = self.club_id.value.strip()
         
         try:
-            # 1. Fetch old club data from uma.moe
-            print(f"[Old Club] Fetching data for club ID: {old_club_id}")
-            api_data = await fetch_circle_data(old_club_id, timeout=15)
+            # 1. Fetch old club data (viewer index if the club is tracked, else uma.moe)
+            indexed_entry = viewer_index.get_member_by_club_id(self.viewer_id, old_club_id)
+            if indexed_entry:
+                print(f"[Old Club] Using viewer index for club ID: {old_club_id}")
+                api_data = {
+                    'name': indexed_entry['circle_name'],
+                    'members': [{
+                        'viewer_id': self.viewer_id,
+                        'trainer_name': indexed_entry['trainer_name'],
+                        'daily_fans': indexed_entry['daily_fans']
+                    }]
+                }
+            else:
+                print(f"[Old Club] Fetching data for club ID: {old_club_id}")
+                api_data = await fetch_circle_data(old_club_id, timeout=15)
             
             if not api_data:
                 await interaction.followup.send(
@@ -1759,92 +1787,42 @@ class GlobalLeaderboardView(discord.ui.View):
 # ============================================================================
 
 async def get_all_members_global() -> list:
-    """Get all members from all clubs for global leaderboard - FAST (uses cache)"""
-    all_members = []
+    """Get all members from all clubs for global leaderboard - FAST (materialized)
     
-    # CRITICAL FIX: Ensure ALL club caches are loaded to prevent inconsistent results
-    # Without this, global leaderboard shows different data depending on which club was viewed first
-    clubs_to_load = []
-    for club_name, club_config in client.config_cache.items():
-        data_sheet_name = club_config.get('Data_Sheet_Name')
-        if data_sheet_name:
-            cache_key = f"{club_name}_{data_sheet_name}"
-            # Check if cache exists and is fresh
-            cached_result = smart_cache.get(cache_key)
-            if cached_result is None:
-                clubs_to_load.append((club_name, data_sheet_name))
-    
-    # Warm missing caches (fast - concurrent)
-    if clubs_to_load:
-        import asyncio
-        tasks = []
-        for club_name, sheet_name in clubs_to_load:
-            task = asyncio.create_task(_load_data_for_command(club_name, sheet_name))
-            tasks.append(task)
-        
-        # Wait for all loads (with timeout)
+    Rows come from the materialized global leaderboard, which the sync updates
+    for every club whose Data sheet changed. Clubs not materialized yet (new
+    clubs, first start) are computed once from their cached data.
+    """
+    missing = [
+        (club_name, club_config.get('Data_Sheet_Name'))
+        for club_name, club_config in client.config_cache.items()
+        if club_config.get('Data_Sheet_Name') and not global_leaderboard.has_club(club_name)
+    ]
+    
+    if missing:
+        # Warm missing caches (fast - concurrent), then materialize those clubs
+        tasks = [
+            asyncio.create_task(_load_data_for_command(club_name, sheet_name))
+            for club_name, sheet_name in missing
+        ]
         try:
-            await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout=10.0)
+            results = await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout=10.0)
         except asyncio.TimeoutError:
             print("⚠️ Some club data loading timed out for global leaderboard")
-    
-    # Now load data from cache (all should be available)
-    for club_name, club_config in client.config_cache.items():
-        data_sheet_name = club_config.get('Data_Sheet_Name')
-        if not data_sheet_name:
-            continue
+            results = [task.result() if task.done() and not task.exception() else None for task in tasks]
         
-        try:
-            # FAST: Read from cache (use global smart_cache, not client.smart_cache)
-            cache_key = f"{club_name}_{data_sheet_name}"
-            
-            # Try SmartCache (in-memory + disk)
-            cached_result = smart_cache.get(cache_key)
-            df = None
-            
-            if cached_result is not None:
-                df, cache_timestamp = cached_result
-            
-            if df is None or df.empty:
-                continue
-            
-            # Calculate monthly stats
-            min_day = df['Day'].min()
-            max_day = df['Day'].max()
-            days_count = max_day - min_day + 1
-            
-            # Group by member name
-            for member_name in df['Name'].unique():
-                member_df = df[df['Name'] == member_name]
-                
-                # Get first and last record
-                first_record = member_df[member_df['Day'] == min_day]
-                last_record = member_df[member_df['Day'] == max_day]
-                
-                if first_record.empty or last_record.empty:
-                    continue
-                
-                # Calculate monthly growth
-                first_fans = int(first_record.iloc[0].get('Total Fans', 0))
-                last_fans = int(last_record.iloc[0].get('Total Fans', 0))
-                monthly_growth = last_fans - first_fans
-                
-                # Calculate daily average
-                daily_average = monthly_growth // days_count if days_count > 0 else 0
-                
-                all_members.append({
-                    'name': member_name,
-                    'fans': monthly_growth,  # Total gained this month
-                    'daily': daily_average,  # Average per day
-                    'club': club_name
-                })
-        except Exception as e:
-            print(f"⚠️ Error loading {club_name} for global leaderboard: {e}")
-            continue
+        for (club_name, _), result in zip(missing, results):
+            if isinstance(result, tuple) and result[0] is not None and not result[0].empty:
+                try:
+                    global_leaderboard.update_club(club_name, result[0])
+                except Exception as e:
+                    print(f"⚠️ Error loading {club_name} for global leaderboard: {e}")
+        await asyncio.to_thread(global_leaderboard.save)
     
-    # Sort by monthly growth (descending)
-    all_members.sort(key=lambda x: x['fans'], reverse=True)
-    return all_members
+    # Sorted by monthly growth (descending)
+    return global_leaderboard.get_members(
+        name for name, cfg in client.config_cache.items() if cfg.get('Data_Sheet_Name')
+    )
 
 
 
@@ -1883,66 +1861,17 @@ async def update_global_leaderboard_message():
         # Load message ID
         message_id = load_global_leaderboard_message_id()
         
-        # Aggregate all members from all clubs
-        all_members = []
-        
-        for club_name, club_config in client.config_cache.items():
-            data_sheet_name = club_config.get('Data_Sheet_Name')
-            if not data_sheet_name:
-                continue
-            
-            try:
-                # Get latest data from Google Sheets
-                df, _ = await _load_data_for_command(club_name, data_sheet_name)
-                
-                if df is None or df.empty:
-                    continue
-                
-                # Calculate monthly stats
-                # Get first and last day of current data
-                min_day = df['Day'].min()
-                max_day = df['Day'].max()
-                days_count = max_day - min_day + 1
-                
-                # Group by member name
-                for member_name in df['Name'].unique():
-                    member_df = df[df['Name'] == member_name]
-                    
-                    # Get first and last record
-                    first_record = member_df[member_df['Day'] == min_day]
-                    last_record = member_df[member_df['Day'] == max_day]
-                    
-                    if first_record.empty or last_record.empty:
-                        continue
-                    
-                    # Calculate monthly growth
-                    first_fans = int(first_record.iloc[0].get('Total Fans', 0))
-                    last_fans = int(last_record.iloc[0].get('Total Fans', 0))
-                    monthly_growth = last_fans - first_fans
-                    
-                    # Calculate daily average
-                    daily_average = monthly_growth // days_count if days_count > 0 else 0
-                    
-                    all_members.append({
-                        'name': member_name,
-                        'fans': monthly_growth,  # Total gained this month
-                        'daily': daily_average,  # Average per day
-                        'club': club_name,
-                        'days': days_count
-                    })
-            except Exception as e:
-                print(f"⚠️ Error loading {club_name} for leaderboard: {e}")
-                continue
-        
-        # Sort by monthly growth
-        all_members.sort(key=lambda x: x['fans'], reverse=True)
+        # All members from all clubs (materialized, no Sheets reads)
+        all_members = await get_all_members_global()
         
         # Create view with pagination
         if all_members:
             view = GlobalLeaderboardView(all_members, members_per_page=10)
-            content = view.get_page_content()
+            embed = view.get_page_embed()
+            content = None
         else:
             view = None
+            embed = None
             content = (
                 "🏆 **Global Leaderboard**\n\n"
                 "⚠️ No member data available yet.\n"
@@ -1953,16 +1882,16 @@ async def update_global_leaderboard_message():
         if message_id:
             try:
                 message = await display_channel.fetch_message(message_id)
-                await message.edit(content=content, view=view)
+                await message.edit(content=content, embed=embed, view=view)
                 print(f"✅ Updated global leaderboard ({len(all_members)} members)")
             except discord.NotFound:
                 # Message deleted, create new
-                message = await display_channel.send(content=content, view=view)
+                message = await display_channel.send(content=content, embed=embed, view=view)
                 save_global_leaderboard_message_id(message.id)
                 print(f"✅ Created new global leaderboard: {message.id}")
         else:
             # Create new message
-            message = await display_channel.send(content=content, view=view)
+            message = await display_channel.send(content=content, embed=embed, view=view)
             save_global_leaderboard_message_id(message.id)
             print(f"✅ Created global leaderboard: {message.id}")
     
@@ -2185,15 +2114,10 @@ async def update_channel_list_message():
             print(f"🗑️ Removing {len(channels_to_remove)} inaccessible channel(s)")
             for ch_to_remove in channels_to_remove:
                 channels_config = [ch for ch in channels_config if ch.get('channel_id') != ch_to_remove.get('channel_id')]
+                await state_store.aio.remove_allowed_channel(ch_to_remove.get('channel_id'))
             
             config.ALLOWED_CHANNEL_IDS = [ch['channel_id'] for ch in channels_config]
-            
-            config_data = {
-                "channels": channels_config,
-                "last_updated": datetime.datetime.now(pytz.timezone('Asia/Ho_Chi_Minh')).strftime("%Y-%m-%d %H:%M:%S")
-            }
-            with open(ALLOWED_CHANNELS_CONFIG_FILE, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, indent=2, ensure_ascii=False)
+            await config_registry.reload('allowed_channels')
         
         # Create view with pagination
         view = ChannelListView(channels_data, invites, channels_per_page=10)
@@ -2455,9 +2379,17 @@ class ClubManagementBot(discord.Client):
         self.member_cache = {}
         self.last_cache_update_time = 0
         self.start_time = datetime.datetime.now(datetime.timezone.utc)
+        self.http_client = http_client
     
     async def setup_hook(self):
         """Setup hook called when bot is ready"""
+        # Pooled HTTP sessions (one per proxy) for uma.moe / OCR / web dashboard
+        self.http_client.attach_proxy_manager(proxy_manager)
+
+        # Connect to Google Sheets in a worker thread; a lazy first use on the
+        # event loop thread would block it during the connection requests
+        await asyncio.to_thread(get_gs_manager)
+        
         # Register persistent views for God Mode panel
         try:
             from god_mode_panel import GodModeControlPanel
@@ -2470,6 +2402,11 @@ class ClubManagementBot(discord.Client):
         await self.tree.sync()
         print("✅ Commands synced to Discord")
         # Note: Scheduled tasks start themselves via @tasks.loop decorators
+    
+    async def close(self):
+        """Close pooled HTTP sessions before shutting down"""
+        await self.http_client.close()
+        await super().close()
 
     
     async def global_channel_check(self, interaction: discord.Interaction) -> bool:
@@ -2528,18 +2465,17 @@ class ClubManagementBot(discord.Client):
         except (AttributeError, TypeError) as e:
             print(f"⚠️ Could not check admin permissions: {e}")
         
-        # ✅ Load channels config from JSON file
-        channels_config = load_channels_config()
-        
-        # Build list of allowed channel IDs from:
-        # 1. File-based config (from set_channel command)
+        # Allowed channel IDs come from:
+        # 1. File-based config (from set_channel command), kept in memory by the config registry
         # 2. Default hardcoded channels (from config.ALLOWED_CHANNEL_IDS)
-        allowed_channel_ids = set(config.ALLOWED_CHANNEL_IDS)  # Start with defaults
-        for ch in channels_config:
-            allowed_channel_ids.add(ch.get('channel_id'))
+        configured_channel_ids = config_registry.get('allowed_channels')['channel_ids']
+        channel_allowed = (
+            interaction.channel_id in configured_channel_ids
+            or interaction.channel_id in config.ALLOWED_CHANNEL_IDS
+        )
         
         # If no restrictions (empty file + empty defaults), allow all
-        if not allowed_channel_ids:
+        if not configured_channel_ids and not config.ALLOWED_CHANNEL_IDS:
             # Log command
             if interaction.type == discord.InteractionType.application_command:
                 asyncio.create_task(self.log_command(interaction))
@@ -2547,10 +2483,10 @@ class ClubManagementBot(discord.Client):
         
         # For autocomplete, fail silently if not in allowed channels
         if interaction.type == discord.InteractionType.autocomplete:
-            return interaction.channel_id in allowed_channel_ids
+            return channel_allowed
         
         # For commands, check channel and send message if wrong
-        if interaction.channel_id not in allowed_channel_ids:
+        if not channel_allowed:
             try:
                 if not interaction.response.is_done():
                     await interaction.response.send_message(
@@ -2662,6 +2598,8 @@ class ClubManagementBot(discord.Client):
             # Update in-memory cache
             for field, value in field_updates.items():
                 self.config_cache[club_name][field] = value
+            club_index.update_club(club_name, self.config_cache[club_name])
+            render_cache.invalidate_club(club_name)
             
             # Also update the serializable cache file
             config_cache_file = os.path.join(SCRIPT_DIR, "cache", "config_cache.json")
@@ -2688,8 +2626,9 @@ class ClubManagementBot(discord.Client):
             print(f"Error updating single club config: {e}")
             return False
     
+    @background_sheets_traffic
     async def update_caches(self):
-        """Update config and member caches from Google Sheets"""
+        """Update config and member caches from Google Sheets (background Sheets priority)"""
         current_time = time.time()
         
         # Check cooldown
@@ -2699,48 +2638,44 @@ class ClubManagementBot(discord.Client):
         
         try:
             print("Bot: Attempting to update cache from Google Sheets...")
-            config_ws = await asyncio.to_thread(gs_manager.sh.worksheet, config.CONFIG_SHEET_NAME)
-            club_configs = await asyncio.to_thread(config_ws.get_all_records)
+            config_ws = await to_sheets_thread(gs_manager.get_worksheet, config.CONFIG_SHEET_NAME)
+            club_configs = await to_sheets_thread(config_ws.get_all_records)
             
             new_config_cache = {}
-            new_member_cache = {}
             serializable_config = {}
-            total_members = 0
             
-            for club_config in club_configs:
+            # get_all_records keeps sheet order: record i is on row i + 2 (row 1 = header)
+            for index, club_config in enumerate(club_configs):
                 club_name = club_config.get('Club_Name')
                 data_sheet_name = club_config.get('Data_Sheet_Name')
                 
-                if not club_name or not data_sheet_name:
-                    continue
-                
-                # Find config row
-                config_cell = await asyncio.to_thread(config_ws.find, club_name, in_column=1)
-                if not config_cell:
-                    print(f"Warning: Could not find row for {club_name}")
+                if not club_name or not data_sheet_name or club_name in new_config_cache:
                     continue
                 
-                club_config['row'] = config_cell.row
+                club_config['row'] = index + 2
                 club_config['config_sheet'] = config_ws
                 
                 new_config_cache[club_name] = club_config
                 serializable_config[club_name] = {
                     k: v for k, v in club_config.items() if k != 'config_sheet'
                 }
-                
-                # Load members from DATA SHEET (has actual data with all members)
-                # instead of Members sheet which may be outdated
-                member_names = await self._load_members_from_data_sheet(data_sheet_name)
-                new_member_cache[club_name] = member_names
-                total_members += len(member_names)
-                
-                # Rate limiting: wait 3s between each sheet read to avoid quota errors
-                # Google Sheets API has 60 requests/minute limit, so 3s = 20 requests/minute max
-                await asyncio.sleep(3)
+            
+            # Load members from DATA SHEETS (have actual data with all members)
+            # instead of Members sheets which may be outdated
+            members_by_sheet = await self._load_members_from_data_sheets(
+                [club_config['Data_Sheet_Name'] for club_config in new_config_cache.values()]
+            )
+            new_member_cache = {
+                club_name: members_by_sheet.get(club_config['Data_Sheet_Name'], [])
+                for club_name, club_config in new_config_cache.items()
+            }
+            total_members = sum(len(names) for names in new_member_cache.values())
             
             # Update caches
             self.config_cache = new_config_cache
             self.member_cache = new_member_cache
+            club_index.build(new_config_cache)
+            member_index.build(new_member_cache)
             
             # Save to files
             self._save_cache_files(serializable_config, new_member_cache)
@@ -2757,8 +2692,8 @@ class ClubManagementBot(discord.Client):
         
         for attempt in range(max_retries):
             try:
-                members_ws = await asyncio.to_thread(gs_manager.sh.worksheet, members_sheet_name)
-                all_values = await asyncio.to_thread(members_ws.get_all_values)
+                members_ws = await to_sheets_thread(gs_manager.get_worksheet, members_sheet_name)
+                all_values = await to_sheets_thread(members_ws.get_all_values)
                 
                 if not all_values or len(all_values) < 1:
                     print(f"Warning: Sheet '{members_sheet_name}' is empty")
@@ -2807,11 +2742,8 @@ class ClubManagementBot(discord.Client):
                 is_rate_limit = "429" in error_str or "quota" in error_str
                 
                 if is_rate_limit and attempt < max_retries - 1:
-                    # Longer exponential backoff: 5s, 15s, 30s
-                    wait_times = [5, 15, 30]
-                    wait_time = wait_times[attempt]
-                    print(f"⚠️ Rate limit hit for {members_sheet_name}, waiting {wait_time}s... (attempt {attempt + 1}/{max_retries})")
-                    await asyncio.sleep(wait_time)
+                    # The Sheets limiter holds the retry until the quota window reopens
+                    print(f"⚠️ Rate limit hit for {members_sheet_name}, retrying... (attempt {attempt + 1}/{max_retries})")
                     continue
                 else:
                     print(f"❌ Error loading members from {members_sheet_name}: {e}")
@@ -2821,14 +2753,72 @@ class ClubManagementBot(discord.Client):
         
         return []
     
+    @staticmethod
+    def _member_names_from_name_column(values: List[str]) -> Optional[List[str]]:
+        """Unique, sorted member names from a Data Sheet's first column
+        
+        Args:
+            values: Column A top to bottom (optional === CURRENT === row, header, names)
+        
+        Returns:
+            Sorted unique names, or None if column A is not the Name column
+        """
+        header_row_idx = 1 if values and values[0] and '=== CURRENT' in values[0] else 0
+        if len(values) <= header_row_idx:
+            return []
+        if values[header_row_idx] not in ("Name", "Trainer Name", "Member Name", "name", "trainer_name"):
+            return None
+        return sorted({value.strip() for value in values[header_row_idx + 1:] if value and value.strip()})
+    
+    async def _load_members_from_data_sheets(self, data_sheet_names: List[str]) -> Dict[str, List[str]]:
+        """Load unique member names of many Data Sheets in a few API calls
+        
+        Reads only the Name column (A) of every sheet with values_batch_get
+        (SHEETS_BATCH_GET_RANGES sheets per request). Sheets whose column A
+        is not a Name column fall back to a full read, run concurrently.
+        
+        Args:
+            data_sheet_names: Data Sheet names
+        
+        Returns:
+            {data_sheet_name: sorted member names} ([] for missing/unreadable sheets)
+        """
+        try:
+            columns = await to_sheets_thread(gs_manager.get_columns_batch, data_sheet_names, 'A')
+        except Exception as e:
+            print(f"⚠️ Batch member load failed, reading sheets one by one: {e}")
+            columns = None
+        
+        members_by_sheet = {}
+        fallback = []
+        for sheet_name in dict.fromkeys(data_sheet_names):
+            if columns is None:
+                fallback.append(sheet_name)
+                continue
+            if sheet_name not in columns:
+                members_by_sheet[sheet_name] = []  # Sheet does not exist (already logged)
+                continue
+            names = self._member_names_from_name_column(columns[sheet_name])
+            if names is None:
+                fallback.append(sheet_name)
+            else:
+                members_by_sheet[sheet_name] = names
+        
+        if fallback:
+            results = await asyncio.gather(*(self._load_members_from_data_sheet(name) for name in fallback))
+            members_by_sheet.update(zip(fallback, results))
+        
+        print(f"✅ Loaded members of {len(members_by_sheet)} Data Sheets ({len(fallback)} needed a full read)")
+        return members_by_sheet
+    
     async def _load_members_from_data_sheet(self, data_sheet_name: str) -> List[str]:
         """Load unique member names from Data Sheet (has actual stats data)"""
         max_retries = 3
         
         for attempt in range(max_retries):
             try:
-                data_ws = await asyncio.to_thread(gs_manager.sh.worksheet, data_sheet_name)
-                all_values = await asyncio.to_thread(data_ws.get_all_values)
+                data_ws = await to_sheets_thread(gs_manager.get_worksheet, data_sheet_name)
+                all_values = await to_sheets_thread(data_ws.get_all_values)
                 
                 if not all_values or len(all_values) < 1:
                     print(f"Warning: Data Sheet '{data_sheet_name}' is empty")
@@ -2877,10 +2867,8 @@ class ClubManagementBot(discord.Client):
                 is_rate_limit = "429" in error_str or "quota" in error_str
                 
                 if is_rate_limit and attempt < max_retries - 1:
-                    wait_times = [5, 15, 30]
-                    wait_time = wait_times[attempt]
-                    print(f"⚠️ Rate limit hit for {data_sheet_name}, waiting {wait_time}s... (attempt {attempt + 1}/{max_retries})")
-                    await asyncio.sleep(wait_time)
+                    # The Sheets limiter holds the retry until the quota window reopens
+                    print(f"⚠️ Rate limit hit for {data_sheet_name}, retrying... (attempt {attempt + 1}/{max_retries})")
                     continue
                 else:
                     print(f"❌ Error loading members from data sheet {data_sheet_name}: {e}")
@@ -2910,15 +2898,17 @@ class ClubManagementBot(discord.Client):
                     config_from_cache = json.load(f)
                 with open(MEMBER_CACHE_FILE, 'r') as f:
                     self.member_cache = json.load(f)
+                member_index.build(self.member_cache)
                 
                 # Re-attach config_sheet if possible
                 try:
-                    config_ws = await asyncio.to_thread(gs_manager.sh.worksheet, config.CONFIG_SHEET_NAME)
+                    config_ws = await to_sheets_thread(gs_manager.get_worksheet, config.CONFIG_SHEET_NAME)
                     for name, club_config in config_from_cache.items():
                         club_config['config_sheet'] = config_ws
                         self.config_cache[name] = club_config
                 except Exception:
                     self.config_cache = config_from_cache
+                club_index.build(self.config_cache)
                 
                 print(f"Loaded {len(self.config_cache)} clubs from cache.")
             
@@ -3105,7 +3095,7 @@ async def tournament_setup(interaction: discord.Interaction):
         await admin_channel.send(embed=embed, view=panel_view)
         
         # Save channel/role IDs for future use
-        tournament = create_tournament(
+        tournament = await create_tournament(
             guild_id=guild.id,
             name="Pending",
             created_by=interaction.user.id
@@ -3117,7 +3107,7 @@ async def tournament_setup(interaction: discord.Interaction):
         tournament.forum_channel_id = forum_channel.id
         tournament.tournament_role_id = tournament_role.id
         tournament.referee_role_id = referee_role.id
-        tournament.save()
+        await tournament.save()
         
         await interaction.followup.send(
             f"✅ **Tournament Setup Complete!**\n\n"
@@ -3250,34 +3240,27 @@ async def before_backup():
 # CHANNEL CONFIG MIGRATION
 # ============================================================================
 
-def migrate_old_channel_config():
+async def migrate_old_channel_config():
     """Migrate old single-channel config to new multi-channel format"""
     old_file = os.path.join(SCRIPT_DIR, "allowed_channel_config.json")
-    new_file = ALLOWED_CHANNELS_CONFIG_FILE
     
-    # Check if old file exists and new file doesn't
-    if os.path.exists(old_file) and not os.path.exists(new_file):
+    # Check if old file exists and no channels are configured yet
+    if os.path.exists(old_file) and not await state_store.aio.list_allowed_channels():
         try:
             with open(old_file, 'r', encoding='utf-8') as f:
                 old_data = json.load(f)
             
             # Convert to new format
-            new_data = {
-                "channels": [{
-                    "channel_id": old_data.get('channel_id'),
-                    "channel_name": old_data.get('channel_name', 'Unknown'),
-                    "server_id": old_data.get('server_id'),
-                    "server_name": old_data.get('server_name', 'Unknown'),
-                    "added_by": old_data.get('set_by'),
-                    "added_by_name": old_data.get('set_by_name', 'Unknown'),
-                    "added_at": old_data.get('set_at', datetime.datetime.now(pytz.timezone('Asia/Ho_Chi_Minh')).strftime("%Y-%m-%d %H:%M:%S"))
-                }],
-                "last_updated": datetime.datetime.now(pytz.timezone('Asia/Ho_Chi_Minh')).strftime("%Y-%m-%d %H:%M:%S")
-            }
-            
-            # Save new format
-            with open(new_file, 'w', encoding='utf-8') as f:
-                json.dump(new_data, f, indent=2, ensure_ascii=False)
+            await state_store.aio.add_allowed_channel({
+                "channel_id": old_data.get('channel_id'),
+                "channel_name": old_data.get('channel_name', 'Unknown'),
+                "server_id": old_data.get('server_id'),
+                "server_name": old_data.get('server_name', 'Unknown'),
+                "added_by": old_data.get('set_by'),
+                "added_by_name": old_data.get('set_by_name', 'Unknown'),
+                "added_at": old_data.get('set_at', datetime.datetime.now(pytz.timezone('Asia/Ho_Chi_Minh')).strftime("%Y-%m-%d %H:%M:%S"))
+            })
+            await config_registry.reload('allowed_channels')
             
             # Rename old file as backup
             backup_file = old_file + '.backup'
@@ -3326,7 +3309,7 @@ async def on_ready():
     print("=" * 50)
     
     # Migrate old channel config if needed
-    migrate_old_channel_config()
+    await migrate_old_channel_config()
     
     # Load channel configuration
     channels_config = load_channels_config()
@@ -3423,38 +3406,11 @@ async def club_autocomplete(
     """Autocomplete for club names - SERVER FILTERED (must complete in <3s)"""
     try:
         # CRITICAL: Only use cached data - NEVER query sheets
-        # Also add timeout protection to prevent Unknown interaction errors
-        if not client.config_cache:
-            return []
-        
-        # Filter clubs by current server - fast path
-        server_id = interaction.guild_id
-        current_lower = current.lower() if current else ""
-        
-        # Fast path: If no server ID (DM), show all clubs
-        if not server_id:
-            choices = [
-                app_commands.Choice(name=name, value=name)
-                for name in list(client.config_cache.keys())[:25]
-                if not current_lower or current_lower in name.lower()
-            ]
-            return choices[:25]
-        
-        # Filter by server - use pre-built list for speed
-        server_clubs = [
-            name for name, config in client.config_cache.items()
-            if config.get('Server_ID') == str(server_id) or config.get('Server_ID') == server_id
-        ]
-        
-        # Fallback: If no clubs for this server yet, show all (for setup phase)
-        if not server_clubs:
-            server_clubs = list(client.config_cache.keys())
-        
-        # Filter by user input - limit iterations
+        # Per-guild index (built with config_cache): dict lookup + prefix range scan.
+        # DMs and servers without clubs yet (setup phase) get all clubs.
         choices = [
             app_commands.Choice(name=name, value=name)
-            for name in server_clubs[:50]  # Limit source list
-            if not current_lower or current_lower in name.lower()
+            for name in club_index.search(interaction.guild_id, current or "", limit=25)
         ]
         return choices[:25]
         
@@ -3478,48 +3434,16 @@ async def member_autocomplete(
     try:
         club_name = getattr(interaction.namespace, 'club_name', None)
         
-        if not club_name or not client.member_cache:
-            return []
-        
-        # Find club (case-insensitive) using cached data only
-        member_list = client.member_cache.get(club_name, [])
-        
-        if not member_list:
-            # Fast case-insensitive lookup
-            club_name_lower = club_name.casefold()
-            for cached_club, members in client.member_cache.items():
-                if cached_club.casefold() == club_name_lower:
-                    member_list = members
-                    break
-        
-        if not member_list:
+        if not club_name:
             return []
         
-        # Filter and return choices
-        # IMPORTANT: Filter ALL members first, then limit to 25
-        # This ensures users can find members even in large clubs (30+ members)
-        current_lower = current.lower() if current else ""
-        
-        if current_lower:
-            # User is typing - filter ALL members to find matches
-            choices = [
-                app_commands.Choice(name=name, value=name)
-                for name in member_list
-                if current_lower in name.lower()
-            ]
-        else:
-            # No filter - sort to show non-ASCII names (Chinese/Japanese) FIRST
-            # This ensures names like 王牌 appear in the dropdown without typing
-            def sort_key(name):
-                # Non-ASCII characters get priority (sort first)
-                has_non_ascii = any(ord(c) > 127 for c in name)
-                return (0 if has_non_ascii else 1, name.lower())
-            
-            sorted_members = sorted(member_list, key=sort_key)
-            choices = [
-                app_commands.Choice(name=name, value=name)
-                for name in sorted_members[:25]
-            ]
+        # Indexed search over ALL members of the club (case-insensitive club
+        # lookup, ranked matches + typo tolerance). An empty query returns the
+        # precomputed order with non-ASCII names (Chinese/Japanese) first.
+        choices = [
+            app_commands.Choice(name=name, value=name)
+            for name in member_index.search_club(club_name, current or "", limit=25)
+        ]
         
         return choices[:25]
     
@@ -3541,6 +3465,23 @@ async def member_autocomplete(
         return []
 
 
+async def global_member_autocomplete(
+    interaction: discord.Interaction,
+    current: str
+) -> List[app_commands.Choice[str]]:
+    """Autocomplete for member names across all clubs (shows the club too)"""
+    try:
+        return [
+            app_commands.Choice(name=f"{name} — {club}"[:100], value=name)
+            for name, club in member_index.search_all(current or "", limit=25)
+        ]
+    except Exception as e:
+        error_str = str(e).lower()
+        if '10062' not in error_str and 'unknown interaction' not in error_str:
+            print(f"Error in global_member_autocomplete: {e}")
+        return []
+
+
 # ============================================================================
 # EVENT HANDLER: ON_MESSAGE (FOR DM CUSTOM NAME HANDLING)
 # ============================================================================
@@ -3600,12 +3541,13 @@ async def on_message(message):
             extracted_club = ocr_result.get('club', 'Unknown')
             
             # Get viewer_id from sheets (primary identifier that never changes)
-            viewer_id = get_viewer_id_from_sheets(
+            viewer_id = await asyncio.to_thread(
+                get_viewer_id_from_sheets,
                 verification['member_name'], 
                 verification['club_name']
             )
             
-            save_profile_link(
+            await save_profile_link(
                 discord_id=user_id,
                 trainer_id=extracted_id,
                 member_name=verification['member_name'],
@@ -3998,7 +3940,7 @@ class CompetitiveClubSetupModal(discord.ui.Modal, title="Setup Competitive Club"
             
             # Create Data sheet (run in thread to avoid blocking)
             data_ws = await asyncio.to_thread(
-                gs_manager.sh.add_worksheet, 
+                gs_manager.add_worksheet, 
                 title=data_sheet, rows=100, cols=6
             )
             await asyncio.to_thread(
@@ -4010,7 +3952,7 @@ class CompetitiveClubSetupModal(discord.ui.Modal, title="Setup Competitive Club"
             
             # Create Members sheet (run in thread to avoid blocking)
             members_ws = await asyncio.to_thread(
-                gs_manager.sh.add_worksheet, 
+                gs_manager.add_worksheet, 
                 title=members_sheet, rows=50, cols=2
             )
             await asyncio.to_thread(
@@ -4027,7 +3969,7 @@ class CompetitiveClubSetupModal(discord.ui.Modal, title="Setup Competitive Club"
             
             # Add to config with competitive type (run in thread)
             config_ws = await asyncio.to_thread(
-                gs_manager.sh.worksheet, config.CONFIG_SHEET_NAME
+                gs_manager.get_worksheet, config.CONFIG_SHEET_NAME
             )
             await asyncio.to_thread(
                 config_ws.append_row,
@@ -4060,6 +4002,8 @@ class CompetitiveClubSetupModal(discord.ui.Modal, title="Setup Competitive Club"
             }
             # Also initialize member_cache for this club (empty for now, will populate on first sync)
             client.member_cache[club_name] = []
+            club_index.update_club(club_name, client.config_cache[club_name])
+            member_index.update_club(club_name, [])
             print(f"📝 Added {club_name} to config_cache and member_cache (skipped full reload)")
             
             await interaction.followup.send(
@@ -4256,7 +4200,7 @@ class CasualClubSetupModal(discord.ui.Modal, title="Setup Casual Club"):
             
             # Create Data sheet (run in thread to avoid blocking)
             data_ws = await asyncio.to_thread(
-                gs_manager.sh.add_worksheet, 
+                gs_manager.add_worksheet, 
                 title=data_sheet, rows=100, cols=6
             )
             await asyncio.to_thread(
@@ -4268,7 +4212,7 @@ class CasualClubSetupModal(discord.ui.Modal, title="Setup Casual Club"):
             
             # Create Members sheet (run in thread to avoid blocking)
             members_ws = await asyncio.to_thread(
-                gs_manager.sh.add_worksheet, 
+                gs_manager.add_worksheet, 
                 title=members_sheet, rows=50, cols=2
             )
             await asyncio.to_thread(
@@ -4285,7 +4229,7 @@ class CasualClubSetupModal(discord.ui.Modal, title="Setup Casual Club"):
             
             # Add to config with casual type (run in thread)
             config_ws = await asyncio.to_thread(
-                gs_manager.sh.worksheet, config.CONFIG_SHEET_NAME
+                gs_manager.get_worksheet, config.CONFIG_SHEET_NAME
             )
             await asyncio.to_thread(
                 config_ws.append_row,
@@ -4318,6 +4262,8 @@ class CasualClubSetupModal(discord.ui.Modal, title="Setup Casual Club"):
             }
             # Also initialize member_cache for this club (empty for now, will populate on first sync)
             client.member_cache[club_name] = []
+            club_index.update_club(club_name, client.config_cache[club_name])
+            member_index.update_club(club_name, [])
             print(f"📝 Added {club_name} to config_cache and member_cache (skipped full reload)")
             
             await interaction.followup.send(
@@ -4986,6 +4932,16 @@ class HelpView(discord.ui.View):
             inline=False
         )
         
+        embed.add_field(
+            name="🔎 /find_member",
+            value=(
+                "Find a trainer without knowing their club\n"
+                "`/find_member member_name:[type name]`\n\n"
+                "Shows matching trainers and their clubs (typos are OK)"
+            ),
+            inline=False
+        )
+        
         embed.add_field(
             name="🔍 /search_club",
             value=(
@@ -6037,7 +5993,7 @@ async def auto_create_club_from_api(
     
     # Create Members sheet (non-blocking)
     members_ws = await asyncio.to_thread(
-        gs_manager.sh.add_worksheet,
+        gs_manager.add_worksheet,
         title=members_sheet,
         rows=100,
         cols=5
@@ -6060,7 +6016,7 @@ async def auto_create_club_from_api(
     
     # Create Data sheet (non-blocking)
     data_ws = await asyncio.to_thread(
-        gs_manager.sh.add_worksheet,
+        gs_manager.add_worksheet,
         title=data_sheet,
         rows=1000,
         cols=10
@@ -6074,7 +6030,7 @@ async def auto_create_club_from_api(
     club_url = f"https://chronogenesis.net/club_profile?circle_id={circle_id}"
     
     # Add to Clubs_Config with provided settings + Club_ID + Server_ID for auto-sync (non-blocking)
-    config_ws = await asyncio.to_thread(gs_manager.sh.worksheet, config.CONFIG_SHEET_NAME)
+    config_ws = await asyncio.to_thread(gs_manager.get_worksheet, config.CONFIG_SHEET_NAME)
     await asyncio.to_thread(config_ws.append_row, [
         club_name,           # Column A: Club_Name
         data_sheet,          # Column B: Data_Sheet_Name
@@ -6118,7 +6074,8 @@ async def status(interaction: discord.Interaction):
     # Check Google Sheets status
     gsheets_status = "✅ Connected"
     try:
-        gs_manager.sh.worksheet(config.CONFIG_SHEET_NAME)
+        # Real metadata request (cached handles would not test the connection)
+        await asyncio.to_thread(gs_manager.refresh_worksheets)
     except:
         gsheets_status = "⚠️ Disconnected (Using Cache)"
     
@@ -6138,6 +6095,13 @@ async def status(interaction: discord.Interaction):
     # Determine primary database
     db_mode = "🔄 Hybrid (Auto-Failover)" if hybrid_db else ("🚀 Supabase" if USE_SUPABASE else "📊 Google Sheets")
     
+    # HTTP connection pool utilisation
+    http_stats = http_client.get_stats()
+    http_status = (
+        f"{http_stats['connections_in_use']} in use / {http_stats['connections_idle']} idle "
+        f"across {http_stats['open_pools']} pools ({http_stats['total_requests']} requests)"
+    )
+    
     status_message = (
         f"🏓 **Pong!**\n"
         f"**Latency:** {latency}ms\n"
@@ -6145,6 +6109,7 @@ async def status(interaction: discord.Interaction):
         f"**Supabase:** {supabase_status}\n"
         f"**GSheets:** {gsheets_status}\n"
         f"**Cache Status:** {cache_status}\n"
+        f"**HTTP Pool:** {http_status}\n"
         f"**Clubs Loaded:** {len(client.config_cache)}"
     )
     
@@ -6177,133 +6142,31 @@ async def uptime(interaction: discord.Interaction):
 # DATA LOADING HELPER
 # ============================================================================
 
-async def _load_data_for_command(club_name: str, data_sheet_name: str) -> Tuple[pd.DataFrame, Optional[str]]:
-    """Load data from Google Sheets FIRST with enhanced retry, cache as fallback only
-    
-    NEW BEHAVIOR (Google Sheets-First):
-    1. Try Google Sheets with 5 retries + exponential backoff
-    2. Only use cache if ALL Google Sheets attempts fail
-    3. Clear error messages for troubleshooting
-    """
-    cache_warning = None
-    cache_key = f"{club_name}_{data_sheet_name}"
-    
-    # ===== TRY GOOGLE SHEETS FIRST WITH ENHANCED RETRY =====
-    max_retries = 5  # Increased from 3 to 5
-    retry_delay = 1  # Base delay in seconds
-    last_error = None
-    df = None
+# Bumped on every invalidation so a refresh that started before a sync write
+# cannot put pre-write data back into the cache
+_data_cache_generation = {}
+
+
+def _prepare_club_dataframe(df: pd.DataFrame, data_sheet_name: str, from_sheet: bool) -> pd.DataFrame:
+    """Convert numeric columns (fresh sheet data only) and compute behind status
     
-    print(f"📡 Attempting to load {club_name} from Google Sheets...")
+    Args:
+        df: Raw DataFrame (from sheet or legacy cache)
+        data_sheet_name: Sheet name (for error messages)
+        from_sheet: True if df holds raw strings from Google Sheets
     
-    for attempt in range(max_retries):
-        try:
-            # Run blocking gspread calls in thread pool to avoid blocking event loop
-            ws = await asyncio.to_thread(gs_manager.sh.worksheet, data_sheet_name)
-            data = await asyncio.to_thread(ws.get_all_values)
-            
-            # Check if first row is the === CURRENT === header and skip it
-            header_row_idx = 0
-            if data and data[0] and data[0][0] and '=== CURRENT' in data[0][0]:
-                header_row_idx = 1  # Skip CURRENT header row
-            
-            headers = data[header_row_idx] if len(data) > header_row_idx else []
-            rows = data[header_row_idx + 1:] if len(data) > header_row_idx + 1 else []
-            
-            # Check if sheet is empty AFTER successful fetch
-            if not data or len(rows) < 1:
-                raise ValueError(
-                    f"Sheet '{data_sheet_name}' is empty.\n"
-                    f"This club has no data yet. Please wait for the bot to update the data (usually at 7AM UTC or 7PM UTC)."
-                )
-            
-            df = pd.DataFrame(rows, columns=headers)
-            print(f"✅ Successfully loaded {club_name} from Google Sheets (attempt {attempt + 1})")
-            break  # Success - exit retry loop
-            
-        except ValueError as ve:
-            # Empty sheet - re-raise ValueError (not a connection issue)
-            raise ve
-        
-        except Exception as e:
-            last_error = e
-            # Check if retryable error
-            if is_retryable_error(e):
-                if attempt < max_retries - 1:
-                    # Exponential backoff with jitter to avoid thundering herd
-                    base_wait = retry_delay * (2 ** attempt)
-                    jitter = random.uniform(0, 1)  # Add 0-1 second randomness
-                    wait_time = base_wait + jitter
-                    
-                    print(f"⚠️ GSheets connection error for {club_name} (attempt {attempt + 1}/{max_retries})")
-                    print(f"   Error: {str(e)[:100]}")
-                    print(f"   ⏳ Retrying in {wait_time:.1f}s...")
-                    await asyncio.sleep(wait_time)
-                    continue
-                else:
-                    # All retries exhausted
-                    print(f"❌ All {max_retries} Google Sheets retries failed for {club_name}")
-            else:
-                # Non-retryable error - raise immediately
-                print(f"❌ Non-retryable error for {club_name}: {e}")
-                raise e
-    
-    # ===== FALLBACK TO CACHE IF ALL GSHEETS RETRIES FAILED =====
-    if df is None and last_error and is_retryable_error(last_error):
-        print(f"🔄 Attempting cache fallback for {club_name}...")
-        
-        # Try SmartCache first (in-memory + disk)
-        cached_result = smart_cache.get(cache_key)
-        if cached_result is not None:
-            df, cache_timestamp = cached_result
-            cache_age_hours = (time.time() - cache_timestamp) / 3600
-            cache_warning = (
-                f"⚠️ **Google Sheets không khả dụng**\n"
-                f"Hiển thị dữ liệu từ cache (cập nhật {cache_age_hours:.1f} giờ trước)\n\n"
-            )
-            print(f"✅ Using SmartCache for {club_name} (age: {cache_age_hours:.1f} hours)")
-        else:
-            # Try old legacy cache as last resort
-            cache_file_path = os.path.join(DATA_CACHE_DIR, f"{club_name}_Data.json")
-            try:
-                with open(cache_file_path, "r") as f:
-                    cache_data = json.load(f)
-                
-                df = pd.read_json(StringIO(cache_data["dataframe_json"]), orient="records")
-                cache_timestamp = cache_data.get("timestamp", 0)
-                cache_warning = f"⚠️ **Google Sheets không khả dụng.** Hiển thị dữ liệu cache cũ từ <t:{cache_timestamp}:R>.\n\n"
-                print(f"✅ Using legacy cache for {club_name}")
-            
-            except FileNotFoundError:
-                raise Exception(
-                    f"❌ Không thể kết nối Google Sheets sau {max_retries} lần thử VÀ không tìm thấy cache cho {club_name}.\n\n"
-                    f"**Nguyên nhân có thể:**\n"
-                    f"• Mất kết nối internet\n"
-                    f"• Google Sheets API đang bảo trì\n"
-                    f"• Chưa có dữ liệu nào được tải về\n\n"
-                    f"**Giải pháp:**\n"
-                    f"• Kiểm tra kết nối mạng\n"
-                    f"• Thử lại sau vài phút"
-                )
-            except Exception as cache_e:
-                raise Exception(
-                    f"❌ Google Sheets failed sau {max_retries} retries VÀ cache bị lỗi cho {club_name}: {cache_e}"
-                )
-    
-    # If still no data, raise error
-    if df is None:
-        raise Exception(f"❌ Không thể tải dữ liệu cho {club_name} từ bất kỳ nguồn nào.")
-    
-    # ===== PROCESS DATA =====
-    try:
-        # Only process fresh data from Google Sheets (not cached data)
-        if cache_warning is None:
-            cols_to_numeric = ['Day', 'Total Fans', 'Daily', 'Target', 'CarryOver', 'Name']
-            for col in cols_to_numeric:
-                if col not in df.columns:
-                    raise Exception(f"Missing required column '{col}' in sheet '{data_sheet_name}'.")
-                if col != 'Name':
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
+    Returns:
+        Processed DataFrame
+    """
+    try:
+        # Only process fresh data from Google Sheets (not cached data)
+        if from_sheet:
+            cols_to_numeric = ['Day', 'Total Fans', 'Daily', 'Target', 'CarryOver', 'Name']
+            for col in cols_to_numeric:
+                if col not in df.columns:
+                    raise Exception(f"Missing required column '{col}' in sheet '{data_sheet_name}'.")
+                if col != 'Name':
+                    df[col] = pd.to_numeric(df[col], errors='coerce')
             
             df = df.dropna(subset=['Day', 'Total Fans', 'Daily', 'Target', 'CarryOver'])
             df['Day'] = df['Day'].astype(int)
@@ -6329,23 +6192,213 @@ async def _load_data_for_command(club_name: str, data_sheet_name: str) -> Tuple[
         if df.empty:
             raise pd.errors.EmptyDataError(f"No valid numeric data found in '{data_sheet_name}'.")
         
-        # ===== STORE IN CACHE (only if data is from Google Sheets, not from cache) =====
-        if cache_warning is None:
-            smart_cache.set(cache_key, df)
-            print(f"💾 Cached fresh data for {club_name}")
-        
-        return df, cache_warning
+        # Compact schema once here; cached frames are shared and read-only afterwards
+        return compact_club_frame(df)
     
     except Exception as process_e:
-        print(f"❌ Error processing DataFrame for {club_name}: {process_e}")
+        print(f"❌ Error processing DataFrame for {data_sheet_name}: {process_e}")
         raise process_e
 
 
+async def _fetch_club_data_from_sheets(club_name: str, data_sheet_name: str) -> pd.DataFrame:
+    """Load a club's Data sheet with retry + exponential backoff and refresh SmartCache
+    
+    Raises:
+        ValueError: Sheet is empty (not a connection issue)
+        Exception: Last error after all retries (or first non-retryable error)
+    """
+    cache_key = f"{club_name}_{data_sheet_name}"
+    generation = _data_cache_generation.get(cache_key, 0)
+    
+    max_retries = 5  # Increased from 3 to 5
+    retry_delay = 1  # Base delay in seconds
+    
+    print(f"📡 Attempting to load {club_name} from Google Sheets...")
+    
+    for attempt in range(max_retries):
+        try:
+            # Run blocking gspread calls in thread pool to avoid blocking event loop
+            ws = await to_sheets_thread(gs_manager.get_worksheet, data_sheet_name)
+            data = await to_sheets_thread(ws.get_all_values)
+            
+            # Check if first row is the === CURRENT === header and skip it
+            header_row_idx = 0
+            if data and data[0] and data[0][0] and '=== CURRENT' in data[0][0]:
+                header_row_idx = 1  # Skip CURRENT header row
+            
+            headers = data[header_row_idx] if len(data) > header_row_idx else []
+            rows = data[header_row_idx + 1:] if len(data) > header_row_idx + 1 else []
+            
+            # Check if sheet is empty AFTER successful fetch
+            if not data or len(rows) < 1:
+                raise ValueError(
+                    f"Sheet '{data_sheet_name}' is empty.\n"
+                    f"This club has no data yet. Please wait for the bot to update the data (usually at 7AM UTC or 7PM UTC)."
+                )
+            
+            df = pd.DataFrame(rows, columns=headers)
+            print(f"✅ Successfully loaded {club_name} from Google Sheets (attempt {attempt + 1})")
+            break  # Success - exit retry loop
+            
+        except ValueError as ve:
+            # Empty sheet - re-raise ValueError (not a connection issue)
+            raise ve
+        
+        except Exception as e:
+            # Check if retryable error
+            if is_retryable_error(e):
+                if attempt < max_retries - 1:
+                    # Exponential backoff with jitter to avoid thundering herd
+                    base_wait = retry_delay * (2 ** attempt)
+                    jitter = random.uniform(0, 1)  # Add 0-1 second randomness
+                    wait_time = base_wait + jitter
+                    
+                    print(f"⚠️ GSheets connection error for {club_name} (attempt {attempt + 1}/{max_retries})")
+                    print(f"   Error: {str(e)[:100]}")
+                    print(f"   ⏳ Retrying in {wait_time:.1f}s...")
+                    await asyncio.sleep(wait_time)
+                    continue
+                # All retries exhausted
+                print(f"❌ All {max_retries} Google Sheets retries failed for {club_name}")
+            else:
+                # Non-retryable error - raise immediately
+                print(f"❌ Non-retryable error for {club_name}: {e}")
+            raise e
+    
+    df = _prepare_club_dataframe(df, data_sheet_name, from_sheet=True)
+    
+    # ===== STORE IN CACHE (skip if the club was invalidated while we were loading) =====
+    if _data_cache_generation.get(cache_key, 0) == generation:
+        smart_cache.set(cache_key, df)
+        print(f"💾 Cached fresh data for {club_name}")
+        # Member stats snapshots for the new frame (before any command asks)
+        await asyncio.to_thread(member_stats.update_club, club_name, df)
+    else:
+        print(f"⏭️ {club_name} was invalidated during load - not caching")
+    
+    return df
+
+
+def _log_refresh_result(task: asyncio.Task):
+    """Done callback: retrieve refresh errors so background failures are logged"""
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None:
+        print(f"⚠️ Data refresh failed: {str(error)[:200]}")
+
+
+def _refresh_club_data(club_name: str, data_sheet_name: str, background: bool = False) -> asyncio.Task:
+    """Start a Sheets refresh for a club, or join the one already in flight
+    
+    Args:
+        background: Run the Sheets reads at background priority (stale-cache refresh)
+    
+    Returns:
+        Task resolving to the processed DataFrame
+    """
+    cache_key = f"{club_name}_{data_sheet_name}"
+    already_running = single_flight.in_flight("club_data", cache_key)
+    fetch = background_sheets_traffic(_fetch_club_data_from_sheets) if background else _fetch_club_data_from_sheets
+    task = single_flight.start(
+        "club_data", cache_key,
+        lambda: fetch(club_name, data_sheet_name)
+    )
+    if not already_running:
+        task.add_done_callback(_log_refresh_result)
+    return task
+
+
+async def _load_data_for_command(club_name: str, data_sheet_name: str) -> Tuple[pd.DataFrame, Optional[str]]:
+    """Load club data cache-first (stale-while-revalidate)
+    
+    1. SmartCache hit: return it immediately; if older than the soft TTL,
+       refresh from Google Sheets in the background
+    2. Cache miss: wait for the Sheets load (5 retries + backoff), shared by
+       all concurrent callers for the same club
+    3. Sheets unavailable: fall back to the legacy disk cache
+    
+    Returns:
+        Tuple of (DataFrame, cache_warning or None)
+    """
+    cache_key = f"{club_name}_{data_sheet_name}"
+    
+    # ===== CACHE FIRST =====
+    cached_result = smart_cache.get(cache_key)
+    if cached_result is not None:
+        df, cache_timestamp = cached_result
+        if time.time() - cache_timestamp > DATA_CACHE_SOFT_TTL_SECONDS:
+            _refresh_club_data(club_name, data_sheet_name, background=True)
+        # Cached frames are shared (render_cache / member_stats key on them):
+        # convert a copy once and swap it into the cache, never in place
+        if 'is_behind' not in df.columns:
+            df = _prepare_club_dataframe(df.copy(), data_sheet_name, from_sheet=False)
+            smart_cache.replace(cache_key, df)
+        elif not is_compact(df):
+            # Entry from a format that doesn't keep dtypes (json)
+            df = compact_club_frame(df)
+            smart_cache.replace(cache_key, df)
+        return df, None
+    
+    # ===== CACHE MISS: LOAD FROM GOOGLE SHEETS =====
+    try:
+        # Shield so one caller timing out doesn't cancel the load for everyone else
+        df = await asyncio.shield(_refresh_club_data(club_name, data_sheet_name))
+        return df, None
+    except ValueError:
+        raise
+    except Exception as e:
+        if not is_retryable_error(e):
+            raise
+    
+    # ===== FALLBACK TO LEGACY CACHE IF ALL GSHEETS RETRIES FAILED =====
+    print(f"🔄 Attempting cache fallback for {club_name}...")
+    cache_file_path = os.path.join(DATA_CACHE_DIR, f"{club_name}_Data.json")
+    try:
+        with open(cache_file_path, "r") as f:
+            cache_data = json.load(f)
+        
+        df = pd.read_json(StringIO(cache_data["dataframe_json"]), orient="records")
+        cache_timestamp = cache_data.get("timestamp", 0)
+        cache_warning = f"⚠️ **Google Sheets không khả dụng.** Hiển thị dữ liệu cache cũ từ <t:{cache_timestamp}:R>.\n\n"
+        print(f"✅ Using legacy cache for {club_name}")
+    
+    except FileNotFoundError:
+        raise Exception(
+            f"❌ Không thể kết nối Google Sheets sau nhiều lần thử VÀ không tìm thấy cache cho {club_name}.\n\n"
+            f"**Nguyên nhân có thể:**\n"
+            f"• Mất kết nối internet\n"
+            f"• Google Sheets API đang bảo trì\n"
+            f"• Chưa có dữ liệu nào được tải về\n\n"
+            f"**Giải pháp:**\n"
+            f"• Kiểm tra kết nối mạng\n"
+            f"• Thử lại sau vài phút"
+        )
+    except Exception as cache_e:
+        raise Exception(
+            f"❌ Google Sheets failed VÀ cache bị lỗi cho {club_name}: {cache_e}"
+        )
+    
+    df = _prepare_club_dataframe(df, data_sheet_name, from_sheet=False)
+    return df, cache_warning
+
+
 # ============================================================================
 # HELPER FUNCTION: FETCH CLUB DATA FROM API
 # ============================================================================
 
 async def fetch_club_data_from_api(trainer_id: str, max_retries: int = 3, use_proxy: bool = True) -> dict:
+    """Fetch club data from uma.moe API (concurrent calls for the same ID share one request)
+    
+    See _fetch_club_data_from_api_uncached for arguments and return value.
+    """
+    return await single_flight.do(
+        "circle_api", (str(trainer_id), use_proxy),
+        lambda: _fetch_club_data_from_api_uncached(trainer_id, max_retries, use_proxy)
+    )
+
+
+async def _fetch_club_data_from_api_uncached(trainer_id: str, max_retries: int = 3, use_proxy: bool = True) -> dict:
     """
     Fetch club data from uma.moe API with retry logic and proxy rotation
     
@@ -6363,28 +6416,27 @@ async def fetch_club_data_from_api(trainer_id: str, max_retries: int = 3, use_pr
             # Get next proxy from rotation
             proxy_url = proxy_manager.get_next_proxy() if use_proxy else None
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url, 
-                    timeout=aiohttp.ClientTimeout(total=15),
-                    proxy=proxy_url
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data
-                    elif response.status == 404:
-                        return None
-                    # Check for retryable HTTP errors (502, 503, 504)
-                    elif response.status in [502, 503, 504]:
-                        if attempt + 1 < max_retries:
-                            wait_time = 2 * (2 ** attempt)  # 2s, 4s, 8s (faster with proxies)
-                            print(f"⚠️ API returned {response.status}. Retrying with different proxy in {wait_time}s... ({attempt + 1}/{max_retries})")
-                            await asyncio.sleep(wait_time)
-                            continue
-                        else:
-                            raise Exception(f"API returned status {response.status} after {max_retries} attempts")
+            async with http_client.get(
+                url, 
+                timeout=aiohttp.ClientTimeout(total=15),
+                proxy_url=proxy_url
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return data
+                elif response.status == 404:
+                    return None
+                # Check for retryable HTTP errors (502, 503, 504)
+                elif response.status in [502, 503, 504]:
+                    if attempt + 1 < max_retries:
+                        wait_time = 2 * (2 ** attempt)  # 2s, 4s, 8s (faster with proxies)
+                        print(f"⚠️ API returned {response.status}. Retrying with different proxy in {wait_time}s... ({attempt + 1}/{max_retries})")
+                        await asyncio.sleep(wait_time)
+                        continue
                     else:
-                        raise Exception(f"API returned status {response.status}")
+                        raise Exception(f"API returned status {response.status} after {max_retries} attempts")
+                else:
+                    raise Exception(f"API returned status {response.status}")
                         
         except asyncio.TimeoutError:
             if attempt + 1 < max_retries:
@@ -6462,92 +6514,9 @@ class SearchClubView(discord.ui.View):
             data_sheet_name = club_config.get('Data_Sheet_Name')
             df, cache_warning = await _load_data_for_command(self.club_name, data_sheet_name)
             
-            max_day = df['Day'].max()
-            df_latest = df[df['Day'] == max_day].copy()
-            
-            df_behind_quota = df_latest[df_latest['is_behind'] == True].copy()
-            df_above_quota = df_latest[df_latest['is_behind'] == False].copy()
-            
-            df_above_quota.sort_values(by='Total Fans', ascending=False, inplace=True)
-            df_behind_quota.sort_values(by='Total Fans', ascending=False, inplace=True)
-            
-            # Build leaderboard display (same as leaderboard command)
-            YELLOW = '\u001b[33m'
-            RESET = '\u001b[0m'
-            VERT = '|'
-            HORZ = '-'
-            CROSS = '+'
-            
-            # ===== DYNAMIC NAME PADDING =====
-            # Calculate the longest name in the player list for proper alignment
-            all_players = pd.concat([df_above_quota, df_behind_quota])
-            max_name_length = max(len(str(player['Name'])) for _, player in all_players.iterrows()) if not all_players.empty else 10
-            max_name_length = min(max_name_length + 2, 25)  # Add 2 spaces padding, cap at 25
-            name_col_width = max_name_length + 2  # Account for spaces around name
-            
-            header_display = f" # {VERT} {'Name':<{max_name_length}} {VERT} Daily {VERT}  Carry  {VERT} Target {VERT} Total"
-            separator = f"{HORZ*3}{CROSS}{HORZ*name_col_width}{CROSS}{HORZ*7}{CROSS}{HORZ*9}{CROSS}{HORZ*8}{CROSS}{HORZ*6}"
-            
-            divider_text = "(Players Behind Quota)"
-            padding = (len(separator) - len(divider_text)) // 2
-            divider_line = f"{HORZ*padding}{divider_text}{HORZ*(len(separator) - len(divider_text) - padding)}"
-            
-            body = []
-            
-            def format_player_line(player, rank, kick_note):
-                is_behind = player.get('is_behind', False)
-                color = YELLOW if is_behind else ""
-                reset = RESET if is_behind else ""
-                
-                player_name = player['Name'][:max_name_length].ljust(max_name_length)
-                rank_str = f"{rank:>2}."
-                
-                daily = format_fans(player['Daily']).rjust(6)
-                carry = format_fans(player['CarryOver']).rjust(8)
-                target = format_fans(player['Target']).replace('+', '').rjust(7)
-                total = format_fans(player['Total Fans']).replace('+', '').rjust(6)
-                
-                line = f"{color}{rank_str}{VERT} {player_name} {VERT}{daily} {VERT}{carry} {VERT}{target} {VERT}{total}{reset}"
-                
-                if kick_note:
-                    line += f"\n{color}   {kick_note}{reset}"
-                
-                return line
-            
-            rank_counter = 1
-            
-            for _, player in df_above_quota.head(30).iterrows():
-                kick_note = get_kick_note(player, max_day)
-                body.append(format_player_line(player, rank_counter, kick_note))
-                rank_counter += 1
-            
-            if not df_behind_quota.empty:
-                body.append(divider_line)
-            
-            remaining_slots = 30 - len(df_above_quota)
-            if remaining_slots > 0:
-                for _, player in df_behind_quota.head(remaining_slots).iterrows():
-                    if rank_counter > 30:
-                        break
-                    kick_note = get_kick_note(player, max_day)
-                    body.append(format_player_line(player, rank_counter, kick_note))
-                    rank_counter += 1
-            
-            current_timestamp = get_last_update_timestamp()
-            message_content = f"Data retrieved from Chronogenesis <t:{current_timestamp}:f>\n"
-            if cache_warning:
-                message_content = cache_warning + message_content
-            message_content += "```ansi\n" + f"{header_display}\n{separator}\n" + "\n".join(body) + "\n```"
-            
-            embed = discord.Embed(
-                title=f"🏆 Leaderboard (Club: {self.club_name} - Day {max_day})",
-                description=message_content,
-                color=discord.Color.purple()
-            )
-            
-            club_daily_quota = club_config.get('Target_Per_Day', 0)
-            footer_text = f"Daily Quota: {format_fans(club_daily_quota).replace('+', '')}"
-            embed.set_footer(text=footer_text)
+            # Same embed as /leaderboard (rendered once per data version)
+            embed = _render_club_leaderboard(self.club_name, club_config, df, cache_warning)
+            max_day = int(df['Day'].max())
             
             view = LeaderboardView(original_embed=embed, club_name=self.club_name, full_df=df, max_day=max_day)
             await interaction.followup.send(embed=embed, view=view, ephemeral=False)
@@ -6593,27 +6562,20 @@ class SearchClubView(discord.ui.View):
             data_sheet_name = club_config.get('Data_Sheet_Name')
             df, cache_warning = await _load_data_for_command(self.club_name, data_sheet_name)
             
-            # Strip whitespace for matching (handles trailing spaces like "王牌 " vs "王牌")
-            df['Name_stripped'] = df['Name'].str.strip()
-            df_member = df[df['Name_stripped'] == found_member.strip()].copy()
-            
-            if df_member.empty:
-                # Try case-insensitive match as fallback
-                df_member = df[df['Name_stripped'].str.lower() == found_member.strip().lower()].copy()
+            # Precomputed snapshot (stripped-name match, case-insensitive fallback)
+            snapshot = member_stats.find(self.club_name, df, found_member)
             
-            if df_member.empty:
+            if snapshot is None:
                 await interaction.followup.send(
                     f"No data found for '{found_member}'.",
                     ephemeral=True
                 )
                 return
             
-            df_member.sort_values(by='Day', inplace=True)
-            
             view = StatsView(
                 member_name=found_member,
                 club_name=self.club_name,
-                df_member=df_member,
+                snapshot=snapshot,
                 club_config=club_config
             )
             
@@ -6958,220 +6920,238 @@ class LeaderboardView(discord.ui.View):
         self.add_item(self.summary_button)
         await interaction.edit_original_response(embed=self.original_embed, view=self)
     
-    async def show_summary(self, interaction: discord.Interaction):
-        """Show summary embed - COMPACT DESIGN"""
-        await interaction.response.defer()
+    def _create_summary_embed(self) -> Optional[discord.Embed]:
+        """Create the performance dashboard embed (None if the latest day has no rows)
+        
+        Reused from render_cache while the club's frame, quota and update
+        timestamp are unchanged.
+        """
+        club_config = client.config_cache.get(self.club_name, {})
+        render_key = (self.max_day, club_config.get('Target_Per_Day', 1), get_last_update_timestamp())
+        summary_embed = render_cache.get(self.club_name, 'summary', self.full_df, render_key)
+        if summary_embed is not None:
+            return summary_embed
+        
+        df_latest = self.full_df[self.full_df['Day'] == self.max_day].copy()
+        if df_latest.empty:
+            return None
+        
+        # ============== Calculate Statistics ==============
+        
+        above_target_count = (df_latest['CarryOver'] >= 0).sum()
+        below_target_count = (df_latest['CarryOver'] < 0).sum()
+        total_members = len(df_latest)
+        above_pct = int((above_target_count / total_members * 100)) if total_members > 0 else 0
+        below_pct = 100 - above_pct
+        
+        total_daily_fans = df_latest['Daily'].sum()
+        average_daily_fans = df_latest['Daily'].mean()
         
+        df_top_daily = df_latest.sort_values(by='Daily', ascending=False)
+        top_3 = df_top_daily.head(3)
+        
+        overall_total_fans = df_latest['Total Fans'].sum()
+        
+        at_risk_count = 0
         try:
-            df_latest = self.full_df[self.full_df['Day'] == self.max_day].copy()
-            
-            if df_latest.empty:
-                await interaction.followup.send(
-                    f"Error: No data found for Day {self.max_day}.",
-                    ephemeral=True
-                )
-                return
-            
-            # ============== Calculate Statistics ==============
-            
-            above_target_count = (df_latest['CarryOver'] >= 0).sum()
-            below_target_count = (df_latest['CarryOver'] < 0).sum()
-            total_members = len(df_latest)
-            above_pct = int((above_target_count / total_members * 100)) if total_members > 0 else 0
-            below_pct = 100 - above_pct
-            
-            total_daily_fans = df_latest['Daily'].sum()
-            average_daily_fans = df_latest['Daily'].mean()
-            
-            df_top_daily = df_latest.sort_values(by='Daily', ascending=False)
-            top_3 = df_top_daily.head(3)
-            
-            overall_total_fans = df_latest['Total Fans'].sum()
-            
-            at_risk_count = 0
-            try:
-                if self.max_day > 10:
-                    at_risk_count = ((df_latest['Total Fans'] == 0)).sum()
-            except:
-                pass
-            
-            club_config = client.config_cache.get(self.club_name, {})
-            club_daily_quota = club_config.get('Target_Per_Day', 1)
-            if club_daily_quota <= 0:
-                club_daily_quota = 1
-            
-            quota_pct = int((total_daily_fans / (club_daily_quota * total_members) * 100)) if total_members > 0 else 0
-            
-            # ===== CALCULATE PROJECTED PROPERLY =====
-            projected = club_daily_quota * total_members * 30
-            
-            # ============== Build Display ==============
-            
-            lines = []
-            
-            # Header
-            lines.append("=" * 56)
-            lines.append(center_text_exact("📊 PERFORMANCE SUMMARY", 56))
-            lines.append(center_text_exact(f"Club: {self.club_name} • Day {self.max_day}", 56))
-            
-            # Timestamp with timezone
-            current_timestamp = get_last_update_timestamp()
-            from datetime import datetime
-            import pytz
-            
-            utc_time = datetime.fromtimestamp(current_timestamp, tz=pytz.UTC)
-            vietnam_tz = pytz.timezone('Asia/Ho_Chi_Minh')
-            local_time = utc_time.astimezone(vietnam_tz)
-            timestamp_display = local_time.strftime("%b %d, %Y %I:%M %p %Z")
+            if self.max_day > 10:
+                at_risk_count = ((df_latest['Total Fans'] == 0)).sum()
+        except:
+            pass
+        
+        club_daily_quota = club_config.get('Target_Per_Day', 1)
+        if club_daily_quota <= 0:
+            club_daily_quota = 1
+        
+        quota_pct = int((total_daily_fans / (club_daily_quota * total_members) * 100)) if total_members > 0 else 0
+        
+        # ===== CALCULATE PROJECTED PROPERLY =====
+        projected = club_daily_quota * total_members * 30
+        
+        # ============== Build Display ==============
+        
+        lines = []
+        
+        # Header
+        lines.append("=" * 56)
+        lines.append(center_text_exact("📊 PERFORMANCE SUMMARY", 56))
+        lines.append(center_text_exact(f"Club: {self.club_name} • Day {self.max_day}", 56))
+        
+        # Timestamp with timezone
+        current_timestamp = get_last_update_timestamp()
+        from datetime import datetime
+        import pytz
+        
+        utc_time = datetime.fromtimestamp(current_timestamp, tz=pytz.UTC)
+        vietnam_tz = pytz.timezone('Asia/Ho_Chi_Minh')
+        local_time = utc_time.astimezone(vietnam_tz)
+        timestamp_display = local_time.strftime("%b %d, %Y %I:%M %p %Z")
+        
+        lines.append(center_text_exact(f"🕐 Updated: {timestamp_display}", 56))
+        lines.append("=" * 56)
+        
+        # ===== TODAY'S RESULTS =====
+        lines.append("")
+        lines.append("📈 TODAY'S RESULTS")
+        lines.append("─" * 56)
+        
+        lines.append(format_stat_line_compact("Total Gained:", format_fans(total_daily_fans).replace('+', ''), label_width=25))
+        lines.append(format_stat_line_compact("Average/Member:", format_fans(average_daily_fans).replace('+', ''), label_width=25))
+        
+        if not top_3.empty:
+            top_player = top_3.iloc[0]
+            top_name = top_player['Name'][:20]
+            top_gain = format_fans(top_player['Daily'])
+            lines.append(format_stat_line_compact("Top Performer:", f"{top_name} ({top_gain})", label_width=25))
+        
+        lines.append(format_stat_line_compact("vs Quota:", f"+{quota_pct}%", label_width=25))
+        lines.append("─" * 56)
+        
+        # ===== TOP PERFORMERS =====
+        lines.append("")
+        lines.append("🏆 TOP PERFORMERS")
+        lines.append("─" * 56)
+
+        # Header - định nghĩa vị trí cột Gain
+        header = "Rank  Name               Gain"
+        lines.append(header)
+        lines.append("─" * 56)
+
+        # Tính vị trí bắt đầu của cột Gain trong header
+        gain_start_position = header.rfind("Gain")  # Tìm vị trí "Gain" trong header
+
+        medals = ["🥇", "🥈", "🥉"]
+        for i, (_, player) in enumerate(top_3.iterrows()):
+            if i >= 3:
+                break
             
-            lines.append(center_text_exact(f"🕐 Updated: {timestamp_display}", 56))
-            lines.append("=" * 56)
+            medal = medals[i]
+            name = player['Name'][:25]  # Giới hạn name
+            gain = format_fans(player['Daily'])
             
-            # ===== TODAY'S RESULTS =====
-            lines.append("")
-            lines.append("📈 TODAY'S RESULTS")
-            lines.append("─" * 56)
+            # Build phần bên trái (emoji + name)
+            left_part = f" {medal}   {name}"
             
-            lines.append(format_stat_line_compact("Total Gained:", format_fans(total_daily_fans).replace('+', ''), label_width=25))
-            lines.append(format_stat_line_compact("Average/Member:", format_fans(average_daily_fans).replace('+', ''), label_width=25))
+            # Tính display width thực tế của left_part
+            left_width = wcswidth(left_part)
+            if left_width == -1:  # Fallback nếu wcwidth fail
+                left_width = len(left_part)
             
-            if not top_3.empty:
-                top_player = top_3.iloc[0]
-                top_name = top_player['Name'][:20]
-                top_gain = format_fans(top_player['Daily'])
-                lines.append(format_stat_line_compact("Top Performer:", f"{top_name} ({top_gain})", label_width=25))
+            # Tính số spaces cần thiết để Gain bắt đầu đúng vị trí
+            spaces_needed = gain_start_position - left_width - 3
             
-            lines.append(format_stat_line_compact("vs Quota:", f"+{quota_pct}%", label_width=25))
-            lines.append("─" * 56)
+            # Đảm bảo ít nhất 2 spaces
+            if spaces_needed < 2:
+                spaces_needed = 2
             
-            # ===== TOP PERFORMERS =====
-            lines.append("")
-            lines.append("🏆 TOP PERFORMERS")
-            lines.append("─" * 56)
-
-            # Header - định nghĩa vị trí cột Gain
-            header = "Rank  Name               Gain"
-            lines.append(header)
-            lines.append("─" * 56)
-
-            # Tính vị trí bắt đầu của cột Gain trong header
-            gain_start_position = header.rfind("Gain")  # Tìm vị trí "Gain" trong header
+            # Build line với Gain căn phải (width = 8)
+            line = left_part + (' ' * spaces_needed) + f"{gain:>8}"
+            lines.append(line)
 
-            medals = ["🥇", "🥈", "🥉"]
-            for i, (_, player) in enumerate(top_3.iterrows()):
-                if i >= 3:
-                    break
-                
-                medal = medals[i]
-                name = player['Name'][:25]  # Giới hạn name
-                gain = format_fans(player['Daily'])
-                
-                # Build phần bên trái (emoji + name)
-                left_part = f" {medal}   {name}"
-                
-                # Tính display width thực tế của left_part
-                left_width = wcswidth(left_part)
-                if left_width == -1:  # Fallback nếu wcwidth fail
-                    left_width = len(left_part)
-                
-                # Tính số spaces cần thiết để Gain bắt đầu đúng vị trí
-                spaces_needed = gain_start_position - left_width - 3
-                
-                # Đảm bảo ít nhất 2 spaces
-                if spaces_needed < 2:
-                    spaces_needed = 2
-                
-                # Build line với Gain căn phải (width = 8)
-                line = left_part + (' ' * spaces_needed) + f"{gain:>8}"
-                lines.append(line)
-
-            lines.append("─" * 56)
-            
-            # ===== PERFORMANCE BREAKDOWN =====
-            lines.append("")
-            lines.append("📊 PERFORMANCE BREAKDOWN")
-            lines.append("─" * 56)
-            
-            lines.append(format_stat_line_compact("Above Target:", f"{above_target_count} members ({above_pct}%)", label_width=25))
-            lines.append(format_stat_line_compact("Behind Target:", f"{below_target_count} members ({below_pct}%)", label_width=25))
-            lines.append("")
-            lines.append(format_stat_line_compact("Performance Ratio:", f"{above_pct}:{below_pct}", label_width=25))
-            
-            if at_risk_count > 0:
-                lines.append(format_stat_line_compact("At-Risk:", f"{at_risk_count} need attention", label_width=25))
-            
-            lines.append("─" * 56)
-            
-            # ===== OVERALL PROGRESS =====
-            lines.append("")
-            lines.append("🎯 OVERALL PROGRESS")
-            lines.append("─" * 56)
+        lines.append("─" * 56)
+        
+        # ===== PERFORMANCE BREAKDOWN =====
+        lines.append("")
+        lines.append("📊 PERFORMANCE BREAKDOWN")
+        lines.append("─" * 56)
+        
+        lines.append(format_stat_line_compact("Above Target:", f"{above_target_count} members ({above_pct}%)", label_width=25))
+        lines.append(format_stat_line_compact("Behind Target:", f"{below_target_count} members ({below_pct}%)", label_width=25))
+        lines.append("")
+        lines.append(format_stat_line_compact("Performance Ratio:", f"{above_pct}:{below_pct}", label_width=25))
+        
+        if at_risk_count > 0:
+            lines.append(format_stat_line_compact("At-Risk:", f"{at_risk_count} need attention", label_width=25))
+        
+        lines.append("─" * 56)
+        
+        # ===== OVERALL PROGRESS =====
+        lines.append("")
+        lines.append("🎯 OVERALL PROGRESS")
+        lines.append("─" * 56)
 
-            lines.append(format_stat_line_compact("Total Fans:", format_fans_billion(overall_total_fans), label_width=25))
+        lines.append(format_stat_line_compact("Total Fans:", format_fans_billion(overall_total_fans), label_width=25))
 
-            progress_pct = int((overall_total_fans / projected * 100)) if projected > 0 else 0
-            progress_text = f"{progress_pct}% • Day {self.max_day}/30"
-            lines.append(format_stat_line_compact("Progress:", progress_text, label_width=25))
+        progress_pct = int((overall_total_fans / projected * 100)) if projected > 0 else 0
+        progress_text = f"{progress_pct}% • Day {self.max_day}/30"
+        lines.append(format_stat_line_compact("Progress:", progress_text, label_width=25))
 
-            proj_text = f"{format_fans_billion(projected)} (target)"
-            lines.append(format_stat_line_compact("Projected:", proj_text, label_width=25))
+        proj_text = f"{format_fans_billion(projected)} (target)"
+        lines.append(format_stat_line_compact("Projected:", proj_text, label_width=25))
 
-            if progress_pct >= 100:
-                exceeded_pct = progress_pct - 100
-                remaining_text = f"Target exceeded! +{exceeded_pct}%"
-            else:
-                fans_remaining = projected - overall_total_fans
-                remaining_pct = 100 - progress_pct
-                remaining_text = f"{format_fans_billion(fans_remaining)} ({remaining_pct}%)"
+        if progress_pct >= 100:
+            exceeded_pct = progress_pct - 100
+            remaining_text = f"Target exceeded! +{exceeded_pct}%"
+        else:
+            fans_remaining = projected - overall_total_fans
+            remaining_pct = 100 - progress_pct
+            remaining_text = f"{format_fans_billion(fans_remaining)} ({remaining_pct}%)"
 
-            lines.append(format_stat_line_compact("Remaining:", remaining_text, label_width=25))
+        lines.append(format_stat_line_compact("Remaining:", remaining_text, label_width=25))
 
-            lines.append("─" * 56)
-            
-            # ===== KEY INSIGHTS =====
-            lines.append("")
-            lines.append("💡 KEY INSIGHTS")
-            lines.append("=" * 56)
-            
-            performance_vs_quota = quota_pct - 100
-            if performance_vs_quota > 0:
-                lines.append(f"• Performance {performance_vs_quota}% above quota")
-            else:
-                lines.append(f"• Performance {abs(performance_vs_quota)}% below quota")
-            
-            if at_risk_count > 0:
-                lines.append(f"• {at_risk_count} members need intervention")
-            
-            if len(df_top_daily) >= 10:
-                top_10_total = df_top_daily.head(10)['Daily'].sum()
-                top_10_pct = int((top_10_total / total_daily_fans * 100)) if total_daily_fans > 0 else 0
-                lines.append(f"• Top 10 contribute {top_10_pct}% of gains")
-            
-            current_pace = overall_total_fans
-            expected_pace = (club_daily_quota * total_members * self.max_day)
-            pace_pct = int((current_pace / expected_pace * 100)) if expected_pace > 0 else 0
-            
-            if pace_pct >= 95:
-                lines.append(f"• On track to meet {format_fans_billion(projected)} target")
-            elif pace_pct >= 80:
-                lines.append(f"• Slightly behind pace ({pace_pct}% of target)")
-            else:
-                lines.append(f"• Behind pace ({pace_pct}% of target)")
-            
-            lines.append("=" * 56)
-            
-            # ============== Create Embed ==============
-            
-            message_content = "```\n" + "\n".join(lines) + "\n```"
-            
-            summary_embed = discord.Embed(
-                title=f"📊 Performance Dashboard",
-                description=message_content,
-                color=0x00A9FF
-            )
+        lines.append("─" * 56)
+        
+        # ===== KEY INSIGHTS =====
+        lines.append("")
+        lines.append("💡 KEY INSIGHTS")
+        lines.append("=" * 56)
+        
+        performance_vs_quota = quota_pct - 100
+        if performance_vs_quota > 0:
+            lines.append(f"• Performance {performance_vs_quota}% above quota")
+        else:
+            lines.append(f"• Performance {abs(performance_vs_quota)}% below quota")
+        
+        if at_risk_count > 0:
+            lines.append(f"• {at_risk_count} members need intervention")
+        
+        if len(df_top_daily) >= 10:
+            top_10_total = df_top_daily.head(10)['Daily'].sum()
+            top_10_pct = int((top_10_total / total_daily_fans * 100)) if total_daily_fans > 0 else 0
+            lines.append(f"• Top 10 contribute {top_10_pct}% of gains")
+        
+        current_pace = overall_total_fans
+        expected_pace = (club_daily_quota * total_members * self.max_day)
+        pace_pct = int((current_pace / expected_pace * 100)) if expected_pace > 0 else 0
+        
+        if pace_pct >= 95:
+            lines.append(f"• On track to meet {format_fans_billion(projected)} target")
+        elif pace_pct >= 80:
+            lines.append(f"• Slightly behind pace ({pace_pct}% of target)")
+        else:
+            lines.append(f"• Behind pace ({pace_pct}% of target)")
+        
+        lines.append("=" * 56)
+        
+        # ============== Create Embed ==============
+        
+        message_content = "```\n" + "\n".join(lines) + "\n```"
+        
+        summary_embed = discord.Embed(
+            title=f"📊 Performance Dashboard",
+            description=message_content,
+            color=0x00A9FF
+        )
+        
+        footer_text = f"Daily Quota: {format_fans(club_daily_quota).replace('+', '')}/member"
+        summary_embed.set_footer(text=footer_text)
+        
+        render_cache.put(self.club_name, 'summary', self.full_df, render_key, summary_embed)
+        return summary_embed
+    
+    async def show_summary(self, interaction: discord.Interaction):
+        """Show summary embed - COMPACT DESIGN"""
+        await interaction.response.defer()
+        
+        try:
+            summary_embed = self._create_summary_embed()
             
-            footer_text = f"Daily Quota: {format_fans(club_daily_quota).replace('+', '')}/member"
-            summary_embed.set_footer(text=footer_text)
+            if summary_embed is None:
+                await interaction.followup.send(
+                    f"Error: No data found for Day {self.max_day}.",
+                    ephemeral=True
+                )
+                return
             
             self.clear_items()
             self.add_item(self.back_button)
@@ -7214,6 +7194,187 @@ class LeaderboardView(discord.ui.View):
             await interaction.followup.send(f"An error occurred: {e}", ephemeral=True)
 
 
+def _render_club_leaderboard(club_name: str, club_config: dict, df: pd.DataFrame, cache_warning: Optional[str] = None) -> discord.Embed:
+    """Render the club leaderboard embed (ANSI table of the latest day)
+    
+    Reused from render_cache while the club's frame, type, quota, rank and
+    update timestamp are unchanged (not cached when showing legacy-cache data).
+    
+    Args:
+        club_name: Club name
+        club_config: Club config (Club_Type, Target_Per_Day, Rank)
+        df: Club frame from _load_data_for_command
+        cache_warning: Warning prepended when Sheets was unavailable
+    
+    Returns:
+        Leaderboard embed
+    """
+    current_timestamp = get_last_update_timestamp()
+    render_key = (
+        club_config.get('Club_Type', 'competitive').lower(),
+        club_config.get('Target_Per_Day', 0),
+        club_config.get('Rank', ''),
+        current_timestamp,
+    )
+    if not cache_warning:
+        embed = render_cache.get(club_name, 'leaderboard', df, render_key)
+        if embed is not None:
+            return embed
+    
+    max_day = int(df['Day'].max())
+    df_latest = df[df['Day'] == max_day].copy()
+    
+    df_behind_quota = df_latest[df_latest['is_behind'] == True].copy()
+    df_above_quota = df_latest[df_latest['is_behind'] == False].copy()
+    
+    df_above_quota.sort_values(by='Total Fans', ascending=False, inplace=True)
+    df_behind_quota.sort_values(by='Total Fans', ascending=False, inplace=True)
+    
+    # ANSI Colors
+    YELLOW = '\u001b[33m'
+    RESET = '\u001b[0m'
+    
+    # Border characters - DÙNG ASCII CHUẨN
+    VERT = '|'
+    HORZ = '-'
+    CROSS = '+'
+    
+    # Check club type
+    club_type = club_config.get('Club_Type', 'competitive').lower()
+    is_casual = club_type == 'casual'
+    
+    # ===== DYNAMIC NAME PADDING =====
+    # Discord code block has ~57 character limit per line
+    # Competitive layout: " # | Name | Daily | Surplus | Target | Total"
+    #                      3  + name + 7     + 9       + 8      + 6 + separators
+    # Fixed chars (competitive): 3 + 7 + 9 + 8 + 6 + 5 (separators) = 38
+    # Max name width for 57 chars: 57 - 38 = 19 chars (including padding)
+    # Casual layout: " # | Name | Daily | Total" = 3 + 7 + 6 + 3 = 19 fixed
+    # Max name width for casual: 57 - 19 = 38 chars
+    
+    MAX_NAME_COMPETITIVE = 15  # 15 chars for name in competitive mode
+    MAX_NAME_CASUAL = 22       # 22 chars for name in casual mode
+    
+    all_players = pd.concat([df_above_quota, df_behind_quota]) if not is_casual else df_latest
+    
+    if is_casual:
+        max_name_cap = MAX_NAME_CASUAL
+    else:
+        max_name_cap = MAX_NAME_COMPETITIVE
+    
+    # Find longest name but cap at max allowed
+    if not all_players.empty:
+        max_name_length = max(len(str(player['Name'])) for _, player in all_players.iterrows())
+        max_name_length = min(max_name_length, max_name_cap)
+    else:
+        max_name_length = 10
+    
+    # Format header và separator theo club type với dynamic name width
+    name_col_width = max_name_length + 2  # Account for spaces around name
+    if is_casual:
+        # Casual: Simpler design - # | Name | Daily | Total
+        header_display = f" # {VERT} {'Name':<{max_name_length}} {VERT} Daily {VERT} Total"
+        separator = f"{HORZ*3}{CROSS}{HORZ*name_col_width}{CROSS}{HORZ*7}{CROSS}{HORZ*6}"
+    else:
+        # Competitive: # | Name | Daily | Surplus | Target | Total
+        header_display = f" # {VERT} {'Name':<{max_name_length}} {VERT} Daily {VERT} Surplus {VERT} Target {VERT} Total"
+        separator = f"{HORZ*3}{CROSS}{HORZ*name_col_width}{CROSS}{HORZ*7}{CROSS}{HORZ*9}{CROSS}{HORZ*8}{CROSS}{HORZ*6}"
+    
+    divider_text = "(Players Behind Quota)" if not is_casual else ""
+    if divider_text:
+        padding = (len(separator) - len(divider_text)) // 2
+        divider_line = f"{HORZ*padding}{divider_text}{HORZ*(len(separator) - len(divider_text) - padding)}"
+    else:
+        divider_line = separator
+    
+    body = []
+    
+    def format_player_line(player, rank, kick_note):
+        # Kiểm tra nếu player dưới quota
+        is_behind = player.get('is_behind', False)
+        
+        # Apply màu vàng nếu behind (chỉ cho competitive)
+        color = YELLOW if is_behind and not is_casual else ""
+        reset = RESET if is_behind and not is_casual else ""
+        
+        # Format các trường chung - sử dụng max_name_length động
+        player_name = player['Name'][:max_name_length].ljust(max_name_length)
+        rank_str = f"{rank:>2}."
+        
+        # Tạo line theo club type
+        if is_casual:
+            # Casual: Simple format
+            daily = format_fans(player['Daily']).rjust(6)
+            total = format_fans(player['Total Fans']).replace('+', '').rjust(6)
+            line = f"{rank_str}{VERT} {player_name} {VERT}{daily} {VERT}{total}"
+        else:
+            # Competitive: Original format
+            daily = format_fans(player['Daily']).rjust(6)
+            carry = format_fans(player['CarryOver']).rjust(8)
+            target = format_fans(player['Target']).replace('+', '').rjust(7)
+            total = format_fans(player['Total Fans']).replace('+', '').rjust(6)
+            line = f"{color}{rank_str}{VERT} {player_name} {VERT}{daily} {VERT}{carry} {VERT}{target} {VERT}{total}{reset}"
+        
+        if kick_note and not is_casual:
+            line += f"\n{color}   {kick_note}{reset}"
+        
+        return line
+    
+    rank_counter = 1
+    
+    # Add above quota players (or all players for casual)
+    if is_casual:
+        # Casual: Just rank by total, no quota concept
+        df_sorted = df_latest.sort_values(by='Total Fans', ascending=False)
+        for _, player in df_sorted.head(30).iterrows():
+            body.append(format_player_line(player, rank_counter, None))
+            rank_counter += 1
+    else:
+        # Competitive: Above quota first
+        for _, player in df_above_quota.head(30).iterrows():
+            kick_note = get_kick_note(player, max_day)
+            body.append(format_player_line(player, rank_counter, kick_note))
+            rank_counter += 1
+        
+        # Add divider
+        if not df_behind_quota.empty:
+            body.append(divider_line)
+        
+        # Add behind quota players
+        remaining_slots = 30 - len(df_above_quota)
+        if remaining_slots > 0:
+            for _, player in df_behind_quota.head(remaining_slots).iterrows():
+                if rank_counter > 30:
+                    break
+                kick_note = get_kick_note(player, max_day)
+                body.append(format_player_line(player, rank_counter, kick_note))
+                rank_counter += 1
+    
+    # Create embed
+    message_content = f"Data retrieved from Chronogenesis <t:{current_timestamp}:f>\n"
+    if cache_warning:
+        message_content = cache_warning + message_content
+    message_content += "```ansi\n" + f"{header_display}\n{separator}\n" + "\n".join(body) + "\n```"
+    
+    # Get rank from config
+    club_rank = club_config.get('Rank', '')
+    rank_display = f" - Global Ranking #{club_rank}" if club_rank else ""
+    
+    embed = discord.Embed(
+        title=f"🏆 Leaderboard (Club: {club_name} - Day {max_day}{rank_display})",
+        description=message_content,
+        color=discord.Color.purple()
+    )
+    
+    club_daily_quota = club_config.get('Target_Per_Day', 0)
+    footer_text = f"Daily Quota: {format_fans(club_daily_quota).replace('+', '')}"
+    embed.set_footer(text=footer_text)
+    
+    if not cache_warning:
+        render_cache.put(club_name, 'leaderboard', df, render_key, embed)
+    return embed
+
+
 @client.tree.command(name="leaderboard", description="Shows the club leaderboard (latest day).")
 @app_commands.autocomplete(club_name=club_autocomplete)
 @app_commands.describe(club_name="The club you want to see")
@@ -7253,155 +7414,8 @@ async def leaderboard(interaction: discord.Interaction, club_name: str):
     try:
         df, cache_warning = await _load_data_for_command(club_name, data_sheet_name)
         
-        max_day = df['Day'].max()
-        df_latest = df[df['Day'] == max_day].copy()
-        
-        df_behind_quota = df_latest[df_latest['is_behind'] == True].copy()
-        df_above_quota = df_latest[df_latest['is_behind'] == False].copy()
-        
-        df_above_quota.sort_values(by='Total Fans', ascending=False, inplace=True)
-        df_behind_quota.sort_values(by='Total Fans', ascending=False, inplace=True)
-        
-        # ANSI Colors
-        YELLOW = '\u001b[33m'
-        RESET = '\u001b[0m'
-        
-        # Border characters - DÙNG ASCII CHUẨN
-        VERT = '|'
-        HORZ = '-'
-        CROSS = '+'
-        
-        # Check club type
-        club_type = club_config.get('Club_Type', 'competitive').lower()
-        is_casual = club_type == 'casual'
-        
-        # ===== DYNAMIC NAME PADDING =====
-        # Discord code block has ~57 character limit per line
-        # Competitive layout: " # | Name | Daily | Surplus | Target | Total"
-        #                      3  + name + 7     + 9       + 8      + 6 + separators
-        # Fixed chars (competitive): 3 + 7 + 9 + 8 + 6 + 5 (separators) = 38
-        # Max name width for 57 chars: 57 - 38 = 19 chars (including padding)
-        # Casual layout: " # | Name | Daily | Total" = 3 + 7 + 6 + 3 = 19 fixed
-        # Max name width for casual: 57 - 19 = 38 chars
-        
-        MAX_NAME_COMPETITIVE = 15  # 15 chars for name in competitive mode
-        MAX_NAME_CASUAL = 22       # 22 chars for name in casual mode
-        
-        all_players = pd.concat([df_above_quota, df_behind_quota]) if not is_casual else df_latest
-        
-        if is_casual:
-            max_name_cap = MAX_NAME_CASUAL
-        else:
-            max_name_cap = MAX_NAME_COMPETITIVE
-        
-        # Find longest name but cap at max allowed
-        if not all_players.empty:
-            max_name_length = max(len(str(player['Name'])) for _, player in all_players.iterrows())
-            max_name_length = min(max_name_length, max_name_cap)
-        else:
-            max_name_length = 10
-        
-        # Format header và separator theo club type với dynamic name width
-        name_col_width = max_name_length + 2  # Account for spaces around name
-        if is_casual:
-            # Casual: Simpler design - # | Name | Daily | Total
-            header_display = f" # {VERT} {'Name':<{max_name_length}} {VERT} Daily {VERT} Total"
-            separator = f"{HORZ*3}{CROSS}{HORZ*name_col_width}{CROSS}{HORZ*7}{CROSS}{HORZ*6}"
-        else:
-            # Competitive: # | Name | Daily | Surplus | Target | Total
-            header_display = f" # {VERT} {'Name':<{max_name_length}} {VERT} Daily {VERT} Surplus {VERT} Target {VERT} Total"
-            separator = f"{HORZ*3}{CROSS}{HORZ*name_col_width}{CROSS}{HORZ*7}{CROSS}{HORZ*9}{CROSS}{HORZ*8}{CROSS}{HORZ*6}"
-        
-        divider_text = "(Players Behind Quota)" if not is_casual else ""
-        if divider_text:
-            padding = (len(separator) - len(divider_text)) // 2
-            divider_line = f"{HORZ*padding}{divider_text}{HORZ*(len(separator) - len(divider_text) - padding)}"
-        else:
-            divider_line = separator
-        
-        body = []
-        
-        def format_player_line(player, rank, kick_note):
-            # Kiểm tra nếu player dưới quota
-            is_behind = player.get('is_behind', False)
-            
-            # Apply màu vàng nếu behind (chỉ cho competitive)
-            color = YELLOW if is_behind and not is_casual else ""
-            reset = RESET if is_behind and not is_casual else ""
-            
-            # Format các trường chung - sử dụng max_name_length động
-            player_name = player['Name'][:max_name_length].ljust(max_name_length)
-            rank_str = f"{rank:>2}."
-            
-            # Tạo line theo club type
-            if is_casual:
-                # Casual: Simple format
-                daily = format_fans(player['Daily']).rjust(6)
-                total = format_fans(player['Total Fans']).replace('+', '').rjust(6)
-                line = f"{rank_str}{VERT} {player_name} {VERT}{daily} {VERT}{total}"
-            else:
-                # Competitive: Original format
-                daily = format_fans(player['Daily']).rjust(6)
-                carry = format_fans(player['CarryOver']).rjust(8)
-                target = format_fans(player['Target']).replace('+', '').rjust(7)
-                total = format_fans(player['Total Fans']).replace('+', '').rjust(6)
-                line = f"{color}{rank_str}{VERT} {player_name} {VERT}{daily} {VERT}{carry} {VERT}{target} {VERT}{total}{reset}"
-            
-            if kick_note and not is_casual:
-                line += f"\n{color}   {kick_note}{reset}"
-            
-            return line
-        
-        rank_counter = 1
-        
-        # Add above quota players (or all players for casual)
-        if is_casual:
-            # Casual: Just rank by total, no quota concept
-            df_sorted = df_latest.sort_values(by='Total Fans', ascending=False)
-            for _, player in df_sorted.head(30).iterrows():
-                body.append(format_player_line(player, rank_counter, None))
-                rank_counter += 1
-        else:
-            # Competitive: Above quota first
-            for _, player in df_above_quota.head(30).iterrows():
-                kick_note = get_kick_note(player, max_day)
-                body.append(format_player_line(player, rank_counter, kick_note))
-                rank_counter += 1
-            
-            # Add divider
-            if not df_behind_quota.empty:
-                body.append(divider_line)
-            
-            # Add behind quota players
-            remaining_slots = 30 - len(df_above_quota)
-            if remaining_slots > 0:
-                for _, player in df_behind_quota.head(remaining_slots).iterrows():
-                    if rank_counter > 30:
-                        break
-                    kick_note = get_kick_note(player, max_day)
-                    body.append(format_player_line(player, rank_counter, kick_note))
-                    rank_counter += 1
-        
-        # Create embed
-        current_timestamp = get_last_update_timestamp()
-        message_content = f"Data retrieved from Chronogenesis <t:{current_timestamp}:f>\n"
-        if cache_warning:
-            message_content = cache_warning + message_content
-        message_content += "```ansi\n" + f"{header_display}\n{separator}\n" + "\n".join(body) + "\n```"
-        
-        # Get rank from config
-        club_rank = club_config.get('Rank', '')
-        rank_display = f" - Global Ranking #{club_rank}" if club_rank else ""
-        
-        embed = discord.Embed(
-            title=f"🏆 Leaderboard (Club: {club_name} - Day {max_day}{rank_display})",
-            description=message_content,
-            color=discord.Color.purple()
-        )
-        
-        club_daily_quota = club_config.get('Target_Per_Day', 0)
-        footer_text = f"Daily Quota: {format_fans(club_daily_quota).replace('+', '')}"
-        embed.set_footer(text=footer_text)
+        embed = _render_club_leaderboard(club_name, club_config, df, cache_warning)
+        max_day = int(df['Day'].max())
         
         view = LeaderboardView(original_embed=embed, club_name=club_name, full_df=df, max_day=max_day)
         await interaction.followup.send(embed=embed, view=view)
@@ -7416,26 +7430,29 @@ async def leaderboard(interaction: discord.Interaction, club_name: str):
 # ============================================================================
 
 class StatsView(discord.ui.View):
-    """View with buttons for stats navigation"""
+    """View with buttons for stats navigation
+    
+    Reads a precomputed member snapshot (utils.member_stats), so switching
+    pages only formats stored values.
+    """
     
-    def __init__(self, member_name: str, club_name: str, df_member: pd.DataFrame, 
+    def __init__(self, member_name: str, club_name: str, snapshot: dict, 
                 club_config: dict, timeout=300):
         super().__init__(timeout=timeout)
         self.member_name = member_name
         self.club_name = club_name
-        self.df_member = df_member
+        self.snapshot = snapshot
         self.club_config = club_config
         self.current_page = 0
         self.mode = "overview"  # overview, summary, history
         
         # Prepare data
-        self.latest_data = df_member.iloc[-1]
-        self.max_day = int(self.latest_data['Day'])
-        self.total_days = len(df_member)
+        self.max_day = snapshot['max_day']
+        self.total_days = snapshot['total_days']
         
         # ===== YUI LOGIC: Detect new member =====
         # Find the FIRST day this member has data (their join day)
-        self.join_day = int(df_member['Day'].min())
+        self.join_day = snapshot['join_day']
         self.actual_days_in_club = self.max_day - self.join_day + 1
         self.is_new_member = self.join_day > 1  # Joined after Day 1
         
@@ -7534,9 +7551,10 @@ class StatsView(discord.ui.View):
         lines.append("🎯 CURRENT SNAPSHOT")
         lines.append("─" * 56)
         
-        total_fans = format_fans(self.latest_data['Total Fans'])
-        daily_gain = format_fans(self.latest_data['Daily'])
-        carry_over = format_fans(self.latest_data['CarryOver'])
+        snapshot = self.snapshot
+        total_fans = format_fans(snapshot['total_fans'])
+        daily_gain = format_fans(snapshot['daily'])
+        carry_over = format_fans(snapshot['carry_over'])
         
         lines.append(format_stat_line_compact("Total Fans:", total_fans.replace('+', '')))
         lines.append(format_stat_line_compact("Today's Gain:", daily_gain))
@@ -7546,9 +7564,9 @@ class StatsView(discord.ui.View):
         if self.is_new_member and self.actual_days_in_club <= 3:
             # New member with 3 days or less - don't judge harshly
             status = "🆕 New - Building up"
-        elif self.latest_data['CarryOver'] >= 0:
+        elif snapshot['carry_over'] >= 0:
             status = "✅ Above Target"
-        elif self.latest_data['CarryOver'] >= -700_000:
+        elif snapshot['carry_over'] >= -700_000:
             status = "⚠️ Behind Target"
         else:
             status = "🔴 Critical"
@@ -7560,19 +7578,19 @@ class StatsView(discord.ui.View):
         lines.append("📈 RECENT PERFORMANCE (Last 7 Days)")
         lines.append("─" * 56)
         
-        recent_7 = self.df_member.tail(7) if len(self.df_member) >= 7 else self.df_member
-        avg_daily_7 = recent_7['Daily'].mean()
-        best_day = recent_7.loc[recent_7['Daily'].idxmax()]
-        worst_day = recent_7.loc[recent_7['Daily'].idxmin()]
+        recent_days = snapshot['recent_days']
+        avg_daily_7 = snapshot['avg_daily_7']
+        best_day, best_daily = snapshot['best_day_7']
+        worst_day, worst_daily = snapshot['worst_day_7']
         
         lines.append(format_stat_line_compact("Average Daily:", format_fans(avg_daily_7).replace('+', '')))
-        lines.append(format_stat_line_compact("Best Day:", f"Day {int(best_day['Day'])} ({format_fans(best_day['Daily'])}) 🏆"))
-        lines.append(format_stat_line_compact("Worst Day:", f"Day {int(worst_day['Day'])} ({format_fans(worst_day['Daily'])}) ⬇️"))
+        lines.append(format_stat_line_compact("Best Day:", f"Day {best_day} ({format_fans(best_daily)}) 🏆"))
+        lines.append(format_stat_line_compact("Worst Day:", f"Day {worst_day} ({format_fans(worst_daily)}) ⬇️"))
         
         # Trend calculation
-        if len(recent_7) >= 4:
-            first_half = recent_7.head(3)['Daily'].mean()
-            second_half = recent_7.tail(4)['Daily'].mean()
+        if recent_days >= 4:
+            first_half = snapshot['first_half_7']
+            second_half = snapshot['second_half_7']
             # Handle NaN values
             import math
             if first_half > 0 and not math.isnan(first_half) and not math.isnan(second_half):
@@ -7622,14 +7640,14 @@ class StatsView(discord.ui.View):
             
             # Streak check (only if enough data)
             if self.actual_days_in_club >= 5:
-                behind_days = (self.df_member.tail(7)['CarryOver'] < 0).sum()
+                behind_days = snapshot['behind_days_7']
                 if behind_days >= 5:
                     insights.append(f"⚠ Behind target for {behind_days} days straight")
             
             # Performance trend (only if enough data)
-            if len(recent_7) >= 4 and self.actual_days_in_club >= 7:
-                first_half = recent_7.head(3)['Daily'].mean()
-                second_half = recent_7.tail(4)['Daily'].mean()
+            if recent_days >= 4 and self.actual_days_in_club >= 7:
+                first_half = snapshot['first_half_7']
+                second_half = snapshot['second_half_7']
                 # Handle NaN
                 import math
                 if first_half > 0 and not math.isnan(first_half) and not math.isnan(second_half):
@@ -7640,8 +7658,8 @@ class StatsView(discord.ui.View):
                     insights.append(f"⚠ Performance dropped {abs(int(trend_pct))}% from peak")
             
             # Catch-up calculation
-            if self.latest_data['CarryOver'] < 0:
-                deficit = abs(self.latest_data['CarryOver'])
+            if snapshot['carry_over'] < 0:
+                deficit = abs(snapshot['carry_over'])
                 days_left = max(1, (30 - self.max_day))
                 needed_daily = deficit / days_left
                 insights.append(f"💡 Action: Need {format_fans(needed_daily).replace('+', '')}/day to catch up")
@@ -7685,15 +7703,16 @@ class StatsView(discord.ui.View):
         lines.append("📈 OVERALL PERFORMANCE")
         lines.append("─" * 56)
         
-        total_fans = self.latest_data['Total Fans']
+        snapshot = self.snapshot
+        total_fans = snapshot['total_fans']
         avg_daily = total_fans / self.total_days if self.total_days > 0 else 0
-        best_day = self.df_member.loc[self.df_member['Daily'].idxmax()]
-        worst_day = self.df_member.loc[self.df_member['Daily'].idxmin()]
+        best_day, best_daily = snapshot['best_day']
+        worst_day, worst_daily = snapshot['worst_day']
         
         lines.append(format_stat_line_compact("Total Fans Earned", format_fans(total_fans).replace('+', '')))
         lines.append(format_stat_line_compact("Average Daily", format_fans(avg_daily).replace('+', '')))
-        lines.append(format_stat_line_compact("Best Single Day", f"Day {int(best_day['Day'])} ({format_fans(best_day['Daily'])})"))
-        lines.append(format_stat_line_compact("Worst Single Day", f"Day {int(worst_day['Day'])} ({format_fans(worst_day['Daily'])})"))
+        lines.append(format_stat_line_compact("Best Single Day", f"Day {best_day} ({format_fans(best_daily)})"))
+        lines.append(format_stat_line_compact("Worst Single Day", f"Day {worst_day} ({format_fans(worst_daily)})"))
         lines.append("─" * 56)
         
         # Consistency Analysis
@@ -7701,7 +7720,7 @@ class StatsView(discord.ui.View):
         lines.append("📊 CONSISTENCY ANALYSIS")
         lines.append("─" * 56)
         
-        days_above_avg = (self.df_member['Daily'] >= avg_daily).sum()
+        days_above_avg = snapshot['days_above_avg']
         days_below_avg = self.total_days - days_above_avg
         above_pct = int(days_above_avg / self.total_days * 100) if self.total_days > 0 else 0
         
@@ -7709,7 +7728,7 @@ class StatsView(discord.ui.View):
         lines.append(format_stat_line_compact("Days Below Average", f"{days_below_avg} days ({100-above_pct}%)"))
         
         # Calculate consistency score (handle NaN from std_dev)
-        std_dev = self.df_member['Daily'].std()
+        std_dev = snapshot['daily_std']
         import math
         if avg_daily > 0 and not math.isnan(std_dev):
             consistency_score = max(0, min(100, int(100 - (std_dev / avg_daily * 50))))
@@ -7723,19 +7742,19 @@ class StatsView(discord.ui.View):
         lines.append("🎯 TARGET TRACKING")
         lines.append("─" * 56)
         
-        days_above_target = (self.df_member['CarryOver'] >= 0).sum()
+        days_above_target = snapshot['days_above_target']
         days_below_target = self.total_days - days_above_target
         target_pct = int(days_above_target / self.total_days * 100) if self.total_days > 0 else 0
         
         lines.append(format_stat_line_compact("Days Above Target", f"{days_above_target} days ({target_pct}%)"))
         lines.append(format_stat_line_compact("Days Below Target", f"{days_below_target} days ({100-target_pct}%)"))
-        lines.append(format_stat_line_compact("Current Status", format_fans(self.latest_data['CarryOver'])))
+        lines.append(format_stat_line_compact("Current Status", format_fans(snapshot['carry_over'])))
         
-        if self.latest_data['CarryOver'] < 0:
+        if snapshot['carry_over'] < 0:
             club_quota = self.club_config.get('Target_Per_Day', 1)
             days_remaining = max(1, 30 - self.max_day)
-            needed_per_day = abs(self.latest_data['CarryOver']) / days_remaining
-            catchup_days = abs(self.latest_data['CarryOver']) / club_quota if club_quota > 0 else 0
+            needed_per_day = abs(snapshot['carry_over']) / days_remaining
+            catchup_days = abs(snapshot['carry_over']) / club_quota if club_quota > 0 else 0
             lines.append(format_stat_line_compact("Est. Days to Catch Up", f"{catchup_days:.1f} days"))
         
         lines.append("─" * 56)
@@ -7745,14 +7764,7 @@ class StatsView(discord.ui.View):
         lines.append("📉 TREND ANALYSIS")
         lines.append("─" * 56)
         
-        weeks = []
-        for week_num in range(1, 5):
-            week_data = self.df_member[
-                (self.df_member['Day'] >= (week_num-1)*7 + 1) & 
-                (self.df_member['Day'] <= week_num*7)
-            ]
-            if not week_data.empty:
-                weeks.append((f"Week {week_num}", week_data['Daily'].mean()))
+        weeks = [(f"Week {week_num}", week_avg) for week_num, week_avg in snapshot['weekly_avg']]
         
         for week_name, week_avg in weeks:
             lines.append(format_stat_line_compact(f"{week_name} Avg", format_fans(week_avg).replace('+', '')))
@@ -7790,13 +7802,13 @@ class StatsView(discord.ui.View):
         start_idx = self.current_page * items_per_page
         end_idx = min(start_idx + items_per_page, self.total_days)
         
-        # Get data for current page (reversed to show latest first)
-        df_reversed = self.df_member.iloc[::-1]
-        page_data = df_reversed.iloc[start_idx:end_idx]
+        # Get data for current page (history is stored latest first)
+        snapshot = self.snapshot
+        page_data = snapshot['history'][start_idx:end_idx]
         
         # Calculate display range
-        first_day = int(page_data.iloc[0]['Day'])
-        last_day = int(page_data.iloc[-1]['Day'])
+        first_day = page_data[0][0]
+        last_day = page_data[-1][0]
         
         # Header
         lines.append("=" * 56)
@@ -7812,24 +7824,23 @@ class StatsView(discord.ui.View):
         lines.append("─" * 56)
         
         # Display format - show exactly 10 days
-        for _, row in page_data.iterrows():
-            day_num = int(row['Day'])
-            daily = format_fans_full(row['Daily'])
-            carry = format_fans(row['CarryOver'])
+        for day_num, daily_fans, carry_over in page_data:
+            daily = format_fans_full(daily_fans)
+            carry = format_fans(carry_over)
             
             # Status icon
-            if row['CarryOver'] >= 0:
+            if carry_over >= 0:
                 icon = "✅"
-            elif row['CarryOver'] >= -700_000:
+            elif carry_over >= -700_000:
                 icon = "⚠️"
             else:
                 icon = "🔴"
             
             # Mark best/worst
             badge = ""
-            if row['Daily'] == self.df_member['Daily'].max():
+            if daily_fans == snapshot['daily_max']:
                 badge = "🏆"
-            elif row['Daily'] == self.df_member['Daily'].min():
+            elif daily_fans == snapshot['daily_min']:
                 badge = "⬇️"
             
             # Format columns with proper spacing
@@ -8111,8 +8122,7 @@ async def stats(interaction: discord.Interaction, club_name: str, member_name: s
         return
     
     # Check if user has linked profile - suggest /profile command
-    profile_links = load_profile_links()
-    user_link = profile_links.get(str(interaction.user.id))
+    user_link = await state_store.aio.get_profile_link(interaction.user.id)
     show_profile_tip = user_link is not None
     
     # Case-insensitive club name matching
@@ -8159,26 +8169,18 @@ async def stats(interaction: discord.Interaction, club_name: str, member_name: s
     try:
         df, cache_warning = await _load_data_for_command(club_name, data_sheet_name)
         
-        # Strip whitespace from Name column for matching
-        # This handles cases where API/Sheets have trailing spaces (e.g., "王牌 " vs "王牌")
-        df['Name_stripped'] = df['Name'].str.strip()
-        df_member = df[df['Name_stripped'] == found_member.strip()].copy()
+        # Precomputed snapshot (stripped-name match, case-insensitive fallback)
+        snapshot = member_stats.find(club_name, df, found_member)
         
-        if df_member.empty:
-            # Try case-insensitive match as fallback
-            df_member = df[df['Name_stripped'].str.lower() == found_member.strip().lower()].copy()
-        
-        if df_member.empty:
+        if snapshot is None:
             await interaction.followup.send(f"No data found for '{found_member}'.")
             return
         
-        df_member.sort_values(by='Day', inplace=True)
-        
         # Create view with navigation
         view = StatsView(
             member_name=found_member,
             club_name=club_name,
-            df_member=df_member,
+            snapshot=snapshot,
             club_config=club_config
         )
         
@@ -8191,12 +8193,11 @@ async def stats(interaction: discord.Interaction, club_name: str, member_name: s
         # ================================================================
         # MID-MONTH JOINER DETECTION (auto-detect old club)
         # ================================================================
-        first_day_with_data = df_member['Day'].min() if not df_member.empty else 1
+        first_day_with_data = snapshot['join_day']
         is_mid_month_joiner = first_day_with_data > 1
         
         # Try to get viewer_id from profile_links if user is viewing their own profile
-        profile_links = load_profile_links()
-        user_link = profile_links.get(str(interaction.user.id))
+        user_link = await state_store.aio.get_profile_link(interaction.user.id)
         viewer_id = None
         if user_link and user_link.get('member_name', '').casefold() == found_member.casefold():
             viewer_id = user_link.get('viewer_id')
@@ -8222,7 +8223,7 @@ async def stats(interaction: discord.Interaction, club_name: str, member_name: s
             members_sheet_name = club_config.get('Members_Sheet_Name')
             if members_sheet_name:
                 member_ws = await asyncio.to_thread(
-                    gs_manager.sh.worksheet, members_sheet_name
+                    gs_manager.get_worksheet, members_sheet_name
                 )
                 all_members_data = await asyncio.to_thread(member_ws.get_all_values)
                 
@@ -8267,8 +8268,7 @@ async def stats(interaction: discord.Interaction, club_name: str, member_name: s
 
         
         # Check if user already linked this profile
-        profile_links = load_profile_links()
-        user_link = profile_links.get(str(interaction.user.id))
+        user_link = await state_store.aio.get_profile_link(interaction.user.id)
         
         if user_link:
             # Check if user is viewing their OWN linked profile
@@ -8328,8 +8328,7 @@ async def profile(interaction: discord.Interaction):
         return
     
     # Check if user has linked profile
-    profile_links = load_profile_links()
-    user_link = profile_links.get(str(interaction.user.id))
+    user_link = await state_store.aio.get_profile_link(interaction.user.id)
     
     if not user_link:
         await interaction.followup.send(
@@ -8393,7 +8392,7 @@ async def profile(interaction: discord.Interaction):
             profile_updated = True
             
             # Update profile link with new club/name
-            save_profile_link(
+            await save_profile_link(
                 discord_id=interaction.user.id,
                 trainer_id=user_link.get('trainer_id', ''),
                 member_name=found_member,
@@ -8409,7 +8408,7 @@ async def profile(interaction: discord.Interaction):
         # Fallback for legacy profile links: try to get viewer_id from sheets
         if not viewer_id and club_config:
             print(f"[Profile] Legacy profile detected, trying to get viewer_id from sheets...")
-            viewer_id = get_viewer_id_from_sheets(member_name, club_name)
+            viewer_id = await asyncio.to_thread(get_viewer_id_from_sheets, member_name, club_name)
             
             if viewer_id:
                 print(f"[Profile] Found viewer_id {viewer_id} for {member_name}, searching via API...")
@@ -8421,7 +8420,7 @@ async def profile(interaction: discord.Interaction):
                     profile_updated = True
                     
                     # Update profile link with new data AND viewer_id
-                    save_profile_link(
+                    await save_profile_link(
                         discord_id=interaction.user.id,
                         trainer_id=user_link.get('trainer_id', ''),
                         member_name=found_member,
@@ -8467,26 +8466,19 @@ async def profile(interaction: discord.Interaction):
         # Load data
         df, cache_warning = await _load_data_for_command(found_club, data_sheet_name)
         
-        # Strip whitespace for matching (handles trailing spaces like "王牌 " vs "王牌")
-        df['Name_stripped'] = df['Name'].str.strip()
-        df_member = df[df['Name_stripped'] == found_member.strip()].copy()
+        # Precomputed snapshot (stripped-name match, case-insensitive fallback)
+        snapshot = member_stats.find(found_club, df, found_member)
         
-        if df_member.empty:
-            # Try case-insensitive match as fallback
-            df_member = df[df['Name_stripped'].str.lower() == found_member.strip().lower()].copy()
-        
-        if df_member.empty:
+        if snapshot is None:
             await interaction.followup.send(f"No data found for '{found_member}'.")
             return
         
-        df_member.sort_values(by='Day', inplace=True)
-        
         # ================================================================
         # OLD CLUB DATA LOOKUP (for transferred members)
         # Check if member is a new joiner and fetch old club data
         # ================================================================
         old_club_info = None
-        old_club_df = None
+        old_snapshot = None
         
         # Check if this member has old club data in CROSS_CLUB_CACHE
         if viewer_id:
@@ -8525,7 +8517,7 @@ async def profile(interaction: discord.Interaction):
         # ================================================================
         # AUTO-DETECT OLD CLUB (if mid-month joiner but no old club found)
         # ================================================================
-        first_day_with_data = df_member['Day'].min() if not df_member.empty else 1
+        first_day_with_data = snapshot['join_day']
         is_mid_month_joiner = first_day_with_data > 1
         
         if not old_club_info and is_mid_month_joiner and viewer_id:
@@ -8574,13 +8566,10 @@ async def profile(interaction: discord.Interaction):
                 if old_data_sheet:
                     try:
                         old_df, _ = await _load_data_for_command(old_club_info['club_name'], old_data_sheet)
-                        old_df['Name_stripped'] = old_df['Name'].str.strip()
-                        old_df_member = old_df[old_df['Name_stripped'] == found_member.strip()].copy()
+                        old_snapshot = member_stats.find(old_club_info['club_name'], old_df, found_member)
                         
-                        if not old_df_member.empty:
-                            old_df_member.sort_values(by='Day', inplace=True)
-                            old_club_df = old_df_member
-                            print(f"[Profile] Loaded {len(old_club_df)} days of data from old club {old_club_info['club_name']}")
+                        if old_snapshot is not None:
+                            print(f"[Profile] Loaded {old_snapshot['total_days']} days of data from old club {old_club_info['club_name']}")
                     except Exception as e:
                         print(f"[Profile] Error loading old club data: {e}")
         
@@ -8588,7 +8577,7 @@ async def profile(interaction: discord.Interaction):
         view = StatsView(
             member_name=found_member,
             club_name=found_club,
-            df_member=df_member,
+            snapshot=snapshot,
             club_config=club_config
         )
         
@@ -8600,8 +8589,8 @@ async def profile(interaction: discord.Interaction):
         old_club_note = ""
         if old_club_info:
             old_club_note = f"\n\n📦 **Previous Club:** {old_club_info['club_name']}"
-            if old_club_df is not None and not old_club_df.empty:
-                old_total = old_club_df['Total'].iloc[-1] if 'Total' in old_club_df.columns else 0
+            if old_snapshot is not None:
+                old_total = old_snapshot['total_fans']
                 old_club_note += f" (Last record: {old_total:,} fans)"
         
         # Add note if profile was auto-updated
@@ -8643,6 +8632,34 @@ async def profile(interaction: discord.Interaction):
         await interaction.followup.send(f"An error occurred: {e}", ephemeral=True)
 
 
+# ============================================================================
+# FIND MEMBER COMMAND (CROSS-CLUB LOOKUP)
+# ============================================================================
+
+@client.tree.command(name="find_member", description="Find a trainer across all tracked clubs.")
+@app_commands.autocomplete(member_name=global_member_autocomplete)
+@app_commands.describe(member_name="The trainer's name (or part of it)")
+async def find_member(interaction: discord.Interaction, member_name: str):
+    """Look up which club(s) a trainer is in via the member index"""
+    matches = member_index.search_all(member_name, limit=10)
+    
+    if not matches:
+        await interaction.response.send_message(
+            f"❌ No trainer matching **{member_name}** found in tracked clubs.",
+            ephemeral=True
+        )
+        return
+    
+    embed = discord.Embed(
+        title=f"🔎 Trainers matching \"{member_name}\"",
+        description="\n".join(f"**{name}** — {club}" for name, club in matches),
+        color=discord.Color.blue()
+    )
+    name, club = matches[0]
+    embed.set_footer(text=f"View stats: /stats club_name:{club} member_name:{name}"[:2048])
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
 # ============================================================================
 # ERROR HANDLER
 # ============================================================================
@@ -8941,7 +8958,7 @@ async def on_guild_join(guild: discord.Guild):
     
     # Save invite to file
     if invite_url:
-        save_server_invite(guild.id, guild.name, invite_url, guild.member_count)
+        await save_server_invite(guild.id, guild.name, invite_url, guild.member_count)
     
     # Send notification to debug channel
     embed = discord.Embed(
@@ -8976,14 +8993,14 @@ async def on_guild_remove(guild: discord.Guild):
     print(f"{'='*60}\n")
     
     # Remove invite from file
-    remove_server_invite(guild.id)
+    await remove_server_invite(guild.id)
     
     # Auto-delete clubs associated with this server
     deleted_clubs = []
     try:
         # Load config sheet
-        config_ws = gs_manager.sh.worksheet(config.CONFIG_SHEET_NAME)
-        all_rows = config_ws.get_all_values()
+        config_ws = await asyncio.to_thread(gs_manager.get_worksheet, config.CONFIG_SHEET_NAME)
+        all_rows = await asyncio.to_thread(config_ws.get_all_values)
         
         if len(all_rows) > 1:
             header = all_rows[0]
@@ -9009,7 +9026,7 @@ async def on_guild_remove(guild: discord.Guild):
                 # Delete rows from bottom to top
                 for row_idx, club_name in sorted(rows_to_delete, reverse=True):
                     try:
-                        config_ws.delete_rows(row_idx)
+                        await asyncio.to_thread(config_ws.delete_rows, row_idx)
                         deleted_clubs.append(club_name)
                         print(f"🗑️ Deleted club '{club_name}' (Server {guild.id} left)")
                     except Exception as e:
@@ -9065,8 +9082,12 @@ async def cache_stats(interaction: discord.Interaction):
         name="Smart Cache (In-Memory)",
         value=(
             f"**Entries:** {stats['total_entries']}\n"
-            f"**Size:** {stats['total_size_mb']} MB\n"
-            f"**TTL:** {stats['ttl_minutes']} minutes"
+            f"**Size:** {stats['total_size_mb']} / {stats['max_size_mb']} MB\n"
+            f"**TTL:** {stats['ttl_minutes']} minutes\n"
+            f"**Disk format:** {stats['format']}\n"
+            f"**Hit rate:** {stats['hit_rate']}% "
+            f"({stats['hits']} memory, {stats['disk_hits']} disk, {stats['misses']} misses)\n"
+            f"**Evictions:** {stats['evictions']} | **Expired:** {stats['expirations']}"
         ),
         inline=False
     )
@@ -9099,6 +9120,20 @@ async def cache_stats(interaction: discord.Interaction):
                 inline=False
             )
     
+    memory_report = smart_cache.get_memory_report()
+    if memory_report:
+        # Largest club frames (compact schema: bytes per row should stay small)
+        memory_lines = [
+            f"{key[:28]}: {entry['bytes'] / 1024:.0f} KB, {entry['rows']} rows "
+            f"({entry['bytes'] // max(entry['rows'], 1)} B/row)"
+            for key, entry in list(memory_report.items())[:5]
+        ]
+        embed.add_field(
+            name="Memory per Club (largest)",
+            value=f"```{chr(10).join(memory_lines)}```",
+            inline=False
+        )
+    
     embed.add_field(
         name="Bot Cache",
         value=(
@@ -9161,14 +9196,9 @@ async def set_channel(interaction: discord.Interaction):
         # Update in-memory config
         config.ALLOWED_CHANNEL_IDS = [ch['channel_id'] for ch in channels_config]
         
-        # Save to file
-        config_data = {
-            "channels": channels_config,
-            "last_updated": datetime.datetime.now(pytz.timezone('Asia/Ho_Chi_Minh')).strftime("%Y-%m-%d %H:%M:%S")
-        }
-        
-        with open(ALLOWED_CHANNELS_CONFIG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(config_data, f, indent=2, ensure_ascii=False)
+        # Save (replace this server's channel in one transaction)
+        await state_store.aio.replace_allowed_channels(channels_config)
+        await config_registry.reload('allowed_channels')
         
         # Update permanent channel list message
         await update_channel_list_message()
@@ -9213,6 +9243,17 @@ async def set_channel(interaction: discord.Interaction):
 # ============================================================================
 
 async def fetch_club_data_full(club_id: str, max_retries: int = 3, use_proxy: bool = True) -> dict:
+    """Fetch full club data (concurrent calls for the same club share one request)
+    
+    See _fetch_club_data_full_uncached for arguments and return value.
+    """
+    return await single_flight.do(
+        "circle_full", (str(club_id), use_proxy),
+        lambda: _fetch_club_data_full_uncached(club_id, max_retries, use_proxy)
+    )
+
+
+async def _fetch_club_data_full_uncached(club_id: str, max_retries: int = 3, use_proxy: bool = True) -> dict:
     """Fetch full club data from uma.moe API including members
     
     Args:
@@ -9233,28 +9274,27 @@ async def fetch_club_data_full(club_id: str, max_retries: int = 3, use_proxy: bo
             # Use proxy rotation for faster requests
             proxy_url = proxy_manager.get_next_proxy() if use_proxy else None
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url, 
-                    timeout=aiohttp.ClientTimeout(total=30),
-                    proxy=proxy_url
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data if isinstance(data, dict) else None
+            async with http_client.get(
+                url, 
+                timeout=aiohttp.ClientTimeout(total=30),
+                proxy_url=proxy_url
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return data if isinstance(data, dict) else None
                     
-                    # Check for retryable HTTP errors (502, 503, 504)
-                    if response.status in [502, 503, 504]:
-                        if attempt + 1 < max_retries:
-                            wait_time = 2 * (2 ** attempt)  # 2s, 4s, 8s (faster with proxy rotation)
-                            print(f"⚠️ API returned {response.status} for club {club_id}. Retrying with different proxy in {wait_time}s... ({attempt + 1}/{max_retries})")
-                            await asyncio.sleep(wait_time)
-                            continue
-                        else:
-                            print(f"❌ API returned {response.status} for club {club_id} after {max_retries} attempts")
-                            return None
+                # Check for retryable HTTP errors (502, 503, 504)
+                if response.status in [502, 503, 504]:
+                    if attempt + 1 < max_retries:
+                        wait_time = 2 * (2 ** attempt)  # 2s, 4s, 8s (faster with proxy rotation)
+                        print(f"⚠️ API returned {response.status} for club {club_id}. Retrying with different proxy in {wait_time}s... ({attempt + 1}/{max_retries})")
+                        await asyncio.sleep(wait_time)
+                        continue
+                    else:
+                        print(f"❌ API returned {response.status} for club {club_id} after {max_retries} attempts")
+                        return None
                     
-                    return None
+                return None
                     
         except asyncio.TimeoutError:
             if attempt + 1 < max_retries:
@@ -9421,18 +9461,6 @@ def calculate_data_sheet_rows(trainer_name: str, daily_gains: list, cumulative_f
     
     return rows
 
-def get_member_last_active_day(daily_gains: list) -> int:
-    """Get the last day a member had activity (non-None gain)"""
-    if not daily_gains:
-        return 0
-    
-    last_day = 0
-    for i, gain in enumerate(daily_gains):
-        if gain is not None:
-            last_day = i + 1  # 1-indexed
-    return last_day
-
-
 def is_member_in_club(daily_gains: list, max_day: int) -> bool:
     """
     Check if member is still in the club.
@@ -9554,254 +9582,111 @@ def get_club_max_day(club_members: list) -> int:
 # MONTHLY ARCHIVE HELPER FUNCTIONS
 # ============================================================================
 
-async def get_current_month_from_sheet(worksheet) -> str:
+def get_current_month_string() -> str:
+    """Get current month as MM/YYYY string (Vietnam timezone)"""
+    vietnam_tz = pytz.timezone('Asia/Ho_Chi_Minh')
+    now = datetime.datetime.now(vietnam_tz)
+    return f"{now.month:02d}/{now.year}"
+
+
+def calculate_last_day_gain(cumulative_fans: list, expected_days: int) -> int:
     """
-    Get the current month from sheet's first row
-    Supports both formats: "=== CURRENT: 12/2024 ===" and "=== CURRENT 12/2025 ==="
-    Returns: "MM/YYYY" or None if not found
+    Calculate the daily gain for the last day of the month.
+    
+    When uma.moe provides Day 1 of new month, we can calculate:
+    last_day_gain = cumulative[Day1_new] - cumulative[last_day_old]
+    
+    Args:
+        cumulative_fans: List of cumulative fans including Day 1 of new month
+        expected_days: Number of days in the old month (e.g., 31 for January)
+    
+    Returns:
+        Daily gain for the last day, or None if cannot calculate
     """
     try:
-        first_cell = await asyncio.to_thread(worksheet.acell, 'A1')
-        if first_cell and first_cell.value:
-            value = first_cell.value
-            # Check if it's a CURRENT header (with or without colon)
-            if '=== CURRENT' in value:
-                # Extract MM/YYYY from header (works for both formats)
-                import re
-                match = re.search(r'(\d{1,2}/\d{4})', value)
-                if match:
-                    return match.group(1)
-        return None
+        # cumulative_fans = [Day1, Day2, ..., Day31, Day1_new]
+        # For 31-day month: index 30 = Day 31, index 31 = Day 1 new
+        if len(cumulative_fans) <= expected_days:
+            return None  # No new month data yet
+        
+        last_day_cumulative = cumulative_fans[expected_days - 1]  # Day 31 = index 30
+        new_month_day1_cumulative = cumulative_fans[expected_days]  # Day 1 new = index 31
+        
+        if last_day_cumulative == 0 or new_month_day1_cumulative == 0:
+            return None
+        
+        gain = new_month_day1_cumulative - last_day_cumulative
+        return gain if gain >= 0 else None
+        
     except Exception as e:
-        print(f"    [Archive] Error reading sheet month: {e}")
+        print(f"Error calculating last day gain: {e}")
         return None
 
 
-async def archive_current_data(worksheet, current_month: str):
-    """
-    Move current month's data to archive section at bottom of sheet.
+# ============================================================================
+# SHEET GRID WRITES (only changed cells)
+# ============================================================================
+
+async def _complete_sheet_grid_write(worksheet, grid: list, handles: list, remember: bool):
+    """Wait for a grid write; remember the grid on success, forget it on failure"""
+    try:
+        await asyncio.gather(*handles)
+    except Exception:
+        # Some ranges may have been written - the sheet's content is unknown now
+        sheet_grid_store.forget(worksheet.title)
+        raise
+    if remember:
+        sheet_grid_store.put(worksheet.title, grid)
+
+
+def queue_sheet_grid_write(worksheet, grid: list, current: Optional[list] = None) -> dict:
+    """Queue the writes that make a sheet show `grid` (from A1)
     
-    1. Read all current data
-    2. Find where archive starts (empty row or "=== ARCHIVE")
-    3. Insert current data as new archive section after last row
+    Only the changed cells are sent (see utils/sheet_diff.py), through the
+    write-behind queue. The sheet is cleared and rewritten only if its
+    content is unknown; an unchanged sheet costs no request.
     
-    Includes retry logic for rate limiting (429 errors).
-    """
-    max_retries = 3
-    
-    for attempt in range(max_retries):
-        try:
-            # Add delay between retries (exponential backoff)
-            if attempt > 0:
-                wait_time = 10 * (2 ** (attempt - 1))  # 10s, 20s, 40s
-                print(f"    [Archive] Retry {attempt + 1}/{max_retries} in {wait_time}s...")
-                await asyncio.sleep(wait_time)
-            
-            # Get all values from sheet
-            all_values = await asyncio.to_thread(worksheet.get_all_values)
-            
-            if len(all_values) <= 1:
-                print(f"    [Archive] No data to archive")
-                return True
-            
-            # Find the current data section (from row 1 until empty row or ARCHIVE)
-            current_data = []
-            archive_start_row = None
-            
-            for idx, row in enumerate(all_values):
-                # Check if this is an archive header or empty row
-                if not row or not row[0]:
-                    archive_start_row = idx
-                    break
-                if '=== ARCHIVE' in row[0]:
-                    archive_start_row = idx
-                    break
-                current_data.append(row)
-            
-            if archive_start_row is None:
-                # All rows are current data
-                archive_start_row = len(all_values)
-            
-            if len(current_data) <= 1:
-                print(f"    [Archive] Only header, nothing to archive")
-                return True
-            
-            # Get existing archive data (everything from archive_start_row onwards)
-            existing_archive = all_values[archive_start_row:] if archive_start_row < len(all_values) else []
-            
-            # Build archive header for the current month
-            archive_header = [f"=== ARCHIVE: {current_month} ==="]
-            # Pad to match column count
-            if current_data:
-                archive_header.extend([''] * (len(current_data[0]) - 1))
-            
-            # Build new sheet structure:
-            # 1. Empty (will be filled with new current data later)
-            # 2. Empty spacer rows
-            # 3. Archive header for this month
-            # 4. Current data (now archived)
-            # 5. Empty spacer rows
-            # 6. Existing archive data
-            
-            # Calculate where to put archive
-            spacer = [[''] * len(current_data[0])] * 2 if current_data else [['', '']] * 2
-            
-            # Only update the archive section (don't touch the top - that will be updated separately)
-            # We append the new archive at the bottom
-            new_archive_section = []
-            new_archive_section.append(archive_header)
-            new_archive_section.extend(current_data)  # The data being archived (including header)
-            new_archive_section.extend(spacer)
-            
-            # Append to existing archive
-            start_row = archive_start_row + 1 if archive_start_row > 0 else len(current_data) + 3
-            
-            print(f"    [Archive] Archiving {len(current_data)} rows from {current_month}")
-            
-            # Add small delay before write to avoid rate limiting
-            await asyncio.sleep(2)
-            
-            # First, add spacer after current data
-            await asyncio.to_thread(
-                worksheet.update,
-                f'A{len(current_data) + 1}',
-                spacer + [archive_header] + current_data[1:] + spacer  # Skip first header in archived data
-            )
-            
-            return True
-            
-        except Exception as e:
-            error_str = str(e).lower()
-            is_rate_limit = '429' in error_str or 'quota' in error_str
-            
-            if is_rate_limit and attempt < max_retries - 1:
-                print(f"    [Archive] Rate limit hit, will retry...")
-                continue
-            else:
-                print(f"    [Archive] Error archiving data: {e}")
-                import traceback
-                traceback.print_exc()
-                return False
-    
-    return False
-
-
-def get_current_month_string() -> str:
-    """Get current month as MM/YYYY string (Vietnam timezone)"""
-    vietnam_tz = pytz.timezone('Asia/Ho_Chi_Minh')
-    now = datetime.datetime.now(vietnam_tz)
-    return f"{now.month:02d}/{now.year}"
-
-
-def get_days_in_month(month_str: str) -> int:
-    """
-    Get the number of days in a month from MM/YYYY string.
-    
-    Args:
-        month_str: Month string in format "MM/YYYY" (e.g., "01/2026", "02/2024")
+    Args:
+        worksheet: gspread Worksheet
+        grid: Planned grid
+        current: The sheet's values if they were just read (get_all_values);
+            if None, the grid the sync last wrote there is used
     
     Returns:
-        Number of days in that month (28-31)
+        {'mode': 'unchanged' | 'diff' | 'full', 'cells': int, 'done': awaitable}
     """
-    try:
-        parts = month_str.split('/')
-        month = int(parts[0])
-        year = int(parts[1])
-        
-        # Months with 31 days
-        if month in [1, 3, 5, 7, 8, 10, 12]:
-            return 31
-        # Months with 30 days
-        elif month in [4, 6, 9, 11]:
-            return 30
-        # February - check for leap year
-        elif month == 2:
-            # Leap year: divisible by 4, except century years must be divisible by 400
-            is_leap = (year % 4 == 0 and year % 100 != 0) or (year % 400 == 0)
-            return 29 if is_leap else 28
+    remember = current is None
+    ranges = []
+    if current is not None:
+        ranges = diff_grid(normalize_grid(current, from_sheet=True), grid)
+        mode = 'diff' if ranges else 'unchanged'
+    elif sheet_grid_store.get_hash(worksheet.title) == grid_hash(normalize_grid(grid)):
+        mode = 'unchanged'  # Same content as the last write (grid file not loaded)
+    else:
+        previous = sheet_grid_store.get(worksheet.title)
+        if previous is None:
+            mode = 'full'
         else:
-            return 30  # Fallback
-    except Exception:
-        return 30  # Safe fallback
-
-
-async def get_archived_member_ids(worksheet, target_month: str) -> set:
-    """
-    Get Trainer IDs from archived data of a specific month.
-    
-    Args:
-        worksheet: Google Sheets worksheet object
-        target_month: Month to search in format "MM/YYYY" (e.g., "01/2026")
-    
-    Returns:
-        Set of Trainer IDs found in the archive for that month
-    """
-    try:
-        all_values = await asyncio.to_thread(worksheet.get_all_values)
-        
-        archived_ids = set()
-        in_target_archive = False
-        
-        for row in all_values:
-            if not row or not row[0]:
-                continue
-            
-            # Check if this is the archive header for our target month
-            if f"=== ARCHIVE: {target_month}" in row[0]:
-                in_target_archive = True
-                continue
-            
-            # Check if we've hit another archive section (end of our target)
-            if in_target_archive and "=== ARCHIVE:" in row[0]:
-                break
-            
-            # Skip header rows within archive
-            if in_target_archive and row[0] in ['Trainer ID', 'Name', '']:
-                continue
-            
-            # Collect Trainer ID (first column)
-            if in_target_archive and row[0]:
-                archived_ids.add(str(row[0]))
-        
-        return archived_ids
-        
-    except Exception as e:
-        print(f"Error getting archived member IDs: {e}")
-        return set()
-
-
-def calculate_last_day_gain(cumulative_fans: list, expected_days: int) -> int:
-    """
-    Calculate the daily gain for the last day of the month.
-    
-    When uma.moe provides Day 1 of new month, we can calculate:
-    last_day_gain = cumulative[Day1_new] - cumulative[last_day_old]
-    
-    Args:
-        cumulative_fans: List of cumulative fans including Day 1 of new month
-        expected_days: Number of days in the old month (e.g., 31 for January)
+            ranges = diff_grid(previous, grid)
+            mode = 'diff' if ranges else 'unchanged'
+    
+    if mode == 'full':
+        cells = sum(len(row) for row in grid)
+        handles = [
+            sheets_write_queue.clear(worksheet),
+            sheets_write_queue.update(worksheet, 'A1', grid),
+        ]
+    else:
+        cells = sum(len(row) for _, values in ranges for row in values)
+        handles = [sheets_write_queue.update(worksheet, a1, values) for a1, values in ranges]
+    sheet_grid_store.count_write(mode, cells)
     
-    Returns:
-        Daily gain for the last day, or None if cannot calculate
-    """
-    try:
-        # cumulative_fans = [Day1, Day2, ..., Day31, Day1_new]
-        # For 31-day month: index 30 = Day 31, index 31 = Day 1 new
-        if len(cumulative_fans) <= expected_days:
-            return None  # No new month data yet
-        
-        last_day_cumulative = cumulative_fans[expected_days - 1]  # Day 31 = index 30
-        new_month_day1_cumulative = cumulative_fans[expected_days]  # Day 1 new = index 31
-        
-        if last_day_cumulative == 0 or new_month_day1_cumulative == 0:
-            return None
-        
-        gain = new_month_day1_cumulative - last_day_cumulative
-        return gain if gain >= 0 else None
-        
-    except Exception as e:
-        print(f"Error calculating last day gain: {e}")
-        return None
+    if mode == 'unchanged':
+        done = asyncio.get_running_loop().create_future()
+        done.set_result(None)
+    else:
+        done = asyncio.ensure_future(_complete_sheet_grid_write(worksheet, grid, handles, remember))
+    return {'mode': mode, 'cells': cells, 'done': done}
 
 
 async def sync_club_member_data_to_sheet(
@@ -9834,7 +9719,7 @@ async def sync_club_member_data_to_sheet(
         
         # Get the data worksheet
         try:
-            data_ws = await asyncio.to_thread(gs_manager.sh.worksheet, data_sheet_name)
+            data_ws = await to_sheets_thread(gs_manager.get_worksheet, data_sheet_name)
         except Exception as e:
             result['errors'].append(f"Cannot access sheet {data_sheet_name}: {e}")
             return result
@@ -9881,21 +9766,15 @@ async def sync_club_member_data_to_sheet(
             result['errors'].append("No valid member data to write")
             return result
         
-        # Clear existing data and write new data
-        # First, clear the sheet (keep only the area we'll write to)
+        # Write only the cells that differ from the last sync (nothing if unchanged)
         try:
-            # Clear existing content
-            await asyncio.to_thread(data_ws.clear)
-            
-            # Write all rows at once (batch update for efficiency)
-            await asyncio.to_thread(
-                data_ws.update,
-                'A1',
-                all_rows
-            )
+            write = queue_sheet_grid_write(data_ws, all_rows)
+            await write['done']
             
             result['success'] = True
             result['rows_written'] = len(all_rows) - 1  # Exclude header
+            if write['mode'] != 'unchanged':
+                invalidate_cache_for_club(club_name, data_sheet_name)
             
         except Exception as e:
             result['errors'].append(f"Error writing to sheet: {e}")
@@ -9909,11 +9788,435 @@ async def sync_club_member_data_to_sheet(
     return result
 
 
+# ============================================================================
+# CLUB DATA SYNC PIPELINE STAGES (fetch → plan → write)
+# ============================================================================
+
+def _index_club_members(club_name: str, club_id: str, api_data: dict):
+    """Refresh the viewer index entries of a club from its API payload"""
+    members = api_data.get('members')
+    if members is None:
+        return
+    circle_name = (api_data.get('circle') or {}).get('name')
+    viewer_index.update_club(club_name, club_id, members, circle_name=circle_name)
+
+
+async def _sync_fetch_club(job: dict) -> Optional[dict]:
+    """Pipeline stage 1: fetch a club's full data from uma.moe
+
+    Args:
+        job: Sync job for one club (see update_club_data_task)
+
+    Returns:
+        The job with 'api_data' set, or None if the API returned nothing
+    """
+    run = job['run']
+    api_data = await fetch_club_data_full(job['club_id'])
+
+    if not api_data:
+        print(f"  ⚠️ {job['club_name']} (ID: {job['club_id']}): API returned no data")
+        run['failed_clubs'].append({'idx': job['idx'], 'config': job['config'], 'reason': 'no_data'})
+        return None
+
+    job['api_data'] = api_data
+    _index_club_members(job['club_name'], job['club_id'], api_data)
+    return job
+
+
+async def _run_sync_planner(*args) -> dict:
+    """Run plan_club_sync off the event loop (in a worker thread)"""
+    return await asyncio.to_thread(plan_club_sync, *args)
+
+
+async def _sync_plan_club(job: dict) -> Optional[dict]:
+    """Pipeline stage 2: read the member sheet and build the write plan for one club
+
+    Takes the rank, skips unchanged payloads and reads the member sheet; the
+    member rows, archive sections, Data sheet rows and transfer highlight
+    ranges come from tasks/sync_planner.py. Nothing is written to Sheets
+    here; the write stage applies the plan.
+
+    Args:
+        job: Sync job with 'api_data' from the fetch stage
+
+    Returns:
+        The job with 'rank' and/or 'member_plan' set
+    """
+    run = job['run']
+    idx = job['idx']
+    club_config = job['config']
+    club_name = job['club_name']
+    members_sheet_name = job['members_sheet_name']
+    target_per_day = job['target_per_day']
+    api_data = job['api_data']
+
+    # ===== RANK (written by the write stage) =====
+    circle_data = api_data.get('circle', {})
+    rank = circle_data.get('monthly_rank')
+
+    # Ensure rank is not None before comparison
+    if rank is not None and rank > 0:
+        job['rank'] = rank
+    else:
+        # No rank data - add to retry list
+        print(f"  ⏭️ {club_name}: No rank data available (will retry)")
+        run['failed_clubs'].append({'idx': idx, 'config': club_config, 'reason': 'no_rank'})
+
+    try:
+        # ===== SYNC MEMBER DATA =====
+        if not members_sheet_name:
+            print(f"  ⏭️ {club_name}: No Members_Sheet_Name configured, skipping member sync")
+            return job
+
+        api_members = api_data.get('members', [])
+        if not api_members:
+            print(f"  ⏭️ {club_name}: No members in API response")
+            return job
+
+        vietnam_tz = pytz.timezone('Asia/Ho_Chi_Minh')
+        today = datetime.datetime.now(vietnam_tz).date()
+        month = month_context(api_members, today)
+        current_month = month['current_month']
+
+        if month['max_days'] < 1:
+            print(f"  ⏭️ {club_name}: Not enough data yet (max_data_day={month['max_data_day']}), skipping")
+            return job
+
+        # ===== SKIP UNCHANGED PAYLOADS (same data as the last sync this month; rank is still written) =====
+        job['payload_hash'] = payload_hash(
+            api_members, target_per_day, members_sheet_name, club_config.get('Data_Sheet_Name', '')
+        )
+        job['current_month'] = current_month
+        job['payload_sheets'] = (members_sheet_name, club_config.get('Data_Sheet_Name', ''))
+        if not month['has_new_month_data'] and sync_payload_store.is_unchanged(club_name, job['payload_hash'], current_month):
+            run['payloads_unchanged'] += 1
+            print(f"  💤 {club_name}: API data unchanged since last sync, updating rank only")
+            return job
+
+        # Read the member sheet ONCE - the planner uses it for transfer detection and archives
+        member_ws = await to_sheets_thread(
+            gs_manager.get_worksheet, members_sheet_name
+        )
+        all_values = await to_sheets_thread(member_ws.get_all_values)
+
+        # Previous month's members and last-day cumulative fans from the local history
+        # store; the planner parses the sheet archive if that month isn't stored
+        archive_cumulative = await asyncio.to_thread(
+            history_store.last_day_cumulative, club_name, month['previous_month']
+        )
+        archived_ids = set(archive_cumulative) if archive_cumulative is not None else None
+
+        if SYNC_PLAN_RECORD_DIR:
+            try:
+                record_plan_inputs(SYNC_PLAN_RECORD_DIR, club_config, api_data, all_values, today,
+                                   archived_ids, archive_cumulative)
+            except Exception as e:
+                print(f"    ⚠️ Could not record planner inputs: {e}")
+
+        # ===== PLAN (pure: no Sheets / network access) =====
+        plan = await _run_sync_planner(club_config, api_data, all_values, today, archived_ids, archive_cumulative)
+        if plan['log']:
+            print("\n".join(plan['log']))
+
+        # Local columnar history (independent of the sheet write), one partition
+        # per month the payload covers (old month until rollover, both across it)
+        for history_month, history_members in plan['history_months'].items():
+            try:
+                history_rows = await asyncio.to_thread(
+                    history_store.write_month, club_name, history_month, history_members
+                )
+                if history_rows:
+                    print(f"    🗄️ History store: {history_rows} rows for {history_month}")
+            except Exception as e:
+                print(f"    ⚠️ History store write failed ({history_month}): {e}")
+
+        if plan['status'] != 'ok':
+            return job
+
+        # Cross-club lookup entries from the archive's last-day backfill
+        for trainer_id, old_club_name, day31_cumulative, archive_month in plan['cross_club_updates']:
+            update_cross_club_cache(trainer_id, old_club_name, day31_cumulative, archive_month)
+
+        job['transfer_warnings'] = plan['transfer_warnings']
+        job['member_plan'] = {
+            'member_ws': member_ws,
+            'member_sheet_values': all_values,  # Sheet as read above (diff base for the write)
+            'full_data': plan['member_grid'],
+            'ranges_to_format': plan['ranges_to_format'],
+            'rows_count': plan['rows_count'],
+            'max_days': plan['max_days'],
+            'current_month': current_month,
+            'new_archive_rows': plan['new_archive_rows'],
+            'existing_archive_rows': plan['existing_archive_rows'],
+            'data_sheet_name': plan['data_sheet_name'],
+            'data_sheet_grid': plan['data_sheet_grid'],
+            'data_sheet_rows': plan['data_sheet_rows'],
+            'member_names': plan['member_names'],
+        }
+        return job
+    except Exception as e:
+        print(f"  ❌ {club_name}: Failed to build member sheet plan: {e}")
+        run['error_count'] += 1
+        # Add to retry list (rank can still be written by the write stage)
+        run['failed_clubs'].append({'idx': idx, 'config': club_config, 'reason': 'exception', 'error': str(e)})
+        return job
+
+
+async def _sync_write_club(job: dict) -> None:
+    """Pipeline stage 3: apply a club's write plan to Google Sheets
+
+    Queues the rank cell (flushed for all clubs at the end of the run), and
+    the changed cells of the member sheet and the Data sheet plus the
+    transfer highlights through the write-behind queue, which merges them
+    with the other clubs' writes into batch requests. Clubs whose sheets are
+    unchanged write nothing but the rank.
+
+    Args:
+        job: Sync job from the plan stage
+    """
+    run = job['run']
+    idx = job['idx']
+    club_config = job['config']
+    club_name = job['club_name']
+    plan = job.get('member_plan')
+
+    try:
+        # ===== UPDATE RANK (column K, written for all clubs in one request) =====
+        rank = job.get('rank')
+        if rank:
+            run['pending_ranks'].append((idx, club_config, club_name, rank))
+
+        if not plan:
+            return None
+
+        # ===== MEMBER SHEET (only changed cells; diffed against the sheet read by the plan) =====
+        member_ws = plan['member_ws']
+        member_write = queue_sheet_grid_write(member_ws, plan['full_data'], current=plan['member_sheet_values'])
+
+        # ===== YELLOW FORMATTING FOR TRANSFERRED MEMBERS =====
+        # Already applied if the sheet is unchanged (formatting survives value writes)
+        ranges_to_format = plan['ranges_to_format']
+        format_handle = None
+        if ranges_to_format and member_write['mode'] != 'unchanged':
+            format_handle = sheets_write_queue.format_background(
+                member_ws, ranges_to_format, (1.0, 1.0, 0.0)  # Yellow #FFFF00
+            )
+
+        # ===== DATA SHEET (only changed cells; diffed against the last grid written) =====
+        data_sheet_name = plan['data_sheet_name']
+        data_write = None
+        if plan['data_sheet_grid']:
+            try:
+                data_ws = await to_sheets_thread(
+                    gs_manager.get_worksheet, data_sheet_name
+                )
+            except Exception:
+                # Sheet doesn't exist - skip
+                print(f"    ⏭️ Data sheet '{data_sheet_name}' not found, skipping Data sync")
+                data_ws = None
+
+            if data_ws:
+                data_write = queue_sheet_grid_write(data_ws, plan['data_sheet_grid'])
+
+        if member_write['mode'] == 'unchanged' and (data_write is None or data_write['mode'] == 'unchanged'):
+            sync_payload_store.record(club_name, job['payload_hash'], job['current_month'], job['payload_sheets'])
+            run['members_synced'] += 1
+            run['sheets_unchanged'] += 1
+            run['transfer_warnings_log'].extend(job.get('transfer_warnings', []))
+            print(f"  💤 {club_name}: Sheets unchanged, no writes")
+            return None
+
+        # Wait for all batched writes together, so a failed one never leaves the
+        # others unobserved (member sheet failures go to the retry list below)
+        data_pending = data_write is not None and data_write['mode'] != 'unchanged'
+        results = await asyncio.gather(
+            member_write['done'],
+            data_write['done'] if data_pending else asyncio.sleep(0),
+            format_handle if format_handle else asyncio.sleep(0),
+            return_exceptions=True,
+        )
+        member_error, data_error, format_error = results
+        if isinstance(member_error, Exception):
+            raise member_error
+
+        if format_handle:
+            if isinstance(format_error, Exception):
+                print(f"    ⚠️ Error applying yellow formatting: {format_error}")
+            else:
+                print(f"    🟡 Applied yellow highlighting to {len(ranges_to_format)} transferred member rows")
+
+        run['members_synced'] += 1
+        run['transfer_warnings_log'].extend(job.get('transfer_warnings', []))
+        print(f"  📊 {club_name}: Synced {plan['rows_count']} members, {plan['max_days']} days ({plan['current_month']})")
+
+        data_synced = True
+        if data_pending:
+            try:
+                if isinstance(data_error, Exception):
+                    raise data_error
+                print(f"    📈 Data sheet: Synced {plan['data_sheet_rows']} rows ({data_write['mode']}, {data_write['cells']} cells)")
+                invalidate_cache_for_club(club_name, data_sheet_name)
+                # Keep autocomplete / member search in step with the new Data sheet
+                client.member_cache[club_name] = plan['member_names']
+                member_index.update_club(club_name, plan['member_names'])
+                # Recompute this club's global leaderboard rows (skipped if unchanged)
+                global_leaderboard.update_club(
+                    club_name, pd.DataFrame(plan['data_sheet_grid'][2:], columns=plan['data_sheet_grid'][1])
+                )
+            except Exception as e:
+                print(f"    ⚠️ Data sheet sync failed: {e}")
+                data_synced = False
+                run['error_count'] += 1
+                # Retried like other failures; the payload is not recorded, so the retry rewrites it
+                run['failed_clubs'].append({'idx': idx, 'config': club_config, 'reason': 'data_sheet', 'error': str(e)})
+
+        # Later runs skip this club until its API data changes
+        if data_synced:
+            sync_payload_store.record(club_name, job['payload_hash'], job['current_month'], job['payload_sheets'])
+
+    except Exception as e:
+        print(f"  ❌ {club_name}: Failed to update member sheet: {e}")
+        run['error_count'] += 1
+        # Add to retry list
+        run['failed_clubs'].append({'idx': idx, 'config': club_config, 'reason': 'exception', 'error': str(e)})
+
+    return None
+
+
+async def _sync_flush_ranks(run: dict) -> None:
+    """Write the queued rank cells of all clubs in one batch request
+
+    Args:
+        run: Shared sync state (pending_ranks, config_ws, counters)
+    """
+    pending = run['pending_ranks']
+    if not pending:
+        return
+
+    handles = [
+        sheets_write_queue.update_cell(run['config_ws'], idx, 11, rank)
+        for idx, _, _, rank in pending
+    ]
+    await sheets_write_queue.flush()
+    results = await asyncio.gather(*handles, return_exceptions=True)
+
+    for (idx, club_config, club_name, rank), result in zip(pending, results):
+        if isinstance(result, Exception):
+            print(f"  ❌ {club_name}: Rank write failed: {result}")
+            run['error_count'] += 1
+            run['failed_clubs'].append({'idx': idx, 'config': club_config, 'reason': 'no_rank'})
+            continue
+
+        # Update config_cache directly
+        if club_name in client.config_cache:
+            client.config_cache[club_name]['Rank'] = rank
+
+        run['rank_updated'] += 1
+        print(f"  ✅ {club_name}: Rank #{rank}")
+    run['pending_ranks'] = []
+
+
+def _new_sync_run(config_ws) -> dict:
+    """Shared state of one pass of the club sync pipeline
+
+    Args:
+        config_ws: Config worksheet (rank column)
+    """
+    return {
+        'config_ws': config_ws,
+        'rank_updated': 0,
+        'members_synced': 0,
+        'error_count': 0,
+        'failed_clubs': [],  # Track clubs that failed to get rank data for retry
+        'transfer_warnings_log': [],  # Track potential club transfers
+        'pending_ranks': [],  # (idx, config, club_name, rank) written in one batch after the pipeline
+        'sheets_unchanged': 0,  # Clubs whose member / Data sheets needed no write
+        'payloads_unchanged': 0,  # Clubs skipped because their API data matched the last sync
+    }
+
+
+def _sync_jobs(run: dict, club_rows) -> Tuple[List[dict], int]:
+    """Pipeline jobs for the clubs with a Club_ID
+
+    Args:
+        run: Shared state from _new_sync_run
+        club_rows: (config sheet row, club config) pairs
+
+    Returns:
+        (jobs, number of clubs skipped for a missing Club_ID)
+    """
+    jobs = []
+    skipped_no_id = 0
+    for idx, club_config in club_rows:
+        club_id = str(club_config.get('Club_ID', '')).strip()
+
+        if not club_id:
+            skipped_no_id += 1
+            continue
+
+        jobs.append({
+            'run': run,
+            'idx': idx,
+            'config': club_config,
+            'club_name': club_config.get('Club_Name', ''),
+            'club_id': club_id,
+            'members_sheet_name': club_config.get('Members_Sheet_Name', ''),
+            'target_per_day': int(club_config.get('Target_Per_Day', 0)),
+        })
+    return jobs, skipped_no_id
+
+
+async def _run_sync_pass(run: dict, jobs: List[dict]) -> dict:
+    """Run jobs through the fetch → plan → write pipeline, then write the ranks
+
+    Used for the main pass and for each retry round.
+
+    Returns:
+        Pipeline stats
+    """
+    def on_stage_error(stage, job, e):
+        print(f"  ❌ Error updating {job['club_name']} ({stage.name} stage): {e}")
+        run['error_count'] += 1
+        # Add to retry list
+        run['failed_clubs'].append({'idx': job['idx'], 'config': job['config'], 'reason': 'exception', 'error': str(e)})
+
+    # Staged pipeline: API fetches, planning (sheet reads) and sheet writes run
+    # concurrently, each bounded by its own worker count (Sheets quota is
+    # enforced by the global Sheets limiter)
+    pipeline = StagedPipeline([
+        PipelineStage(
+            "fetch", _sync_fetch_club,
+            concurrency=SYNC_FETCH_CONCURRENCY,
+            rate_limiter=AsyncRateLimiter(SYNC_API_RATE_PER_SECOND, name="uma.moe")
+        ),
+        PipelineStage(
+            "plan", _sync_plan_club,
+            concurrency=SYNC_PLAN_CONCURRENCY
+        ),
+        PipelineStage(
+            "write", _sync_write_club,
+            concurrency=SYNC_WRITE_CONCURRENCY
+        ),
+    ], on_error=on_stage_error)
+
+    pipeline_stats = await pipeline.run(jobs)
+    await _sync_flush_ranks(run)
+    return pipeline_stats
+
+
+def _unique_failed_clubs(failed_clubs: List[dict]) -> List[dict]:
+    """One entry per config row (a club can fail in several stages)"""
+    unique = {}
+    for failed_item in failed_clubs:
+        unique.setdefault(failed_item['idx'], failed_item)
+    return list(unique.values())
+
+
 @tasks.loop(time=[
-    dt_time(hour=0, minute=0, tzinfo=pytz.UTC),     # 00:00 UTC = 7:00 AM Vietnam (GMT+7)
-    dt_time(hour=15, minute=30, tzinfo=pytz.UTC),   # 15:30 UTC = 10:30 PM Vietnam (GMT+7)
-    dt_time(hour=17, minute=0, tzinfo=pytz.UTC),    # 17:00 UTC = 12:00 AM Vietnam (midnight, GMT+7)
+    # 00:00 / 15:30 / 17:00 UTC = 7:00 AM / 10:30 PM / 12:00 AM Vietnam (GMT+7)
+    dt_time(hour=hour, minute=minute, tzinfo=pytz.UTC) for hour, minute in CLUB_SYNC_TIMES_UTC
 ])
+@background_sheets_traffic
 async def update_club_data_task():
     """Three times daily task to update club ranks AND member data from uma.moe API
     
@@ -9922,6 +10225,12 @@ async def update_club_data_task():
     - 10:30 PM Vietnam (15:30 UTC)  
     - 12:00 AM Vietnam/midnight (17:00 UTC)
     
+    Clubs flow through a staged pipeline (fetch → plan → write), each stage
+    with its own concurrency (see SYNC_* in config.py). Sheets requests are
+    paced by the global Sheets limiter at background priority. Failed clubs
+    are retried through the same stages; the sheet contents are planned by
+    tasks/sync_planner.py.
+    
     - Updates club monthly rank (column K)
     - Syncs member daily fan data to each club's member sheet
     - Applies Yui logic for late joiners
@@ -9930,11 +10239,14 @@ async def update_club_data_task():
     print(f"\n[{datetime.datetime.now()}] ====== STARTING CLUB DATA SYNC ======")
     
     try:
+        # Refresh worksheet handles once per sync (one metadata request)
+        await to_sheets_thread(gs_manager.refresh_worksheets)
+        
         # Read clubs directly from Google Sheets (no cache dependency)
-        config_ws = await asyncio.to_thread(
-            gs_manager.sh.worksheet, config.CONFIG_SHEET_NAME
+        config_ws = await to_sheets_thread(
+            gs_manager.get_worksheet, config.CONFIG_SHEET_NAME
         )
-        all_configs = await asyncio.to_thread(config_ws.get_all_records)
+        all_configs = await to_sheets_thread(config_ws.get_all_records)
         
         total_clubs = len(all_configs)
         print(f"  📊 Found {total_clubs} clubs in Sheets")
@@ -9943,977 +10255,43 @@ async def update_club_data_task():
             print("  ⚠️ No clubs found in config sheet!")
             return
         
-        rank_updated = 0
-        members_synced = 0
-        error_count = 0
-        skipped_no_id = 0
-        failed_clubs = []  # Track clubs that failed to get rank data for retry
-        transfer_warnings_log = []  # Track potential club transfers
-        
-        for idx, club_config in enumerate(all_configs, start=2):  # Start from row 2 (after header)
-            club_name = club_config.get('Club_Name', '')
-            club_id = str(club_config.get('Club_ID', '')).strip()
-            members_sheet_name = club_config.get('Members_Sheet_Name', '')
-            target_per_day = int(club_config.get('Target_Per_Day', 0))
-            
-            if not club_id:
-                skipped_no_id += 1
-                continue
-            
-            # Rate limit: 0.5s between clubs (reduced with proxy rotation)
-            if idx > 2:  # Skip delay for first club
-                await asyncio.sleep(0.5)
-            
-            try:
-                # Fetch full club data from API
-                api_data = await fetch_club_data_full(club_id)
-                
-                if not api_data:
-                    print(f"  ⚠️ {club_name} (ID: {club_id}): API returned no data")
-                    failed_clubs.append({'idx': idx, 'config': club_config, 'reason': 'no_data'})
-                    continue
-                
-                # ===== UPDATE RANK =====
-                circle_data = api_data.get('circle', {})
-                rank = circle_data.get('monthly_rank')
-                
-                # Ensure rank is not None before comparison
-                if rank is not None and rank > 0:
-                    # Update column K (Rank) - column 11
-                    await asyncio.to_thread(
-                        config_ws.update_cell, idx, 11, rank
-                    )
-                    
-                    # Update config_cache directly
-                    if club_name in client.config_cache:
-                        client.config_cache[club_name]['Rank'] = rank
-                    
-                    rank_updated += 1
-                    print(f"  ✅ {club_name}: Rank #{rank}")
-                else:
-                    # No rank data - add to retry list
-                    print(f"  ⏭️ {club_name}: No rank data available (will retry)")
-                    failed_clubs.append({'idx': idx, 'config': club_config, 'reason': 'no_rank'})
-                
-                # ===== SYNC MEMBER DATA =====
-                if not members_sheet_name:
-                    print(f"  ⏭️ {club_name}: No Members_Sheet_Name configured, skipping member sync")
-                    continue
-                
-                api_members = api_data.get('members', [])
-                if not api_members:
-                    print(f"  ⏭️ {club_name}: No members in API response")
-                    continue
-                
-                # Get current month for labeling
-                vietnam_tz = pytz.timezone('Asia/Ho_Chi_Minh')
-                current_date = datetime.datetime.now(vietnam_tz)
-                
-                # Find max_days by looking at the highest day with data across ALL members
-                # API returns 31 slots (Day 1-31), 0 means no data for that day
-                max_data_day = 0
-                for member in api_members:
-                    cumulative = member.get('daily_fans', [])
-                    for day_idx in range(len(cumulative) - 1, -1, -1):  # Reverse search
-                        if cumulative[day_idx] > 0:
-                            max_data_day = max(max_data_day, day_idx + 1)  # 1-indexed
-                            break
-                
-                # max_days for daily_gains is max_data_day - 1 (because we calculate gain from consecutive days)
-                max_days = max_data_day - 1 if max_data_day > 1 else 0
-                current_day = max_days
-                
-                if max_days < 1:
-                    print(f"  ⏭️ {club_name}: Not enough data yet (max_data_day={max_data_day}), skipping")
-                    continue
-                
-                print(f"    [DEBUG] Current date: {current_date.strftime('%Y-%m-%d')}, max_days={max_days} (max_data_day={max_data_day})")
-                
-                # Build rows for sheet update
-                rows_data = []
-                data_sheet_rows = []  # For Data sheet: Name, Day, Total Fans, Daily, Target, CarryOver
-                skipped_inactive = 0
-                transfer_warnings_log = []  # Collect transfer warnings for Discord notification
-                
-                # Check if this is a new month transition - need to calculate last day of old month
-                current_month = get_current_month_string()
-                expected_days_old_month = None
-                has_new_month_data = False
-                
-                # Calculate expected days for PREVIOUS month (not current)
-                parts = current_month.split('/')
-                prev_month_num = int(parts[0]) - 1
-                prev_year = int(parts[1])
-                if prev_month_num < 1:
-                    prev_month_num = 12
-                    prev_year -= 1
-                prev_month_str = f"{prev_month_num:02d}/{prev_year}"
-                expected_days_prev_month = get_days_in_month(prev_month_str)
-                
-                # Pre-check for new month data
-                for member in api_members:
-                    member_cumulative = member.get('daily_fans', [])
-                    if len(member_cumulative) > expected_days_prev_month:  # Has data beyond previous month
-                        has_new_month_data = True
-                        expected_days_old_month = expected_days_prev_month
-                        break
-                
-                # Get archived member IDs for transfer detection (only if we have archive)
-                archived_ids = set()
-                try:
-                    # Get previous month string
-                    parts = current_month.split('/')
-                    prev_month = int(parts[0]) - 1
-                    prev_year = int(parts[1])
-                    if prev_month < 1:
-                        prev_month = 12
-                        prev_year -= 1
-                    previous_month_str = f"{prev_month:02d}/{prev_year}"
-                    
-                    # Get worksheet and archived IDs
-                    temp_ws = await asyncio.to_thread(
-                        gs_manager.sh.worksheet, members_sheet_name
-                    )
-                    archived_ids = await get_archived_member_ids(temp_ws, previous_month_str)
-                    if archived_ids:
-                        print(f"    📋 Found {len(archived_ids)} members in {previous_month_str} archive for transfer detection")
-                except Exception as e:
-                    print(f"    ⚠️ Could not load archived IDs for transfer detection: {e}")
-                
-                for idx_m, member in enumerate(api_members):
-                    trainer_id = str(member.get('viewer_id', ''))
-                    trainer_name = member.get('trainer_name', '')
-                    cumulative = member.get('daily_fans', [])
-                    
-                    if not trainer_id or not cumulative:
-                        continue
-                    
-                    # Calculate daily gains using fetch-back formula
-                    daily_gains = calculate_daily_gains_from_cumulative(cumulative)
-                    
-                    # If we have new month data, calculate last day gain and append
-                    if has_new_month_data and expected_days_old_month:
-                        last_day_gain = calculate_last_day_gain(cumulative, expected_days_old_month)
-                        if last_day_gain is not None:
-                            daily_gains.append(last_day_gain)
-                    
-                    # Debug: Print first member's data
-                    if idx_m == 0:
-                        print(f"    [DEBUG] First member: {trainer_name}")
-                        print(f"    [DEBUG] Cumulative (first 5): {cumulative[:5]}")
-                        print(f"    [DEBUG] Daily gains (first 5): {daily_gains[:5] if daily_gains else 'empty'}")
-                        print(f"    [DEBUG] max_days={max_days}, current_day={current_day}")
-                        if daily_gains:
-                            last_active = get_member_last_active_day(daily_gains)
-                            print(f"    [DEBUG] last_active_day={last_active}")
-                    
-                    # Filter: Skip members who have left the club
-                    # Check if member has cumulative data for max_data_day (not daily_gains)
-                    # This correctly handles new members who only have 1 day of data
-                    has_current_data = len(cumulative) >= max_data_day and cumulative[max_data_day - 1] > 0
-                    if not has_current_data:
-                        skipped_inactive += 1
-                        print(f"    ❌ Filtered out: {trainer_name} (ID: {trainer_id}) - Không có data ngày {max_data_day}, đã rời club")
-                        continue
-                    
-                    # Apply Yui logic
-                    start_day, adjusted_target, is_new = apply_yui_logic(daily_gains, target_per_day)
-                    
-                    # Transfer detection: Check if member is new and starts from Day 2
-                    transfer_warning = ""
-                    if archived_ids:  # Only check if we have archived data
-                        is_not_in_previous_month = trainer_id not in archived_ids
-                        starts_from_day_2 = start_day == 2
-                        if is_not_in_previous_month and starts_from_day_2:
-                            transfer_warning = "⚠️ Possible Transfer"
-                            transfer_warnings_log.append({
-                                'club': club_name,
-                                'trainer_name': trainer_name,
-                                'trainer_id': trainer_id
-                            })
-                            print(f"    ⚠️ Transfer warning: {trainer_name} (ID: {trainer_id}) - Không có trong archive tháng trước + bắt đầu từ Day 2")
-                    
-                    # Build row: Trainer ID, Name, Day 1..N, TotalFans, _YuiStartDay, _YuiTarget, _IsNewMember, _TransferWarning
-                    row = [trainer_id, trainer_name]
-                    
-                    for day in range(max_days):
-                        if day < len(daily_gains) and daily_gains[day] is not None:
-                            row.append(daily_gains[day])
-                        else:
-                            row.append('')  # Empty cell
-                    
-                    # Get Day 31 cumulative (last day's total fans for month-end calculation)
-                    # This is the cumulative fans for the last day with data in old month
-                    day31_cumulative = 0
-                    if len(cumulative) >= expected_days_prev_month:
-                        # Get the cumulative for the last day of previous month
-                        day31_cumulative = cumulative[expected_days_prev_month - 1] if cumulative[expected_days_prev_month - 1] > 0 else 0
-                    else:
-                        # Fallback: get last non-zero cumulative
-                        for c in reversed(cumulative):
-                            if c > 0:
-                                day31_cumulative = c
-                                break
-                    
-                    row.extend([
-                        start_day if start_day <= max_days else 'N/A',
-                        adjusted_target,
-                        'Yes' if is_new else 'No',
-                        day31_cumulative,  # _Day31_Cumulative column
-                        transfer_warning
-                    ])
-                    
-                    rows_data.append(row)
-                    
-                    # Build Data sheet rows for this member (limit to max_days)
-                    member_data_rows = calculate_data_sheet_rows(
-                        trainer_name, daily_gains, cumulative, target_per_day, max_days
-                    )
-                    data_sheet_rows.extend(member_data_rows)
-                
-                if not rows_data:
-                    print(f"  ⏭️ {club_name}: No active members to sync (skipped {skipped_inactive} inactive)")
-                    continue
-                
-                # Build header row
-                header = ['Trainer ID', 'Name']
-                header.extend([f'Day {i}' for i in range(1, max_days + 1)])
-                header.extend(['_YuiStartDay', '_YuiTarget', '_IsNewMember', '_Day31_Cumulative', '_TransferWarning'])
-                
-                # Write to member sheet
-                try:
-                    member_ws = await asyncio.to_thread(
-                        gs_manager.sh.worksheet, members_sheet_name
-                    )
-                    
-                    # Get current month string (MM/YYYY)
-                    current_month = get_current_month_string()
-                    
-                    # Read existing sheet data to check for archives
-                    await asyncio.sleep(0.5)  # Reduced rate limiting with proxies
-                    all_values = await asyncio.to_thread(member_ws.get_all_values)
-                    
-                    # Find existing archives (everything after === ARCHIVE)
-                    existing_archives = []
-                    archive_start = None
-                    sheet_month = None
-                    has_current_header = False
-                    legacy_complete_data = False  # Flag for legacy sheets with complete month data
-                    legacy_day_count = 0
-                    
-                    for idx_v, row in enumerate(all_values):
-                        if row and row[0]:
-                            if '=== CURRENT' in row[0]:
-                                has_current_header = True
-                                # Extract month from header
-                                import re
-                                match = re.search(r'(\d{1,2}/\d{4})', row[0])
-                                if match:
-                                    sheet_month = match.group(1)
-                            elif '=== ARCHIVE' in row[0]:
-                                archive_start = idx_v
-                                break
-                    
-                    # Handle legacy sheets without CURRENT header
-                    if not has_current_header and len(all_values) > 1:
-                        # Sheet has data but no CURRENT header - this is legacy format
-                        print(f"    📋 Legacy format detected (no CURRENT header)")
-                        
-                        # SMART DETECTION: Count Day columns to determine which month's data is on sheet
-                        # Find header row (first row with "Trainer ID" or "Name")
-                        sheet_header = None
-                        for row in all_values:
-                            if row and ('Trainer ID' in row or 'Name' in row):
-                                sheet_header = row
-                                break
-                        
-                        if sheet_header:
-                            # Count "Day X" columns
-                            day_columns = [col for col in sheet_header if col.startswith('Day ')]
-                            sheet_day_count = len(day_columns)
-                            
-                            # Check if _Day31_Cumulative exists and has data
-                            has_cumulative_col = '_Day31_Cumulative' in sheet_header or '_LastDayCumulative' in sheet_header
-                            
-                            # Calculate previous month's expected days
-                            parts = current_month.split('/')
-                            prev_month_num = int(parts[0]) - 1
-                            prev_year = int(parts[1])
-                            if prev_month_num < 1:
-                                prev_month_num = 12
-                                prev_year -= 1
-                            prev_month_str = f"{prev_month_num:02d}/{prev_year}"
-                            expected_days_prev = get_days_in_month(prev_month_str)
-                            
-                            print(f"    📋 Sheet has {sheet_day_count} Day columns, previous month ({prev_month_str}) expects {expected_days_prev} days")
-                            
-                            # If sheet has data for complete month (e.g., 30-31 days), assume it's from prev month
-                            if sheet_day_count >= expected_days_prev - 1:
-                                sheet_month = prev_month_str
-                                legacy_complete_data = True  # Flag to bypass API max_days check
-                                legacy_day_count = sheet_day_count  # Store actual sheet day count
-                                print(f"    📋 ✅ Sheet appears to have complete {sheet_month} data - will archive")
-                            else:
-                                # Sheet has partial data - might be current month, don't archive
-                                print(f"    📋 ⏳ Sheet has partial data ({sheet_day_count} days) - treating as current month")
-                                sheet_month = current_month  # Don't archive, treat as current
-                        else:
-                            # Fallback: assume previous month
-                            parts = current_month.split('/')
-                            prev_month_num = int(parts[0]) - 1
-                            prev_year = int(parts[1])
-                            if prev_month_num < 1:
-                                prev_month_num = 12
-                                prev_year -= 1
-                            sheet_month = f"{prev_month_num:02d}/{prev_year}"
-                            print(f"    📋 No header found, assuming data is from {sheet_month}")
-                    
-                    # If archive exists, preserve it
-                    red_cells_to_format = []  # Track cells needing red formatting [(row, col), ...]
-                    if archive_start is not None:
-                        existing_archives = all_values[archive_start:]
-                        print(f"    📦 [DEBUG] Found {len(existing_archives)} archive rows starting at row {archive_start + 1}")
-                        
-                        # ============================================================
-                        # AUTO-UPDATE EXISTING ARCHIVE WITH DAY 31 IF MISSING
-                        # ============================================================
-                        if existing_archives and len(existing_archives) > 1:
-                            # Find the archive header row (first row after === ARCHIVE header)
-                            archive_data_header_idx = None
-                            for idx, row in enumerate(existing_archives):
-                                if row and len(row) > 0:
-                                    if row[0] == 'Trainer ID' or row[0] == 'Name':
-                                        archive_data_header_idx = idx
-                                        break
-                            
-                            if archive_data_header_idx is not None:
-                                archive_data_header = existing_archives[archive_data_header_idx]
-                                
-                                # Check if Day 31 column already exists
-                                last_day_col_name = None
-                                last_day_col_idx = None
-                                for idx, col_name in enumerate(archive_data_header):
-                                    if col_name and str(col_name).startswith('Day '):
-                                        last_day_col_name = col_name
-                                        last_day_col_idx = idx
-                                
-                                # Extract the day number from last Day column
-                                if last_day_col_name:
-                                    try:
-                                        last_day_num = int(str(last_day_col_name).replace('Day ', ''))
-                                    except ValueError:
-                                        last_day_num = 30
-                                    
-                                    # Get expected days for archive month
-                                    archive_month = None
-                                    for row in existing_archives:
-                                        if row and '=== ARCHIVE' in str(row[0]):
-                                            import re
-                                            match = re.search(r'(\d{1,2}/\d{4})', str(row[0]))
-                                            if match:
-                                                archive_month = match.group(1)
-                                                break
-                                    
-                                    if archive_month:
-                                        expected_days_archive = get_days_in_month(archive_month)
-                                        
-                                        # Check if Day 31 already exists
-                                        day31_exists = (last_day_num >= expected_days_archive)
-                                        
-                                        # Even if Day 31 exists, check if it needs recalculation (has N/A values)
-                                        needs_recalc = False
-                                        day31_col_idx = None
-                                        if day31_exists:
-                                            # Find Day 31 column index
-                                            for idx, col_name in enumerate(archive_data_header):
-                                                if col_name == f'Day {expected_days_archive}':
-                                                    day31_col_idx = idx
-                                                    break
-                                            
-                                            if day31_col_idx:
-                                                # Count N/A values
-                                                na_count = 0
-                                                for row in existing_archives[archive_data_header_idx + 1:]:
-                                                    if row and len(row) > day31_col_idx:
-                                                        if row[day31_col_idx] == 'N/A':
-                                                            na_count += 1
-                                                if na_count > 0:
-                                                    print(f"    📊 Archive {archive_month} has Day {expected_days_archive} but {na_count} N/A values - recalculating...")
-                                                    needs_recalc = True
-                                        
-                                        # Calculate Day 31 if missing OR has N/A values to recalculate
-                                        if not day31_exists or needs_recalc:
-                                            if not day31_exists:
-                                                print(f"    📊 Archive {archive_month} missing Day {expected_days_archive} - calculating...")
-                                            
-                                            # Find Trainer ID and _Day31_Cumulative columns
-                                            trainer_id_col = None
-                                            day31_cumulative_col = None
-                                            for idx, col_name in enumerate(archive_data_header):
-                                                if col_name == 'Trainer ID':
-                                                    trainer_id_col = idx
-                                                elif col_name == '_Day31_Cumulative':
-                                                    day31_cumulative_col = idx
-                                            
-                                            if trainer_id_col is not None and day31_cumulative_col is not None:
-                                                # Build API member lookup with transfer detection
-                                                # Members who transferred: cumulative[0] > 0 but cumulative[1] = 0
-                                                api_member_data = {}
-                                                for member in api_members:
-                                                    member_id = str(member.get('viewer_id', ''))
-                                                    member_cumulative = member.get('daily_fans', [])
-                                                    if member_cumulative and len(member_cumulative) > 0:
-                                                        is_transferred = False
-                                                        if len(member_cumulative) > 1 and member_cumulative[0] > 0 and member_cumulative[1] == 0:
-                                                            is_transferred = True  # Has Day 1 but no Day 2 = transferred out
-                                                        api_member_data[member_id] = {
-                                                            'day1_cumulative': member_cumulative[0],
-                                                            'is_transferred': is_transferred
-                                                        }
-                                                
-                                                # Debug: count transferred members in API
-                                                transferred_in_api = sum(1 for m in api_member_data.values() if m['is_transferred'])
-                                                print(f"    [DEBUG] API members: {len(api_member_data)}, transferred: {transferred_in_api}")
-                                                
-                                                # Determine column position for Day 31
-                                                if needs_recalc and day31_col_idx is not None:
-                                                    # Updating existing Day 31 column
-                                                    day31_insert_pos = day31_col_idx
-                                                    is_insert_mode = False
-                                                    print(f"    🔄 Updating existing Day {expected_days_archive} column at position {day31_insert_pos}")
-                                                else:
-                                                    # Adding new Day 31 column
-                                                    day31_insert_pos = last_day_col_idx + 1
-                                                    is_insert_mode = True
-                                                    existing_archives[archive_data_header_idx] = list(archive_data_header)
-                                                    existing_archives[archive_data_header_idx].insert(day31_insert_pos, f'Day {expected_days_archive}')
-                                                
-                                                # Calculate Day 31 for each member
-                                                members_with_day31 = 0
-                                                members_transferred = 0
-                                                members_not_found = 0
-                                                for row_idx in range(archive_data_header_idx + 1, len(existing_archives)):
-                                                    row = existing_archives[row_idx]
-                                                    if not row or not row[0] or '===' in str(row[0]):
-                                                        # Skip empty rows or section headers
-                                                        row = list(row) if row else ['']
-                                                        if is_insert_mode:
-                                                            row.insert(day31_insert_pos, '')
-                                                        existing_archives[row_idx] = row
-                                                        continue
-                                                    
-                                                    row = list(row)
-                                                    member_trainer_id = str(row[trainer_id_col]) if len(row) > trainer_id_col else ''
-                                                    old_cumulative = 0
-                                                    try:
-                                                        if len(row) > day31_cumulative_col:
-                                                            old_cumulative = int(row[day31_cumulative_col]) if row[day31_cumulative_col] else 0
-                                                    except (ValueError, TypeError):
-                                                        old_cumulative = 0
-                                                    
-                                                    # Calculate Day 31
-                                                    day31_value = 'N/A'
-                                                    is_transferred_member = False
-                                                    
-                                                    if member_trainer_id in api_member_data:
-                                                        member_info = api_member_data[member_trainer_id]
-                                                        new_day1_cumulative = member_info['day1_cumulative']
-                                                        is_transferred_member = member_info['is_transferred']
-                                                        
-                                                        if old_cumulative > 0 and new_day1_cumulative > 0:
-                                                            day31_value = new_day1_cumulative - old_cumulative
-                                                            if day31_value < 0:
-                                                                day31_value = 'N/A'
-                                                                members_not_found += 1
-                                                            else:
-                                                                if is_transferred_member:
-                                                                    members_transferred += 1
-                                                                    # Track for red formatting - calculate actual row in full_data
-                                                                    # This is relative position in existing_archives
-                                                                    red_cells_to_format.append((row_idx, day31_insert_pos))
-                                                                else:
-                                                                    members_with_day31 += 1
-                                                                
-                                                                # Build CROSS_CLUB_CACHE for transfer lookup
-                                                                update_cross_club_cache(
-                                                                    member_trainer_id, 
-                                                                    club_name, 
-                                                                    old_cumulative,
-                                                                    archive_month
-                                                                )
-                                                        else:
-                                                            members_not_found += 1
-                                                    else:
-                                                        # Member not in API at all
-                                                        members_not_found += 1
-                                                    
-                                                    # Set Day 31 value (insert or update)
-                                                    if is_insert_mode:
-                                                        row.insert(day31_insert_pos, day31_value)
-                                                    else:
-                                                        # Update existing column
-                                                        while len(row) <= day31_insert_pos:
-                                                            row.append('')
-                                                        row[day31_insert_pos] = day31_value
-                                                    existing_archives[row_idx] = row
-                                                
-                                                print(f"    ✅ Day {expected_days_archive} added: {members_with_day31} stayed, {members_transferred} transferred (red), {members_not_found} not found (N/A)")
-                                                print(f"    📦 CROSS_CLUB_CACHE: Added {members_with_day31 + members_transferred} members from {club_name}")
-                    else:
-                        print(f"    📦 [DEBUG] No existing archives found in sheet")
-                    
-                    # Check if we need to archive current data (month changed)
-                    new_archive_section = []
-                    if sheet_month and sheet_month != current_month:
-                        # First, check if sheet has actual data to archive
-                        # Count data rows (excluding headers like === CURRENT, === ARCHIVE)
-                        sheet_data_rows = 0
-                        for row in all_values:
-                            if row and row[0]:
-                                if '===' in row[0]:
-                                    continue  # Skip header lines
-                                if row[0] == 'Name' or row[0] == 'Trainer ID':
-                                    continue  # Skip column header
-                                sheet_data_rows += 1
-                            else:
-                                break  # Stop at empty row
-                        
-                        if sheet_data_rows < 1:
-                            # NEW CLUB or empty sheet - nothing to archive
-                            print(f"    📋 New club detected (no old data on sheet) - skipping archive check")
-                        else:
-                            # Sheet has data - continue with archive logic
-                            # YUI LOGIC: Only archive if old month's data is COMPLETE
-                            # uma.moe updates with 1 day delay, so on first day of new month,
-                            # we may not have complete data for the last day of previous month
-                            expected_days = get_days_in_month(sheet_month)
-                            
-                            # Get current calendar day (in Vietnam timezone)
-                            vietnam_tz = pytz.timezone('Asia/Ho_Chi_Minh')
-                            current_calendar_day = datetime.datetime.now(vietnam_tz).day
-                            
-                            # Check if we have Day 1 of new month (needed to calculate last day of old month)
-                            # API returns cumulative for each day, so len > expected_days means new month data exists
-                            has_new_month_data = False
-                            for member in api_members:
-                                member_cumulative = member.get('daily_fans', [])
-                                if len(member_cumulative) > expected_days:
-                                    has_new_month_data = True
-                                    break
-                            
-                            # Determine if we should archive
-                            should_archive = False
-                            archive_reason = ""
-                            
-                            if has_new_month_data:
-                                # CASE 1: Have Day 1 of new month - can calculate last day of old month
-                                should_archive = True
-                                archive_reason = f"✅ Day 1 new month available - calculating Day {expected_days} daily gains"
-                                print(f"    📊 Day 1 of {current_month} detected - will calculate Day {expected_days} of {sheet_month}")
-                            elif legacy_complete_data:
-                                # CASE 0: Legacy sheet with complete data - bypass API max_days check
-                                # Use sheet's day count instead of API data
-                                should_archive = True
-                                archive_reason = f"✅ Legacy sheet has {legacy_day_count} Day columns (complete data for {sheet_month})"
-                            elif max_days >= expected_days - 1 and current_calendar_day >= 2:
-                                # CASE 2: FALLBACK - uma.moe skipped last day
-                                # If it's already Day 2+ of new month and we have (expected - 1) days,
-                                # uma.moe probably skipped the last day. Archive anyway.
-                                should_archive = True
-                                archive_reason = f"⚠️ Fallback archive: {max_days}/{expected_days} days (Day {expected_days} skipped by uma.moe)"
-                            elif max_days >= expected_days - 2 and current_calendar_day >= 3:
-                                # CASE 3: Force archive after Day 3 if we have at least expected - 2 days
-                                # This is a safety net to prevent data being stuck
-                                should_archive = True
-                                archive_reason = f"⚠️ Force archive (Day 3+): {max_days}/{expected_days} days"
-                            
-                            if should_archive:
-                                print(f"    🗓️ New month detected ({sheet_month} → {current_month})")
-                                print(f"    {archive_reason} - proceeding with archive")
-                                # Get current data to archive (rows between CURRENT header and archive/empty)
-                                current_data_to_archive = []
-                                for row in all_values:
-                                    if not row or not row[0]:
-                                        break
-                                    if '=== ARCHIVE' in row[0]:
-                                        break
-                                    current_data_to_archive.append(row)
-                                
-                                if len(current_data_to_archive) > 1:
-                                    # Build archive section for old month
-                                    archive_header = [f"=== ARCHIVE: {sheet_month} ==="]
-                                    archive_header.extend([''] * (len(header) - 1))
-                                    spacer = [[''] * len(header)] * 2
-                                    
-                                    # Determine where actual data starts
-                                    # If first row is CURRENT header, skip it
-                                    # If first row is data header (legacy), keep it
-                                    skip_first = 0
-                                    if current_data_to_archive[0] and '=== CURRENT' in str(current_data_to_archive[0][0]):
-                                        skip_first = 1  # Skip CURRENT header
-                                    
-                                    archive_data = current_data_to_archive[skip_first:]
-                                    
-                                    # ============================================================
-                                    # CALCULATE DAY 31 FOR ARCHIVE
-                                    # ============================================================
-                                    # Find _Day31_Cumulative and Trainer ID columns in archive header
-                                    if archive_data and len(archive_data) > 1:
-                                        archive_data_header = archive_data[0]
-                                        day31_cumulative_col = None
-                                        trainer_id_col = None
-                                        
-                                        for idx, col_name in enumerate(archive_data_header):
-                                            if col_name == '_Day31_Cumulative':
-                                                day31_cumulative_col = idx
-                                            elif col_name == 'Trainer ID':
-                                                trainer_id_col = idx
-                                        
-                                        # Build API member lookup for Day 1 new month cumulative
-                                        api_member_day1 = {}
-                                        for member in api_members:
-                                            member_id = str(member.get('viewer_id', ''))
-                                            member_cumulative = member.get('daily_fans', [])
-                                            if member_cumulative and len(member_cumulative) > 0:
-                                                api_member_day1[member_id] = member_cumulative[0]
-                                        
-                                        if day31_cumulative_col and trainer_id_col:
-                                            # Add Day 31 column to header
-                                            archive_data[0] = list(archive_data[0])
-                                            # Find position after Day 30 (or last Day column)
-                                            last_day_col = None
-                                            for idx, col_name in enumerate(archive_data[0]):
-                                                if col_name and col_name.startswith('Day '):
-                                                    last_day_col = idx
-                                            
-                                            # Insert Day 31 after last Day column
-                                            if last_day_col is not None:
-                                                day31_insert_pos = last_day_col + 1
-                                                archive_data[0].insert(day31_insert_pos, f'Day {expected_days}')
-                                                
-                                                # Calculate Day 31 for each member row
-                                                members_with_day31 = 0
-                                                members_transferred = 0
-                                                for row_idx in range(1, len(archive_data)):
-                                                    row = list(archive_data[row_idx])
-                                                    
-                                                    # Get member's Trainer ID and _Day31_Cumulative
-                                                    member_trainer_id = str(row[trainer_id_col]) if len(row) > trainer_id_col else ''
-                                                    old_cumulative = 0
-                                                    try:
-                                                        if len(row) > day31_cumulative_col:
-                                                            old_cumulative = int(row[day31_cumulative_col]) if row[day31_cumulative_col] else 0
-                                                    except (ValueError, TypeError):
-                                                        old_cumulative = 0
-                                                    
-                                                    # Calculate Day 31
-                                                    day31_value = 'N/A'
-                                                    if member_trainer_id in api_member_day1:
-                                                        new_day1_cumulative = api_member_day1[member_trainer_id]
-                                                        if old_cumulative > 0 and new_day1_cumulative > 0:
-                                                            day31_value = new_day1_cumulative - old_cumulative
-                                                            if day31_value < 0:
-                                                                day31_value = 'N/A'  # Invalid calculation
-                                                            else:
-                                                                members_with_day31 += 1
-                                                        else:
-                                                            members_transferred += 1
-                                                    else:
-                                                        members_transferred += 1
-                                                    
-                                                    # Insert Day 31 value
-                                                    row.insert(day31_insert_pos, day31_value)
-                                                    archive_data[row_idx] = row
-                                                
-                                                print(f"    📊 Day {expected_days} calculated: {members_with_day31} members, {members_transferred} transferred (N/A)")
-                                    
-                                    new_archive_section = spacer + [archive_header] + archive_data + spacer
-                                    print(f"    📦 Archiving {len(archive_data)} rows from {sheet_month}")
-                            else:
-                                # Data not complete yet - DON'T archive, wait for uma.moe to update
-                                print(f"    🗓️ New month detected ({sheet_month} → {current_month})")
-                                print(f"    ⏳ Data INCOMPLETE: only {max_days}/{expected_days} days - SKIPPING archive")
-                                print(f"    💡 Will auto-archive on Day 2 if uma.moe skips last day")
-                    
-                    # Build CURRENT header with month
-                    current_header = [f"=== CURRENT: {current_month} ==="]
-                    current_header.extend([''] * (len(header) - 1))
-                    
-                    # Build full data: CURRENT header + data header + rows + spacer + new archive + existing archives
-                    full_data = [current_header, header] + rows_data
-                    
-                    # Add spacer and archives
-                    if new_archive_section or existing_archives:
-                        spacer = [[''] * len(header)] * 2
-                        full_data.extend(spacer)
-                        if new_archive_section:
-                            full_data.extend(new_archive_section)
-                        if existing_archives:
-                            full_data.extend(existing_archives)
-                    
-                    # SAFETY CHECK: Verify archives are preserved before clearing
-                    # This prevents accidental data loss if archive detection fails
-                    if archive_start is not None and len(existing_archives) > 0:
-                        # We found archives in original sheet - make sure they're in full_data
-                        archive_preserved = any('=== ARCHIVE' in str(row[0]) for row in full_data if row and row[0])
-                        if not archive_preserved:
-                            print(f"    ⚠️ SAFETY: Archives detected but not preserved! Skipping write to prevent data loss.")
-                            print(f"    📦 Original had {len(existing_archives)} archive rows")
-                            continue  # Skip this club, don't write
-                    
-                    # Clear and rewrite entire sheet
-                    await asyncio.sleep(0.3)
-                    await asyncio.to_thread(member_ws.clear)
-                    await asyncio.sleep(0.3)
-                    await asyncio.to_thread(
-                        member_ws.update, 'A1', full_data
-                    )
-                    
-                    # ============================================================
-                    # APPLY YELLOW FORMATTING FOR TRANSFERRED MEMBERS
-                    # - Members who LEFT: in archive but not in current → yellow in archive
-                    # - Members who JOINED: in current but not in archive → yellow in current
-                    # ============================================================
-                    try:
-                        from gspread_formatting import format_cell_range, CellFormat, Color
-                        
-                        # Build current member IDs set
-                        current_member_ids = set()
-                        for member in api_members:
-                            member_id = str(member.get('viewer_id', ''))
-                            if member_id:
-                                current_member_ids.add(member_id)
-                        
-                        print(f"    [DEBUG] Current members from API: {len(current_member_ids)}")
-                        if current_member_ids:
-                            sample_current = list(current_member_ids)[:3]
-                            print(f"    [DEBUG] Sample current IDs: {sample_current}")
-                        
-                        # Build archive member IDs set (from existing_archives)
-                        archive_member_ids = set()
-                        archive_member_rows = {}  # {trainer_id: row_index_in_archive}
-                        
-                        # Use new_archive_section FIRST (just created), then existing_archives
-                        archive_to_compare = None
-                        archive_source = None
-                        
-                        if new_archive_section and len(new_archive_section) > 3:
-                            # New archive was just created from previous month - use this
-                            archive_to_compare = new_archive_section
-                            archive_source = "new_archive_section"
-                        elif existing_archives and len(existing_archives) > 3:
-                            # Use existing archives
-                            archive_to_compare = existing_archives
-                            archive_source = "existing_archives"
-                        
-                        print(f"    [DEBUG] Archive source: {archive_source}, length: {len(archive_to_compare) if archive_to_compare else 0}")
-                        
-                        if archive_to_compare:
-                            archive_header_idx = None
-                            trainer_id_col = None
-                            
-                            # Find header and Trainer ID column
-                            for idx, row in enumerate(archive_to_compare):
-                                if row and len(row) > 0:
-                                    if row[0] == 'Trainer ID':
-                                        archive_header_idx = idx
-                                        trainer_id_col = 0
-                                        print(f"    [DEBUG] Found archive header at idx {idx}, Trainer ID at col 0")
-                                        break
-                                    elif 'Trainer ID' in row:
-                                        archive_header_idx = idx
-                                        trainer_id_col = row.index('Trainer ID')
-                                        print(f"    [DEBUG] Found archive header at idx {idx}, Trainer ID at col {trainer_id_col}")
-                                        break
-                            
-                            if archive_header_idx is None:
-                                print(f"    [DEBUG] ⚠️ Could not find archive header row!")
-                                print(f"    [DEBUG] First 5 rows of archive_to_compare:")
-                                for i, row in enumerate(archive_to_compare[:5]):
-                                    print(f"    [DEBUG]   Row {i}: {row[:3] if row else 'empty'}")
-                            
-                            if archive_header_idx is not None and trainer_id_col is not None:
-                                for idx in range(archive_header_idx + 1, len(archive_to_compare)):
-                                    row = archive_to_compare[idx]
-                                    if row and len(row) > trainer_id_col and row[trainer_id_col]:
-                                        if '===' not in str(row[0]):  # Skip section headers
-                                            archive_member_ids.add(str(row[trainer_id_col]))
-                                            archive_member_rows[str(row[trainer_id_col])] = idx
-                        else:
-                            print(f"    [DEBUG] No archive data to compare - skipping transfer highlighting")
-                        
-                        print(f"    [DEBUG] Archive members found: {len(archive_member_ids)}")
-                        if archive_member_ids:
-                            sample_archive = list(archive_member_ids)[:3]
-                            print(f"    [DEBUG] Sample archive IDs: {sample_archive}")
-                        
-                        # Calculate who LEFT and who JOINED (only if we have archive to compare)
-                        if not archive_to_compare:
-                            print(f"    [DEBUG] ⏭️ Skipping transfer highlighting - no archive to compare against")
-                            members_left = set()
-                            members_joined = set()
-                        else:
-                            members_left = archive_member_ids - current_member_ids  # In archive but not current
-                            members_joined = current_member_ids - archive_member_ids  # In current but not archive
-                        
-                        print(f"    [DEBUG] Members LEFT (archive - current): {len(members_left)}")
-                        print(f"    [DEBUG] Members JOINED (current - archive): {len(members_joined)}")
-                        
-                        if members_left or members_joined:
-                            print(f"    🔄 Transfer detection: {len(members_left)} OUT, {len(members_joined)} NEW")
-                            
-                            # Yellow color for highlighting
-                            yellow_format = CellFormat(
-                                backgroundColor=Color(1.0, 1.0, 0.0)  # Yellow #FFFF00
-                            )
-                            
-                            formatted_count = 0
-                            ranges_to_format = []  # Collect all ranges first
-                            
-                            # Collect LEFT members in archive (only A:B columns)
-                            if members_left and archive_to_compare:
-                                # Calculate archive start position in sheet
-                                # full_data = [CURRENT header, data header, rows_data..., spacer, new_archive, existing_archives]
-                                if archive_source == "new_archive_section":
-                                    # New archive position: after current data + spacer
-                                    archive_offset = 2 + len(rows_data) + 2  # Headers + data + spacer
-                                else:
-                                    # Existing archive position: after current data + spacer + new_archive
-                                    archive_offset = 2 + len(rows_data) + 2
-                                    if new_archive_section:
-                                        archive_offset += len(new_archive_section)
-                                
-                                for trainer_id in members_left:
-                                    if trainer_id in archive_member_rows:
-                                        rel_row = archive_member_rows[trainer_id]
-                                        actual_row = archive_offset + rel_row + 1  # +1 for 1-indexed
-                                        ranges_to_format.append(f"A{actual_row}:B{actual_row}")
-                            
-                            # Collect JOINED members in current data (only A:B columns)
-                            if members_joined:
-                                # Current data starts at row 3 (after CURRENT header + data header)
-                                # rows_data has Trainer ID at column 0
-                                for row_idx, row in enumerate(rows_data):
-                                    if row and len(row) > 0:
-                                        if str(row[0]) in members_joined:
-                                            actual_row = 3 + row_idx  # Row 3 is first data row
-                                            ranges_to_format.append(f"A{actual_row}:B{actual_row}")
-                            
-                            # Apply formatting in batches to avoid rate limit
-                            if ranges_to_format:
-                                print(f"    [DEBUG] Formatting {len(ranges_to_format)} ranges...")
-                                batch_size = 10  # Max 10 formats per batch
-                                
-                                for i in range(0, len(ranges_to_format), batch_size):
-                                    batch = ranges_to_format[i:i+batch_size]
-                                    for row_range in batch:
-                                        try:
-                                            await asyncio.to_thread(
-                                                format_cell_range, member_ws, row_range, yellow_format
-                                            )
-                                            formatted_count += 1
-                                        except Exception as fmt_err:
-                                            print(f"    ⚠️ Format error for {row_range}: {fmt_err}")
-                                    
-                                    # Wait between batches to avoid rate limit
-                                    if i + batch_size < len(ranges_to_format):
-                                        await asyncio.sleep(2)  # 2 second delay between batches
-                            
-                            if formatted_count > 0:
-                                print(f"    🟡 Applied yellow highlighting to {formatted_count} transferred member rows")
-                    except ImportError:
-                        print(f"    ⚠️ gspread_formatting not installed - skipping yellow formatting")
-                    except Exception as e:
-                        print(f"    ⚠️ Error applying yellow formatting: {e}")
-                    
-                    members_synced += 1
-                    print(f"  📊 {club_name}: Synced {len(rows_data)} members, {max_days} days ({current_month})")
-                    print(f"    📦 [DEBUG] Wrote {len(full_data)} total rows (new_archive={len(new_archive_section)}, existing_archive={len(existing_archives)})")
-                    
-                    # ===== SYNC DATA SHEET =====
-                    # Data sheet name: from config, or derive from Members_Sheet_Name
-                    # Pattern: Eden03_Members → Eden03_Data
-                    if club_config.get('Data_Sheet_Name'):
-                        data_sheet_name = club_config.get('Data_Sheet_Name')
-                    elif members_sheet_name and '_Members' in members_sheet_name:
-                        data_sheet_name = members_sheet_name.replace('_Members', '_Data')
-                    else:
-                        data_sheet_name = f"{club_name}_Data"
-                    
-                    if data_sheet_rows:
-                        try:
-                            # Get or create Data sheet
-                            try:
-                                data_ws = await asyncio.to_thread(
-                                    gs_manager.sh.worksheet, data_sheet_name
-                                )
-                            except Exception:
-                                # Sheet doesn't exist - skip
-                                print(f"    ⏭️ Data sheet '{data_sheet_name}' not found, skipping Data sync")
-                                data_ws = None
-                            
-                            if data_ws:
-                                # Build Data sheet header
-                                data_header = ['Name', 'Day', 'Total Fans', 'Daily', 'Target', 'CarryOver']
-                                
-                                # Build CURRENT header with month
-                                current_data_header = [f"=== CURRENT: {current_month} ==="]
-                                current_data_header.extend([''] * (len(data_header) - 1))
-                                
-                                # Build full data
-                                full_data_sheet = [current_data_header, data_header] + data_sheet_rows
-                                
-                                # Simple approach: Always clear and rewrite
-                                await asyncio.sleep(0.5)  # Reduced with proxies
-                                await asyncio.to_thread(data_ws.clear)
-                                await asyncio.sleep(0.3)
-                                await asyncio.to_thread(
-                                    data_ws.update, 'A1', full_data_sheet
-                                )
-                                
-                                print(f"    📈 Data sheet: Synced {len(data_sheet_rows)} rows")
-                        except Exception as e:
-                            print(f"    ⚠️ Data sheet sync failed: {e}")
-                    
-                except Exception as e:
-                    print(f"  ❌ {club_name}: Failed to update member sheet: {e}")
-                    error_count += 1
-                    # Add to retry list
-                    failed_clubs.append({'idx': idx, 'config': club_config, 'reason': 'exception', 'error': str(e)})
-                    
-            except Exception as e:
-                print(f"  ❌ Error updating {club_name}: {e}")
-                error_count += 1
-                # Add to retry list
-                failed_clubs.append({'idx': idx, 'config': club_config, 'reason': 'exception', 'error': str(e)})
+        # Shared state for the pipeline stages
+        run = _new_sync_run(config_ws)
+        jobs, skipped_no_id = _sync_jobs(run, enumerate(all_configs, start=2))  # Start from row 2 (after header)
+        
+        print(f"  🚀 Syncing {len(jobs)} clubs through staged pipeline...")
+        pipeline_stats = await _run_sync_pass(run, jobs)
+        
+        rank_updated = run['rank_updated']
+        members_synced = run['members_synced']
+        error_count = run['error_count']
+        failed_clubs = _unique_failed_clubs(run['failed_clubs'])
+        transfer_warnings_log = run['transfer_warnings_log']
         
         print(f"\n[{datetime.datetime.now()}] ====== SYNC COMPLETE ======")
+        print(f"  ⏱️ Pipeline time: {pipeline_stats['duration_seconds']}s")
+        for stage_stats in pipeline_stats['stages']:
+            print(
+                f"     - {stage_stats['stage']}: {stage_stats['processed']} processed, "
+                f"{stage_stats['failed']} failed, busy {stage_stats['busy_seconds']}s, "
+                f"rate-limited {stage_stats['rate_limit_wait_seconds']}s"
+            )
+        queue_stats = sheets_write_queue.get_stats()
+        print(
+            f"  📮 Sheets writes: {queue_stats['writes_enqueued']} queued → "
+            f"{queue_stats['requests_sent']} requests ({queue_stats['requests_failed']} failed)"
+        )
         print(f"  ✅ Ranks updated: {rank_updated}")
         print(f"  📊 Clubs synced: {members_synced}")
+        print(f"  💤 Skipped (API data unchanged): {run['payloads_unchanged']}")
+        print(f"  💤 Clubs with unchanged sheets: {run['sheets_unchanged']}")
         print(f"  ⏭️ Skipped (no Club_ID): {skipped_no_id}")
         print(f"  ❌ Errors: {error_count}")
         print(f"  🔄 Failed clubs (to retry): {len(failed_clubs)}")
         
-        # Send transfer warnings to Discord
-        if transfer_warnings_log:
-            try:
-                debug_channel = bot.get_channel(DEBUG_LOG_CHANNEL_ID)
-                if debug_channel:
-                    # Build transfer warning message
-                    warning_lines = [f"⚠️ **Transfer Warnings Detected** ({len(transfer_warnings_log)} members):\n"]
-                    for warn in transfer_warnings_log[:20]:  # Limit to 20 to avoid message too long
-                        warning_lines.append(f"• **{warn['club']}**: {warn['trainer_name']} (ID: `{warn['trainer_id']}`)")
-                    
-                    if len(transfer_warnings_log) > 20:
-                        warning_lines.append(f"\n... and {len(transfer_warnings_log) - 20} more")
-                    
-                    warning_msg = "\n".join(warning_lines)
-                    await debug_channel.send(warning_msg)
-                    print(f"  📤 Sent {len(transfer_warnings_log)} transfer warnings to Discord")
-            except Exception as e:
-                print(f"  ⚠️ Failed to send transfer warnings to Discord: {e}")
-        
         # ===== RETRY LOOP FOR FAILED CLUBS =====
+        # Failed clubs go through the same fetch → plan → write stages again
+        # (clubs whose sheets were already written skip as unchanged payloads)
         if failed_clubs:
             max_retries = 3
             retry_delay = 10  # seconds between retries
@@ -10926,284 +10304,16 @@ async def update_club_data_task():
                 print(f"  ⏳ Waiting {retry_delay}s before retry...")
                 await asyncio.sleep(retry_delay)
                 
-                still_failed = []
-                retry_success = 0
+                retry_run = _new_sync_run(config_ws)
+                retry_jobs, _ = _sync_jobs(retry_run, [(item['idx'], item['config']) for item in failed_clubs])
+                await _run_sync_pass(retry_run, retry_jobs)
                 
-                for failed_item in failed_clubs:
-                    idx = failed_item['idx']
-                    club_config = failed_item['config']
-                    club_name = club_config.get('Club_Name', '')
-                    club_id = str(club_config.get('Club_ID', '')).strip()
-                    retry_reason = failed_item.get('reason', 'unknown')
-                    
-                    try:
-                        # Rate limit
-                        await asyncio.sleep(1)
-                        
-                        # Determine retry type based on reason
-                        if retry_reason == 'exception':
-                            # FULL SYNC RETRY - exception during member sync, need full retry
-                            print(f"    🔄 [Retry {retry_round}] {club_name}: Full sync (exception)")
-                            api_data = await fetch_club_data_full(club_id)
-                            
-                            if not api_data:
-                                print(f"    ⚠️ [Retry {retry_round}] {club_name}: Still no data")
-                                still_failed.append(failed_item)
-                                continue
-                            
-                            circle_data = api_data.get('circle', {})
-                            api_members = api_data.get('members', [])
-                            rank = circle_data.get('monthly_rank')
-                            
-                            # Update rank first
-                            if rank is not None and rank > 0:
-                                await asyncio.to_thread(
-                                    config_ws.update_cell, idx, 11, rank
-                                )
-                                if club_name in client.config_cache:
-                                    client.config_cache[club_name]['Rank'] = rank
-                                rank_updated += 1
-                            
-                            # Try to sync member sheet
-                            if api_members:
-                                try:
-                                    members_sheet_name = club_config.get('Members_Sheet_Name', '')
-                                    target_per_day = int(club_config.get('Target_Per_Day', 0))
-                                    
-                                    if members_sheet_name:
-                                        member_ws = await asyncio.to_thread(
-                                            gs_manager.sh.worksheet, members_sheet_name
-                                        )
-                                        
-                                        # Build simple current data (no archive logic in retry)
-                                        current_day = datetime.datetime.now(tz=pytz.timezone('Asia/Tokyo')).day
-                                        current_month = datetime.datetime.now(tz=pytz.timezone('Asia/Tokyo')).strftime('%m/%Y')
-                                        
-                                        # Build rows data
-                                        rows_data = []
-                                        for member in api_members:
-                                            trainer_id = str(member.get('viewer_id', ''))
-                                            trainer_name = member.get('trainer_name', '')
-                                            cumulative = member.get('daily_fans', [])
-                                            
-                                            if not trainer_id or not cumulative:
-                                                continue
-                                            
-                                            # Calculate daily gains
-                                            daily_gains = calculate_daily_gains_from_cumulative(cumulative)
-                                            max_days = len(daily_gains)
-                                            
-                                            if max_days == 0:
-                                                continue
-                                            
-                                            # Build row
-                                            row = [trainer_id, trainer_name]
-                                            for day_num in range(1, max_days + 1):
-                                                row.append(daily_gains[day_num - 1] if day_num <= len(daily_gains) else '')
-                                            
-                                            # Calculate totals
-                                            total = sum(g for g in daily_gains if g is not None and isinstance(g, (int, float)))
-                                            expected = target_per_day * max_days
-                                            carryover = total - expected
-                                            
-                                            row.extend([total, expected, carryover])
-                                            rows_data.append(row)
-                                        
-                                        if rows_data:
-                                            # Build header
-                                            max_days_in_data = max(len(r) - 5 for r in rows_data) if rows_data else 1
-                                            header = ['Trainer ID', 'Name']
-                                            for d in range(1, max_days_in_data + 1):
-                                                header.append(f"Day {d}")
-                                            header.extend(['Total', 'Expected', 'CarryOver'])
-                                            
-                                            # Current header
-                                            current_header = [f"=== CURRENT: {current_month} ==="]
-                                            current_header.extend([''] * (len(header) - 1))
-                                            
-                                            full_data = [current_header, header] + rows_data
-                                            
-                                            # ========== SMART ARCHIVE DETECTION WITH LEGACY SUPPORT ==========
-                                            existing_data = await asyncio.to_thread(member_ws.get_all_values)
-                                            existing_archives = []
-                                            archive_start = None
-                                            
-                                            print(f"    📋 [Retry] Sheet has {len(existing_data)} rows total")
-                                            
-                                            # STEP 1: Detect sheet format and month
-                                            has_current_header = False
-                                            legacy_complete_data = False
-                                            sheet_month = None
-                                            
-                                            for row in existing_data:
-                                                if row and len(row) > 0 and row[0]:
-                                                    cell_upper = str(row[0]).strip().upper()
-                                                    if '=== CURRENT' in cell_upper:
-                                                        has_current_header = True
-                                                        # Extract month from CURRENT header
-                                                        import re
-                                                        match = re.search(r'(\d{1,2}/\d{4})', str(row[0]))
-                                                        if match:
-                                                            sheet_month = match.group(1)
-                                                    elif '=== ARCHIVE' in cell_upper:
-                                                        # Found existing archive section
-                                                        archive_start = existing_data.index(row)
-                                                        break
-                                            
-                                            # STEP 2: Handle LEGACY FORMAT (no === CURRENT === header)
-                                            if not has_current_header and len(existing_data) > 0:
-                                                print(f"    📋 [Retry] Legacy format detected (no CURRENT header)")
-                                                
-                                                # Find header row with "Trainer ID" or "Name"
-                                                sheet_header = None
-                                                for row in existing_data:
-                                                    if row and ('Trainer ID' in row or 'Name' in row):
-                                                        sheet_header = row
-                                                        break
-                                                
-                                                if sheet_header:
-                                                    # Count "Day X" columns to determine which month
-                                                    day_columns = [col for col in sheet_header if isinstance(col, str) and col.startswith('Day ')]
-                                                    sheet_day_count = len(day_columns)
-                                                    
-                                                    # Calculate previous month's expected days
-                                                    parts = current_month.split('/')
-                                                    prev_month_num = int(parts[0]) - 1
-                                                    prev_year = int(parts[1])
-                                                    if prev_month_num < 1:
-                                                        prev_month_num = 12
-                                                        prev_year -= 1
-                                                    prev_month_str = f"{prev_month_num:02d}/{prev_year}"
-                                                    expected_days_prev = get_days_in_month(prev_month_str)
-                                                    
-                                                    print(f"    📋 [Retry] Sheet has {sheet_day_count} Day columns")
-                                                    print(f"    📋 [Retry] Previous month ({prev_month_str}) expects {expected_days_prev} days")
-                                                    
-                                                    # If sheet has complete month data (≥ 29 days), it's OLD MONTH
-                                                    if sheet_day_count >= expected_days_prev - 1:
-                                                        legacy_complete_data = True
-                                                        sheet_month = prev_month_str
-                                                        print(f"    📦 [Retry] ✅ Legacy sheet has complete {sheet_month} data ({sheet_day_count} days)")
-                                                        
-                                                        # Archive ENTIRE legacy sheet
-                                                        archive_header_row = [f"=== ARCHIVE: {sheet_month} ==="]
-                                                        if len(existing_data) > 0 and len(existing_data[0]) > 1:
-                                                            archive_header_row.extend([''] * (len(existing_data[0]) - 1))
-                                                        
-                                                        existing_archives = [[''], archive_header_row] + existing_data
-                                                        print(f"    📦 [Retry] Archived {len(existing_data)} legacy rows")
-                                                    else:
-                                                        # Partial data - current month, don't archive
-                                                        print(f"    ℹ️ [Retry] Legacy sheet has partial data ({sheet_day_count} days) - no archive")
-                                                        existing_archives = []
-                                            
-                                            # STEP 3: Handle NEW FORMAT (has === CURRENT === header)
-                                            elif has_current_header:
-                                                print(f"    📋 [Retry] New format with CURRENT header detected")
-                                                
-                                                # Check if sheet month matches current month
-                                                if sheet_month and sheet_month != current_month:
-                                                    print(f"    📦 [Retry] Sheet month ({sheet_month}) != current ({current_month})")
-                                                    
-                                                    # Preserve existing archive section if found
-                                                    if archive_start is not None:
-                                                        existing_archives = existing_data[archive_start:]
-                                                        print(f"    📦 [Retry] Preserved {len(existing_archives)} existing archive rows")
-                                                    else:
-                                                        # No archive yet - create new archive from current section
-                                                        # Find where current data ends (empty row or end of data)
-                                                        current_data_end = None
-                                                        for row_idx in range(len(existing_data)):
-                                                            if row_idx > 1:  # Skip headers
-                                                                row = existing_data[row_idx]
-                                                                if not row or not any(row):  # Empty row
-                                                                    current_data_end = row_idx
-                                                                    break
-                                                        
-                                                        if current_data_end is None:
-                                                            current_data_end = len(existing_data)
-                                                        
-                                                        # Create archive from old month data
-                                                        archive_header_row = [f"=== ARCHIVE: {sheet_month} ==="]
-                                                        archive_header_row.extend([''] * (len(existing_data[0]) - 1))
-                                                        
-                                                        existing_archives = [[''], archive_header_row] + existing_data[:current_data_end]
-                                                        print(f"    📦 [Retry] Created archive for {sheet_month} ({current_data_end} rows)")
-                                                else:
-                                                    # Same month - only preserve existing archives
-                                                    if archive_start is not None:
-                                                        existing_archives = existing_data[archive_start:]
-                                                        print(f"    📦 [Retry] Same month - preserved {len(existing_archives)} archive rows")
-                                                    else:
-                                                        print(f"    ℹ️ [Retry] Same month - no archives found")
-                                            
-                                            # STEP 4: Empty sheet
-                                            else:
-                                                print(f"    ℹ️ [Retry] Empty or unrecognized sheet format")
-                                            
-                                            # Build final data with archives
-                                            if existing_archives:
-                                                spacer = [[''] * len(header)]
-                                                full_data = full_data + spacer + existing_archives
-                                                print(f"    ✅ [Retry] Final: {len(full_data)} rows (with archives)")
-                                            else:
-                                                print(f"    ✅ [Retry] Final: {len(full_data)} rows (no archives)")
-
-                                            
-                                            # Clear and write (with archives preserved)
-                                            await asyncio.sleep(0.5)
-                                            await asyncio.to_thread(member_ws.clear)
-                                            await asyncio.sleep(0.3)
-                                            await asyncio.to_thread(member_ws.update, 'A1', full_data)
-                                            
-                                            print(f"    ✅ [Retry {retry_round}] {club_name}: Synced {len(rows_data)} members + Rank #{rank}")
-                                            retry_success += 1
-                                            members_synced += 1
-                                        else:
-                                            print(f"    ⚠️ [Retry {retry_round}] {club_name}: No member data to sync")
-                                            still_failed.append(failed_item)
-                                    else:
-                                        # No members sheet, just rank update
-                                        print(f"    ✅ [Retry {retry_round}] {club_name}: Rank #{rank} (no member sheet)")
-                                        retry_success += 1
-                                except Exception as member_err:
-                                    print(f"    ⚠️ [Retry {retry_round}] {club_name}: Member sync failed - {member_err}")
-                                    still_failed.append(failed_item)
-                            else:
-                                print(f"    ⏭️ [Retry {retry_round}] {club_name}: No members in API response")
-                                still_failed.append(failed_item)
-                        else:
-                            # RANK-ONLY RETRY - just need rank data
-                            api_data = await fetch_club_data_full(club_id)
-                            
-                            if not api_data:
-                                print(f"    ⚠️ [Retry {retry_round}] {club_name}: Still no data")
-                                still_failed.append(failed_item)
-                                continue
-                            
-                            circle_data = api_data.get('circle', {})
-                            rank = circle_data.get('monthly_rank')
-                            
-                            if rank is not None and rank > 0:
-                                # Success! Update rank only
-                                await asyncio.to_thread(
-                                    config_ws.update_cell, idx, 11, rank
-                                )
-                                
-                                if club_name in client.config_cache:
-                                    client.config_cache[club_name]['Rank'] = rank
-                                
-                                retry_success += 1
-                                rank_updated += 1
-                                print(f"    ✅ [Retry {retry_round}] {club_name}: Rank #{rank}")
-                            else:
-                                print(f"    ⏭️ [Retry {retry_round}] {club_name}: Still no rank data")
-                                still_failed.append(failed_item)
-                            
-                    except Exception as e:
-                        print(f"    ❌ [Retry {retry_round}] {club_name}: Error - {e}")
-                        still_failed.append(failed_item)
+                rank_updated += retry_run['rank_updated']
+                members_synced += retry_run['members_synced']
+                transfer_warnings_log.extend(retry_run['transfer_warnings_log'])
                 
+                still_failed = _unique_failed_clubs(retry_run['failed_clubs'])
+                retry_success = len(failed_clubs) - len(still_failed)
                 failed_clubs = still_failed
                 print(f"  📊 Retry round {retry_round}: {retry_success} succeeded, {len(failed_clubs)} still failed")
                 
@@ -11219,10 +10329,35 @@ async def update_club_data_task():
                     club_name = failed_item['config'].get('Club_Name', 'Unknown')
                     print(f"     - {club_name}")
         
+        # Send transfer warnings to Discord (main pass + retries)
+        if transfer_warnings_log:
+            try:
+                debug_channel = client.get_channel(DEBUG_LOG_CHANNEL_ID)
+                if debug_channel:
+                    # Build transfer warning message
+                    warning_lines = [f"⚠️ **Transfer Warnings Detected** ({len(transfer_warnings_log)} members):\n"]
+                    for warn in transfer_warnings_log[:20]:  # Limit to 20 to avoid message too long
+                        warning_lines.append(f"• **{warn['club']}**: {warn['trainer_name']} (ID: `{warn['trainer_id']}`)")
+                    
+                    if len(transfer_warnings_log) > 20:
+                        warning_lines.append(f"\n... and {len(transfer_warnings_log) - 20} more")
+                    
+                    warning_msg = "\n".join(warning_lines)
+                    await debug_channel.send(warning_msg)
+                    print(f"  📤 Sent {len(transfer_warnings_log)} transfer warnings to Discord")
+            except Exception as e:
+                print(f"  ⚠️ Failed to send transfer warnings to Discord: {e}")
+        
         # Log completion
         if members_synced > 0:
             print(f"\n  ✅ Data sync completed successfully")
         
+        # Persist the viewer -> club index built from this run's payloads
+        # (file writes in a worker thread, off the event loop)
+        await asyncio.to_thread(viewer_index.save)
+        await asyncio.to_thread(global_leaderboard.save)
+        await asyncio.to_thread(sync_payload_store.save)
+        
     except Exception as e:
         print(f"[{datetime.datetime.now()}] Error in sync task: {e}")
         import traceback
@@ -11279,43 +10414,42 @@ async def fetch_schedule_task():
     try:
         headers = {"If-None-Match": schedule_last_etag} if schedule_last_etag else {}
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(SCHEDULE_URL, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as resp:
-                if resp.status == 304:
-                    # Not modified
-                    return
+        async with http_client.get(SCHEDULE_URL, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as resp:
+            if resp.status == 304:
+                # Not modified
+                return
                 
-                if resp.status == 200:
-                    # GitHub raw returns text/plain, so use text() + json.loads()
-                    text_data = await resp.text()
-                    new_data = json.loads(text_data)
-                    new_etag = resp.headers.get("ETag")
+            if resp.status == 200:
+                # GitHub raw returns text/plain, so use text() + json.loads()
+                text_data = await resp.text()
+                new_data = json.loads(text_data)
+                new_etag = resp.headers.get("ETag")
                     
-                    # CONTENT COMPARISON - only notify if events actually changed
-                    old_events = {e.get('event_name') for e in schedule_cache}
-                    new_events = {e.get('event_name') for e in new_data}
-                    content_changed = old_events != new_events
+                # CONTENT COMPARISON - only notify if events actually changed
+                old_events = {e.get('event_name') for e in schedule_cache}
+                new_events = {e.get('event_name') for e in new_data}
+                content_changed = old_events != new_events
                     
-                    # Update cache
-                    had_data = len(schedule_cache) > 0
-                    schedule_cache = new_data
-                    schedule_last_etag = new_etag
+                # Update cache
+                had_data = len(schedule_cache) > 0
+                schedule_cache = new_data
+                schedule_last_etag = new_etag
                     
-                    # Save to disk
-                    with open(SCHEDULE_CACHE_FILE, 'w', encoding='utf-8') as f:
-                        json.dump({
-                            "etag": new_etag,
-                            "data": new_data,
-                            "updated_at": datetime.datetime.now().isoformat()
-                        }, f, indent=2)
+                # Save to disk
+                with open(SCHEDULE_CACHE_FILE, 'w', encoding='utf-8') as f:
+                    json.dump({
+                        "etag": new_etag,
+                        "data": new_data,
+                        "updated_at": datetime.datetime.now().isoformat()
+                    }, f, indent=2)
                     
-                    print(f"✅ Schedule fetched: {len(new_data)} events, changed={content_changed}")
+                print(f"✅ Schedule fetched: {len(new_data)} events, changed={content_changed}")
                     
-                    # Only notify if had previous data AND content actually changed
-                    if had_data and content_changed:
-                        await send_schedule_notification()
-                else:
-                    print(f"⚠️ Schedule fetch: HTTP {resp.status}")
+                # Only notify if had previous data AND content actually changed
+                if had_data and content_changed:
+                    await send_schedule_notification()
+            else:
+                print(f"⚠️ Schedule fetch: HTTP {resp.status}")
     except Exception as e:
         print(f"⚠️ Schedule fetch error: {e}")
 
@@ -11423,7 +10557,7 @@ async def on_ready():
             
             # Fetch uma list and load active tournaments
             await fetch_uma_list()
-            load_active_tournaments()
+            await load_active_tournaments()
             
             # Register ResultSubmitView for all active matches
             for guild in client.guilds:
@@ -11528,6 +10662,9 @@ if __name__ == "__main__":
         sys.exit(1)
     
     try:
+        # Open the state database (and import legacy JSON once) before any handler runs
+        state_store.open()
+        
         print("Starting bot...")
         client.run(BOT_TOKEN)
     except discord.LoginFailure:
@@ -138,7 +138,7 @@ async def handle_ban_message(message: discord.Message, match: Match, tournament:
     
     # Add bans
     match.add_bans(message.author.id, uma_names)
-    tournament.save()
+    await tournament.save()
     
     # Confirm and tag next player
     next_player = match.get_current_ban_player()
@@ -158,9 +158,9 @@ async def handle_ban_message(message: discord.Message, match: Match, tournament:
         # Sync bans to Google Sheets
         try:
             from tournament_sheets import get_tournament_sheets
-            sheets = get_tournament_sheets()
+            sheets = await asyncio.to_thread(get_tournament_sheets)
             players = [{'id': pid, 'name': tournament.players[pid].display_name} for pid in match.players]
-            sheets.sync_match_data(tournament.name, match.match_id, match.round_num, players, match.bans, {})
+            await asyncio.to_thread(sheets.sync_match_data, tournament.name, match.match_id, match.round_num, players, match.bans, {})
         except Exception as e:
             print(f"Sheets ban sync error: {e}")
         
@@ -214,7 +214,7 @@ async def handle_pick_message(message: discord.Message, match: Match, tournament
     
     # Add picks
     match.add_picks(message.author.id, uma_names)
-    tournament.save()
+    await tournament.save()
     
     # Confirm and tag next player
     next_player = match.get_current_pick_player()
@@ -234,9 +234,9 @@ async def handle_pick_message(message: discord.Message, match: Match, tournament
         # Sync picks to Google Sheets
         try:
             from tournament_sheets import get_tournament_sheets
-            sheets = get_tournament_sheets()
+            sheets = await asyncio.to_thread(get_tournament_sheets)
             players = [{'id': pid, 'name': tournament.players[pid].display_name} for pid in match.players]
-            sheets.sync_match_data(tournament.name, match.match_id, match.round_num, players, match.bans, match.picks)
+            await asyncio.to_thread(sheets.sync_match_data, tournament.name, match.match_id, match.round_num, players, match.bans, match.picks)
         except Exception as e:
             print(f"Sheets pick sync error: {e}")
         
@@ -334,7 +334,7 @@ async def create_match_posts(guild: discord.Guild, tournament: Tournament, match
         # Set match status to banning
         match.status = "banning"
         
-        tournament.save()
+        await tournament.save()
 
 
 # ============================================================================
@@ -376,7 +376,7 @@ class TournamentActionsSelect(Select):
         
         tournament.status = "in_progress"
         matches = tournament.generate_bracket()
-        tournament.save()
+        await tournament.save()
         
         await interaction.response.send_message(
             f"✅ Registration closed! Created {len(matches)} matches for Round {tournament.current_round}",
@@ -439,21 +439,24 @@ class TournamentActionsSelect(Select):
                 print(f"Error deleting bracket thread: {e}")
         
         tournament.status = "completed"
-        tournament.save()
+        await tournament.save()
         
         # Archive to Google Sheets
         archived = False
         try:
             from tournament_sheets import get_tournament_sheets
-            sheets = get_tournament_sheets()
-            archived = sheets.archive_tournament(tournament.name)
+            sheets = await asyncio.to_thread(get_tournament_sheets)
+            archived = await asyncio.to_thread(sheets.archive_tournament, tournament.name)
         except Exception as e:
             print(f"Sheets archive error: {e}")
         
-        # Delete local JSON file after archiving
+        # Delete local record (and legacy JSON file) after archiving
         try:
             import os
             from tournament_manager import TOURNAMENTS_DIR
+            from models.state_store import state_store
+            if await state_store.aio.delete_tournament(tournament.id):
+                print(f"🗑️ Deleted tournament record: {tournament.id}")
             json_file = os.path.join(TOURNAMENTS_DIR, f"{tournament.id}.json")
             if os.path.exists(json_file):
                 os.remove(json_file)
@@ -619,7 +622,7 @@ class CreateTournamentModal(Modal, title="🏆 Create Tournament"):
             tournament = existing
         else:
             # No setup exists - create new (won't have channels)
-            tournament = create_tournament(
+            tournament = await create_tournament(
                 guild_id=interaction.guild_id,
                 name=self.name.value,
                 created_by=interaction.user.id
@@ -628,7 +631,7 @@ class CreateTournamentModal(Modal, title="🏆 Create Tournament"):
             tournament.prize_pool = self.prize_pool.value if self.prize_pool.value else None
             tournament.status = "registration"
         
-        tournament.save()
+        await tournament.save()
         
         # Send registration message to public channel
         if tournament.public_channel_id:
@@ -644,7 +647,7 @@ class CreateTournamentModal(Modal, title="🏆 Create Tournament"):
                 
                 msg = await channel.send(content=f"{role_mention}🏆 **NEW TOURNAMENT!**", embed=embed, view=view)
                 tournament.registration_message_id = msg.id
-                tournament.save()
+                await tournament.save()
         
         await interaction.response.send_message(
             f"✅ Created **{tournament.name}** and opened registration!\n"
@@ -680,7 +683,7 @@ class JoinTournamentButton(Button):
             if interaction.user.id in tournament.players:
                 # Already joined - offer to leave
                 tournament.remove_player(interaction.user.id)
-                tournament.save()
+                await tournament.save()
                 await interaction.response.send_message("👋 You left the tournament!", ephemeral=True)
                 await self.update_registration_message(interaction, tournament)
                 return
@@ -691,7 +694,7 @@ class JoinTournamentButton(Button):
             
             # Join tournament
             tournament.add_player(interaction.user.id, interaction.user.display_name)
-            tournament.save()
+            await tournament.save()
             
             await interaction.response.send_message(
                 f"✅ You joined **{tournament.name}**!\n"
@@ -702,8 +705,8 @@ class JoinTournamentButton(Button):
             # Sync to Google Sheets (after response)
             try:
                 from tournament_sheets import get_tournament_sheets
-                sheets = get_tournament_sheets()
-                sheets.sync_registrant(tournament.name, interaction.user.display_name, interaction.user.id)
+                sheets = await asyncio.to_thread(get_tournament_sheets)
+                await asyncio.to_thread(sheets.sync_registrant, tournament.name, interaction.user.display_name, interaction.user.id)
             except Exception as e:
                 print(f"Sheets sync error: {e}")
             
@@ -793,14 +796,14 @@ class SubmitResultModal(Modal, title="Submit Game Result"):
             
             # Add result
             winner = self.match.add_game_result(placements)
-            self.tournament.save()
+            await self.tournament.save()
             
             # Sync result to Google Sheets
             game_num = len(self.match.game_results)
             try:
                 from tournament_sheets import get_tournament_sheets
-                sheets = get_tournament_sheets()
-                sheets.sync_game_result(self.tournament.name, self.match.match_id, game_num, placements)
+                sheets = await asyncio.to_thread(get_tournament_sheets)
+                await asyncio.to_thread(sheets.sync_game_result, self.tournament.name, self.match.match_id, game_num, placements)
             except Exception as e:
                 print(f"Sheets result sync error: {e}")
             
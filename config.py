@@ -57,6 +57,11 @@ CONFIG_CACHE_FILE = os.path.join(CACHE_DIR, "config_cache.json")
 MEMBER_CACHE_FILE = os.path.join(CACHE_DIR, "member_cache.json")
 DATA_CACHE_DIR = os.path.join(CACHE_DIR, "data")
 SMART_CACHE_DIR = os.path.join(CACHE_DIR, "smart_cache")
+VIEWER_INDEX_FILE = os.path.join(CACHE_DIR, "viewer_index.json")
+HISTORY_STORE_DIR = os.path.join(CACHE_DIR, "history")
+GLOBAL_LEADERBOARD_STORE_FILE = os.path.join(CACHE_DIR, "global_leaderboard.json")
+SHEET_GRID_STORE_DIR = os.path.join(CACHE_DIR, "sheet_grids")
+SYNC_PAYLOAD_STORE_FILE = os.path.join(CACHE_DIR, "sync_payloads.json")
 
 # Create cache directories
 os.makedirs(CACHE_DIR, exist_ok=True)
@@ -85,6 +90,10 @@ EXAMPLE_PROFILE_IMAGE = os.path.join(SCRIPT_DIR, "assets", "example_profile.png"
 SCHEDULE_CACHE_FILE = os.path.join(SCRIPT_DIR, "schedule_cache.json")
 SCHEDULE_CONFIG_FILE = os.path.join(SCRIPT_DIR, "schedule_config.json")
 
+# Bot state database (profile links, channels, admins, invites, tournaments)
+# The JSON files above are imported into it once and kept as a fallback copy
+STATE_DB_FILE = os.getenv('STATE_DB_FILE', os.path.join(SCRIPT_DIR, "state.db"))
+
 # Error logging
 LOGS_DIR = os.path.join(SCRIPT_DIR, "logs")
 os.makedirs(LOGS_DIR, exist_ok=True)
@@ -104,6 +113,13 @@ def parse_int_list(env_var: str, default: list = None) -> list:
         return default or []
 
 
+def longest_sync_gap_seconds(times) -> int:
+    """Longest time between two consecutive daily runs of a schedule"""
+    minutes = sorted(hour * 60 + minute for hour, minute in times)
+    gaps = [b - a for a, b in zip(minutes, minutes[1:])] + [minutes[0] + 24 * 60 - minutes[-1]]
+    return max(gaps) * 60
+
+
 def load_schedule_config() -> dict:
     """Load saved schedule channel config"""
     if os.path.exists(SCHEDULE_CONFIG_FILE):
@@ -206,6 +222,107 @@ PROMO_COOLDOWN = 3600  # 3600 seconds (1 hour) cooldown per user
 
 SLOW_COMMAND_THRESHOLD = 2.0  # Commands slower than 2 seconds will be logged
 
+# ============================================================================
+# CLUB DATA SYNC PIPELINE
+# ============================================================================
+
+# Club data sync schedule, (hour, minute) UTC:
+# 7:00 AM, 10:30 PM and 12:00 AM Vietnam (GMT+7)
+CLUB_SYNC_TIMES_UTC = [(0, 0), (15, 30), (17, 0)]
+
+# Worker counts per stage (fetch = uma.moe API, plan = sheet reads, write = sheet writes)
+SYNC_FETCH_CONCURRENCY = int(os.getenv('SYNC_FETCH_CONCURRENCY', '8'))
+SYNC_PLAN_CONCURRENCY = int(os.getenv('SYNC_PLAN_CONCURRENCY', '4'))
+SYNC_WRITE_CONCURRENCY = int(os.getenv('SYNC_WRITE_CONCURRENCY', '2'))
+
+# uma.moe rate limit for the fetch stage (Sheets requests go through the global Sheets limiter)
+SYNC_API_RATE_PER_SECOND = float(os.getenv('SYNC_API_RATE_PER_SECOND', '10'))
+
+# Record each club's planner inputs here (for benchmark_sync_planner.py); empty = off
+SYNC_PLAN_RECORD_DIR = os.getenv('SYNC_PLAN_RECORD_DIR', '')
+
+# Sheets write-behind queue: wait this long for more writes before sending a batch
+SHEETS_WRITE_FLUSH_DELAY = float(os.getenv('SHEETS_WRITE_FLUSH_DELAY', '1.0'))
+# Split values_batch_update requests above this many cells (keeps payloads small)
+SHEETS_WRITE_MAX_CELLS_PER_REQUEST = int(os.getenv('SHEETS_WRITE_MAX_CELLS_PER_REQUEST', '100000'))
+# Sheets per values_batch_get request when bulk-loading member names (update_caches)
+SHEETS_BATCH_GET_RANGES = int(os.getenv('SHEETS_BATCH_GET_RANGES', '100'))
+
+# ============================================================================
+# GOOGLE SHEETS RATE LIMIT
+# ============================================================================
+
+# One token bucket for all Sheets requests. Quota is 60 requests/minute per user:
+# rate + burst stays within it over any 60s window.
+SHEETS_REQUESTS_PER_MINUTE = float(os.getenv('SHEETS_REQUESTS_PER_MINUTE', '55'))
+SHEETS_BURST = int(os.getenv('SHEETS_BURST', '5'))
+# Tokens background tasks leave free so commands don't queue behind the sync
+SHEETS_INTERACTIVE_RESERVE = int(os.getenv('SHEETS_INTERACTIVE_RESERVE', '2'))
+# On 429: pause for Retry-After (or this backoff, doubling) and retry
+SHEETS_429_MAX_RETRIES = int(os.getenv('SHEETS_429_MAX_RETRIES', '5'))
+SHEETS_429_BACKOFF_SECONDS = float(os.getenv('SHEETS_429_BACKOFF_SECONDS', '10'))
+# Worker threads for background Sheets calls; they block on the bucket there,
+# not in the default executor commands and to_thread helpers share
+SHEETS_BACKGROUND_THREADS = int(os.getenv('SHEETS_BACKGROUND_THREADS', '4'))
+
+# ============================================================================
+# CONFIG REGISTRY
+# ============================================================================
+
+# Per-interaction config (channels, lockdown, admins, invites) is served from memory;
+# its file mtime / state store version is re-checked at most this often
+CONFIG_REGISTRY_CHECK_INTERVAL = float(os.getenv('CONFIG_REGISTRY_CHECK_INTERVAL', '2.0'))
+
+# ============================================================================
+# MEMBER SEARCH
+# ============================================================================
+
+# Minimum rapidfuzz score (0-100) for typo-tolerant member name matches
+MEMBER_SEARCH_FUZZY_CUTOFF = float(os.getenv('MEMBER_SEARCH_FUZZY_CUTOFF', '80'))
+
+# ============================================================================
+# COMMAND DATA CACHE
+# ============================================================================
+
+# Cached club data older than this is served as-is and refreshed in the background
+DATA_CACHE_SOFT_TTL_SECONDS = int(os.getenv('DATA_CACHE_SOFT_TTL_SECONDS', '300'))
+
+# SmartCache on-disk format: 'arrow' (memory-mapped, keeps dtypes), 'parquet'
+# (smallest) or 'json' (legacy). Needs pyarrow; falls back to json without it.
+SMART_CACHE_FORMAT = os.getenv('SMART_CACHE_FORMAT', 'arrow')
+# Memory budget for SmartCache DataFrames; least recently used entries are
+# dropped from memory (kept on disk) above it. 0 = unbounded.
+SMART_CACHE_MAX_MEMORY_MB = float(os.getenv('SMART_CACHE_MAX_MEMORY_MB', '256'))
+
+# Viewer ID -> club index (rebuilt per club by each sync). A club's entries
+# stay fresh for the longest gap between syncs plus a margin for the sync run
+VIEWER_INDEX_MAX_AGE_SECONDS = int(os.getenv(
+    'VIEWER_INDEX_MAX_AGE_SECONDS', str(longest_sync_gap_seconds(CLUB_SYNC_TIMES_UTC) + 2 * 3600)
+))
+
+# ============================================================================
+# SHARED HTTP CLIENT
+# ============================================================================
+
+# Connection pool sizes (direct pool + one pool per proxy)
+HTTP_POOL_LIMIT = int(os.getenv('HTTP_POOL_LIMIT', '100'))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', '20'))
+HTTP_PROXY_POOL_LIMIT = int(os.getenv('HTTP_PROXY_POOL_LIMIT', '10'))
+HTTP_DNS_CACHE_TTL = int(os.getenv('HTTP_DNS_CACHE_TTL', '300'))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', '30'))
+
+# ============================================================================
+# PROXY HEALTH SCORING
+# ============================================================================
+
+# Eject a proxy after this many consecutive failures (429 ejects immediately)
+PROXY_EJECT_AFTER_FAILURES = int(os.getenv('PROXY_EJECT_AFTER_FAILURES', '3'))
+# Ejection time doubles on every consecutive ejection, up to the max
+PROXY_EJECT_BASE_SECONDS = float(os.getenv('PROXY_EJECT_BASE_SECONDS', '30'))
+PROXY_EJECT_MAX_SECONDS = float(os.getenv('PROXY_EJECT_MAX_SECONDS', '900'))
+# Number of recent requests used for the error rate
+PROXY_HEALTH_WINDOW = int(os.getenv('PROXY_HEALTH_WINDOW', '50'))
+
 # ============================================================================
 # SCHEDULE SYSTEM
 # ============================================================================
@@ -0,0 +1,5 @@
+"""pytest configuration for the repository root"""
+
+# Script-style checks run directly (python test_bot_integration.py); it calls
+# sys.exit() at import, which pytest can't collect
+collect_ignore = ["test_bot_integration.py"]
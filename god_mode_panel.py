@@ -16,6 +16,9 @@ import pytz
 import importlib.util
 from dotenv import load_dotenv
 
+from utils.config_registry import config_registry
+from models.state_store import state_store
+
 # Helper to import bot-hosting.py (hyphen in name requires special import)
 _bot_hosting_module = None
 
@@ -48,16 +51,15 @@ GOD_MODE_USER_IDS = [GOD_MODE_USER_ID] if GOD_MODE_USER_ID else []
 # Lockdown state file
 LOCKDOWN_FILE_PATH = os.path.join(os.path.dirname(__file__), "lockdown_state.json")
 
+# Checked on every interaction, so served from memory (reloaded when the file changes)
+config_registry.register(
+    'lockdown', LOCKDOWN_FILE_PATH,
+    lambda data: data if data else {'active': False, 'reason': None}
+)
+
 def is_lockdown_active() -> bool:
     """Check if bot is in lockdown mode"""
-    try:
-        if os.path.exists(LOCKDOWN_FILE_PATH):
-            with open(LOCKDOWN_FILE_PATH, 'r') as f:
-                data = json.load(f)
-                return data.get('active', False)
-    except:
-        pass
-    return False
+    return bool(config_registry.get('lockdown').get('active', False))
 
 def set_lockdown_state(active: bool, reason: str = None) -> dict:
     """Set lockdown state"""
@@ -69,17 +71,12 @@ def set_lockdown_state(active: bool, reason: str = None) -> dict:
     }
     with open(LOCKDOWN_FILE_PATH, 'w') as f:
         json.dump(state, f, indent=2)
+    config_registry.invalidate('lockdown')
     return state
 
 def get_lockdown_state() -> dict:
     """Get current lockdown state"""
-    try:
-        if os.path.exists(LOCKDOWN_FILE_PATH):
-            with open(LOCKDOWN_FILE_PATH, 'r') as f:
-                return json.load(f)
-    except:
-        pass
-    return {'active': False, 'reason': None}
+    return dict(config_registry.get('lockdown'))
 
 
 class GlobalAnnouncementModal(Modal):
@@ -127,15 +124,11 @@ class GlobalAnnouncementModal(Modal):
             )
             embed.set_footer(text="Fan-Count Bot Announcement")
             
-            # Load allowed channels from config file
-            allowed_channels_file = os.path.join(os.path.dirname(__file__), "allowed_channels_config.json")
+            # Load allowed channels from the state store
             allowed_channels = []
             
             try:
-                if os.path.exists(allowed_channels_file):
-                    with open(allowed_channels_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    allowed_channels = data.get('channels', [])
+                allowed_channels = await state_store.aio.list_allowed_channels()
             except Exception as e:
                 print(f"⚠️ Error loading channels config: {e}")
             
@@ -270,7 +263,9 @@ class GodModeControlPanel(View):
                 name="Smart Cache (In-Memory)",
                 value=(
                     f"**Entries:** {stats['total_entries']}\n"
-                    f"**Size:** {stats['total_size_mb']} MB"
+                    f"**Size:** {stats['total_size_mb']} / {stats['max_size_mb']} MB\n"
+                    f"**Disk format:** {stats['format']}\n"
+                    f"**Hit rate:** {stats['hit_rate']}% ({stats['evictions']} evictions)"
                 ),
                 inline=False
             )
@@ -284,6 +279,178 @@ class GodModeControlPanel(View):
                 inline=False
             )
             
+            http_stats = bot_module.http_client.get_stats()
+            pool_lines = [
+                f"`{name}` {pool['in_use']}/{pool['limit']} in use, {pool['idle']} idle, "
+                f"{pool['requests']} req, {pool['errors']} err"
+                for name, pool in list(http_stats['pools'].items())[:10]
+            ]
+            embed.add_field(
+                name="HTTP Connection Pools",
+                value=(
+                    f"**Open Pools:** {http_stats['open_pools']} "
+                    f"({http_stats['configured_proxies']} proxies configured)\n"
+                    f"**Requests:** {http_stats['total_requests']} "
+                    f"({http_stats['total_errors']} errors)\n"
+                    + ("\n".join(pool_lines) if pool_lines else "No requests yet")
+                ),
+                inline=False
+            )
+            
+            index_stats = bot_module.viewer_index.get_stats()
+            embed.add_field(
+                name="Viewer Index",
+                value=(
+                    f"**Viewers:** {index_stats['viewers']} in {index_stats['clubs']} clubs\n"
+                    f"**Oldest Club:** {index_stats['oldest_club_age_hours']}h "
+                    f"(stale after {index_stats['max_age_hours']}h)"
+                ),
+                inline=False
+            )
+            
+            history_stats = bot_module.history_store.get_stats()
+            embed.add_field(
+                name="History Store",
+                value=(
+                    f"**Partitions:** {history_stats['partitions']} in {history_stats['clubs']} clubs\n"
+                    f"**Size:** {history_stats['size_mb']} MB"
+                    if history_stats['enabled'] else "Disabled (pyarrow not installed)"
+                ),
+                inline=False
+            )
+            
+            flight_stats = bot_module.single_flight.get_stats()
+            flight_lines = [
+                f"`{name}` {s['calls']} calls → {s['executions']} fetches ({s['coalesced']} coalesced)"
+                for name, s in flight_stats['resources'].items()
+            ]
+            embed.add_field(
+                name="Request Coalescing",
+                value=(
+                    f"**In Flight:** {flight_stats['in_flight']}\n"
+                    + ("\n".join(flight_lines) if flight_lines else "No requests yet")
+                ),
+                inline=False
+            )
+            
+            registry_stats = config_registry.get_stats()
+            embed.add_field(
+                name="Config Registry",
+                value="\n".join(
+                    f"`{name}` {entry['hits']} lookups, {entry['loads']} loads"
+                    for name, entry in registry_stats.items()
+                ) or "No entries registered",
+                inline=False
+            )
+            
+            index_stats = bot_module.member_index.get_stats()
+            embed.add_field(
+                name="Member Index",
+                value=(
+                    f"**Members:** {index_stats['members']} in {index_stats['clubs']} clubs "
+                    f"({index_stats['trigrams']} trigrams)\n"
+                    f"**Searches:** {index_stats['searches']} ({index_stats['builds']} builds)"
+                ),
+                inline=False
+            )
+            
+            render_stats = bot_module.render_cache.get_stats()
+            embed.add_field(
+                name="Render Cache",
+                value=(
+                    f"**Embeds:** {render_stats['entries']}\n"
+                    f"**Hit rate:** {render_stats['hit_rate']}% "
+                    f"({render_stats['hits']} hits, {render_stats['invalidations']} invalidations)"
+                ),
+                inline=False
+            )
+            
+            snapshot_stats = bot_module.member_stats.get_stats()
+            embed.add_field(
+                name="Member Stats Snapshots",
+                value=(
+                    f"**Members:** {snapshot_stats['members']} in {snapshot_stats['clubs']} clubs\n"
+                    f"**Lookups:** {snapshot_stats['lookups']} ({snapshot_stats['builds']} club builds)"
+                ),
+                inline=False
+            )
+            
+            leaderboard_stats = bot_module.global_leaderboard.get_stats()
+            embed.add_field(
+                name="Global Leaderboard",
+                value=(
+                    f"**Members:** {leaderboard_stats['members']} in {leaderboard_stats['clubs']} clubs\n"
+                    f"**Recomputed:** {leaderboard_stats['updates']} "
+                    f"(unchanged: {leaderboard_stats['unchanged']})"
+                ),
+                inline=False
+            )
+            
+            store_stats = await state_store.aio.get_stats()
+            embed.add_field(
+                name="State Store (SQLite)",
+                value=(
+                    f"**Size:** {store_stats['size_kb']} KB\n"
+                    + "\n".join(f"`{table}` {count} rows" for table, count in store_stats['tables'].items())
+                ),
+                inline=False
+            )
+            
+            limiter_stats = bot_module.sheets_limiter.get_stats()
+            priority_lines = [
+                f"`{name}` {p['requests']} req, avg wait {p['avg_wait_seconds']}s, max {p['max_wait_seconds']}s"
+                for name, p in limiter_stats['priorities'].items()
+            ]
+            embed.add_field(
+                name="Sheets Rate Limiter",
+                value=(
+                    f"**Rate:** {limiter_stats['requests_per_minute']}/min "
+                    f"({limiter_stats['available_tokens']}/{limiter_stats['capacity']} tokens)\n"
+                    f"**429s:** {limiter_stats['rate_limited']} "
+                    f"(paused {limiter_stats['paused_seconds']}s total"
+                    + (f", {limiter_stats['paused_for_seconds']}s left" if limiter_stats['paused_for_seconds'] else "")
+                    + ")\n"
+                    + "\n".join(priority_lines)
+                ),
+                inline=False
+            )
+            
+            handle_stats = bot_module.gs_manager.get_worksheet_cache_stats()
+            embed.add_field(
+                name="Worksheet Handles",
+                value=(
+                    f"**Cached:** {handle_stats['worksheets']} worksheets\n"
+                    f"**Lookups served from cache:** {handle_stats['hits']} "
+                    f"({handle_stats['refreshes']} metadata refreshes)"
+                ),
+                inline=False
+            )
+            
+            grid_stats = bot_module.sheet_grid_store.get_stats()
+            payload_stats = bot_module.sync_payload_store.get_stats()
+            embed.add_field(
+                name="Sheet Diff Writes",
+                value=(
+                    f"**Known grids:** {grid_stats['sheets']} sheets\n"
+                    f"**Writes:** {grid_stats['diffed']} diff, {grid_stats['full_writes']} full, "
+                    f"{grid_stats['unchanged']} unchanged ({grid_stats['cells_written']:,} cells)\n"
+                    f"**Unchanged API data:** {payload_stats['skipped']} club syncs skipped "
+                    f"({payload_stats['changed']} changed)"
+                ),
+                inline=False
+            )
+            
+            queue_stats = bot_module.sheets_write_queue.get_stats()
+            embed.add_field(
+                name="Sheets Write Queue",
+                value=(
+                    f"**Pending:** {queue_stats['pending_writes']} writes\n"
+                    f"**Sent:** {queue_stats['writes_enqueued']} writes in {queue_stats['requests_sent']} requests "
+                    f"({queue_stats['requests_failed']} failed)"
+                ),
+                inline=False
+            )
+            
             await interaction.followup.send(embed=embed, ephemeral=True)
         except Exception as e:
             await interaction.followup.send(f"❌ Error: {e}", ephemeral=True)
@@ -310,6 +477,7 @@ class GodModeControlPanel(View):
             total_size_mb = before_stats['total_size_mb']
             
             smart_cache.invalidate()
+            bot_module.render_cache.invalidate_club()
             
             await interaction.followup.send(
                 f"✅ **Cache cleared!**\n\n"
@@ -321,6 +489,58 @@ class GodModeControlPanel(View):
         except Exception as e:
             await interaction.followup.send(f"❌ Error: {e}", ephemeral=True)
     
+    @discord.ui.button(
+        label="🌐 Proxy Stats",
+        style=discord.ButtonStyle.secondary,
+        custom_id="gm_proxy_stats",
+        row=0
+    )
+    async def proxy_stats(self, interaction: discord.Interaction, button: Button):
+        """Show per-proxy health stats"""
+        if not self.is_god_mode(interaction):
+            await interaction.response.send_message("❌ Unauthorized", ephemeral=True)
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        
+        try:
+            proxy_manager = _get_bot_module().proxy_manager
+            summary = proxy_manager.get_stats()
+            
+            embed = discord.Embed(
+                title="🌐 Proxy Health",
+                description=(
+                    f"**Proxies:** {summary['total']} "
+                    f"({summary['active']} active, {summary['ejected']} ejected)\n"
+                    f"**Requests:** {summary['requests']} | "
+                    f"**429:** {summary['rate_limited']} | **5xx:** {summary['server_errors']}"
+                ),
+                color=discord.Color.blue()
+            )
+            
+            status_icons = {'active': '🟢', 'probation': '🟡', 'ejected': '🔴'}
+            lines = []
+            for s in proxy_manager.get_proxy_stats()[:20]:
+                latency = f"{s['latency_ms']}ms" if s['latency_ms'] is not None else "n/a"
+                line = (
+                    f"{status_icons[s['status']]} `{s['proxy']}` score {s['score']} | "
+                    f"{latency} | err {s['error_rate'] * 100:.0f}% | "
+                    f"{s['requests']} req, {s['rate_limited']}×429, {s['server_errors']}×5xx"
+                )
+                if s['status'] == 'ejected':
+                    line += f" | back in {s['ejected_for_seconds']}s"
+                lines.append(line)
+            
+            embed.add_field(
+                name="Per Proxy (best first)",
+                value="\n".join(lines)[:1024] if lines else "No proxies loaded",
+                inline=False
+            )
+            
+            await interaction.followup.send(embed=embed, ephemeral=True)
+        except Exception as e:
+            await interaction.followup.send(f"❌ Error: {e}", ephemeral=True)
+    
     # Row 2: Bot Control
     @discord.ui.button(
         label="🔄 Restart Bot",
@@ -493,18 +713,12 @@ class GodModeControlPanel(View):
         
         try:
             bot_module = _get_bot_module()
-            ALLOWED_CHANNELS_CONFIG_FILE = bot_module.ALLOWED_CHANNELS_CONFIG_FILE
             config = bot_module.config
             
-            if not os.path.exists(ALLOWED_CHANNELS_CONFIG_FILE):
-                await interaction.followup.send("ℹ️ No channel config file exists.", ephemeral=True)
-                return
-            
             # Load current data for backup and count
-            with open(ALLOWED_CHANNELS_CONFIG_FILE, 'r', encoding='utf-8') as f:
-                current_data = json.load(f)
+            current_data = {"channels": await state_store.aio.list_allowed_channels()}
             
-            channel_count = len(current_data.get('channels', []))
+            channel_count = len(current_data['channels'])
             
             if channel_count == 0:
                 await interaction.followup.send("ℹ️ No channels to clear.", ephemeral=True)
@@ -521,7 +735,8 @@ class GodModeControlPanel(View):
                 json.dump(current_data, f, indent=2, ensure_ascii=False)
             
             # Now clear the channels
-            os.remove(ALLOWED_CHANNELS_CONFIG_FILE)
+            await state_store.aio.replace_allowed_channels([])
+            await config_registry.reload('allowed_channels')
             config.ALLOWED_CHANNEL_IDS = []
             
             await interaction.followup.send(
@@ -636,7 +851,7 @@ def create_control_panel_embed():
     
     embed.add_field(
         name="📊 Row 1: Cache Management",
-        value="• **Cache Stats** - View cache info\n• **Clear Cache** - Clear all cached data",
+        value="• **Cache Stats** - View cache info\n• **Clear Cache** - Clear all cached data\n• **Proxy Stats** - Per-proxy health (latency, errors, ejections)",
         inline=False
     )
     
@@ -141,7 +141,7 @@ class HybridDatabaseManager:
                 def fetch_from_sheets():
                     # Your existing Google Sheets fetch logic here
                     # This is a placeholder - replace with actual sheet read
-                    ws = self.gs_manager.sh.worksheet(f"{club_name}_Data")
+                    ws = self.gs_manager.get_worksheet(f"{club_name}_Data")
                     return pd.DataFrame(ws.get_all_records())
                 
                 result, source = await self.get_data_with_timeout(fetch_from_sheets)
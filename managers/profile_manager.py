@@ -4,8 +4,6 @@ Profile management and verification system.
 Handles profile linking, OCR verification, and support messages.
 """
 
-import os
-import json
 import time
 import random
 import asyncio
@@ -13,7 +11,6 @@ import datetime
 import discord
 import aiohttp
 from config import (
-    PROFILE_LINKS_FILE,
     SUPPORT_MESSAGE,
     SUPPORT_SERVER_URL,
     DONATION_MESSAGE,
@@ -25,6 +22,8 @@ from config import (
     OCR_SERVICE_URL,
     EXAMPLE_PROFILE_IMAGE,
 )
+from models.http_client import http_client
+from models.state_store import state_store
 
 # Track last promo time per user
 promo_cooldowns = {}  # {user_id: last_promo_timestamp}
@@ -108,22 +107,28 @@ async def maybe_send_promo_message(interaction: discord.Interaction):
         print(f"Error sending promo message: {e}")
 
 
-def load_profile_links() -> dict:
-    """Load Discord ID -> Trainer ID mappings from file
+async def load_profile_links() -> dict:
+    """Load all Discord ID -> Trainer ID mappings (from the state store)
     
     Returns:
         Dictionary of profile links
     """
-    if os.path.exists(PROFILE_LINKS_FILE):
-        try:
-            with open(PROFILE_LINKS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            pass
-    return {}
+    return await state_store.aio.get_all_profile_links()
 
 
-def save_profile_link(discord_id: int, trainer_id: str, member_name: str, club_name: str, viewer_id: str = None):
+async def get_profile_link(discord_id: int) -> dict:
+    """Get one user's profile link (indexed lookup, no full load)
+    
+    Args:
+        discord_id: Discord user ID
+        
+    Returns:
+        Profile link dict, or None if the user is not linked
+    """
+    return await state_store.aio.get_profile_link(discord_id)
+
+
+async def save_profile_link(discord_id: int, trainer_id: str, member_name: str, club_name: str, viewer_id: str = None):
     """Save a verified profile link
     
     Args:
@@ -133,16 +138,13 @@ def save_profile_link(discord_id: int, trainer_id: str, member_name: str, club_n
         club_name: Club name at time of linking
         viewer_id: Player ID from uma.moe API (never changes even if user changes club/name)
     """
-    links = load_profile_links()
-    links[str(discord_id)] = {
+    await state_store.aio.save_profile_link(discord_id, {
         "viewer_id": viewer_id,  # Primary identifier - never changes
         "trainer_id": trainer_id,
         "member_name": member_name,
         "club_name": club_name,
         "linked_at": datetime.datetime.now(datetime.timezone.utc).isoformat()
-    }
-    with open(PROFILE_LINKS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(links, f, indent=2)
+    })
 
 
 async def call_ocr_service(image_data: bytes) -> dict:
@@ -158,16 +160,15 @@ async def call_ocr_service(image_data: bytes) -> dict:
         import base64
         base64_image = base64.b64encode(image_data).decode('utf-8')
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{OCR_SERVICE_URL}/api/extract",
-                json={"base64Image": f"data:image/png;base64,{base64_image}"},
-                timeout=aiohttp.ClientTimeout(total=60)
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    if result.get('success'):
-                        return result.get('data', {})
+        async with http_client.post(
+            f"{OCR_SERVICE_URL}/api/extract",
+            json={"base64Image": f"data:image/png;base64,{base64_image}"},
+            timeout=aiohttp.ClientTimeout(total=60)
+        ) as response:
+            if response.status == 200:
+                result = await response.json()
+                if result.get('success'):
+                    return result.get('data', {})
         return {}
     except Exception as e:
         print(f"OCR service error: {e}")
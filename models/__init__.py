@@ -2,6 +2,15 @@
 
 from .cache import SmartCache, CROSS_CLUB_CACHE, update_cross_club_cache, get_cross_club_data
 from .proxy import ProxyManager
+from .http_client import HttpClient, http_client
+from .viewer_index import ViewerIndex
+from .history_store import HistoryStore
+from .global_leaderboard import GlobalLeaderboard
+from .sync_payload_store import SyncPayloadStore, sync_payload_store, payload_hash
+from .state_store import StateStore, state_store
+from .sheets_write_queue import SheetsWriteQueue, sheets_write_queue
+from .sheet_grid_store import SheetGridStore, sheet_grid_store
+from .sheets_limiter import SheetsRateLimiter, sheets_limiter, install_sheets_limiter, background_sheets_traffic, to_sheets_thread
 from .database import GoogleSheetsManager, gs_manager, supabase_db, USE_SUPABASE, hybrid_db, get_gs_manager, get_hybrid_db
 
 __all__ = [
@@ -10,6 +19,25 @@ __all__ = [
     'update_cross_club_cache',
     'get_cross_club_data',
     'ProxyManager',
+    'HttpClient',
+    'http_client',
+    'ViewerIndex',
+    'HistoryStore',
+    'GlobalLeaderboard',
+    'SyncPayloadStore',
+    'sync_payload_store',
+    'payload_hash',
+    'StateStore',
+    'state_store',
+    'SheetsWriteQueue',
+    'sheets_write_queue',
+    'SheetGridStore',
+    'sheet_grid_store',
+    'SheetsRateLimiter',
+    'sheets_limiter',
+    'install_sheets_limiter',
+    'background_sheets_traffic',
+    'to_sheets_thread',
     'GoogleSheetsManager',
     'gs_manager',
     'supabase_db',
@@ -2,16 +2,17 @@
 Cache management module for smart data caching with disk persistence.
 
 Provides:
-- SmartCache: In-memory cache with TTL and disk persistence
+- SmartCache: Size-bounded LRU memory tier over a disk tier, with TTLs
 - Cross-club transfer detection system
 """
 
 import os
-import json
 import time
-import pandas as pd
-from io import StringIO
-from typing import Tuple, Optional
+from collections import OrderedDict
+from typing import Optional
+
+from config import SMART_CACHE_FORMAT, SMART_CACHE_MAX_MEMORY_MB
+from .cache_formats import get_cache_format, available_formats, ALL_SUFFIXES
 
 # ============================================================================
 # SMART DATA CACHE WITH DISK PERSISTENCE
@@ -20,56 +21,129 @@ from typing import Tuple, Optional
 class SmartCache:
     """In-memory cache with disk persistence for reliability
     
+    Every entry is written to disk; memory holds the recently used ones.
+    Nothing is read at startup - entries are loaded from disk on first access.
+    
     Features:
-    - Automatic TTL expiration
-    - Disk persistence for recovery after restart
-    - Memory usage monitoring
+    - Automatic TTL expiration, with optional per-key TTLs
+    - Disk persistence for recovery after restart (lazy loading)
+    - Memory budget with LRU eviction to the disk tier
+    - Pluggable on-disk format (json / arrow / parquet, see cache_formats)
+    - Atomic disk writes (temp file + rename)
+    - One-time migration of entries written in another format
+    - Incremental memory accounting and hit/miss/eviction counters
     - Individual key invalidation
     """
     
-    def __init__(self, cache_dir: str, ttl_seconds: int = 1800):
+    def __init__(
+        self,
+        cache_dir: str,
+        ttl_seconds: int = 1800,
+        cache_format: str = SMART_CACHE_FORMAT,
+        max_memory_mb: float = SMART_CACHE_MAX_MEMORY_MB
+    ):
         """
         Initialize SmartCache
         
         Args:
             cache_dir: Directory for disk cache storage
-            ttl_seconds: Time-to-live in seconds (default: 30 minutes)
+            ttl_seconds: Default time-to-live in seconds (default: 30 minutes)
+            cache_format: On-disk format name ('arrow', 'parquet' or 'json')
+            max_memory_mb: Memory budget for cached DataFrames (0 = unbounded)
         """
-        self.cache = {}  # In-memory cache: {key: (data, timestamp)}
+        self.cache = OrderedDict()  # In-memory cache: {key: (data, timestamp)}, least recently used first
         self.cache_dir = cache_dir
         self.ttl = ttl_seconds  # Time-to-live in seconds
+        self.format = get_cache_format(cache_format)
+        self.max_bytes = int(max_memory_mb * 1024 * 1024)
+        
+        self._ttls = {}  # Per-key TTL overrides {key: seconds}
+        self._sizes = {}  # {key: bytes} of in-memory entries
+        self.total_bytes = 0
+        
+        # Metrics
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        
         os.makedirs(cache_dir, exist_ok=True)
-        self._load_from_disk()
+        self._migrate_disk_format()
     
     def _get_cache_file(self, key: str) -> str:
         """Get cache file path for a key"""
         safe_key = key.replace('/', '_').replace('\\', '_')
-        return os.path.join(self.cache_dir, f"{safe_key}.cache.json")
+        return os.path.join(self.cache_dir, f"{safe_key}{self.format.suffix}")
     
-    def _load_from_disk(self):
-        """Load all cache files from disk on startup"""
+    def _write_to_disk(self, key: str, df, timestamp: float, ttl: Optional[float] = None):
+        """Persist one entry in the configured format"""
+        self.format.write(self._get_cache_file(key), key, timestamp, df, ttl)
+    
+    def _migrate_disk_format(self):
+        """Rewrite entries stored in another format (e.g. legacy .cache.json)
+        
+        Runs once per file: the old file is removed after it was rewritten in
+        the configured format. Entries are not kept in memory.
+        """
         try:
-            cache_files = [f for f in os.listdir(self.cache_dir) if f.endswith('.cache.json')]
-            loaded = 0
-            for filename in cache_files:
+            readers = {fmt.suffix: fmt for fmt in available_formats().values()}
+            migrated = 0
+            for filename in sorted(os.listdir(self.cache_dir)):
+                suffix = next((s for s in ALL_SUFFIXES if filename.endswith(s)), None)
+                if suffix is None or suffix == self.format.suffix:
+                    continue
+                filepath = os.path.join(self.cache_dir, filename)
+                reader = readers.get(suffix)
+                if reader is None:
+                    print(f"Warning: Cannot read cache file {filename} (format unavailable)")
+                    continue
                 try:
-                    filepath = os.path.join(self.cache_dir, filename)
-                    with open(filepath, 'r') as f:
-                        data = json.load(f)
-                    
-                    key = data.get('key')
+                    key, df, timestamp, ttl = reader.read(filepath)
                     if key:
-                        df = pd.read_json(StringIO(data['dataframe_json']), orient='records')
-                        timestamp = data.get('timestamp', time.time())
-                        self.cache[key] = (df, timestamp)
-                        loaded += 1
+                        self._write_to_disk(key, df, timestamp, ttl)
+                        migrated += 1
+                    os.remove(filepath)
                 except Exception as e:
-                    print(f"Warning: Failed to load cache file {filename}: {e}")
+                    print(f"Warning: Failed to migrate cache file {filename}: {e}")
             
-            if loaded > 0:
-                print(f"✅ Loaded {loaded} cached datasets from disk")
+            if migrated > 0:
+                print(f"🔄 Migrated {migrated} cache files to {self.format.name}")
         except Exception as e:
-            print(f"Warning: Could not load cache from disk: {e}")
+            print(f"Warning: Could not migrate disk cache: {e}")
+    
+    # ========================================================================
+    # MEMORY TIER
+    # ========================================================================
+    
+    def ttl_for(self, key: str) -> float:
+        """TTL of a key (its override, or the cache default)"""
+        return self._ttls.get(key, self.ttl)
+    
+    def _store(self, key: str, df, timestamp: float):
+        """Put an entry in memory (most recently used) and enforce the budget"""
+        self._drop(key)
+        try:
+            size = int(df.memory_usage(deep=True).sum())
+        except Exception:
+            size = 0
+        self.cache[key] = (df, timestamp)
+        self._sizes[key] = size
+        self.total_bytes += size
+        
+        # Evict least recently used entries (they stay on disk); keep the new one
+        while self.max_bytes and self.total_bytes > self.max_bytes and len(self.cache) > 1:
+            old_key = next(iter(self.cache))
+            self._drop(old_key)
+            self.evictions += 1
+    
+    def _drop(self, key: str) -> bool:
+        """Remove an entry from memory only"""
+        if key not in self.cache:
+            return False
+        del self.cache[key]
+        self.total_bytes -= self._sizes.pop(key, 0)
+        return True
     
     def get(self, key: str):
         """Get data from cache (in-memory or disk) with TTL check
@@ -84,68 +158,88 @@ class SmartCache:
         if key in self.cache:
             df, timestamp = self.cache[key]
             age = time.time() - timestamp
+            ttl = self.ttl_for(key)
             
-            if age < self.ttl:
+            if age < ttl:
                 # Cache still fresh
+                self.cache.move_to_end(key)
+                self.hits += 1
                 return (df, timestamp)
             else:
                 # Cache expired - invalidate it
-                print(f"⏰ Cache EXPIRED for {key} (age: {age/60:.1f} min, TTL: {self.ttl/60:.1f} min)")
+                print(f"⏰ Cache EXPIRED for {key} (age: {age/60:.1f} min, TTL: {ttl/60:.1f} min)")
                 self.invalidate(key)
+                self.expirations += 1
+                self.misses += 1
                 return None
         
         # Try disk fallback
         try:
             cache_file = self._get_cache_file(key)
             if os.path.exists(cache_file):
-                with open(cache_file, 'r') as f:
-                    data = json.load(f)
-                
-                df = pd.read_json(StringIO(data['dataframe_json']), orient='records')
-                timestamp = data.get('timestamp', time.time())
+                _, df, timestamp, ttl = self.format.read(cache_file)
+                if ttl is not None:
+                    self._ttls[key] = ttl
                 age = time.time() - timestamp
                 
                 # Check TTL for disk cache too
-                if age < self.ttl:
+                if age < self.ttl_for(key):
                     # Load into memory
-                    self.cache[key] = (df, timestamp)
+                    self._store(key, df, timestamp)
+                    self.disk_hits += 1
                     return (df, timestamp)
                 else:
                     # Disk cache expired - delete file
                     print(f"⏰ Disk cache EXPIRED for {key} (age: {age/60:.1f} min)")
+                    self._ttls.pop(key, None)
+                    self.expirations += 1
                     try:
                         os.remove(cache_file)
                     except:
                         pass
-                    return None
         except Exception as e:
             print(f"Warning: Failed to load cache from disk for {key}: {e}")
         
+        self.misses += 1
         return None
     
-    def set(self, key: str, df):
+    def set(self, key: str, df, ttl_seconds: Optional[float] = None):
         """Set data in cache (both memory and disk)
         
         Args:
             key: Cache key
             df: DataFrame to cache
+            ttl_seconds: TTL for this key (None = cache default), e.g. longer
+                for archive data that no longer changes
         """
         timestamp = time.time()
-        self.cache[key] = (df, timestamp)
+        if ttl_seconds is None:
+            self._ttls.pop(key, None)
+        else:
+            self._ttls[key] = ttl_seconds
+        self._store(key, df, timestamp)
         
         # Persist to disk
         try:
-            cache_file = self._get_cache_file(key)
-            data = {
-                'key': key,
-                'timestamp': timestamp,
-                'dataframe_json': df.to_json(orient='records')
-            }
-            with open(cache_file, 'w') as f:
-                json.dump(data, f)
+            self._write_to_disk(key, df, timestamp, ttl_seconds)
         except Exception as e:
             print(f"Warning: Failed to save cache to disk for {key}: {e}")
     
+    def replace(self, key: str, df):
+        """Swap the in-memory frame of a key, keeping its timestamp and TTL
+        
+        Used after converting a cached frame once (e.g. legacy schema), so
+        later hits get the converted frame without mutating the shared one.
+        
+        Args:
+            key: Cache key
+            df: Replacement DataFrame
+        """
+        entry = self.cache.get(key)
+        if entry is None:
+            return
+        self._store(key, df, entry[1])
+    
     def invalidate(self, key: str = None):
         """Clear cache for specific key or all (memory + disk)
         
@@ -154,8 +248,8 @@ class SmartCache:
         """
         if key:
             # Clear from memory
-            if key in self.cache:
-                del self.cache[key]
+            self._ttls.pop(key, None)
+            if self._drop(key):
                 print(f"🗑️ Cache INVALIDATED for {key}")
             
             # Clear from disk
@@ -169,11 +263,14 @@ class SmartCache:
         else:
             # Clear all from memory
             self.cache.clear()
+            self._sizes.clear()
+            self._ttls.clear()
+            self.total_bytes = 0
             print("🗑️ Cache CLEARED completely")
             
             # Clear all from disk
             try:
-                cache_files = [f for f in os.listdir(self.cache_dir) if f.endswith('.cache.json')]
+                cache_files = [f for f in os.listdir(self.cache_dir) if f.endswith(ALL_SUFFIXES)]
                 for filename in cache_files:
                     try:
                         os.remove(os.path.join(self.cache_dir, filename))
@@ -184,30 +281,44 @@ class SmartCache:
             except Exception as e:
                 print(f"Warning: Could not delete disk cache files: {e}")
     
+    def get_memory_report(self) -> dict:
+        """Memory of each in-memory entry
+        
+        Returns:
+            {key: {'rows', 'bytes'}}, largest first
+        """
+        return {
+            key: {'rows': len(self.cache[key][0]), 'bytes': size}
+            for key, size in sorted(self._sizes.items(), key=lambda item: item[1], reverse=True)
+        }
+    
     def get_stats(self) -> dict:
         """Get cache statistics with age information
         
+        Sizes are tracked when entries are stored, so this does not measure
+        any DataFrame.
+        
         Returns:
             Dictionary with cache statistics
         """
-        total_size = 0
-        cache_ages = {}
         current_time = time.time()
-        
-        for key, (df, timestamp) in self.cache.items():
-            try:
-                total_size += df.memory_usage(deep=True).sum()
-                age_minutes = (current_time - timestamp) / 60
-                cache_ages[key] = age_minutes
-            except:
-                pass
+        cache_ages = {key: (current_time - timestamp) / 60 for key, (_, timestamp) in self.cache.items()}
+        lookups = self.hits + self.disk_hits + self.misses
         
         return {
             "total_entries": len(self.cache),
             "keys": list(self.cache.keys()),
-            "total_size_mb": round(total_size / 1024 / 1024, 2),
+            "total_size_mb": round(self.total_bytes / 1024 / 1024, 2),
+            "max_size_mb": round(self.max_bytes / 1024 / 1024, 2),
             "cache_ages": cache_ages,
-            "ttl_minutes": round(self.ttl / 60, 1)
+            "ttl_minutes": round(self.ttl / 60, 1),
+            "format": self.format.name,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups * 100, 1) if lookups else 0.0
         }
 
 
@@ -0,0 +1,167 @@
+"""
+On-disk formats for SmartCache entries.
+
+Each format writes one file per cache key holding the DataFrame plus the
+entry's key, timestamp and TTL override (None = cache default):
+
+- json:    legacy `<key>.cache.json` (records JSON inside a JSON envelope)
+- arrow:   `<key>.cache.arrow`, uncompressed Arrow IPC (Feather v2), read
+           memory-mapped; key/timestamp/TTL live in the schema metadata
+- parquet: `<key>.cache.parquet`, compressed columnar file (smallest on disk)
+
+Arrow and Parquet keep dtypes (int64 Day/Daily, bool flags) so cached frames
+need no re-coercion. Both require pyarrow; without it SmartCache uses json.
+Writes go to a temp file that is renamed over the target, so a crash never
+leaves a half-written entry.
+"""
+
+import os
+import json
+import time
+import pandas as pd
+from io import StringIO
+from typing import Dict, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    feather = None
+    PYARROW_AVAILABLE = False
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+# (key, dataframe, timestamp, ttl override or None)
+CacheEntry = Tuple[str, pd.DataFrame, float, Optional[float]]
+
+# Schema metadata keys (Arrow / Parquet)
+_META_KEY = b'smart_cache.key'
+_META_TIMESTAMP = b'smart_cache.timestamp'
+_META_TTL = b'smart_cache.ttl'
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+
+def _atomic_write(path: str, write):
+    """Call write(temp_path), then rename the temp file over path"""
+    temp_path = f"{path}.tmp"
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _to_table(key: str, timestamp: float, df: pd.DataFrame, ttl: Optional[float]):
+    """DataFrame -> Arrow table with the entry's key/timestamp/TTL in its metadata"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_META_KEY] = key.encode('utf-8')
+    metadata[_META_TIMESTAMP] = repr(timestamp).encode('ascii')
+    if ttl is not None:
+        metadata[_META_TTL] = repr(ttl).encode('ascii')
+    return table.replace_schema_metadata(metadata)
+
+
+def _from_table(table) -> CacheEntry:
+    metadata = table.schema.metadata or {}
+    key = metadata.get(_META_KEY, b'').decode('utf-8')
+    timestamp = float(metadata.get(_META_TIMESTAMP, time.time()))
+    ttl = float(metadata[_META_TTL]) if _META_TTL in metadata else None
+    return key, table.to_pandas(), timestamp, ttl
+
+
+# ============================================================================
+# FORMATS
+# ============================================================================
+
+
+class JsonCacheFormat:
+    """Legacy records-JSON format (no dependencies, loses dtypes)"""
+
+    name = 'json'
+    suffix = '.cache.json'
+
+    def write(self, path: str, key: str, timestamp: float, df: pd.DataFrame, ttl: Optional[float] = None):
+        data = {
+            'key': key,
+            'timestamp': timestamp,
+            'ttl': ttl,
+            'dataframe_json': df.to_json(orient='records')
+        }
+
+        def write_json(temp_path):
+            with open(temp_path, 'w') as f:
+                json.dump(data, f)
+
+        _atomic_write(path, write_json)
+
+    def read(self, path: str) -> CacheEntry:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        df = pd.read_json(StringIO(data['dataframe_json']), orient='records')
+        return data.get('key'), df, data.get('timestamp', time.time()), data.get('ttl')
+
+
+class ArrowCacheFormat:
+    """Uncompressed Arrow IPC (Feather v2), memory-mapped reads"""
+
+    name = 'arrow'
+    suffix = '.cache.arrow'
+
+    def write(self, path: str, key: str, timestamp: float, df: pd.DataFrame, ttl: Optional[float] = None):
+        table = _to_table(key, timestamp, df, ttl)
+        # Uncompressed so reads can map the file instead of decoding it
+        _atomic_write(path, lambda temp_path: feather.write_feather(table, temp_path, compression='uncompressed'))
+
+    def read(self, path: str) -> CacheEntry:
+        return _from_table(feather.read_table(path, memory_map=True))
+
+
+class ParquetCacheFormat:
+    """Compressed Parquet (smallest files, slower than Arrow to load)"""
+
+    name = 'parquet'
+    suffix = '.cache.parquet'
+
+    def write(self, path: str, key: str, timestamp: float, df: pd.DataFrame, ttl: Optional[float] = None):
+        table = _to_table(key, timestamp, df, ttl)
+        _atomic_write(path, lambda temp_path: pq.write_table(table, temp_path))
+
+    def read(self, path: str) -> CacheEntry:
+        return _from_table(pq.read_table(path, memory_map=True))
+
+
+def available_formats() -> Dict[str, object]:
+    """Formats usable with the installed packages, by name"""
+    formats = {'json': JsonCacheFormat()}
+    if PYARROW_AVAILABLE:
+        formats['arrow'] = ArrowCacheFormat()
+        if pq is not None:
+            formats['parquet'] = ParquetCacheFormat()
+    return formats
+
+
+def get_cache_format(name: str):
+    """Format by name, falling back to json if it is unknown or unavailable"""
+    formats = available_formats()
+    cache_format = formats.get((name or '').lower())
+    if cache_format is None:
+        print(f"⚠️ SmartCache format '{name}' unavailable - using json")
+        cache_format = formats['json']
+    return cache_format
+
+
+# All suffixes SmartCache may find on disk (for migration and clearing)
+ALL_SUFFIXES = (JsonCacheFormat.suffix, ArrowCacheFormat.suffix, ParquetCacheFormat.suffix)
@@ -2,7 +2,7 @@
 Database management module for Google Sheets and Supabase integration.
 
 Provides:
-- GoogleSheetsManager: Connection and retry logic for Google Sheets API
+- GoogleSheetsManager: Connection, retry logic and worksheet handle cache for Google Sheets API
 - Supabase integration for backup storage
 - Hybrid failover system
 """
@@ -10,12 +10,17 @@ Provides:
 import time
 import random
 import asyncio
+import threading
 import gspread
 from gspread.exceptions import WorksheetNotFound
 
 # Import from local modules
-from config import config
+from config import config, SHEETS_BATCH_GET_RANGES
 from utils.error_handling import log_error, is_retryable_error
+from utils.single_flight import single_flight
+from models.sheets_limiter import install_sheets_limiter
+from models.sheet_grid_store import sheet_grid_store
+from models.sync_payload_store import sync_payload_store
 
 # ============================================================================
 # DATABASE INITIALIZATION
@@ -45,6 +50,8 @@ class GoogleSheetsManager:
     - Retry logic with exponential backoff
     - Config sheet verification
     - Async timeout protection
+    - All requests paced by the global Sheets rate limiter
+    - Worksheet handle cache (title -> Worksheet), so lookups cost no request
     """
     
     def __init__(self):
@@ -52,12 +59,18 @@ class GoogleSheetsManager:
         self.gc = None
         self.sh = None
         self.connected = False
+        
+        # Worksheet handles by title (refreshed per sync or on a miss)
+        self._worksheets = {}
+        self._worksheets_lock = threading.Lock()
+        self.worksheet_hits = 0
+        self.worksheet_refreshes = 0
         self._connect()
     
     def _connect(self):
         """Establish connection to Google Sheets"""
         try:
-            self.gc = gspread.service_account(filename=config.SERVICE_ACCOUNT_FILE)
+            self.gc = install_sheets_limiter(gspread.service_account(filename=config.SERVICE_ACCOUNT_FILE))
             self.sh = self.gc.open_by_key(config.GOOGLE_SHEET_ID)
             self.connected = True
             print("Bot: Connected to Google Sheets.")
@@ -74,7 +87,7 @@ class GoogleSheetsManager:
     def _verify_config_sheet(self):
         """Verify the config sheet has correct headers"""
         try:
-            config_ws = self.sh.worksheet(config.CONFIG_SHEET_NAME)
+            config_ws = self.get_worksheet(config.CONFIG_SHEET_NAME)
             headers = config_ws.row_values(1)
             expected_headers = [
                 'Club_Name', 'Data_Sheet_Name', 'Members_Sheet_Name',
@@ -88,6 +101,70 @@ class GoogleSheetsManager:
         except WorksheetNotFound:
             print(f"ERROR (Bot): '{config.CONFIG_SHEET_NAME}' sheet not found.")
     
+    # ========================================================================
+    # WORKSHEET HANDLE CACHE
+    # ========================================================================
+    
+    def refresh_worksheets(self) -> dict:
+        """Reload all worksheet handles with one spreadsheet metadata request
+        
+        Returns:
+            {title: Worksheet}
+        """
+        worksheets = {ws.title: ws for ws in self.sh.worksheets()}
+        self._worksheets = worksheets
+        self.worksheet_refreshes += 1
+        return worksheets
+    
+    def get_worksheet(self, title: str):
+        """Cached worksheet handle (replaces sh.worksheet, which fetches metadata every call)
+        
+        A miss refreshes the handle cache once; sheets created by another
+        process are picked up that way.
+        
+        Args:
+            title: Worksheet title
+            
+        Returns:
+            gspread Worksheet
+            
+        Raises:
+            WorksheetNotFound: If no worksheet has that title after a refresh
+        """
+        ws = self._worksheets.get(title)
+        if ws is not None:
+            self.worksheet_hits += 1
+            return ws
+        
+        with self._worksheets_lock:
+            # Another thread may have refreshed while we waited
+            ws = self._worksheets.get(title)
+            if ws is None:
+                ws = self.refresh_worksheets().get(title)
+        if ws is None:
+            raise WorksheetNotFound(title)
+        return ws
+    
+    def add_worksheet(self, title: str, rows: int, cols: int):
+        """Create a worksheet and cache its handle
+        
+        Anything the sync remembers about a sheet with this title belongs to
+        an older sheet, so it is dropped (the next sync fills the new one).
+        """
+        ws = self.sh.add_worksheet(title=title, rows=rows, cols=cols)
+        self._worksheets[title] = ws
+        sheet_grid_store.forget(title)
+        sync_payload_store.forget_sheet(title)
+        return ws
+    
+    def get_worksheet_cache_stats(self) -> dict:
+        """Worksheet handle cache statistics"""
+        return {
+            'worksheets': len(self._worksheets),
+            'hits': self.worksheet_hits,
+            'refreshes': self.worksheet_refreshes,
+        }
+    
     def get_worksheet_with_retry(self, sheet_name: str, max_retries: int = None) -> list:
         """Get worksheet data with enhanced retry logic
         
@@ -107,7 +184,7 @@ class GoogleSheetsManager:
         
         for attempt in range(max_retries):
             try:
-                ws = self.sh.worksheet(sheet_name)
+                ws = self.get_worksheet(sheet_name)
                 return ws.get_all_values()
             except Exception as e:
                 log_error(e, "Google Sheets worksheet", {"sheet_name": sheet_name, "attempt": attempt + 1})
@@ -133,6 +210,17 @@ class GoogleSheetsManager:
     async def get_worksheet_async(self, sheet_name: str, timeout_seconds: int = 10, max_retries: int = 3) -> list:
         """Async version with timeout protection
         
+        Concurrent calls for the same sheet share one fetch (single-flight).
+        See _get_worksheet_async_uncached for details.
+        """
+        return await single_flight.do(
+            "sheet_values", sheet_name,
+            lambda: self._get_worksheet_async_uncached(sheet_name, timeout_seconds, max_retries)
+        )
+    
+    async def _get_worksheet_async_uncached(self, sheet_name: str, timeout_seconds: int = 10, max_retries: int = 3) -> list:
+        """Fetch all values of a worksheet with timeout protection
+        
         OPTIMIZATIONS:
         - asyncio.timeout(10) prevents hanging on slow responses
         - Reduced retries from 5 to 3 for faster failure
@@ -150,7 +238,7 @@ class GoogleSheetsManager:
             try:
                 # Timeout protection - prevents hanging
                 async with asyncio.timeout(timeout_seconds):
-                    ws = await asyncio.to_thread(self.sh.worksheet, sheet_name)
+                    ws = await asyncio.to_thread(self.get_worksheet, sheet_name)
                     data = await asyncio.to_thread(ws.get_all_values)
                     return data
                     
@@ -191,6 +279,42 @@ class GoogleSheetsManager:
                     raise
         return []
 
+    def get_columns_batch(self, sheet_names: list, column: str = 'A',
+                          chunk_size: int = None) -> dict:
+        """Read one column of many worksheets with values_batch_get
+
+        One spreadsheet metadata request lists the existing worksheets (and
+        refreshes the worksheet handle cache), then
+        every `chunk_size` sheets cost a single values request (instead of a
+        worksheet lookup plus a full read per sheet). Missing sheets are
+        skipped so one bad name cannot fail a whole batch.
+
+        Args:
+            sheet_names: Worksheet titles to read
+            column: Column letter (default: A)
+            chunk_size: Ranges per request (default: SHEETS_BATCH_GET_RANGES)
+
+        Returns:
+            {sheet_name: [cell values, top to bottom]} for the sheets that exist
+        """
+        chunk_size = chunk_size or SHEETS_BATCH_GET_RANGES
+        existing = self.refresh_worksheets()
+        names = [name for name in dict.fromkeys(sheet_names) if name in existing]
+        missing = [name for name in dict.fromkeys(sheet_names) if name not in existing]
+        if missing:
+            print(f"⚠️ Batch read: {len(missing)} sheet(s) not found: {missing[:5]}")
+
+        columns = {}
+        for start in range(0, len(names), chunk_size):
+            chunk = names[start:start + chunk_size]
+            ranges = ["'{}'!{}:{}".format(name.replace("'", "''"), column, column) for name in chunk]
+            response = self.sh.values_batch_get(ranges, params={'majorDimension': 'COLUMNS'})
+            # valueRanges come back in request order; empty columns have no 'values'
+            for name, value_range in zip(chunk, response.get('valueRanges', [])):
+                values = value_range.get('values') or [[]]
+                columns[name] = values[0]
+        return columns
+
 
 # ============================================================================
 # LAZY INITIALIZATION FOR GOOGLE SHEETS MANAGER
@@ -0,0 +1,205 @@
+"""
+Materialized global leaderboard.
+
+Each club's leaderboard rows (monthly growth and daily average per member)
+are computed once from its Data sheet frame and kept here. The sync updates
+only the clubs whose Data sheet it rewrote, and only if the data changed, so
+the global view and the pinned message are a merge + sort of stored rows
+instead of a per-member scan of every club.
+
+Structure (persisted as JSON):
+    { 'club_name': {
+        'signature': str (hash of the rows it was computed from),
+        'updated_at': float,
+        'members': [{'name', 'fans', 'daily', 'club', 'days'}, ...]
+    } }
+"""
+
+import os
+import json
+import time
+import hashlib
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from config import GLOBAL_LEADERBOARD_STORE_FILE
+
+# ============================================================================
+# CLUB ROWS
+# ============================================================================
+
+
+def dataframe_signature(df: pd.DataFrame) -> str:
+    """Hash of the columns the leaderboard is computed from"""
+    if df is None or df.empty:
+        return ''
+    digest = hashlib.blake2b(digest_size=16)
+    for column in ('Name', 'Day', 'Total Fans'):
+        digest.update(pd.util.hash_pandas_object(df[column], index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def club_leaderboard_rows(club_name: str, df: pd.DataFrame) -> List[dict]:
+    """Monthly growth and daily average of every member in one pass
+
+    Growth is Total Fans on the club's last day minus Total Fans on its first
+    day; members missing either day are left out (as before).
+
+    Args:
+        club_name: Club name stored on each row
+        df: Data sheet frame (Name, Day, Total Fans, ...)
+
+    Returns:
+        Rows in the order members first appear in the frame
+    """
+    if df is None or df.empty:
+        return []
+
+    frame = pd.DataFrame({
+        'Name': df['Name'],
+        'Day': pd.to_numeric(df['Day'], errors='coerce'),
+        'Fans': pd.to_numeric(df['Total Fans'], errors='coerce'),
+    }).dropna(subset=['Day'])
+    if frame.empty:
+        return []
+
+    min_day = frame['Day'].min()
+    max_day = frame['Day'].max()
+    days_count = int(max_day - min_day + 1)
+
+    # One groupby: first Total Fans per (member, edge day)
+    edges = frame[frame['Day'].isin([min_day, max_day])]
+    table = edges.groupby(['Name', 'Day'], sort=False, observed=True)['Fans'].first().unstack()
+    table = table.reindex(pd.unique(edges['Name'])).dropna(subset=[min_day, max_day])
+
+    growth = (table[max_day] - table[min_day]).astype('int64')
+    daily = growth // days_count if days_count > 0 else growth * 0
+
+    return [
+        {'name': name, 'fans': int(fans), 'daily': int(avg), 'club': club_name, 'days': days_count}
+        for name, fans, avg in zip(table.index, growth.tolist(), daily.tolist())
+    ]
+
+
+# ============================================================================
+# GLOBAL LEADERBOARD
+# ============================================================================
+
+
+class GlobalLeaderboard:
+    """Per-club leaderboard rows, merged on read
+
+    Features:
+    - One groupby per club, recomputed only when its data changed
+    - Merged + sorted list cached until a club changes
+    - JSON persistence with atomic writes (survives restarts)
+    """
+
+    def __init__(self, store_file: str = GLOBAL_LEADERBOARD_STORE_FILE):
+        """
+        Initialize GlobalLeaderboard
+
+        Args:
+            store_file: Path of the persisted leaderboard
+        """
+        self.store_file = store_file
+        self.clubs: Dict[str, dict] = {}
+        self.dirty = False
+        self._merged: Optional[tuple] = None  # (club names, rows)
+
+        # Metrics
+        self.updates = 0
+        self.unchanged = 0
+        self._load()
+
+    def _load(self):
+        """Load the leaderboard from disk"""
+        if not os.path.exists(self.store_file):
+            return
+        try:
+            with open(self.store_file, 'r', encoding='utf-8') as f:
+                self.clubs = json.load(f)
+            members = sum(len(club['members']) for club in self.clubs.values())
+            print(f"✅ Loaded global leaderboard: {members} members in {len(self.clubs)} clubs")
+        except Exception as e:
+            print(f"⚠️ Could not load global leaderboard: {e}")
+            self.clubs = {}
+
+    def save(self):
+        """Persist the leaderboard (atomic write, only if it changed)"""
+        if not self.dirty:
+            return
+        temp_file = f"{self.store_file}.tmp"
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.clubs, f, ensure_ascii=False)
+            os.replace(temp_file, self.store_file)
+            self.dirty = False
+            print(f"💾 Saved global leaderboard ({len(self.clubs)} clubs)")
+        except Exception as e:
+            print(f"⚠️ Could not save global leaderboard: {e}")
+
+    def update_club(self, club_name: str, df: pd.DataFrame) -> bool:
+        """Recompute a club's rows if its data changed
+
+        Args:
+            club_name: Club name
+            df: The club's Data sheet frame
+
+        Returns:
+            True if the club's rows were recomputed
+        """
+        signature = dataframe_signature(df)
+        club = self.clubs.get(club_name)
+        if club is not None and club['signature'] == signature:
+            self.unchanged += 1
+            return False
+
+        self.clubs[club_name] = {
+            'signature': signature,
+            'updated_at': time.time(),
+            'members': club_leaderboard_rows(club_name, df),
+        }
+        self._merged = None
+        self.dirty = True
+        self.updates += 1
+        return True
+
+    def has_club(self, club_name: str) -> bool:
+        """Check if a club's rows are materialized"""
+        return club_name in self.clubs
+
+    def get_members(self, club_names: Iterable[str]) -> List[dict]:
+        """All members of the given clubs, highest monthly growth first
+
+        Args:
+            club_names: Tracked clubs in display order (e.g. config_cache keys);
+                clubs not materialized yet are skipped
+
+        Returns:
+            New list of the shared row dicts (treat rows as read-only)
+        """
+        club_names = tuple(club_names)
+        if self._merged is None or self._merged[0] != club_names:
+            rows = [
+                member
+                for club_name in club_names if club_name in self.clubs
+                for member in self.clubs[club_name]['members']
+            ]
+            rows.sort(key=lambda member: member['fans'], reverse=True)
+            self._merged = (club_names, rows)
+        return list(self._merged[1])
+
+    def get_stats(self) -> dict:
+        """Get leaderboard statistics
+
+        Returns:
+            Dictionary with club / member counts and update counters
+        """
+        return {
+            'clubs': len(self.clubs),
+            'members': sum(len(club['members']) for club in self.clubs.values()),
+            'updates': self.updates,
+            'unchanged': self.unchanged,
+        }
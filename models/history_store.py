@@ -0,0 +1,227 @@
+"""
+Local columnar store for monthly club history.
+
+One Arrow IPC file per (club, month) partition:
+
+    data_cache/history/<club>/<YYYY-MM>.arrow
+
+Each file holds one row per (viewer_id, day) with cumulative and daily fans.
+Files are written uncompressed so reads can memory-map them (zero-copy), and
+replaced atomically so a reader never sees a half-written partition.
+
+Requires pyarrow; without it the store is disabled and callers fall back to
+the member sheets.
+"""
+
+import os
+import time
+from typing import Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pc = None
+    PYARROW_AVAILABLE = False
+
+from config import HISTORY_STORE_DIR
+
+# ============================================================================
+# HISTORY STORE
+# ============================================================================
+
+if PYARROW_AVAILABLE:
+    HISTORY_SCHEMA = pa.schema([
+        ('viewer_id', pa.string()),
+        ('trainer_name', pa.string()),
+        ('club', pa.string()),
+        ('month', pa.string()),  # MM/YYYY (same label as the sheet archives)
+        ('day', pa.int8()),
+        ('cumulative_fans', pa.int64()),
+        ('daily_fans', pa.int64()),  # Null when no gain is known for that day
+    ])
+else:
+    HISTORY_SCHEMA = None
+
+
+def _month_to_partition(month: str) -> str:
+    """'MM/YYYY' -> 'YYYY-MM' (sortable file name)"""
+    month_num, year = month.split('/')
+    return f"{int(year):04d}-{int(month_num):02d}"
+
+
+def _partition_to_month(partition: str) -> str:
+    """'YYYY-MM' -> 'MM/YYYY'"""
+    year, month_num = partition.split('-')
+    return f"{month_num}/{year}"
+
+
+class HistoryStore:
+    """Columnar (Arrow) history of member fans, partitioned by club and month
+
+    Features:
+    - One partition file per club/month, rewritten atomically by the sync
+    - Memory-mapped, zero-copy reads
+    - Archive lookups (member IDs, last-day cumulative fans) for the
+      transfer checks and the last-day backfill
+    """
+
+    def __init__(self, base_dir: str = HISTORY_STORE_DIR):
+        """
+        Initialize HistoryStore
+
+        Args:
+            base_dir: Root directory of the partitions
+        """
+        self.base_dir = base_dir
+        self.enabled = PYARROW_AVAILABLE
+        if self.enabled:
+            os.makedirs(base_dir, exist_ok=True)
+        else:
+            print("⚠️ pyarrow not installed - local history store disabled")
+
+    def _club_dir(self, club_name: str) -> str:
+        safe_club = club_name.replace('/', '_').replace('\\', '_')
+        return os.path.join(self.base_dir, safe_club)
+
+    def _partition_file(self, club_name: str, month: str) -> str:
+        return os.path.join(self._club_dir(club_name), f"{_month_to_partition(month)}.arrow")
+
+    def has_month(self, club_name: str, month: str) -> bool:
+        """Check if a club/month partition exists"""
+        return self.enabled and os.path.exists(self._partition_file(club_name, month))
+
+    # ========================================================================
+    # WRITE
+    # ========================================================================
+
+    def write_month(self, club_name: str, month: str, members: List[dict]) -> int:
+        """Replace a club/month partition
+
+        Args:
+            club_name: Club name
+            month: Month label 'MM/YYYY'
+            members: [{'viewer_id', 'trainer_name', 'cumulative': [...], 'daily': [...]}]
+                     cumulative[i] / daily[i] are for Day i+1 (0 / None = no data)
+
+        Returns:
+            Number of rows written
+        """
+        if not self.enabled:
+            return 0
+
+        viewer_ids, names, days, cumulatives, dailies = [], [], [], [], []
+        for member in members:
+            cumulative = member.get('cumulative') or []
+            daily = member.get('daily') or []
+            for day_idx, fans in enumerate(cumulative):
+                if not fans or fans <= 0:
+                    continue
+                viewer_ids.append(str(member['viewer_id']))
+                names.append(member.get('trainer_name', ''))
+                days.append(day_idx + 1)
+                cumulatives.append(int(fans))
+                dailies.append(daily[day_idx] if day_idx < len(daily) else None)
+
+        row_count = len(viewer_ids)
+        table = pa.table({
+            'viewer_id': pa.array(viewer_ids, pa.string()),
+            'trainer_name': pa.array(names, pa.string()),
+            'club': pa.array([club_name] * row_count, pa.string()),
+            'month': pa.array([month] * row_count, pa.string()),
+            'day': pa.array(days, pa.int8()),
+            'cumulative_fans': pa.array(cumulatives, pa.int64()),
+            'daily_fans': pa.array(dailies, pa.int64()),
+        }, schema=HISTORY_SCHEMA)
+
+        path = self._partition_file(club_name, month)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with pa.OSFile(temp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, HISTORY_SCHEMA) as writer:
+                writer.write_table(table)
+        os.replace(temp_path, path)
+        return row_count
+
+    # ========================================================================
+    # READ
+    # ========================================================================
+
+    def read_month(self, club_name: str, month: str, columns: List[str] = None):
+        """Memory-map a club/month partition
+
+        Args:
+            club_name: Club name
+            month: Month label 'MM/YYYY'
+            columns: Optional column subset
+
+        Returns:
+            pyarrow.Table backed by the mapped file, or None if missing
+        """
+        if not self.has_month(club_name, month):
+            return None
+        source = pa.memory_map(self._partition_file(club_name, month), 'r')
+        table = pa.ipc.open_file(source).read_all()
+        return table.select(columns) if columns else table
+
+    def months(self, club_name: str) -> List[str]:
+        """List stored months of a club (oldest first)"""
+        club_dir = self._club_dir(club_name)
+        if not self.enabled or not os.path.isdir(club_dir):
+            return []
+        partitions = sorted(f[:-len('.arrow')] for f in os.listdir(club_dir) if f.endswith('.arrow'))
+        return [_partition_to_month(p) for p in partitions]
+
+    def clubs(self) -> List[str]:
+        """List clubs with stored history"""
+        if not self.enabled:
+            return []
+        return sorted(d for d in os.listdir(self.base_dir) if os.path.isdir(os.path.join(self.base_dir, d)))
+
+    def last_day_cumulative(self, club_name: str, month: str) -> Optional[Dict[str, int]]:
+        """Cumulative fans of every member of a club/month on their last stored day
+
+        Replaces scanning the sheet archive: the keys are the month's member
+        IDs (transfer detection), the values the archive's _Day31_Cumulative
+        (last-day backfill).
+
+        Returns:
+            {viewer_id: cumulative fans}, or None if the partition doesn't exist
+        """
+        table = self.read_month(club_name, month, columns=['viewer_id', 'day', 'cumulative_fans'])
+        if table is None:
+            return None
+        table = table.take(pc.sort_indices(table, sort_keys=[('day', 'ascending')]))
+        # Later days overwrite earlier ones
+        return dict(zip(table.column('viewer_id').to_pylist(), table.column('cumulative_fans').to_pylist()))
+
+    def get_stats(self) -> dict:
+        """Get store statistics
+
+        Returns:
+            Dictionary with enabled flag, partition count and size on disk
+        """
+        if not self.enabled:
+            return {'enabled': False, 'clubs': 0, 'partitions': 0, 'size_mb': 0.0}
+
+        partitions = 0
+        size = 0
+        newest = 0.0
+        for club in self.clubs():
+            club_dir = self._club_dir(club)
+            for filename in os.listdir(club_dir):
+                if filename.endswith('.arrow'):
+                    path = os.path.join(club_dir, filename)
+                    partitions += 1
+                    size += os.path.getsize(path)
+                    newest = max(newest, os.path.getmtime(path))
+
+        return {
+            'enabled': True,
+            'clubs': len(self.clubs()),
+            'partitions': partitions,
+            'size_mb': round(size / 1024 / 1024, 2),
+            'last_write_age_hours': round((time.time() - newest) / 3600, 1) if newest else None,
+        }
@@ -0,0 +1,242 @@
+"""
+Shared HTTP client module with pooled keep-alive connections.
+
+Provides:
+- HttpClient: Long-lived aiohttp sessions with connection pooling and DNS cache
+- http_client: Process-wide instance (owned by ClubManagementBot)
+
+One session (and connector) is kept for direct requests and one per proxy,
+so repeated calls to uma.moe reuse TCP/TLS connections instead of doing a
+fresh handshake and DNS lookup for every request.
+"""
+
+import time
+import aiohttp
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from config import (
+    HTTP_POOL_LIMIT, HTTP_POOL_LIMIT_PER_HOST, HTTP_PROXY_POOL_LIMIT,
+    HTTP_DNS_CACHE_TTL, HTTP_KEEPALIVE_TIMEOUT,
+)
+
+# ============================================================================
+# POOLED HTTP CLIENT
+# ============================================================================
+
+DIRECT_POOL = "direct"
+
+
+class HttpClient:
+    """Pooled HTTP client shared by all outbound requests
+
+    Features:
+    - One keep-alive connection pool for direct requests
+    - One connection pool per proxy (from ProxyManager)
+    - DNS cache on every connector
+    - Lazy session creation (safe to use before the bot is ready)
+    - Pool utilisation statistics
+    """
+
+    def __init__(
+        self,
+        limit: int = HTTP_POOL_LIMIT,
+        limit_per_host: int = HTTP_POOL_LIMIT_PER_HOST,
+        proxy_limit: int = HTTP_PROXY_POOL_LIMIT,
+        dns_cache_ttl: int = HTTP_DNS_CACHE_TTL,
+        keepalive_timeout: float = HTTP_KEEPALIVE_TIMEOUT,
+    ):
+        """
+        Initialize HttpClient
+
+        Args:
+            limit: Max open connections for the direct pool
+            limit_per_host: Max connections per host for the direct pool
+            proxy_limit: Max open connections for each proxy pool
+            dns_cache_ttl: Seconds to cache DNS lookups
+            keepalive_timeout: Seconds to keep idle connections open
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.proxy_limit = proxy_limit
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.proxy_manager = None
+
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._pool_stats: Dict[str, dict] = {}
+        self.started_at = time.time()
+
+    def attach_proxy_manager(self, proxy_manager):
+        """Link a ProxyManager so every loaded proxy gets its own pool
+        and request outcomes feed its health scoring
+
+        Args:
+            proxy_manager: ProxyManager instance
+        """
+        self.proxy_manager = proxy_manager
+
+    @staticmethod
+    def _pool_key(proxy_url: Optional[str]) -> str:
+        return proxy_url or DIRECT_POOL
+
+    @staticmethod
+    def _display_name(pool_key: str) -> str:
+        """Hide proxy credentials in stats/logs"""
+        if pool_key == DIRECT_POOL:
+            return DIRECT_POOL
+        parts = urlsplit(pool_key)
+        return f"{parts.hostname}:{parts.port}" if parts.hostname else "proxy"
+
+    def _new_session(self, proxy_url: Optional[str]) -> aiohttp.ClientSession:
+        if proxy_url:
+            # All traffic of a proxy pool goes to the same proxy host
+            connector = aiohttp.TCPConnector(
+                limit=self.proxy_limit,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+        else:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+        return aiohttp.ClientSession(connector=connector)
+
+    def get_session(self, proxy_url: Optional[str] = None) -> aiohttp.ClientSession:
+        """Get (or lazily create) the pooled session for a proxy
+
+        Args:
+            proxy_url: Proxy URL, or None for direct requests
+
+        Returns:
+            Long-lived aiohttp.ClientSession - do NOT close it
+        """
+        key = self._pool_key(proxy_url)
+        session = self._sessions.get(key)
+        if session is None or session.closed:
+            session = self._new_session(proxy_url)
+            self._sessions[key] = session
+            self._pool_stats.setdefault(key, {"requests": 0, "errors": 0})
+        return session
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, proxy_url: Optional[str] = None, **kwargs):
+        """Send a request through the pool for `proxy_url`
+
+        Usage:
+            async with http_client.request("GET", url, proxy_url=proxy) as response:
+                data = await response.json()
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            proxy_url: Optional proxy URL (selects the proxy's pool)
+            **kwargs: Passed to aiohttp (json, headers, timeout, ...)
+        """
+        session = self.get_session(proxy_url)
+        stats = self._pool_stats[self._pool_key(proxy_url)]
+        stats["requests"] += 1
+        started = time.monotonic()
+        got_response = False
+
+        try:
+            async with session.request(method, url, proxy=proxy_url, **kwargs) as response:
+                got_response = True
+                if proxy_url and self.proxy_manager:
+                    # Feed proxy health scoring (429 / 5xx count against the proxy)
+                    self.proxy_manager.record_result(
+                        proxy_url,
+                        success=response.status != 429 and response.status < 500,
+                        latency=time.monotonic() - started,
+                        status=response.status,
+                    )
+                yield response
+        except Exception:
+            # Only transport errors - exceptions raised by the caller's block don't count
+            if not got_response:
+                stats["errors"] += 1
+                if proxy_url and self.proxy_manager:
+                    self.proxy_manager.record_result(proxy_url, success=False)
+            raise
+
+    async def send(self, method: str, url: str, proxy_url: Optional[str] = None, **kwargs) -> int:
+        """Send a request and release the connection without reading the body
+
+        For fire-and-forget calls (web dashboard logs/stats).
+
+        Returns:
+            HTTP status code
+        """
+        async with self.request(method, url, proxy_url=proxy_url, **kwargs) as response:
+            return response.status
+
+    def get(self, url: str, proxy_url: Optional[str] = None, **kwargs):
+        """Shortcut for request("GET", ...)"""
+        return self.request("GET", url, proxy_url=proxy_url, **kwargs)
+
+    def post(self, url: str, proxy_url: Optional[str] = None, **kwargs):
+        """Shortcut for request("POST", ...)"""
+        return self.request("POST", url, proxy_url=proxy_url, **kwargs)
+
+    async def close(self):
+        """Close all pooled sessions (call on bot shutdown)"""
+        for session in self._sessions.values():
+            if not session.closed:
+                try:
+                    await session.close()
+                except Exception as e:
+                    print(f"⚠️ Error closing HTTP session: {e}")
+        self._sessions.clear()
+
+    def get_stats(self) -> dict:
+        """Get pool utilisation statistics
+
+        Returns:
+            Dictionary with totals and per-pool connection usage
+        """
+        pools = {}
+        total_in_use = 0
+        total_idle = 0
+
+        for key, stats in self._pool_stats.items():
+            session = self._sessions.get(key)
+            connector = session.connector if session and not session.closed else None
+
+            in_use = 0
+            idle = 0
+            limit = 0
+            if connector is not None:
+                # aiohttp has no public API for this - read internals defensively
+                in_use = len(getattr(connector, "_acquired", ()))
+                idle = sum(len(conns) for conns in getattr(connector, "_conns", {}).values())
+                limit = connector.limit
+
+            total_in_use += in_use
+            total_idle += idle
+            pools[self._display_name(key)] = {
+                "in_use": in_use,
+                "idle": idle,
+                "limit": limit,
+                "utilisation_pct": round(in_use / limit * 100, 1) if limit else 0.0,
+                "requests": stats["requests"],
+                "errors": stats["errors"],
+            }
+
+        configured_proxies = len(self.proxy_manager.proxies) if self.proxy_manager else 0
+        return {
+            "open_pools": sum(1 for s in self._sessions.values() if not s.closed),
+            "configured_proxies": configured_proxies,
+            "total_requests": sum(s["requests"] for s in self._pool_stats.values()),
+            "total_errors": sum(s["errors"] for s in self._pool_stats.values()),
+            "connections_in_use": total_in_use,
+            "connections_idle": total_idle,
+            "pools": pools,
+        }
+
+
+# Process-wide shared client (lifecycle owned by ClubManagementBot)
+http_client = HttpClient()
@@ -2,11 +2,25 @@
 Proxy management module for rotating through proxy servers.
 
 Supports both authenticated (ip:port:user:pass) and simple (ip:port) formats.
+Proxies are picked by health score (latency + recent error rate); proxies that
+keep failing or get rate limited are ejected for an exponentially growing time.
 """
 
 import os
-import asyncio
-from typing import Optional, List
+import time
+import random
+from collections import deque
+from typing import Optional, List, Dict
+from urllib.parse import urlsplit
+
+from config import (
+    PROXY_EJECT_AFTER_FAILURES, PROXY_EJECT_BASE_SECONDS,
+    PROXY_EJECT_MAX_SECONDS, PROXY_HEALTH_WINDOW,
+)
+
+# Latency smoothing factor (EWMA) and floor used in the score
+LATENCY_EWMA_ALPHA = 0.3
+MIN_LATENCY_SECONDS = 0.05
 
 # ============================================================================
 # PROXY MANAGER
@@ -17,8 +31,9 @@ class ProxyManager:
     
     Features:
     - Load proxies from file with multiple formats
-    - Round-robin rotation
-    - Thread-safe access
+    - Weighted selection by health score (latency, recent error rate)
+    - Temporary ejection of failing / rate-limited proxies with exponential re-admission
+    - Per-proxy stats (for God Mode panel)
     - Reload capability
     """
     
@@ -30,8 +45,8 @@ class ProxyManager:
             proxy_file: Path to proxies.txt file
         """
         self.proxies: List[str] = []
-        self.current_index = 0
-        self.lock = asyncio.Lock()
+        self.health: Dict[str, dict] = {}
+        self.rng = random.Random()
         
         if proxy_file:
             self.load_proxies(proxy_file)
@@ -65,27 +80,158 @@ class ProxyManager:
                         ip, port, username, password = parts
                         proxy_url = f"http://{username}:{password}@{ip}:{port}"
                         self.proxies.append(proxy_url)
+                        self._get_health(proxy_url)
                     elif len(parts) == 2:
                         # Format: ip:port (no auth)
                         ip, port = parts
                         proxy_url = f"http://{ip}:{port}"
                         self.proxies.append(proxy_url)
+                        self._get_health(proxy_url)
             
             print(f"✅ Loaded {len(self.proxies)} proxies from {proxy_file}")
         except Exception as e:
             print(f"❌ Error loading proxies: {e}")
     
+    # ========================================================================
+    # HEALTH TRACKING
+    # ========================================================================
+    
+    def _get_health(self, proxy_url: str) -> dict:
+        """Get (or create) the health record of a proxy"""
+        health = self.health.get(proxy_url)
+        if health is None:
+            health = {
+                'requests': 0,
+                'failures': 0,
+                'rate_limited': 0,
+                'server_errors': 0,
+                'selected': 0,
+                'latency_ewma': None,
+                'recent': deque(maxlen=PROXY_HEALTH_WINDOW),  # True = success
+                'consecutive_failures': 0,
+                'ejected_until': 0.0,
+                'ejection_count': 0,  # Consecutive ejections (drives backoff)
+                'total_ejections': 0,
+                'probation': False,  # Re-admitted, one more failure ejects again
+            }
+            self.health[proxy_url] = health
+        return health
+    
+    def _default_latency(self) -> float:
+        """Latency assumed for proxies without measurements (mean of known ones)"""
+        known = [h['latency_ewma'] for h in self.health.values() if h['latency_ewma'] is not None]
+        return sum(known) / len(known) if known else 1.0
+    
+    def is_ejected(self, proxy_url: str) -> bool:
+        """Check if a proxy is currently ejected"""
+        return self._get_health(proxy_url)['ejected_until'] > time.monotonic()
+    
+    def get_score(self, proxy_url: str) -> float:
+        """Selection weight of a proxy (higher is better)
+        
+        Score = smoothed success rate² / latency, so a proxy failing half its
+        requests gets ~4x less traffic than a healthy one of the same speed.
+        """
+        health = self._get_health(proxy_url)
+        recent = health['recent']
+        # Laplace smoothing so new proxies start with a fair share
+        success_rate = (sum(recent) + 1) / (len(recent) + 2)
+        latency = health['latency_ewma']
+        if latency is None:
+            latency = self._default_latency()
+        return max(success_rate ** 2 / max(latency, MIN_LATENCY_SECONDS), 1e-6)
+    
+    def _eject(self, proxy_url: str, reason: str):
+        """Take a proxy out of rotation, doubling the time on each consecutive ejection"""
+        health = self._get_health(proxy_url)
+        duration = min(
+            PROXY_EJECT_BASE_SECONDS * (2 ** health['ejection_count']),
+            PROXY_EJECT_MAX_SECONDS
+        )
+        health['ejected_until'] = time.monotonic() + duration
+        health['ejection_count'] += 1
+        health['total_ejections'] += 1
+        health['consecutive_failures'] = 0
+        health['probation'] = True
+        print(f"🚫 Proxy {self.mask_proxy(proxy_url)} ejected for {duration:.0f}s ({reason})")
+    
+    def record_result(
+        self,
+        proxy_url: Optional[str],
+        success: bool,
+        latency: Optional[float] = None,
+        status: Optional[int] = None
+    ):
+        """Record the outcome of a request made through a proxy
+        
+        Args:
+            proxy_url: Proxy used (ignored if None or unknown)
+            success: True if the proxy delivered a usable response
+            latency: Seconds until response headers (None if no response)
+            status: HTTP status code (None on connection errors / timeouts)
+        """
+        if not proxy_url or proxy_url not in self.health:
+            return
+        
+        health = self.health[proxy_url]
+        health['requests'] += 1
+        health['recent'].append(bool(success))
+        
+        if latency is not None:
+            if health['latency_ewma'] is None:
+                health['latency_ewma'] = latency
+            else:
+                health['latency_ewma'] += LATENCY_EWMA_ALPHA * (latency - health['latency_ewma'])
+        
+        if status == 429:
+            health['rate_limited'] += 1
+        elif status is not None and status >= 500:
+            health['server_errors'] += 1
+        
+        if success:
+            health['consecutive_failures'] = 0
+            if health['probation']:
+                # Survived re-admission - reset the backoff
+                health['probation'] = False
+                health['ejection_count'] = 0
+            return
+        
+        health['failures'] += 1
+        health['consecutive_failures'] += 1
+        
+        if status == 429:
+            self._eject(proxy_url, "rate limited")
+        elif health['probation']:
+            self._eject(proxy_url, "failed after re-admission")
+        elif health['consecutive_failures'] >= PROXY_EJECT_AFTER_FAILURES:
+            self._eject(proxy_url, f"{health['consecutive_failures']} consecutive failures")
+    
+    # ========================================================================
+    # SELECTION
+    # ========================================================================
+    
     def get_next_proxy(self) -> Optional[str]:
-        """Get next proxy in rotation (thread-safe)
+        """Pick a proxy weighted by health score
+        
+        Ejected proxies are skipped. If every proxy is ejected, the one that
+        is re-admitted first is returned rather than no proxy at all.
         
         Returns:
-            Next proxy URL or None if no proxies loaded
+            Proxy URL or None if no proxies loaded
         """
         if not self.proxies:
             return None
         
-        proxy = self.proxies[self.current_index % len(self.proxies)]
-        self.current_index += 1
+        now = time.monotonic()
+        available = [p for p in self.proxies if self._get_health(p)['ejected_until'] <= now]
+        
+        if available:
+            weights = [self.get_score(p) for p in available]
+            proxy = self.rng.choices(available, weights=weights, k=1)[0]
+        else:
+            proxy = min(self.proxies, key=lambda p: self.health[p]['ejected_until'])
+        
+        self.health[proxy]['selected'] += 1
         return proxy
     
     def get_proxy_connector(self) -> Optional[str]:
@@ -114,5 +260,70 @@ class ProxyManager:
             proxy_file: Path to proxies file
         """
         self.proxies = []
-        self.current_index = 0
+        self.health = {}
         self.load_proxies(proxy_file)
+    
+    # ========================================================================
+    # STATS
+    # ========================================================================
+    
+    @staticmethod
+    def mask_proxy(proxy_url: str) -> str:
+        """Proxy label without credentials (host:port)"""
+        parts = urlsplit(proxy_url)
+        return f"{parts.hostname}:{parts.port}" if parts.hostname else "proxy"
+    
+    def get_proxy_stats(self) -> List[dict]:
+        """Get per-proxy health stats, best score first
+        
+        Returns:
+            List of dicts with proxy label, status, score, latency and error counters
+        """
+        now = time.monotonic()
+        stats = []
+        for proxy_url in dict.fromkeys(self.proxies):
+            health = self._get_health(proxy_url)
+            recent = health['recent']
+            ejected_for = max(0.0, health['ejected_until'] - now)
+            
+            if ejected_for > 0:
+                status = 'ejected'
+            elif health['probation']:
+                status = 'probation'
+            else:
+                status = 'active'
+            
+            stats.append({
+                'proxy': self.mask_proxy(proxy_url),
+                'status': status,
+                'score': round(self.get_score(proxy_url), 3),
+                'latency_ms': round(health['latency_ewma'] * 1000) if health['latency_ewma'] is not None else None,
+                'error_rate': round(1 - sum(recent) / len(recent), 3) if recent else 0.0,
+                'requests': health['requests'],
+                'selected': health['selected'],
+                'failures': health['failures'],
+                'rate_limited': health['rate_limited'],
+                'server_errors': health['server_errors'],
+                'ejected_for_seconds': round(ejected_for),
+                'total_ejections': health['total_ejections'],
+            })
+        
+        stats.sort(key=lambda s: s['score'], reverse=True)
+        return stats
+    
+    def get_stats(self) -> dict:
+        """Get summary of proxy pool health
+        
+        Returns:
+            Dictionary with total / active / ejected counts
+        """
+        per_proxy = self.get_proxy_stats()
+        ejected = sum(1 for s in per_proxy if s['status'] == 'ejected')
+        return {
+            'total': len(per_proxy),
+            'active': len(per_proxy) - ejected,
+            'ejected': ejected,
+            'requests': sum(s['requests'] for s in per_proxy),
+            'rate_limited': sum(s['rate_limited'] for s in per_proxy),
+            'server_errors': sum(s['server_errors'] for s in per_proxy),
+        }
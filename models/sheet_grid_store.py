@@ -0,0 +1,163 @@
+"""
+Last-known grids of sheets written by the club sync.
+
+The sync does not read Data sheets back before writing them, so the grid it
+wrote last is kept here and the next run sends only the cells that differ
+(see utils/sheet_diff.py). Grids are stored by content hash: the index maps
+sheet title -> hash, and each distinct grid is one `<hash>.json` file.
+
+An entry is dropped whenever the sheet may have been changed by something
+else (sheet (re)created, a write failed), so the next write is a full
+rewrite instead of a diff against stale data.
+
+Structure:
+    <dir>/index.json   { 'sheet title': 'hash', ... }
+    <dir>/<hash>.json  [[cell, ...], ...] (normalized strings)
+"""
+
+import os
+import json
+from typing import Dict, List, Optional
+
+from config import SHEET_GRID_STORE_DIR
+from utils.sheet_diff import normalize_grid, grid_hash
+
+# ============================================================================
+# SHEET GRID STORE
+# ============================================================================
+
+
+class SheetGridStore:
+    """Sheet title -> last written grid, content-addressed on disk
+
+    Features:
+    - Unchanged check by hash without loading the grid
+    - Identical grids stored once
+    - Atomic index / grid writes (survives restarts)
+    """
+
+    def __init__(self, directory: str = SHEET_GRID_STORE_DIR):
+        """
+        Initialize SheetGridStore
+
+        Args:
+            directory: Directory holding index.json and the grid files
+        """
+        self.directory = directory
+        self.index_file = os.path.join(directory, "index.json")
+        self.index: Dict[str, str] = {}
+
+        # Metrics
+        self.unchanged = 0
+        self.diffed = 0
+        self.full_writes = 0
+        self.cells_written = 0
+        self._load()
+
+    def _load(self):
+        """Load the index from disk"""
+        os.makedirs(self.directory, exist_ok=True)
+        if not os.path.exists(self.index_file):
+            return
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+            print(f"✅ Loaded sheet grid index: {len(self.index)} sheets")
+        except Exception as e:
+            print(f"⚠️ Could not load sheet grid index: {e}")
+            self.index = {}
+
+    def _write_json(self, path: str, data):
+        temp_file = f"{path}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_file, path)
+
+    def _grid_file(self, content_hash: str) -> str:
+        return os.path.join(self.directory, f"{content_hash}.json")
+
+    def get_hash(self, title: str) -> Optional[str]:
+        """Hash of the sheet's last written grid (None if unknown)"""
+        return self.index.get(title)
+
+    def get(self, title: str) -> Optional[List[List[str]]]:
+        """Last written grid of a sheet (normalized), or None if unknown"""
+        content_hash = self.index.get(title)
+        if content_hash is None:
+            return None
+        try:
+            with open(self._grid_file(content_hash), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ Sheet grid for '{title}' unreadable, forgetting it: {e}")
+            self.forget(title)
+            return None
+
+    def put(self, title: str, grid: List[list]):
+        """Record the grid that was just written to a sheet
+
+        Args:
+            title: Worksheet title
+            grid: Written grid (raw values; stored normalized)
+        """
+        normalized = normalize_grid(grid)
+        content_hash = grid_hash(normalized)
+        previous = self.index.get(title)
+        try:
+            if not os.path.exists(self._grid_file(content_hash)):
+                self._write_json(self._grid_file(content_hash), normalized)
+            self.index[title] = content_hash
+            self._write_json(self.index_file, self.index)
+        except Exception as e:
+            print(f"⚠️ Could not save sheet grid for '{title}': {e}")
+            self.index.pop(title, None)
+            return
+        if previous and previous != content_hash:
+            self._remove_unused(previous)
+
+    def forget(self, title: str):
+        """Drop a sheet's grid (next write is a full rewrite)"""
+        previous = self.index.pop(title, None)
+        if previous is None:
+            return
+        try:
+            self._write_json(self.index_file, self.index)
+        except Exception as e:
+            print(f"⚠️ Could not save sheet grid index: {e}")
+        self._remove_unused(previous)
+
+    def _remove_unused(self, content_hash: str):
+        if content_hash in self.index.values():
+            return
+        try:
+            os.remove(self._grid_file(content_hash))
+        except OSError:
+            pass
+
+    def count_write(self, mode: str, cells: int):
+        """Count one sheet write ('unchanged', 'diff' or 'full')"""
+        if mode == 'unchanged':
+            self.unchanged += 1
+        elif mode == 'diff':
+            self.diffed += 1
+        else:
+            self.full_writes += 1
+        self.cells_written += cells
+
+    def get_stats(self) -> dict:
+        """Get store statistics
+
+        Returns:
+            Dictionary with sheet count and write counters
+        """
+        return {
+            'sheets': len(self.index),
+            'unchanged': self.unchanged,
+            'diffed': self.diffed,
+            'full_writes': self.full_writes,
+            'cells_written': self.cells_written,
+        }
+
+
+# Process-wide store used by the club data sync
+sheet_grid_store = SheetGridStore()
@@ -0,0 +1,378 @@
+"""
+Global rate limiter for Google Sheets API traffic.
+
+Every gspread request goes through one token bucket sized to the Sheets quota
+(60 requests/minute per user). The limiter is installed on the gspread
+client's HTTP layer (`install_sheets_limiter`), so worksheet lookups, reads
+and writes are all paced without sleeps at the call sites.
+
+gspread is synchronous and runs in worker threads, so the bucket is
+thread-safe and blocks the calling thread. It is for worker threads only:
+every gspread call must go through `to_sheets_thread` / `asyncio.to_thread`,
+because a request waiting for a token on the event loop thread would freeze
+the whole bot. Requests made on the loop thread are counted and reported
+once per call site. The priority of a request comes
+from a context variable that is copied into the thread, so background tasks
+mark themselves with `@background_sheets_traffic` and everything else counts
+as interactive. Interactive requests are served first and background traffic
+never takes the last few tokens.
+
+Background calls go through `to_sheets_thread`, which runs them on a small
+dedicated pool: a sync waiting for tokens then parks at most
+SHEETS_BACKGROUND_THREADS threads instead of filling the default executor
+that commands use for their own asyncio.to_thread calls.
+
+On 429 the whole bucket pauses for Retry-After (or an exponential backoff)
+and the request is retried.
+"""
+
+import time
+import random
+import asyncio
+import functools
+import threading
+import traceback
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from config import (
+    SHEETS_REQUESTS_PER_MINUTE,
+    SHEETS_BURST,
+    SHEETS_INTERACTIVE_RESERVE,
+    SHEETS_429_MAX_RETRIES,
+    SHEETS_429_BACKOFF_SECONDS,
+    SHEETS_BACKGROUND_THREADS,
+)
+
+# ============================================================================
+# PRIORITIES
+# ============================================================================
+
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+
+_sheets_priority: contextvars.ContextVar = contextvars.ContextVar('sheets_priority', default=INTERACTIVE)
+
+
+def background_sheets_traffic(func):
+    """Mark an async task so its Sheets requests run at background priority
+
+    Usage:
+        @tasks.loop(hours=1)
+        @background_sheets_traffic
+        async def update_task(): ...
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        token = _sheets_priority.set(BACKGROUND)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _sheets_priority.reset(token)
+    return wrapper
+
+
+def current_sheets_priority() -> str:
+    """Priority of Sheets requests made from the current context"""
+    return _sheets_priority.get()
+
+
+_background_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _background_pool() -> ThreadPoolExecutor:
+    global _background_executor
+    if _background_executor is None:
+        _background_executor = ThreadPoolExecutor(
+            max_workers=max(1, SHEETS_BACKGROUND_THREADS),
+            thread_name_prefix='sheets-background',
+        )
+    return _background_executor
+
+
+async def to_sheets_thread(func, *args, **kwargs):
+    """Run a blocking Sheets call in a worker thread (like asyncio.to_thread)
+
+    Interactive calls use the default executor. Background calls use a
+    bounded pool of their own, so threads blocked on the limiter never
+    starve the default executor.
+
+    Args:
+        func: Blocking gspread call
+
+    Returns:
+        func's result
+    """
+    if _sheets_priority.get() != BACKGROUND:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(_background_pool(), call)
+
+
+# ============================================================================
+# SHEETS RATE LIMITER
+# ============================================================================
+
+
+def _retry_after_seconds(error) -> Optional[float]:
+    """Read Retry-After (seconds) from a gspread APIError, if present"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    value = headers.get('Retry-After')
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _status_code(error) -> Optional[int]:
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None)
+
+
+def _on_event_loop_thread() -> bool:
+    """True if the current thread is running an asyncio event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _caller_site() -> str:
+    """First stack frame outside this module and installed packages"""
+    for frame in reversed(traceback.extract_stack()[:-1]):
+        if frame.filename != __file__ and 'site-packages' not in frame.filename:
+            return f"{frame.filename}:{frame.lineno}"
+    return 'unknown'
+
+
+class SheetsRateLimiter:
+    """Thread-safe token bucket shared by all Google Sheets requests
+
+    Waiting blocks the calling thread, so it must be a worker thread, never
+    the event loop thread.
+
+    Features:
+    - One bucket for the whole process (sized to the per-user quota)
+    - Interactive requests before background ones, with reserved tokens
+    - Global pause on 429, honouring Retry-After
+    - Per-priority request / wait metrics
+    - Warning (once per call site) for requests made on the event loop thread
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = SHEETS_REQUESTS_PER_MINUTE,
+        burst: float = SHEETS_BURST,
+        interactive_reserve: float = SHEETS_INTERACTIVE_RESERVE,
+        max_retries: int = SHEETS_429_MAX_RETRIES,
+        backoff_seconds: float = SHEETS_429_BACKOFF_SECONDS,
+    ):
+        """
+        Initialize SheetsRateLimiter
+
+        Args:
+            requests_per_minute: Sustained request rate
+            burst: Bucket capacity
+            interactive_reserve: Tokens background traffic leaves for commands
+            max_retries: Retries of a request that got 429
+            backoff_seconds: First pause after a 429 without Retry-After (doubles)
+        """
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(burst)
+        self.reserve = min(float(interactive_reserve), self.capacity - 1)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+        self._waiting = {INTERACTIVE: 0, BACKGROUND: 0}
+
+        # Metrics
+        self.stats = {
+            priority: {'requests': 0, 'wait_seconds': 0.0, 'max_wait_seconds': 0.0}
+            for priority in (INTERACTIVE, BACKGROUND)
+        }
+        self.rate_limited = 0
+        self.retries = 0
+        self.paused_seconds = 0.0
+        self.loop_thread_requests = 0
+        self._loop_thread_sites = set()
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._last_refill = now
+
+    def _report_loop_thread_request(self):
+        """Count a request made on the event loop thread, warn once per call site"""
+        site = _caller_site()
+        with self._cond:
+            self.loop_thread_requests += 1
+            if site in self._loop_thread_sites:
+                return
+            self._loop_thread_sites.add(site)
+        print(f"⚠️ Sheets request on the event loop thread blocks the bot while it waits; "
+              f"run it via to_sheets_thread ({site})")
+
+    def acquire(self, priority: str = None) -> float:
+        """Block until a request may be sent
+
+        Only call this from a worker thread: the wait blocks the thread.
+
+        Args:
+            priority: INTERACTIVE or BACKGROUND (default: from the current context)
+
+        Returns:
+            Seconds spent waiting
+        """
+        priority = priority or _sheets_priority.get()
+        started = time.monotonic()
+        if _on_event_loop_thread():
+            self._report_loop_thread_request()
+
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+
+                    if now < self._paused_until:
+                        self._cond.wait(self._paused_until - now)
+                        continue
+
+                    if priority == BACKGROUND:
+                        # Commands go first; keep a few tokens for them
+                        floor = 1 + self.reserve
+                        if self._waiting[INTERACTIVE] or self._tokens < floor:
+                            self._cond.wait(max(floor - self._tokens, 0.05) / self.rate)
+                            continue
+                    elif self._tokens < 1:
+                        self._cond.wait((1 - self._tokens) / self.rate)
+                        continue
+
+                    self._tokens -= 1
+                    break
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+        waited = time.monotonic() - started
+        stats = self.stats[priority]
+        stats['requests'] += 1
+        stats['wait_seconds'] += waited
+        stats['max_wait_seconds'] = max(stats['max_wait_seconds'], waited)
+        return waited
+
+    def pause(self, seconds: float):
+        """Stop all requests for `seconds` (quota exhausted)"""
+        with self._cond:
+            until = time.monotonic() + seconds
+            if until > self._paused_until:
+                self.paused_seconds += until - max(self._paused_until, time.monotonic())
+                self._paused_until = until
+            # Start the next window without a burst
+            self._tokens = 0.0
+            self._cond.notify_all()
+
+    def call(self, func, *args, **kwargs):
+        """Run one Sheets request under the limiter, retrying on 429
+
+        Args:
+            func: Function doing exactly one HTTP request
+
+        Returns:
+            func's result
+        """
+        attempt = 0
+        while True:
+            self.acquire()
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if _status_code(e) != 429 or attempt >= self.max_retries:
+                    raise
+
+                self.rate_limited += 1
+                self.retries += 1
+                retry_after = _retry_after_seconds(e)
+                wait_time = retry_after if retry_after is not None else (
+                    self.backoff_seconds * (2 ** attempt) + random.uniform(0, 1)
+                )
+                print(f"⚠️ Sheets quota hit (429), pausing all Sheets requests for {wait_time:.1f}s "
+                      f"(retry {attempt + 1}/{self.max_retries})")
+                self.pause(wait_time)
+                attempt += 1
+
+    def get_stats(self) -> dict:
+        """Get limiter statistics
+
+        Returns:
+            Dictionary with rate, tokens, pause state and per-priority metrics
+        """
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            tokens = self._tokens
+            paused_for = max(self._paused_until - now, 0.0)
+            waiting = dict(self._waiting)
+
+        return {
+            'requests_per_minute': round(self.rate * 60, 1),
+            'capacity': self.capacity,
+            'available_tokens': round(tokens, 2),
+            'paused_for_seconds': round(paused_for, 1),
+            'waiting': waiting,
+            'rate_limited': self.rate_limited,
+            'retries': self.retries,
+            'paused_seconds': round(self.paused_seconds, 1),
+            'loop_thread_requests': self.loop_thread_requests,
+            'priorities': {
+                priority: {
+                    'requests': s['requests'],
+                    'avg_wait_seconds': round(s['wait_seconds'] / s['requests'], 3) if s['requests'] else 0.0,
+                    'max_wait_seconds': round(s['max_wait_seconds'], 2),
+                }
+                for priority, s in self.stats.items()
+            },
+        }
+
+
+# Process-wide limiter for all Sheets clients
+sheets_limiter = SheetsRateLimiter()
+
+
+def install_sheets_limiter(gc, limiter: SheetsRateLimiter = None):
+    """Route every request of a gspread client through the limiter
+
+    Wraps the client's HTTP `request` method (gspread 6: gc.http_client,
+    gspread 5: the client itself). Spreadsheets and worksheets opened from
+    the client share it, so all their calls are covered.
+
+    Args:
+        gc: gspread Client (from gspread.service_account)
+        limiter: Limiter to use (default: the shared sheets_limiter)
+    """
+    limiter = limiter or sheets_limiter
+    transport = getattr(gc, 'http_client', gc)
+    if getattr(transport, '_sheets_limited', False):
+        return gc
+
+    original_request = transport.request
+
+    @functools.wraps(original_request)
+    def limited_request(*args, **kwargs):
+        return limiter.call(original_request, *args, **kwargs)
+
+    transport.request = limited_request
+    transport._sheets_limited = True
+    return gc
@@ -0,0 +1,294 @@
+"""
+Write-behind queue for Google Sheets.
+
+Callers enqueue writes (value updates, sheet clears, formatting) and get an
+awaitable handle back. Pending writes are merged per spreadsheet and sent as
+few API requests as possible:
+
+    1. values_batch_clear   - all cleared worksheets
+    2. values_batch_update  - all value ranges (one request per input option)
+    3. batch_update         - all formatting requests
+
+Requests are paced by the global Sheets limiter (models/sheets_limiter.py),
+so the sync's many small writes (rank cells, member sheets, Data sheets,
+highlights) cost a handful of quota units and no sleeps.
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+from gspread.utils import a1_range_to_grid_range, absolute_range_name, rowcol_to_a1
+
+from config import SHEETS_WRITE_FLUSH_DELAY, SHEETS_WRITE_MAX_CELLS_PER_REQUEST
+from utils.error_handling import is_retryable_error
+from models.sheets_limiter import to_sheets_thread
+from utils.rate_limiter import AsyncRateLimiter
+
+# ============================================================================
+# SHEETS WRITE QUEUE
+# ============================================================================
+
+RAW = 'RAW'
+USER_ENTERED = 'USER_ENTERED'
+
+
+class SheetsWriteQueue:
+    """Merge pending Google Sheets writes into batch requests
+
+    Features:
+    - Awaitable completion handle per write (exceptions are set on the handle)
+    - Writes are merged per spreadsheet and flushed after a short delay
+    - Clearing a worksheet drops its earlier pending value updates
+    - Large value batches are split by cell count
+    - A rejected batch is bisected and resent, so only the offending writes fail
+    - Optional extra limiter on top of the global Sheets limiter
+    """
+
+    def __init__(
+        self,
+        rate_limiter: Optional[AsyncRateLimiter] = None,
+        flush_delay: float = SHEETS_WRITE_FLUSH_DELAY,
+        max_cells_per_request: int = SHEETS_WRITE_MAX_CELLS_PER_REQUEST,
+    ):
+        """
+        Initialize SheetsWriteQueue
+
+        Args:
+            rate_limiter: Optional limiter for the queue's requests (the global
+                Sheets limiter applies either way)
+            flush_delay: Seconds to wait for more writes before an automatic flush
+            max_cells_per_request: Split values_batch_update requests above this many cells
+        """
+        self.rate_limiter = rate_limiter
+        self.flush_delay = flush_delay
+        self.max_cells = max_cells_per_request
+
+        # spreadsheet id -> pending batch
+        self._pending: Dict[str, dict] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+
+        # Metrics
+        self.writes_enqueued = 0
+        self.requests_sent = 0
+        self.requests_failed = 0
+        self.last_flush_at: Optional[float] = None
+
+    # ========================================================================
+    # ENQUEUE
+    # ========================================================================
+
+    def _batch_for(self, spreadsheet) -> dict:
+        batch = self._pending.get(spreadsheet.id)
+        if batch is None:
+            batch = {
+                'spreadsheet': spreadsheet,
+                'clears': {},  # worksheet title -> handle
+                'values': {RAW: [], USER_ENTERED: []},  # [(worksheet title, range, values, handle)]
+                'requests': [],  # [(request dicts, handle)]
+            }
+            self._pending[spreadsheet.id] = batch
+        return batch
+
+    def _new_handle(self) -> asyncio.Future:
+        self.writes_enqueued += 1
+        self._schedule_flush()
+        return asyncio.get_running_loop().create_future()
+
+    def update(self, worksheet, range_name: str, values: List[list], value_input_option: str = RAW) -> asyncio.Future:
+        """Queue a value update (like worksheet.update(range_name, values))
+
+        Args:
+            worksheet: gspread Worksheet
+            range_name: A1 range within the worksheet (e.g. 'A1', 'K5')
+            values: 2D list of values
+            value_input_option: RAW (default) or USER_ENTERED (like update_cell)
+
+        Returns:
+            Handle resolved once the write is sent
+        """
+        handle = self._new_handle()
+        batch = self._batch_for(worksheet.spreadsheet)
+        batch['values'][value_input_option].append((worksheet.title, range_name, values, handle))
+        return handle
+
+    def update_cell(self, worksheet, row: int, col: int, value) -> asyncio.Future:
+        """Queue a single cell update (like worksheet.update_cell)"""
+        return self.update(worksheet, rowcol_to_a1(row, col), [[value]], USER_ENTERED)
+
+    def clear(self, worksheet) -> asyncio.Future:
+        """Queue clearing all values of a worksheet (like worksheet.clear)
+
+        Value updates for this worksheet queued before the clear are dropped
+        (their handles resolve immediately), so a clear + rewrite costs no more
+        than the rewrite itself.
+        """
+        handle = self._new_handle()
+        batch = self._batch_for(worksheet.spreadsheet)
+        for option, updates in batch['values'].items():
+            kept = []
+            for update in updates:
+                if update[0] == worksheet.title:
+                    if not update[3].done():
+                        update[3].set_result(None)
+                else:
+                    kept.append(update)
+            batch['values'][option] = kept
+
+        previous = batch['clears'].get(worksheet.title)
+        if previous is not None and not previous.done():
+            previous.set_result(None)
+        batch['clears'][worksheet.title] = handle
+        return handle
+
+    def batch_update(self, spreadsheet, requests: List[dict]) -> asyncio.Future:
+        """Queue raw spreadsheets.batchUpdate requests (formatting, etc.)"""
+        handle = self._new_handle()
+        self._batch_for(spreadsheet)['requests'].append((list(requests), handle))
+        return handle
+
+    def format_background(self, worksheet, ranges: List[str], rgb: Tuple[float, float, float]) -> asyncio.Future:
+        """Queue a background color for A1 ranges of a worksheet
+
+        Args:
+            worksheet: gspread Worksheet
+            ranges: A1 ranges (e.g. ['A5:Z5', 'A9:Z9'])
+            rgb: (red, green, blue) in 0..1
+
+        Returns:
+            Handle resolved once the formatting is sent
+        """
+        red, green, blue = rgb
+        requests = [{
+            'repeatCell': {
+                'range': a1_range_to_grid_range(cell_range, worksheet.id),
+                'cell': {'userEnteredFormat': {'backgroundColor': {'red': red, 'green': green, 'blue': blue}}},
+                'fields': 'userEnteredFormat.backgroundColor',
+            }
+        } for cell_range in ranges]
+        return self.batch_update(worksheet.spreadsheet, requests)
+
+    # ========================================================================
+    # FLUSH
+    # ========================================================================
+
+    def _schedule_flush(self):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._delayed_flush())
+
+    async def _delayed_flush(self):
+        # Keep going while writes arrive during a flush
+        while True:
+            await asyncio.sleep(self.flush_delay)
+            await self.flush()
+            if not self._pending:
+                break
+
+    async def flush(self):
+        """Send all pending writes now and wait until they are done"""
+        async with self._flush_lock:
+            pending, self._pending = self._pending, {}
+            for batch in pending.values():
+                await self._flush_spreadsheet(batch)
+            if pending:
+                self.last_flush_at = time.time()
+
+    async def _send_parts(self, call, parts: List[Tuple[list, asyncio.Future]], make_args):
+        """Send merged writes as one request; bisect it if the API rejects it
+
+        A batch request is atomic, so one bad range or request (deleted
+        worksheet, invalid grid range) fails every write merged into it.
+        On a non-retryable error the parts are split in half and resent
+        until the failure is narrowed down to the offending writes.
+        Retryable errors (quota, 5xx) fail the whole batch as before,
+        since resending halves would only multiply the load.
+
+        Args:
+            call: Spreadsheet method to call (e.g. spreadsheet.values_batch_update)
+            parts: (payload items, handle) per queued write
+            make_args: Builds the call's arguments from a flat payload list
+
+        Returns:
+            True if every part was sent
+        """
+        parts = [(items, handle) for items, handle in parts if not handle.done()]
+        if not parts:
+            return True
+
+        if self.rate_limiter:
+            await self.rate_limiter.acquire()
+        payload = [item for items, _ in parts for item in items]
+        try:
+            await to_sheets_thread(call, *make_args(payload))
+            self.requests_sent += 1
+        except Exception as e:
+            self.requests_failed += 1
+            if len(parts) > 1 and not is_retryable_error(e):
+                middle = len(parts) // 2
+                first = await self._send_parts(call, parts[:middle], make_args)
+                second = await self._send_parts(call, parts[middle:], make_args)
+                return first and second
+            for _, handle in parts:
+                if not handle.done():
+                    handle.set_exception(e)
+            return False
+
+        for _, handle in parts:
+            if not handle.done():
+                handle.set_result(None)
+        return True
+
+    async def _flush_spreadsheet(self, batch: dict):
+        spreadsheet = batch['spreadsheet']
+
+        # 1. Clears first, so updates queued after a clear land on the empty sheet
+        clears = batch['clears']
+        if clears:
+            parts = [([absolute_range_name(title)], handle) for title, handle in clears.items()]
+            await self._send_parts(spreadsheet.values_batch_clear, parts,
+                                   lambda ranges: (None, {'ranges': ranges}))
+
+        # 2. Value updates, split into requests of at most max_cells cells
+        for option, updates in batch['values'].items():
+            def make_args(data, option=option):
+                return ({'valueInputOption': option, 'data': data},)
+
+            parts, cells = [], 0
+            for title, range_name, values, handle in updates:
+                size = sum(len(row) for row in values)
+                if parts and cells + size > self.max_cells:
+                    await self._send_parts(spreadsheet.values_batch_update, parts, make_args)
+                    parts, cells = [], 0
+                parts.append(([{'range': absolute_range_name(title, range_name), 'values': values}], handle))
+                cells += size
+            if parts:
+                await self._send_parts(spreadsheet.values_batch_update, parts, make_args)
+
+        # 3. Formatting and other structural requests
+        if batch['requests']:
+            await self._send_parts(spreadsheet.batch_update, batch['requests'],
+                                   lambda requests: ({'requests': requests},))
+
+    def get_stats(self) -> dict:
+        """Get queue statistics
+
+        Returns:
+            Dictionary with pending / enqueued writes and request counters
+        """
+        pending = 0
+        for batch in self._pending.values():
+            pending += len(batch['clears']) + len(batch['requests'])
+            pending += sum(len(updates) for updates in batch['values'].values())
+        return {
+            'pending_writes': pending,
+            'writes_enqueued': self.writes_enqueued,
+            'requests_sent': self.requests_sent,
+            'requests_failed': self.requests_failed,
+            'writes_per_request': round(self.writes_enqueued / self.requests_sent, 1) if self.requests_sent else None,
+            'last_flush_age_seconds': round(time.time() - self.last_flush_at, 1) if self.last_flush_at else None,
+        }
+
+
+# Process-wide queue used by the club data sync
+sheets_write_queue = SheetsWriteQueue()
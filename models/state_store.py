@@ -0,0 +1,587 @@
+"""
+Embedded SQLite store for bot state.
+
+Replaces the JSON state files that were loaded and rewritten in full on
+every change (profile links, allowed channels, admin list, server invites,
+channel change log, tournaments). Each change is now a single-row upsert in
+a transaction, so writes are O(1) and concurrent writers can't lose updates.
+
+Tables keep the lookup keys as indexed columns and the original dict as JSON
+in `data`, so records round-trip exactly as the JSON files stored them.
+
+- Opened explicitly at startup (`state_store.open()`), not on import
+- WAL journal: readers never block the writer
+- Per-table change counters in `meta` (`table_version()`), so a cache of one
+  table only reloads when that table changed
+- One-time import from the legacy JSON files (tracked in the meta table)
+- `aio` exposes every method as a coroutine (runs in a worker thread)
+- `backup()` / `restore()` snapshot the live database with SQLite's online
+  backup API (used by auto_backup.py)
+"""
+
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+from config import (
+    STATE_DB_FILE,
+    SCRIPT_DIR,
+    PROFILE_LINKS_FILE,
+    ALLOWED_CHANNELS_CONFIG_FILE,
+    ADMIN_LIST_FILE,
+    SERVER_INVITES_FILE,
+    CHANNEL_CHANGE_LOG_FILE,
+)
+
+TOURNAMENTS_JSON_DIR = os.path.join(SCRIPT_DIR, "tournaments")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS profile_links (
+    discord_id TEXT PRIMARY KEY,
+    viewer_id TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_profile_links_viewer ON profile_links(viewer_id);
+CREATE TABLE IF NOT EXISTS allowed_channels (
+    channel_id INTEGER PRIMARY KEY,
+    guild_id INTEGER,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_allowed_channels_guild ON allowed_channels(guild_id);
+CREATE TABLE IF NOT EXISTS admins (
+    user_id INTEGER PRIMARY KEY,
+    updated_by INTEGER,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS server_invites (
+    guild_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS channel_change_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    action TEXT,
+    channel_id INTEGER,
+    guild_id INTEGER,
+    changed_by INTEGER,
+    timestamp TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_channel_change_log_channel ON channel_change_log(channel_id);
+CREATE INDEX IF NOT EXISTS idx_channel_change_log_guild ON channel_change_log(guild_id);
+CREATE TABLE IF NOT EXISTS tournaments (
+    id TEXT PRIMARY KEY,
+    guild_id INTEGER,
+    status TEXT,
+    updated_at REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tournaments_guild ON tournaments(guild_id);
+"""
+
+# ============================================================================
+# STATE STORE
+# ============================================================================
+
+
+class _AsyncStateStore:
+    """Coroutine versions of the StateStore methods (run in a worker thread)"""
+
+    def __init__(self, store: 'StateStore'):
+        self._store = store
+
+    def __getattr__(self, name):
+        method = getattr(self._store, name)
+
+        async def call(*args, **kwargs):
+            return await asyncio.to_thread(method, *args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+
+class StateStore:
+    """SQLite-backed store for profile links, channels, admins, invites, tournaments
+
+    Features:
+    - Explicit open() at startup; using the store before that raises
+    - WAL journal with indexed key columns (discord_id, viewer_id, channel_id, guild_id)
+    - Single-row transactional writes instead of full-file rewrites
+    - One-time import of the legacy JSON files
+    - Async access layer (`store.aio.method(...)`)
+    - Online backup to a snapshot file
+    """
+
+    def __init__(self, db_file: str = STATE_DB_FILE, import_legacy: bool = True):
+        """
+        Initialize StateStore (the database is opened by open())
+
+        Args:
+            db_file: SQLite database path
+            import_legacy: Import the JSON state files on first open
+        """
+        self.db_file = db_file
+        self.import_legacy = import_legacy
+        self._lock = threading.RLock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self.aio = _AsyncStateStore(self)
+
+    def open(self) -> 'StateStore':
+        """Open the database, create the schema and import legacy JSON once
+
+        Safe to call more than once.
+
+        Returns:
+            The store itself
+        """
+        with self._lock:
+            if self._connection is not None:
+                return self
+            conn = sqlite3.connect(self.db_file, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.executescript(SCHEMA)
+            self._connection = conn
+
+        if self.import_legacy:
+            self.import_legacy_json()
+        print(f"✅ State store opened: {self.db_file}")
+        return self
+
+    @property
+    def is_open(self) -> bool:
+        return self._connection is not None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        if self._connection is None:
+            raise RuntimeError("State store is not open (call state_store.open() at startup)")
+        return self._connection
+
+    # ========================================================================
+    # HELPERS
+    # ========================================================================
+
+    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _write(self, table: str, statements: List[tuple]):
+        """Run statements in one transaction and bump the table's version"""
+        statements = statements + [(
+            "INSERT INTO meta (key, value) VALUES (?, '1') "
+            "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1",
+            (f"version:{table}",)
+        )]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for sql, params in statements:
+                    if isinstance(params, list):
+                        self._conn.executemany(sql, params)
+                    else:
+                        self._conn.execute(sql, params)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def table_version(self, table: str) -> int:
+        """Change counter of one table (bumped by every write to it, from any connection)"""
+        rows = self._query("SELECT value FROM meta WHERE key = ?", (f"version:{table}",))
+        return int(rows[0]['value']) if rows else 0
+
+    @staticmethod
+    def _int_or_none(value) -> Optional[int]:
+        try:
+            return int(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+
+    # ========================================================================
+    # PROFILE LINKS
+    # ========================================================================
+
+    def get_profile_link(self, discord_id) -> Optional[dict]:
+        """Get one user's profile link (None if not linked)"""
+        rows = self._query("SELECT data FROM profile_links WHERE discord_id = ?", (str(discord_id),))
+        return json.loads(rows[0]['data']) if rows else None
+
+    def get_profile_links_by_viewer(self, viewer_id) -> Dict[str, dict]:
+        """Get every Discord user linked to a viewer_id"""
+        rows = self._query("SELECT discord_id, data FROM profile_links WHERE viewer_id = ?", (str(viewer_id),))
+        return {row['discord_id']: json.loads(row['data']) for row in rows}
+
+    def get_all_profile_links(self) -> Dict[str, dict]:
+        """Get all profile links as {discord_id: link}"""
+        rows = self._query("SELECT discord_id, data FROM profile_links")
+        return {row['discord_id']: json.loads(row['data']) for row in rows}
+
+    def save_profile_link(self, discord_id, link: dict):
+        """Insert or replace one profile link"""
+        viewer_id = link.get('viewer_id')
+        self._write('profile_links', [(
+            "INSERT OR REPLACE INTO profile_links (discord_id, viewer_id, data) VALUES (?, ?, ?)",
+            (str(discord_id), str(viewer_id) if viewer_id else None, json.dumps(link, ensure_ascii=False))
+        )])
+
+    def delete_profile_link(self, discord_id) -> bool:
+        """Remove a profile link"""
+        with self._lock:
+            existed = bool(self._query("SELECT 1 FROM profile_links WHERE discord_id = ?", (str(discord_id),)))
+            if existed:
+                self._write('profile_links', [("DELETE FROM profile_links WHERE discord_id = ?", (str(discord_id),))])
+        return existed
+
+    # ========================================================================
+    # ALLOWED CHANNELS
+    # ========================================================================
+
+    def list_allowed_channels(self) -> List[dict]:
+        """Allowed channels in the order they were added"""
+        rows = self._query("SELECT data FROM allowed_channels ORDER BY position")
+        return [json.loads(row['data']) for row in rows]
+
+    def get_guild_channels(self, guild_id) -> List[dict]:
+        """Allowed channels of one server"""
+        rows = self._query(
+            "SELECT data FROM allowed_channels WHERE guild_id = ? ORDER BY position",
+            (self._int_or_none(guild_id),)
+        )
+        return [json.loads(row['data']) for row in rows]
+
+    def add_allowed_channel(self, channel: dict) -> bool:
+        """Add a channel (False if it is already allowed)"""
+        with self._lock:
+            if self._query("SELECT 1 FROM allowed_channels WHERE channel_id = ?", (channel['channel_id'],)):
+                return False
+            self._write('allowed_channels', [(
+                "INSERT INTO allowed_channels (channel_id, guild_id, position, data) "
+                "VALUES (?, ?, (SELECT COALESCE(MAX(position), -1) + 1 FROM allowed_channels), ?)",
+                (channel['channel_id'], self._int_or_none(channel.get('server_id')),
+                 json.dumps(channel, ensure_ascii=False))
+            )])
+        return True
+
+    def remove_allowed_channel(self, channel_id) -> bool:
+        """Remove a channel (False if it wasn't allowed)"""
+        with self._lock:
+            if not self._query("SELECT 1 FROM allowed_channels WHERE channel_id = ?", (channel_id,)):
+                return False
+            self._write('allowed_channels', [("DELETE FROM allowed_channels WHERE channel_id = ?", (channel_id,))])
+        return True
+
+    def replace_allowed_channels(self, channels: List[dict]):
+        """Replace the whole allowed channel list (bulk edits / pruning)"""
+        rows = [
+            (ch['channel_id'], self._int_or_none(ch.get('server_id')), position, json.dumps(ch, ensure_ascii=False))
+            for position, ch in enumerate(channels)
+        ]
+        self._write('allowed_channels', [
+            ("DELETE FROM allowed_channels", ()),
+            ("INSERT OR REPLACE INTO allowed_channels (channel_id, guild_id, position, data) VALUES (?, ?, ?, ?)", rows),
+        ])
+
+    # ========================================================================
+    # ADMINS
+    # ========================================================================
+
+    def list_admins(self) -> List[int]:
+        """Dynamic admin user IDs"""
+        return [row['user_id'] for row in self._query("SELECT user_id FROM admins ORDER BY rowid")]
+
+    def replace_admins(self, admin_ids: List[int], updated_by: int = None, updated_at: str = None):
+        """Replace the dynamic admin list"""
+        self._write('admins', [
+            ("DELETE FROM admins", ()),
+            ("INSERT OR REPLACE INTO admins (user_id, updated_by, updated_at) VALUES (?, ?, ?)",
+             [(int(admin_id), updated_by, updated_at) for admin_id in admin_ids]),
+        ])
+
+    # ========================================================================
+    # SERVER INVITES
+    # ========================================================================
+
+    def get_server_invites(self) -> Dict[str, dict]:
+        """All server invites as {guild_id: invite}"""
+        rows = self._query("SELECT guild_id, data FROM server_invites")
+        return {row['guild_id']: json.loads(row['data']) for row in rows}
+
+    def get_server_invite(self, guild_id) -> Optional[dict]:
+        """One server's invite (None if missing)"""
+        rows = self._query("SELECT data FROM server_invites WHERE guild_id = ?", (str(guild_id),))
+        return json.loads(rows[0]['data']) if rows else None
+
+    def save_server_invite(self, guild_id, invite: dict):
+        """Insert or replace a server invite"""
+        self._write('server_invites', [(
+            "INSERT OR REPLACE INTO server_invites (guild_id, data) VALUES (?, ?)",
+            (str(guild_id), json.dumps(invite, ensure_ascii=False))
+        )])
+
+    def delete_server_invite(self, guild_id) -> Optional[dict]:
+        """Remove a server invite
+
+        Returns:
+            The removed invite, or None if there was none
+        """
+        with self._lock:
+            invite = self.get_server_invite(guild_id)
+            if invite is not None:
+                self._write('server_invites', [("DELETE FROM server_invites WHERE guild_id = ?", (str(guild_id),))])
+        return invite
+
+    # ========================================================================
+    # CHANNEL CHANGE LOG
+    # ========================================================================
+
+    def log_channel_change(self, entry: dict):
+        """Append a channel configuration change"""
+        self._write('channel_change_log', [(
+            "INSERT INTO channel_change_log (action, channel_id, guild_id, changed_by, timestamp, data) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (entry.get('action'), self._int_or_none(entry.get('channel_id')),
+             self._int_or_none(entry.get('server_id')), self._int_or_none(entry.get('changed_by')),
+             entry.get('timestamp'), json.dumps(entry, ensure_ascii=False))
+        )])
+
+    def get_channel_changes(self, limit: int = 50, guild_id=None) -> List[dict]:
+        """Most recent channel changes first"""
+        if guild_id is not None:
+            rows = self._query(
+                "SELECT data FROM channel_change_log WHERE guild_id = ? ORDER BY id DESC LIMIT ?",
+                (self._int_or_none(guild_id), limit)
+            )
+        else:
+            rows = self._query("SELECT data FROM channel_change_log ORDER BY id DESC LIMIT ?", (limit,))
+        return [json.loads(row['data']) for row in rows]
+
+    # ========================================================================
+    # TOURNAMENTS
+    # ========================================================================
+
+    def save_tournament(self, tournament: dict):
+        """Insert or replace a tournament (Tournament.to_dict())"""
+        self._write('tournaments', [(
+            "INSERT OR REPLACE INTO tournaments (id, guild_id, status, updated_at, data) VALUES (?, ?, ?, ?, ?)",
+            (tournament['id'], self._int_or_none(tournament.get('guild_id')), tournament.get('status'),
+             time.time(), json.dumps(tournament, ensure_ascii=False))
+        )])
+
+    def get_tournament(self, tournament_id: str) -> Optional[dict]:
+        """Get one tournament dict (None if missing)"""
+        rows = self._query("SELECT data FROM tournaments WHERE id = ?", (tournament_id,))
+        return json.loads(rows[0]['data']) if rows else None
+
+    def list_tournaments(self, exclude_status: str = None) -> List[dict]:
+        """All tournaments, optionally skipping one status (e.g. 'completed')"""
+        if exclude_status:
+            rows = self._query(
+                "SELECT data FROM tournaments WHERE status IS NOT ? ORDER BY updated_at", (exclude_status,)
+            )
+        else:
+            rows = self._query("SELECT data FROM tournaments ORDER BY updated_at")
+        return [json.loads(row['data']) for row in rows]
+
+    def delete_tournament(self, tournament_id: str) -> bool:
+        """Remove a tournament"""
+        with self._lock:
+            existed = bool(self._query("SELECT 1 FROM tournaments WHERE id = ?", (tournament_id,)))
+            if existed:
+                self._write('tournaments', [("DELETE FROM tournaments WHERE id = ?", (tournament_id,))])
+        return existed
+
+    # ========================================================================
+    # LEGACY JSON IMPORT
+    # ========================================================================
+
+    def _imported(self, name: str) -> bool:
+        return bool(self._query("SELECT 1 FROM meta WHERE key = ?", (f"imported:{name}",)))
+
+    def _mark_imported(self, name: str, statements: List[tuple]):
+        statements.append((
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            (f"imported:{name}", str(time.time()))
+        ))
+        self._write(name, statements)
+
+    @staticmethod
+    def _read_json(path: str):
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def import_legacy_json(self) -> Dict[str, int]:
+        """Import the JSON state files once (each table is imported at most once)
+
+        The JSON files are left in place as a fallback copy.
+
+        Returns:
+            Number of imported records per table (only tables imported now)
+        """
+        imported = {}
+        importers = [
+            ('profile_links', PROFILE_LINKS_FILE, self._import_profile_links),
+            ('allowed_channels', ALLOWED_CHANNELS_CONFIG_FILE, self._import_allowed_channels),
+            ('admins', ADMIN_LIST_FILE, self._import_admins),
+            ('server_invites', SERVER_INVITES_FILE, self._import_server_invites),
+            ('channel_change_log', CHANNEL_CHANGE_LOG_FILE, self._import_channel_change_log),
+        ]
+        for name, path, importer in importers:
+            if self._imported(name):
+                continue
+            try:
+                data = self._read_json(path)
+                statements, count = importer(data) if data else ([], 0)
+                self._mark_imported(name, statements)
+                if count:
+                    imported[name] = count
+            except Exception as e:
+                print(f"⚠️ State store: could not import {os.path.basename(path)}: {e}")
+
+        if not self._imported('tournaments'):
+            try:
+                statements, count = self._import_tournaments()
+                self._mark_imported('tournaments', statements)
+                if count:
+                    imported['tournaments'] = count
+            except Exception as e:
+                print(f"⚠️ State store: could not import tournaments: {e}")
+
+        for name, count in imported.items():
+            print(f"📥 State store: imported {count} {name} from JSON")
+        return imported
+
+    def _import_profile_links(self, data: dict):
+        rows = [
+            (str(discord_id), str(link.get('viewer_id')) if link.get('viewer_id') else None,
+             json.dumps(link, ensure_ascii=False))
+            for discord_id, link in data.items()
+        ]
+        return [("INSERT OR REPLACE INTO profile_links (discord_id, viewer_id, data) VALUES (?, ?, ?)", rows)], len(rows)
+
+    def _import_allowed_channels(self, data: dict):
+        rows = [
+            (ch['channel_id'], self._int_or_none(ch.get('server_id')), position, json.dumps(ch, ensure_ascii=False))
+            for position, ch in enumerate(data.get('channels', []))
+        ]
+        return [("INSERT OR REPLACE INTO allowed_channels (channel_id, guild_id, position, data) VALUES (?, ?, ?, ?)", rows)], len(rows)
+
+    def _import_admins(self, data: dict):
+        rows = [(int(a), data.get('updated_by'), data.get('last_updated')) for a in data.get('admin_user_ids', [])]
+        return [("INSERT OR REPLACE INTO admins (user_id, updated_by, updated_at) VALUES (?, ?, ?)", rows)], len(rows)
+
+    def _import_server_invites(self, data: dict):
+        rows = [(str(gid), json.dumps(invite, ensure_ascii=False)) for gid, invite in data.get('invites', {}).items()]
+        return [("INSERT OR REPLACE INTO server_invites (guild_id, data) VALUES (?, ?)", rows)], len(rows)
+
+    def _import_channel_change_log(self, data: dict):
+        # JSON history is newest first; insert oldest first so ids increase with time
+        rows = [
+            (e.get('action'), self._int_or_none(e.get('channel_id')), self._int_or_none(e.get('server_id')),
+             self._int_or_none(e.get('changed_by')), e.get('timestamp'), json.dumps(e, ensure_ascii=False))
+            for e in reversed(data.get('history', []))
+        ]
+        return [(
+            "INSERT INTO channel_change_log (action, channel_id, guild_id, changed_by, timestamp, data) "
+            "VALUES (?, ?, ?, ?, ?, ?)", rows
+        )], len(rows)
+
+    def _import_tournaments(self):
+        rows = []
+        if os.path.isdir(TOURNAMENTS_JSON_DIR):
+            for filename in sorted(os.listdir(TOURNAMENTS_JSON_DIR)):
+                if not filename.endswith('.json'):
+                    continue
+                path = os.path.join(TOURNAMENTS_JSON_DIR, filename)
+                data = self._read_json(path)
+                if not data or 'id' not in data:
+                    continue
+                rows.append((data['id'], self._int_or_none(data.get('guild_id')), data.get('status'),
+                             os.path.getmtime(path), json.dumps(data, ensure_ascii=False)))
+        return [(
+            "INSERT OR REPLACE INTO tournaments (id, guild_id, status, updated_at, data) VALUES (?, ?, ?, ?, ?)", rows
+        )], len(rows)
+
+    # ========================================================================
+    # BACKUP / STATS
+    # ========================================================================
+
+    def backup(self, dest_path: str):
+        """Snapshot the live database to dest_path (online backup API)
+
+        A plain file copy of a WAL database can miss committed pages that are
+        still in the -wal file.
+        """
+        with self._lock:
+            dest = sqlite3.connect(dest_path)
+            try:
+                self._conn.backup(dest)
+            finally:
+                dest.close()
+
+    def restore(self, source_path: str):
+        """Replace the live database with a snapshot made by backup()
+
+        Table versions end up above both the snapshot's and the current ones,
+        so every cache of a table reloads.
+        """
+        with self._lock:
+            before = {row['key']: int(row['value']) for row in self._query(
+                "SELECT key, value FROM meta WHERE key LIKE 'version:%'"
+            )}
+            source = sqlite3.connect(source_path)
+            try:
+                source.backup(self._conn)
+            finally:
+                source.close()
+            after = {row['key']: int(row['value']) for row in self._query(
+                "SELECT key, value FROM meta WHERE key LIKE 'version:%'"
+            )}
+            versions = [
+                (key, str(max(before.get(key, 0), after.get(key, 0)) + 1))
+                for key in set(before) | set(after)
+            ]
+            self._conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", versions)
+
+    def get_stats(self) -> dict:
+        """Get row counts per table and database size
+
+        Returns:
+            Dictionary with table counts and size in KB
+        """
+        counts = {}
+        for table in ('profile_links', 'allowed_channels', 'admins', 'server_invites',
+                      'channel_change_log', 'tournaments'):
+            counts[table] = self._query(f"SELECT COUNT(*) AS n FROM {table}")[0]['n']
+        size = sum(
+            os.path.getsize(path) for path in (self.db_file, f"{self.db_file}-wal")
+            if os.path.exists(path)
+        )
+        return {'tables': counts, 'size_kb': round(size / 1024, 1)}
+
+    def close(self):
+        """Checkpoint the WAL and close the connection"""
+        with self._lock:
+            if self._connection is None:
+                return
+            try:
+                self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            finally:
+                self._connection.close()
+                self._connection = None
+
+
+# Process-wide store (opened at startup with state_store.open())
+state_store = StateStore()
@@ -0,0 +1,168 @@
+"""
+Content hashes of the uma.moe payloads the club sync last applied.
+
+uma.moe data changes once per game day, but the sync runs three times a day.
+The hash covers what the sheets are built from: the members (viewer id, name,
+daily_fans) sorted by viewer id, plus the club settings used for the rows.
+When a club's hash and month match the last successful sync, the run skips
+its sheet read, planning and writes; only the rank is updated.
+
+Creating a worksheet drops the hashes of clubs that wrote a sheet with that
+title, so a re-created sheet is filled on the next run.
+
+Structure (persisted as JSON):
+    { 'club_name': {'hash': str, 'month': 'MM/YYYY', 'sheets': [titles], 'synced_at': float} }
+"""
+
+import os
+import json
+import time
+import hashlib
+from typing import Dict, Iterable
+
+from config import SYNC_PAYLOAD_STORE_FILE
+
+# ============================================================================
+# PAYLOAD HASH
+# ============================================================================
+
+
+def payload_hash(members: Iterable[dict], *settings) -> str:
+    """Hash of a club's normalized API members and sheet settings
+
+    Args:
+        members: API members (viewer_id, trainer_name, daily_fans)
+        *settings: Other inputs of the sheet rows (target, sheet names, ...)
+
+    Returns:
+        Hex digest; member order in the payload does not matter
+    """
+    normalized = sorted(
+        [
+            str(member.get('viewer_id', '')),
+            str(member.get('trainer_name', '')),
+            [int(fans or 0) for fans in member.get('daily_fans') or []],
+        ]
+        for member in members
+    )
+    payload = json.dumps([normalized, [str(setting) for setting in settings]],
+                         ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+# ============================================================================
+# SYNC PAYLOAD STORE
+# ============================================================================
+
+
+class SyncPayloadStore:
+    """Per-club hash of the last payload written to the sheets
+
+    Features:
+    - Unchanged check per club and month (a new month always re-syncs)
+    - Recorded only after the club's writes succeeded
+    - JSON persistence with atomic writes (survives restarts)
+    """
+
+    def __init__(self, store_file: str = SYNC_PAYLOAD_STORE_FILE):
+        """
+        Initialize SyncPayloadStore
+
+        Args:
+            store_file: Path of the persisted hashes
+        """
+        self.store_file = store_file
+        self.clubs: Dict[str, dict] = {}
+        self.dirty = False
+
+        # Metrics
+        self.skipped = 0
+        self.changed = 0
+        self._load()
+
+    def _load(self):
+        """Load the hashes from disk"""
+        if not os.path.exists(self.store_file):
+            return
+        try:
+            with open(self.store_file, 'r', encoding='utf-8') as f:
+                self.clubs = json.load(f)
+            print(f"✅ Loaded sync payload hashes: {len(self.clubs)} clubs")
+        except Exception as e:
+            print(f"⚠️ Could not load sync payload hashes: {e}")
+            self.clubs = {}
+
+    def save(self):
+        """Persist the hashes (atomic write, only if they changed)"""
+        if not self.dirty:
+            return
+        temp_file = f"{self.store_file}.tmp"
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.clubs, f, ensure_ascii=False)
+            os.replace(temp_file, self.store_file)
+            self.dirty = False
+        except Exception as e:
+            print(f"⚠️ Could not save sync payload hashes: {e}")
+
+    def is_unchanged(self, club_name: str, content_hash: str, month: str) -> bool:
+        """Check if a club's payload was already synced this month
+
+        Args:
+            club_name: Club name
+            content_hash: payload_hash() of the current payload
+            month: Current month ('MM/YYYY')
+
+        Returns:
+            True if the sheets already hold this payload
+        """
+        club = self.clubs.get(club_name)
+        if club is not None and club['hash'] == content_hash and club['month'] == month:
+            self.skipped += 1
+            return True
+        self.changed += 1
+        return False
+
+    def record(self, club_name: str, content_hash: str, month: str, sheets: Iterable[str] = ()):
+        """Remember the payload a club's sheets were just written from
+
+        Args:
+            club_name: Club name
+            content_hash: payload_hash() of the payload
+            month: Month the sheets were written for ('MM/YYYY')
+            sheets: Titles of the worksheets that were written
+        """
+        self.clubs[club_name] = {
+            'hash': content_hash,
+            'month': month,
+            'sheets': [title for title in sheets if title],
+            'synced_at': time.time(),
+        }
+        self.dirty = True
+
+    def forget(self, club_name: str):
+        """Drop a club's hash (its next sync runs in full)"""
+        if self.clubs.pop(club_name, None) is not None:
+            self.dirty = True
+
+    def forget_sheet(self, title: str):
+        """Drop the hashes of all clubs that wrote a worksheet with this title"""
+        for club_name in [name for name, club in self.clubs.items() if title in club.get('sheets', ())]:
+            self.forget(club_name)
+        self.save()
+
+    def get_stats(self) -> dict:
+        """Get store statistics
+
+        Returns:
+            Dictionary with club count and skip counters
+        """
+        return {
+            'clubs': len(self.clubs),
+            'skipped': self.skipped,
+            'changed': self.changed,
+        }
+
+
+# Process-wide store used by the club data sync
+sync_payload_store = SyncPayloadStore()
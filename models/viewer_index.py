@@ -0,0 +1,199 @@
+"""
+Viewer ID → club reverse index.
+
+Built during the club data sync from the uma.moe member payloads it already
+fetches, and persisted to disk, so /profile and transfer detection can find a
+player's clubs without fetching every tracked club again.
+
+Structure:
+    { 'viewer_id': { 'club_name': {
+        'club_name': str, 'club_id': str, 'circle_name': str,
+        'trainer_name': str, 'active_days': int, 'daily_fans': [int, ...],
+        'last_seen': float (unix time of the sync that saw the member)
+    } } }
+"""
+
+import os
+import json
+import time
+from typing import Dict, Iterable, List, Optional
+
+from config import VIEWER_INDEX_FILE, VIEWER_INDEX_MAX_AGE_SECONDS
+
+# ============================================================================
+# VIEWER INDEX
+# ============================================================================
+
+
+def count_active_days(daily_fans: list) -> int:
+    """Number of days with fan data (same rule as the live API search)"""
+    return sum(1 for fans in daily_fans if fans and fans > 0)
+
+
+class ViewerIndex:
+    """Reverse index of viewer_id → clubs, refreshed per club by the sync
+
+    Features:
+    - O(1) lookup of every tracked club a viewer is in
+    - O(1) lookup of a club by its uma.moe ID
+    - Per-club freshness: only stale or missing clubs need a live scan
+    - JSON persistence with atomic writes (survives restarts)
+    """
+
+    def __init__(self, index_file: str = VIEWER_INDEX_FILE, max_age_seconds: int = VIEWER_INDEX_MAX_AGE_SECONDS):
+        """
+        Initialize ViewerIndex
+
+        Args:
+            index_file: Path of the persisted index
+            max_age_seconds: Club entries older than this are considered stale
+        """
+        self.index_file = index_file
+        self.max_age = max_age_seconds
+        self.viewers: Dict[str, Dict[str, dict]] = {}
+        self.clubs: Dict[str, dict] = {}  # club_name -> {'club_id', 'updated_at', 'viewer_ids'}
+        self.club_names_by_id: Dict[str, str] = {}  # club_id -> club_name (most recently updated)
+        self.dirty = False
+        self._load()
+
+    def _load(self):
+        """Load the index from disk"""
+        if not os.path.exists(self.index_file):
+            return
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.viewers = data.get('viewers', {})
+            self.clubs = data.get('clubs', {})
+            self._index_club_ids()
+            print(f"✅ Loaded viewer index: {len(self.viewers)} viewers in {len(self.clubs)} clubs")
+        except Exception as e:
+            print(f"⚠️ Could not load viewer index: {e}")
+            self.viewers = {}
+            self.clubs = {}
+            self.club_names_by_id = {}
+
+    def _index_club_ids(self):
+        """Rebuild club_id -> club_name (a renamed club keeps its ID: newest name wins)"""
+        self.club_names_by_id = {
+            club['club_id']: club_name
+            for club_name, club in sorted(self.clubs.items(), key=lambda item: item[1]['updated_at'])
+        }
+
+    def save(self):
+        """Persist the index (atomic write, only if it changed)"""
+        if not self.dirty:
+            return
+        temp_file = f"{self.index_file}.tmp"
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump({'viewers': self.viewers, 'clubs': self.clubs}, f, ensure_ascii=False)
+            os.replace(temp_file, self.index_file)
+            self.dirty = False
+            print(f"💾 Saved viewer index ({len(self.viewers)} viewers, {len(self.clubs)} clubs)")
+        except Exception as e:
+            print(f"⚠️ Could not save viewer index: {e}")
+
+    def update_club(self, club_name: str, club_id: str, members: list, circle_name: str = None):
+        """Replace a club's entries with the members of a fresh API payload
+
+        Args:
+            club_name: Club name (Clubs_Config)
+            club_id: uma.moe circle ID
+            members: API members list (viewer_id, trainer_name, daily_fans)
+            circle_name: Club name as shown on uma.moe
+        """
+        now = time.time()
+        old_ids = set(self.clubs.get(club_name, {}).get('viewer_ids', []))
+        new_ids = []
+
+        for member in members:
+            viewer_id = str(member.get('viewer_id', '') or '')
+            if not viewer_id:
+                continue
+            daily_fans = member.get('daily_fans', []) or []
+            self.viewers.setdefault(viewer_id, {})[club_name] = {
+                'club_name': club_name,
+                'club_id': str(club_id),
+                'circle_name': circle_name or club_name,
+                'trainer_name': member.get('trainer_name', 'Unknown'),
+                'active_days': count_active_days(daily_fans),
+                'daily_fans': daily_fans,
+                'last_seen': now,
+            }
+            new_ids.append(viewer_id)
+
+        # Members no longer in the payload are no longer in this club
+        for viewer_id in old_ids.difference(new_ids):
+            clubs = self.viewers.get(viewer_id)
+            if clubs:
+                clubs.pop(club_name, None)
+                if not clubs:
+                    del self.viewers[viewer_id]
+
+        old_club_id = self.clubs.get(club_name, {}).get('club_id')
+        self.clubs[club_name] = {'club_id': str(club_id), 'updated_at': now, 'viewer_ids': new_ids}
+        if old_club_id not in (None, str(club_id)) and self.club_names_by_id.get(old_club_id) == club_name:
+            # The club changed ID (rare): its old ID goes back to an older club that has it
+            self._index_club_ids()
+        self.club_names_by_id[str(club_id)] = club_name
+        self.dirty = True
+
+    def stale_clubs(self, club_names: Iterable[str]) -> List[str]:
+        """Clubs the index can't answer for (never indexed, or older than max age)
+
+        Args:
+            club_names: Tracked club names (e.g. client.config_cache keys)
+
+        Returns:
+            The given clubs that need a live scan, in order
+        """
+        cutoff = time.time() - self.max_age
+        return [
+            club_name for club_name in club_names
+            if club_name not in self.clubs or self.clubs[club_name]['updated_at'] < cutoff
+        ]
+
+    def lookup(self, viewer_id: str, club_names: Iterable[str] = None) -> List[dict]:
+        """Get every club a viewer is in, most active days first
+
+        Args:
+            viewer_id: The player's viewer_id
+            club_names: Optional filter (only these clubs)
+
+        Returns:
+            List of entry dicts (empty if not found)
+        """
+        entries = list(self.viewers.get(str(viewer_id), {}).values())
+        if club_names is not None:
+            allowed = set(club_names)
+            entries = [e for e in entries if e['club_name'] in allowed]
+        entries.sort(key=lambda e: e['active_days'], reverse=True)
+        return entries
+
+    def get_member_by_club_id(self, viewer_id: str, club_id: str) -> Optional[dict]:
+        """Get a viewer's entry in the club with the given uma.moe ID if it is fresh
+
+        Returns:
+            Entry dict, or None if the club isn't indexed / is stale / viewer not in it
+        """
+        club_name = self.club_names_by_id.get(str(club_id))
+        club = self.clubs.get(club_name)
+        if club is None or club['updated_at'] < time.time() - self.max_age:
+            return None
+        return self.viewers.get(str(viewer_id), {}).get(club_name)
+
+    def get_stats(self) -> dict:
+        """Get index statistics
+
+        Returns:
+            Dictionary with viewer / club counts and oldest club age
+        """
+        now = time.time()
+        ages = [now - club['updated_at'] for club in self.clubs.values()]
+        return {
+            'viewers': len(self.viewers),
+            'clubs': len(self.clubs),
+            'oldest_club_age_hours': round(max(ages) / 3600, 1) if ages else None,
+            'max_age_hours': round(self.max_age / 3600, 1),
+        }
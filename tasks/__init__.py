@@ -0,0 +1,13 @@
+"""Tasks package - Scheduled background task helpers"""
+
+from .sync_pipeline import PipelineStage, StagedPipeline
+from .sync_planner import plan_club_sync, month_context, record_plan_inputs, load_plan_inputs
+
+__all__ = [
+    'PipelineStage',
+    'StagedPipeline',
+    'plan_club_sync',
+    'month_context',
+    'record_plan_inputs',
+    'load_plan_inputs',
+]
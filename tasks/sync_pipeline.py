@@ -0,0 +1,164 @@
+"""
+Staged async pipeline for the club data sync.
+
+Each stage runs its own pool of workers with bounded concurrency and an
+optional rate limiter, so a slow dependency (uma.moe, Google Sheets) only
+throttles its own stage instead of the whole sync.
+
+Example:
+    pipeline = StagedPipeline([
+        PipelineStage("fetch", fetch_club, concurrency=8, rate_limiter=api_limiter),
+        PipelineStage("plan", plan_club, concurrency=4, rate_limiter=read_limiter),
+        PipelineStage("write", write_club, concurrency=1, rate_limiter=write_limiter),
+    ])
+    stats = await pipeline.run(jobs)
+"""
+
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Iterable, List, Optional
+
+from utils.rate_limiter import AsyncRateLimiter
+
+
+class PipelineStage:
+    """A single pipeline stage
+
+    The handler receives an item and returns the item for the next stage,
+    or None to drop it (e.g. nothing left to do for that club).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[Any]],
+        concurrency: int = 1,
+        rate_limiter: Optional[AsyncRateLimiter] = None,
+        cost: Optional[Callable[[Any], float]] = None,
+    ):
+        """
+        Args:
+            name: Stage name (used in logs and stats)
+            handler: Async function processing one item
+            concurrency: Number of workers for this stage
+            rate_limiter: Optional limiter acquired before each item
+            cost: Optional function returning how many limiter tokens an item uses
+        """
+        self.name = name
+        self.handler = handler
+        self.concurrency = max(1, int(concurrency))
+        self.rate_limiter = rate_limiter
+        self.cost = cost
+
+        # Stats
+        self.processed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.wait_seconds = 0.0
+
+    def get_stats(self) -> dict:
+        return {
+            "stage": self.name,
+            "concurrency": self.concurrency,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "busy_seconds": round(self.busy_seconds, 2),
+            "rate_limit_wait_seconds": round(self.wait_seconds, 2),
+        }
+
+
+class StagedPipeline:
+    """Run items through a sequence of stages connected by bounded queues"""
+
+    def __init__(
+        self,
+        stages: List[PipelineStage],
+        queue_size: int = 0,
+        on_error: Optional[Callable[[PipelineStage, Any, Exception], None]] = None,
+    ):
+        """
+        Args:
+            stages: Ordered list of stages
+            queue_size: Max items buffered between stages (0 = unbounded)
+            on_error: Called with (stage, item, exception) when a handler raises
+        """
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+        self.stages = stages
+        self.queue_size = queue_size
+        self.on_error = on_error
+
+    async def _worker(self, stage: PipelineStage, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue]):
+        while True:
+            item = await inbox.get()
+            try:
+                if stage.rate_limiter:
+                    tokens = stage.cost(item) if stage.cost else 1
+                    if tokens > 0:
+                        stage.wait_seconds += await stage.rate_limiter.acquire(tokens)
+
+                started = time.monotonic()
+                try:
+                    result = await stage.handler(item)
+                finally:
+                    stage.busy_seconds += time.monotonic() - started
+
+                stage.processed += 1
+                if outbox is not None:
+                    if result is None:
+                        stage.dropped += 1
+                    else:
+                        await outbox.put(result)
+            except Exception as e:
+                stage.failed += 1
+                if self.on_error:
+                    try:
+                        self.on_error(stage, item, e)
+                    except Exception as cb_err:
+                        print(f"⚠️ Pipeline error callback failed: {cb_err}")
+                else:
+                    print(f"❌ Pipeline stage '{stage.name}' failed: {e}")
+            finally:
+                inbox.task_done()
+
+    async def run(self, items: Iterable[Any]) -> dict:
+        """Push all items through the pipeline and wait for completion
+
+        Args:
+            items: Items for the first stage
+
+        Returns:
+            Dictionary with total duration and per-stage stats
+        """
+        started = time.monotonic()
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        workers = []
+
+        for i, stage in enumerate(self.stages):
+            outbox = queues[i + 1] if i + 1 < len(self.stages) else None
+            workers.append([
+                asyncio.create_task(self._worker(stage, queues[i], outbox))
+                for _ in range(stage.concurrency)
+            ])
+
+        try:
+            for item in items:
+                await queues[0].put(item)
+
+            # Items only flow forward, so draining stages in order drains the pipeline
+            for i, queue in enumerate(queues):
+                await queue.join()
+                for task in workers[i]:
+                    task.cancel()
+        finally:
+            for stage_workers in workers:
+                for task in stage_workers:
+                    task.cancel()
+            await asyncio.gather(*(t for w in workers for t in w), return_exceptions=True)
+
+        return {
+            "duration_seconds": round(time.monotonic() - started, 2),
+            "stages": [stage.get_stats() for stage in self.stages],
+        }
@@ -0,0 +1,994 @@
+"""
+Pure write planning for the club data sync.
+
+plan_club_sync() turns one club's uma.moe payload and its member sheet (as
+read) into everything the write stage sends:
+
+- member sheet grid: CURRENT month rows, a new archive section on month
+  rollover (with the last-day gains), preserved archives (with Day 31
+  backfilled from the new month's Day 1); the last-day cumulative fans come
+  from the history store when it has the month
+- yellow highlight ranges for members who joined / left
+- Data sheet grid
+- cross-club cache updates and history store members per month
+
+Planning touches no Google Sheets, network, disk or module state, so the
+same code runs in the main pass and the retry pass (in a worker thread),
+offline on recorded payloads (benchmark_sync_planner.py) and in the tests
+(test_sync_planner.py).
+Log lines are returned in the plan instead of printed, so plans built in
+parallel don't interleave their output. record_plan_inputs() /
+load_plan_inputs() save and replay the inputs of real syncs.
+"""
+
+import os
+import re
+import json
+import datetime
+from typing import List, Optional
+
+from utils import fan_engine
+
+MEMBER_HEADER_SUFFIX = ['_YuiStartDay', '_YuiTarget', '_IsNewMember', '_Day31_Cumulative', '_TransferWarning']
+DATA_SHEET_HEADER = ['Name', 'Day', 'Total Fans', 'Daily', 'Target', 'CarryOver']
+
+_MONTH = re.compile(r'(\d{1,2}/\d{4})')
+
+# ============================================================================
+# MONTH HELPERS
+# ============================================================================
+
+
+def month_string(today: datetime.date) -> str:
+    """Month of a date as MM/YYYY"""
+    return f"{today.month:02d}/{today.year}"
+
+
+def previous_month_string(month_str: str) -> str:
+    """Month before a MM/YYYY month (e.g. "01/2026" -> "12/2025")"""
+    parts = month_str.split('/')
+    month = int(parts[0]) - 1
+    year = int(parts[1])
+    if month < 1:
+        month = 12
+        year -= 1
+    return f"{month:02d}/{year}"
+
+
+def get_days_in_month(month_str: str) -> int:
+    """
+    Get the number of days in a month from MM/YYYY string.
+
+    Args:
+        month_str: Month string in format "MM/YYYY" (e.g., "01/2026", "02/2024")
+
+    Returns:
+        Number of days in that month (28-31)
+    """
+    try:
+        parts = month_str.split('/')
+        month = int(parts[0])
+        year = int(parts[1])
+
+        # Months with 31 days
+        if month in [1, 3, 5, 7, 8, 10, 12]:
+            return 31
+        # Months with 30 days
+        elif month in [4, 6, 9, 11]:
+            return 30
+        # February - check for leap year
+        elif month == 2:
+            # Leap year: divisible by 4, except century years must be divisible by 400
+            is_leap = (year % 4 == 0 and year % 100 != 0) or (year % 400 == 0)
+            return 29 if is_leap else 28
+        else:
+            return 30  # Fallback
+    except Exception:
+        return 30  # Safe fallback
+
+
+def extract_archived_member_ids(all_values: list, target_month: str) -> set:
+    """
+    Get Trainer IDs from archived data of a specific month in an already-read sheet.
+
+    Args:
+        all_values: Sheet values (from worksheet.get_all_values())
+        target_month: Month to search in format "MM/YYYY" (e.g., "01/2026")
+
+    Returns:
+        Set of Trainer IDs found in the archive for that month
+    """
+    archived_ids = set()
+    in_target_archive = False
+
+    for row in all_values:
+        if not row or not row[0]:
+            continue
+
+        # Check if this is the archive header for our target month
+        if f"=== ARCHIVE: {target_month}" in row[0]:
+            in_target_archive = True
+            continue
+
+        # Check if we've hit another archive section (end of our target)
+        if in_target_archive and "=== ARCHIVE:" in row[0]:
+            break
+
+        # Skip header rows within archive
+        if in_target_archive and row[0] in ['Trainer ID', 'Name', '']:
+            continue
+
+        # Collect Trainer ID (first column)
+        if in_target_archive and row[0]:
+            archived_ids.add(str(row[0]))
+
+    return archived_ids
+
+
+def data_sheet_name_for(club_config: dict) -> str:
+    """Data sheet of a club: from config, or derived from Members_Sheet_Name
+
+    Pattern: Eden03_Members → Eden03_Data
+    """
+    members_sheet_name = club_config.get('Members_Sheet_Name', '')
+    if club_config.get('Data_Sheet_Name'):
+        return club_config.get('Data_Sheet_Name')
+    if members_sheet_name and '_Members' in members_sheet_name:
+        return members_sheet_name.replace('_Members', '_Data')
+    return f"{club_config.get('Club_Name', '')}_Data"
+
+
+# ============================================================================
+# MONTH CONTEXT
+# ============================================================================
+
+
+def month_context(api_members: list, today: datetime.date) -> dict:
+    """Days covered by a payload and whether it already holds the new month
+
+    API returns 31 slots (Day 1-31) of cumulative fans, 0 means no data for
+    that day. More slots than the previous month has days means Day 1 of the
+    current month is in the payload (needed for the old month's last day).
+
+    Args:
+        api_members: uma.moe members (daily_fans = cumulative fans per day)
+        today: Current date (Vietnam time)
+
+    Returns:
+        Dict with current_month, previous_month, expected_days_prev_month,
+        has_new_month_data, max_data_day and max_days
+    """
+    # Highest day with data across ALL members
+    max_data_day = 0
+    for member in api_members:
+        cumulative = member.get('daily_fans', [])
+        for day_idx in range(len(cumulative) - 1, -1, -1):  # Reverse search
+            if cumulative[day_idx] > 0:
+                max_data_day = max(max_data_day, day_idx + 1)  # 1-indexed
+                break
+
+    current_month = month_string(today)
+    previous_month = previous_month_string(current_month)
+    expected_days_prev_month = get_days_in_month(previous_month)
+    has_new_month_data = any(
+        len(member.get('daily_fans', [])) > expected_days_prev_month for member in api_members
+    )
+
+    return {
+        'current_month': current_month,
+        'previous_month': previous_month,
+        'expected_days_prev_month': expected_days_prev_month,
+        'has_new_month_data': has_new_month_data,
+        'max_data_day': max_data_day,
+        # Daily gains come from consecutive days, so one day less than the data
+        'max_days': max_data_day - 1 if max_data_day > 1 else 0,
+    }
+
+
+def split_history_months(history_members: List[dict], ctx: dict, today: datetime.date) -> dict:
+    """Split the payload's members into the months their days belong to
+
+    Until uma.moe rolls over, the payload still holds the previous month;
+    with has_new_month_data it holds the whole previous month followed by
+    Day 1+ of the current one. A payload with more data days than today's
+    day of month can't be the current month either.
+
+    Args:
+        history_members: [{'viewer_id', 'trainer_name', 'cumulative', 'daily'}]
+        ctx: month_context() of the payload
+        today: Current date (Vietnam time)
+
+    Returns:
+        {'MM/YYYY': members} with cumulative / daily cut to that month's days
+    """
+    if not history_members:
+        return {}
+    if not ctx['has_new_month_data']:
+        month = ctx['previous_month'] if ctx['max_data_day'] > today.day else ctx['current_month']
+        return {month: history_members}
+
+    # Previous month: first expected_days_prev_month slots (daily includes its last-day gain)
+    # Current month: the slots after them (no daily gain known for its Day 1 yet)
+    split = ctx['expected_days_prev_month']
+    previous, current = [], []
+    for member in history_members:
+        previous.append(dict(member, cumulative=member['cumulative'][:split], daily=member['daily'][:split]))
+        rest = member['cumulative'][split:]
+        if any(fans and fans > 0 for fans in rest):
+            current.append(dict(member, cumulative=rest, daily=[None] * len(rest)))
+
+    months = {ctx['previous_month']: previous}
+    if current:
+        months[ctx['current_month']] = current
+    return months
+
+
+# ============================================================================
+# CLUB SYNC PLAN
+# ============================================================================
+
+
+def plan_club_sync(
+    club_config: dict,
+    api_data: dict,
+    sheet_values: List[list],
+    today: datetime.date,
+    archived_ids: Optional[set] = None,
+    archive_cumulative: Optional[dict] = None,
+) -> dict:
+    """Build the write plan of one club from its payload and member sheet
+
+    Args:
+        club_config: Club row of the config sheet (Club_Name, Members_Sheet_Name,
+            Data_Sheet_Name, Target_Per_Day)
+        api_data: uma.moe payload ('members' with viewer_id, trainer_name, daily_fans)
+        sheet_values: Member sheet as read (get_all_values output)
+        today: Current date (Vietnam time); decides the month and archive fallbacks
+        archived_ids: Trainer IDs of the previous month (history store); parsed
+            from the sheet archive if None
+        archive_cumulative: {Trainer ID: cumulative fans on the last day} of the
+            previous month (history store); the archive's _Day31_Cumulative
+            cells are used for members not in it
+
+    Returns:
+        Plan dict. 'status' is 'ok' or 'skipped' (with 'reason'); 'log' holds
+        the log lines. An ok plan has member_grid, ranges_to_format,
+        data_sheet_name, data_sheet_grid, member_names, cross_club_updates,
+        transfer_warnings, history_months and row counts.
+    """
+    club_name = club_config.get('Club_Name', '')
+    target_per_day = int(club_config.get('Target_Per_Day', 0))
+    api_members = api_data.get('members', [])
+    log = []
+    plan = {'status': 'skipped', 'reason': None, 'log': log, 'history_months': {}}
+
+    if not api_members:
+        plan['reason'] = 'no_members'
+        log.append(f"  ⏭️ {club_name}: No members in API response")
+        return plan
+
+    ctx = month_context(api_members, today)
+    current_month = ctx['current_month']
+    max_days = ctx['max_days']
+    plan['current_month'] = current_month
+
+    if max_days < 1:
+        plan['reason'] = 'not_enough_data'
+        log.append(f"  ⏭️ {club_name}: Not enough data yet (max_data_day={ctx['max_data_day']}), skipping")
+        return plan
+
+    # Transfer detection against the previous month's members
+    if archived_ids is None:
+        archived_ids = extract_archived_member_ids(sheet_values, ctx['previous_month'])
+    if archived_ids:
+        log.append(f"    📋 Found {len(archived_ids)} members in {ctx['previous_month']} archive for transfer detection")
+
+    members = _plan_member_rows(club_name, api_members, target_per_day, ctx, archived_ids, log)
+    rows_data = members['rows_data']
+    plan['history_months'] = split_history_months(members['history_members'], ctx, today)
+
+    if not rows_data:
+        plan['reason'] = 'no_active_members'
+        log.append(f"  ⏭️ {club_name}: No active members to sync (skipped {members['skipped_inactive']} inactive)")
+        return plan
+
+    # Build header row
+    header = ['Trainer ID', 'Name']
+    header.extend([f'Day {i}' for i in range(1, max_days + 1)])
+    header.extend(MEMBER_HEADER_SUFFIX)
+
+    # ===== ARCHIVES =====
+    archive_cumulative_by_month = {ctx['previous_month']: archive_cumulative} if archive_cumulative else {}
+    layout = _sheet_layout(sheet_values, ctx, log)
+    archive_start = layout['archive_start']
+    sheet_month = layout['sheet_month']
+
+    # Preserve existing archives (everything from the first === ARCHIVE row)
+    existing_archives = []
+    cross_club_updates = []
+    if archive_start is not None:
+        existing_archives = [list(row) for row in sheet_values[archive_start:]]
+        cross_club_updates = _backfill_archive_last_day(
+            existing_archives, api_members, club_name, archive_cumulative_by_month, log
+        )
+
+    # Archive the sheet's month if it's over (month changed)
+    new_archive_section = []
+    if sheet_month and sheet_month != current_month:
+        new_archive_section = _archive_sheet_month(
+            sheet_values, api_members, sheet_month, ctx, layout, len(header), today,
+            archive_cumulative_by_month.get(sheet_month), log
+        )
+
+    # ===== MEMBER SHEET GRID =====
+    # CURRENT header + data header + rows + spacer + new archive + existing archives
+    current_header = [f"=== CURRENT: {current_month} ==="]
+    current_header.extend([''] * (len(header) - 1))
+    full_data = [current_header, header] + rows_data
+
+    if new_archive_section or existing_archives:
+        spacer = [[''] * len(header)] * 2
+        full_data.extend(spacer)
+        if new_archive_section:
+            full_data.extend(new_archive_section)
+        if existing_archives:
+            full_data.extend(existing_archives)
+
+    # SAFETY CHECK: Verify archives are preserved before the sheet is rewritten
+    # This prevents accidental data loss if archive detection fails
+    if archive_start is not None and len(existing_archives) > 0:
+        archive_preserved = any('=== ARCHIVE' in str(row[0]) for row in full_data if row and row[0])
+        if not archive_preserved:
+            plan['reason'] = 'archive_not_preserved'
+            log.append("    ⚠️ SAFETY: Archives detected but not preserved! Skipping write to prevent data loss.")
+            log.append(f"    📦 Original had {len(existing_archives)} archive rows")
+            return plan
+
+    ranges_to_format = []
+    try:
+        ranges_to_format = _transfer_highlight_ranges(api_members, rows_data, new_archive_section, existing_archives, log)
+    except Exception as e:
+        log.append(f"    ⚠️ Error collecting transfer highlight ranges: {e}")
+
+    # ===== DATA SHEET GRID =====
+    data_sheet_rows = members['data_sheet_rows']
+    data_sheet_grid = None
+    if data_sheet_rows:
+        current_data_header = [f"=== CURRENT: {current_month} ==="]
+        current_data_header.extend([''] * (len(DATA_SHEET_HEADER) - 1))
+        data_sheet_grid = [current_data_header, list(DATA_SHEET_HEADER)] + data_sheet_rows
+
+    plan.update({
+        'status': 'ok',
+        'member_grid': full_data,
+        'ranges_to_format': ranges_to_format,
+        'rows_count': len(rows_data),
+        'max_days': max_days,
+        'new_archive_rows': len(new_archive_section),
+        'existing_archive_rows': len(existing_archives),
+        'data_sheet_name': data_sheet_name_for(club_config),
+        'data_sheet_grid': data_sheet_grid,
+        'data_sheet_rows': len(data_sheet_rows),
+        # Same list update_caches reads back from the Data sheet
+        'member_names': sorted({str(row[0]).strip() for row in data_sheet_rows if str(row[0]).strip()}),
+        'cross_club_updates': cross_club_updates,
+        'transfer_warnings': members['transfer_warnings'],
+    })
+    return plan
+
+
+# ============================================================================
+# PLAN STEPS
+# ============================================================================
+
+
+def _plan_member_rows(club_name: str, api_members: list, target_per_day: int, ctx: dict,
+                      archived_ids: set, log: list) -> dict:
+    """CURRENT rows, Data sheet rows and history members of a club
+
+    Daily gains (+ last-day gain on month transition), Yui logic and Data sheet
+    rows are computed for the whole club in one vectorized pass.
+
+    Returns:
+        Dict with rows_data, data_sheet_rows, history_members,
+        transfer_warnings and skipped_inactive
+    """
+    max_days = ctx['max_days']
+    max_data_day = ctx['max_data_day']
+    expected_days_prev_month = ctx['expected_days_prev_month']
+
+    trainer_names = [m.get('trainer_name', '') for m in api_members]
+    club_batch = fan_engine.compute_club_batch(
+        [m.get('daily_fans', []) for m in api_members],
+        target_per_day,
+        max_days,
+        expected_days_prev_month if ctx['has_new_month_data'] else None
+    )
+    gains_by_member = fan_engine.gain_lists(club_batch)
+    yui_by_member = fan_engine.yui_results(club_batch)
+    data_rows_by_member = fan_engine.data_sheet_rows(club_batch, trainer_names)
+
+    rows_data = []
+    data_sheet_rows = []  # Name, Day, Total Fans, Daily, Target, CarryOver
+    history_members = []  # All members with data in the payload (for the local history store)
+    transfer_warnings = []  # For the Discord notification
+    skipped_inactive = 0
+
+    for idx_m, member in enumerate(api_members):
+        trainer_id = str(member.get('viewer_id', ''))
+        trainer_name = trainer_names[idx_m]
+        cumulative = member.get('daily_fans', [])
+
+        if not trainer_id or not cumulative:
+            continue
+
+        daily_gains = gains_by_member[idx_m]
+
+        history_members.append({
+            'viewer_id': trainer_id,
+            'trainer_name': trainer_name,
+            'cumulative': cumulative,
+            'daily': daily_gains
+        })
+
+        # Skip members who have left the club: no cumulative data for max_data_day
+        # (not daily_gains, so new members with only 1 day of data are kept)
+        has_current_data = len(cumulative) >= max_data_day and cumulative[max_data_day - 1] > 0
+        if not has_current_data:
+            skipped_inactive += 1
+            log.append(f"    ❌ Filtered out: {trainer_name} (ID: {trainer_id}) - Không có data ngày {max_data_day}, đã rời club")
+            continue
+
+        start_day, adjusted_target, is_new = yui_by_member[idx_m]
+
+        # Transfer detection: new this month and starts from Day 2
+        transfer_warning = ""
+        if archived_ids and trainer_id not in archived_ids and start_day == 2:
+            transfer_warning = "⚠️ Possible Transfer"
+            transfer_warnings.append({
+                'club': club_name,
+                'trainer_name': trainer_name,
+                'trainer_id': trainer_id
+            })
+            log.append(f"    ⚠️ Transfer warning: {trainer_name} (ID: {trainer_id}) - Không có trong archive tháng trước + bắt đầu từ Day 2")
+
+        # Row: Trainer ID, Name, Day 1..N, _YuiStartDay, _YuiTarget, _IsNewMember, _Day31_Cumulative, _TransferWarning
+        row = [trainer_id, trainer_name]
+        for day in range(max_days):
+            if day < len(daily_gains) and daily_gains[day] is not None:
+                row.append(daily_gains[day])
+            else:
+                row.append('')
+
+        # Cumulative fans on the last day of the previous month (month-end calculation)
+        day31_cumulative = 0
+        if len(cumulative) >= expected_days_prev_month:
+            day31_cumulative = cumulative[expected_days_prev_month - 1] if cumulative[expected_days_prev_month - 1] > 0 else 0
+        else:
+            # Fallback: last non-zero cumulative
+            for c in reversed(cumulative):
+                if c > 0:
+                    day31_cumulative = c
+                    break
+
+        row.extend([
+            start_day if start_day <= max_days else 'N/A',
+            adjusted_target,
+            'Yes' if is_new else 'No',
+            day31_cumulative,
+            transfer_warning
+        ])
+        rows_data.append(row)
+        data_sheet_rows.extend(data_rows_by_member[idx_m])
+
+    return {
+        'rows_data': rows_data,
+        'data_sheet_rows': data_sheet_rows,
+        'history_members': history_members,
+        'transfer_warnings': transfer_warnings,
+        'skipped_inactive': skipped_inactive,
+    }
+
+
+def _sheet_layout(sheet_values: List[list], ctx: dict, log: list) -> dict:
+    """Month on the sheet and where its archives start
+
+    Sheets without a CURRENT header are the legacy format: a sheet with
+    (almost) a full month of Day columns is taken as the previous month's
+    complete data, a partial one as the current month.
+
+    Returns:
+        Dict with archive_start (row index or None), sheet_month,
+        legacy_complete_data and legacy_day_count
+    """
+    archive_start = None
+    sheet_month = None
+    has_current_header = False
+    legacy_complete_data = False
+    legacy_day_count = 0
+
+    for idx_v, row in enumerate(sheet_values):
+        if row and row[0]:
+            if '=== CURRENT' in row[0]:
+                has_current_header = True
+                match = _MONTH.search(row[0])
+                if match:
+                    sheet_month = match.group(1)
+            elif '=== ARCHIVE' in row[0]:
+                archive_start = idx_v
+                break
+
+    if not has_current_header and len(sheet_values) > 1:
+        log.append("    📋 Legacy format detected (no CURRENT header)")
+        prev_month_str = ctx['previous_month']
+
+        # Count Day columns to determine which month's data is on the sheet
+        sheet_header = None
+        for row in sheet_values:
+            if row and ('Trainer ID' in row or 'Name' in row):
+                sheet_header = row
+                break
+
+        if sheet_header:
+            sheet_day_count = len([col for col in sheet_header if col.startswith('Day ')])
+            expected_days_prev = ctx['expected_days_prev_month']
+            log.append(f"    📋 Sheet has {sheet_day_count} Day columns, previous month ({prev_month_str}) expects {expected_days_prev} days")
+
+            if sheet_day_count >= expected_days_prev - 1:
+                # Complete month on the sheet - archive it (bypasses the API max_days check)
+                sheet_month = prev_month_str
+                legacy_complete_data = True
+                legacy_day_count = sheet_day_count
+                log.append(f"    📋 ✅ Sheet appears to have complete {sheet_month} data - will archive")
+            else:
+                # Partial data - might be current month, don't archive
+                log.append(f"    📋 ⏳ Sheet has partial data ({sheet_day_count} days) - treating as current month")
+                sheet_month = ctx['current_month']
+        else:
+            sheet_month = prev_month_str
+            log.append(f"    📋 No header found, assuming data is from {sheet_month}")
+
+    return {
+        'archive_start': archive_start,
+        'sheet_month': sheet_month,
+        'legacy_complete_data': legacy_complete_data,
+        'legacy_day_count': legacy_day_count,
+    }
+
+
+def _archived_cumulative(row: list, trainer_id: str, day31_cumulative_col: int,
+                         store_cumulative: Optional[dict]) -> int:
+    """Cumulative fans of an archived member on the month's last day
+
+    The history store's value is used if it has the member, else the row's
+    _Day31_Cumulative cell (0 if empty or not a number).
+    """
+    if store_cumulative and trainer_id in store_cumulative:
+        return store_cumulative[trainer_id]
+    try:
+        if len(row) > day31_cumulative_col:
+            return int(row[day31_cumulative_col]) if row[day31_cumulative_col] else 0
+    except (ValueError, TypeError):
+        pass
+    return 0
+
+
+def _backfill_archive_last_day(existing_archives: List[list], api_members: list, club_name: str,
+                               archive_cumulative_by_month: dict, log: list) -> List[tuple]:
+    """Add (or recalculate N/A) last-day gains of the newest archive in place
+
+    The last day of a month is only known once uma.moe has Day 1 of the next
+    month: gain = Day 1 cumulative - the archived _Day31_Cumulative.
+
+    Args:
+        existing_archives: Archive rows of the sheet (modified in place)
+        api_members: Current uma.moe members
+        club_name: Club name (for the cross-club cache)
+        archive_cumulative_by_month: {month: {Trainer ID: last-day cumulative}}
+            from the history store
+        log: Log lines
+
+    Returns:
+        Cross-club cache updates [(trainer_id, club_name, day31_cumulative, month)]
+    """
+    cross_club_updates = []
+    if len(existing_archives) <= 1:
+        return cross_club_updates
+
+    # Archive data header (first Trainer ID / Name row)
+    archive_data_header_idx = None
+    for idx, row in enumerate(existing_archives):
+        if row and (row[0] == 'Trainer ID' or row[0] == 'Name'):
+            archive_data_header_idx = idx
+            break
+    if archive_data_header_idx is None:
+        return cross_club_updates
+    archive_data_header = existing_archives[archive_data_header_idx]
+
+    last_day_col_name = None
+    last_day_col_idx = None
+    for idx, col_name in enumerate(archive_data_header):
+        if col_name and str(col_name).startswith('Day '):
+            last_day_col_name = col_name
+            last_day_col_idx = idx
+    if not last_day_col_name:
+        return cross_club_updates
+
+    try:
+        last_day_num = int(str(last_day_col_name).replace('Day ', ''))
+    except ValueError:
+        last_day_num = 30
+
+    archive_month = None
+    for row in existing_archives:
+        if row and '=== ARCHIVE' in str(row[0]):
+            match = _MONTH.search(str(row[0]))
+            if match:
+                archive_month = match.group(1)
+                break
+    if not archive_month:
+        return cross_club_updates
+
+    expected_days_archive = get_days_in_month(archive_month)
+    day31_exists = last_day_num >= expected_days_archive
+
+    # Even if the last day exists, recalculate it if it has N/A values
+    needs_recalc = False
+    day31_col_idx = None
+    if day31_exists:
+        for idx, col_name in enumerate(archive_data_header):
+            if col_name == f'Day {expected_days_archive}':
+                day31_col_idx = idx
+                break
+
+        if day31_col_idx:
+            na_count = sum(
+                1 for row in existing_archives[archive_data_header_idx + 1:]
+                if row and len(row) > day31_col_idx and row[day31_col_idx] == 'N/A'
+            )
+            if na_count > 0:
+                log.append(f"    📊 Archive {archive_month} has Day {expected_days_archive} but {na_count} N/A values - recalculating...")
+                needs_recalc = True
+
+    if day31_exists and not needs_recalc:
+        return cross_club_updates
+    if not day31_exists:
+        log.append(f"    📊 Archive {archive_month} missing Day {expected_days_archive} - calculating...")
+
+    trainer_id_col = None
+    day31_cumulative_col = None
+    for idx, col_name in enumerate(archive_data_header):
+        if col_name == 'Trainer ID':
+            trainer_id_col = idx
+        elif col_name == '_Day31_Cumulative':
+            day31_cumulative_col = idx
+    if trainer_id_col is None or day31_cumulative_col is None:
+        return cross_club_updates
+    store_cumulative = archive_cumulative_by_month.get(archive_month)
+
+    # API member lookup; transferred out = has Day 1 but no Day 2
+    api_member_data = {}
+    for member in api_members:
+        member_cumulative = member.get('daily_fans', [])
+        if member_cumulative:
+            api_member_data[str(member.get('viewer_id', ''))] = {
+                'day1_cumulative': member_cumulative[0],
+                'is_transferred': len(member_cumulative) > 1 and member_cumulative[0] > 0 and member_cumulative[1] == 0,
+            }
+
+    if needs_recalc and day31_col_idx is not None:
+        # Update the existing last-day column
+        day31_insert_pos = day31_col_idx
+        is_insert_mode = False
+        log.append(f"    🔄 Updating existing Day {expected_days_archive} column at position {day31_insert_pos}")
+    else:
+        # Insert a new last-day column after the last Day column
+        day31_insert_pos = last_day_col_idx + 1
+        is_insert_mode = True
+        existing_archives[archive_data_header_idx] = list(archive_data_header)
+        existing_archives[archive_data_header_idx].insert(day31_insert_pos, f'Day {expected_days_archive}')
+
+    members_with_day31 = 0
+    members_transferred = 0
+    members_not_found = 0
+    for row_idx in range(archive_data_header_idx + 1, len(existing_archives)):
+        row = existing_archives[row_idx]
+        if not row or not row[0] or '===' in str(row[0]):
+            # Empty rows / section headers keep their shape
+            row = list(row) if row else ['']
+            if is_insert_mode:
+                row.insert(day31_insert_pos, '')
+            existing_archives[row_idx] = row
+            continue
+
+        row = list(row)
+        member_trainer_id = str(row[trainer_id_col]) if len(row) > trainer_id_col else ''
+        old_cumulative = _archived_cumulative(row, member_trainer_id, day31_cumulative_col, store_cumulative)
+
+        day31_value = 'N/A'
+        member_info = api_member_data.get(member_trainer_id)
+        if member_info and old_cumulative > 0 and member_info['day1_cumulative'] > 0:
+            day31_value = member_info['day1_cumulative'] - old_cumulative
+            if day31_value < 0:
+                day31_value = 'N/A'
+                members_not_found += 1
+            else:
+                if member_info['is_transferred']:
+                    members_transferred += 1
+                else:
+                    members_with_day31 += 1
+                # CROSS_CLUB_CACHE entry for the transfer lookup
+                cross_club_updates.append((member_trainer_id, club_name, old_cumulative, archive_month))
+        else:
+            members_not_found += 1
+
+        if is_insert_mode:
+            row.insert(day31_insert_pos, day31_value)
+        else:
+            while len(row) <= day31_insert_pos:
+                row.append('')
+            row[day31_insert_pos] = day31_value
+        existing_archives[row_idx] = row
+
+    log.append(f"    ✅ Day {expected_days_archive} added: {members_with_day31} stayed, {members_transferred} transferred, {members_not_found} not found (N/A)")
+    log.append(f"    📦 CROSS_CLUB_CACHE: Added {members_with_day31 + members_transferred} members from {club_name}")
+    return cross_club_updates
+
+
+def _archive_sheet_month(sheet_values: List[list], api_members: list, sheet_month: str, ctx: dict,
+                         layout: dict, header_len: int, today: datetime.date,
+                         store_cumulative: Optional[dict], log: list) -> List[list]:
+    """Archive section for the month on the sheet, once its data is complete
+
+    uma.moe updates with 1 day delay, so on the first day of a new month the
+    last day of the previous one may be missing. The month is archived when:
+    Day 1 of the new month is in the payload, a legacy sheet holds the whole
+    month, or (fallbacks) it is Day 2+ with expected-1 days / Day 3+ with
+    expected-2 days.
+
+    The last-day gain uses the history store's last-day cumulative fans of
+    the month (store_cumulative) where it has the member.
+
+    Returns:
+        Rows to insert (spacer, ARCHIVE header, archived rows, spacer), or []
+    """
+    current_month = ctx['current_month']
+    max_days = ctx['max_days']
+
+    # Data rows on the sheet (excluding === headers and the column header)
+    sheet_data_rows = 0
+    for row in sheet_values:
+        if row and row[0]:
+            if '===' in row[0] or row[0] == 'Name' or row[0] == 'Trainer ID':
+                continue
+            sheet_data_rows += 1
+        else:
+            break
+
+    if sheet_data_rows < 1:
+        log.append("    📋 New club detected (no old data on sheet) - skipping archive check")
+        return []
+
+    expected_days = get_days_in_month(sheet_month)
+    current_calendar_day = today.day
+    has_new_month_data = any(len(member.get('daily_fans', [])) > expected_days for member in api_members)
+
+    should_archive = False
+    archive_reason = ""
+    if has_new_month_data:
+        # Day 1 of new month available - can calculate last day of old month
+        should_archive = True
+        archive_reason = f"✅ Day 1 new month available - calculating Day {expected_days} daily gains"
+        log.append(f"    📊 Day 1 of {current_month} detected - will calculate Day {expected_days} of {sheet_month}")
+    elif layout['legacy_complete_data']:
+        # Legacy sheet with complete data - use the sheet's day count instead of API data
+        should_archive = True
+        archive_reason = f"✅ Legacy sheet has {layout['legacy_day_count']} Day columns (complete data for {sheet_month})"
+    elif max_days >= expected_days - 1 and current_calendar_day >= 2:
+        # Fallback: uma.moe probably skipped the last day
+        should_archive = True
+        archive_reason = f"⚠️ Fallback archive: {max_days}/{expected_days} days (Day {expected_days} skipped by uma.moe)"
+    elif max_days >= expected_days - 2 and current_calendar_day >= 3:
+        # Safety net so data is never stuck
+        should_archive = True
+        archive_reason = f"⚠️ Force archive (Day 3+): {max_days}/{expected_days} days"
+
+    log.append(f"    🗓️ New month detected ({sheet_month} → {current_month})")
+    if not should_archive:
+        log.append(f"    ⏳ Data INCOMPLETE: only {max_days}/{expected_days} days - SKIPPING archive")
+        log.append("    💡 Will auto-archive on Day 2 if uma.moe skips last day")
+        return []
+    log.append(f"    {archive_reason} - proceeding with archive")
+
+    # Current data on the sheet (rows up to the first archive / empty row)
+    current_data_to_archive = []
+    for row in sheet_values:
+        if not row or not row[0] or '=== ARCHIVE' in row[0]:
+            break
+        current_data_to_archive.append(row)
+
+    if len(current_data_to_archive) <= 1:
+        return []
+
+    archive_header = [f"=== ARCHIVE: {sheet_month} ==="]
+    archive_header.extend([''] * (header_len - 1))
+    spacer = [[''] * header_len] * 2
+
+    # CURRENT header is dropped, a legacy data header is kept
+    skip_first = 1 if current_data_to_archive[0] and '=== CURRENT' in str(current_data_to_archive[0][0]) else 0
+    archive_data = [list(row) for row in current_data_to_archive[skip_first:]]
+
+    # ===== LAST DAY OF THE ARCHIVED MONTH =====
+    if len(archive_data) > 1:
+        day31_cumulative_col = None
+        trainer_id_col = None
+        for idx, col_name in enumerate(archive_data[0]):
+            if col_name == '_Day31_Cumulative':
+                day31_cumulative_col = idx
+            elif col_name == 'Trainer ID':
+                trainer_id_col = idx
+
+        api_member_day1 = {
+            str(member.get('viewer_id', '')): member['daily_fans'][0]
+            for member in api_members if member.get('daily_fans')
+        }
+
+        if day31_cumulative_col and trainer_id_col:
+            last_day_col = None
+            for idx, col_name in enumerate(archive_data[0]):
+                if col_name and col_name.startswith('Day '):
+                    last_day_col = idx
+
+            if last_day_col is not None:
+                day31_insert_pos = last_day_col + 1
+                archive_data[0].insert(day31_insert_pos, f'Day {expected_days}')
+
+                members_with_day31 = 0
+                members_transferred = 0
+                for row in archive_data[1:]:
+                    member_trainer_id = str(row[trainer_id_col]) if len(row) > trainer_id_col else ''
+                    old_cumulative = _archived_cumulative(
+                        row, member_trainer_id, day31_cumulative_col, store_cumulative
+                    )
+
+                    day31_value = 'N/A'
+                    new_day1_cumulative = api_member_day1.get(member_trainer_id, 0)
+                    if old_cumulative > 0 and new_day1_cumulative > 0:
+                        day31_value = new_day1_cumulative - old_cumulative
+                        if day31_value < 0:
+                            day31_value = 'N/A'  # Invalid calculation
+                        else:
+                            members_with_day31 += 1
+                    else:
+                        members_transferred += 1
+
+                    row.insert(day31_insert_pos, day31_value)
+
+                log.append(f"    📊 Day {expected_days} calculated: {members_with_day31} members, {members_transferred} transferred (N/A)")
+
+    log.append(f"    📦 Archiving {len(archive_data)} rows from {sheet_month}")
+    return spacer + [archive_header] + archive_data + spacer
+
+
+def _transfer_highlight_ranges(api_members: list, rows_data: List[list], new_archive_section: List[list],
+                               existing_archives: List[list], log: list) -> List[str]:
+    """A:B ranges to highlight yellow for members who left or joined
+
+    - Members who LEFT: in the archive but not current → highlighted in the archive
+    - Members who JOINED: current but not in the archive → highlighted in current
+
+    The archive compared is the one just created, else the existing ones.
+    """
+    ranges_to_format = []
+    current_member_ids = {str(member.get('viewer_id', '')) for member in api_members} - {''}
+
+    archive_to_compare = None
+    archive_source = None
+    if new_archive_section and len(new_archive_section) > 3:
+        archive_to_compare = new_archive_section
+        archive_source = "new_archive_section"
+    elif existing_archives and len(existing_archives) > 3:
+        archive_to_compare = existing_archives
+        archive_source = "existing_archives"
+
+    if not archive_to_compare:
+        return ranges_to_format
+
+    archive_header_idx = None
+    trainer_id_col = None
+    for idx, row in enumerate(archive_to_compare):
+        if row and len(row) > 0:
+            if row[0] == 'Trainer ID':
+                archive_header_idx = idx
+                trainer_id_col = 0
+                break
+            elif 'Trainer ID' in row:
+                archive_header_idx = idx
+                trainer_id_col = row.index('Trainer ID')
+                break
+
+    archive_member_rows = {}  # {trainer_id: row_index_in_archive}
+    if archive_header_idx is not None:
+        for idx in range(archive_header_idx + 1, len(archive_to_compare)):
+            row = archive_to_compare[idx]
+            if row and len(row) > trainer_id_col and row[trainer_id_col] and '===' not in str(row[0]):
+                archive_member_rows[str(row[trainer_id_col])] = idx
+
+    archive_member_ids = set(archive_member_rows)
+    members_left = archive_member_ids - current_member_ids
+    members_joined = current_member_ids - archive_member_ids
+
+    if not members_left and not members_joined:
+        return ranges_to_format
+    log.append(f"    🔄 Transfer detection: {len(members_left)} OUT, {len(members_joined)} NEW")
+
+    if members_left:
+        # Archives start after CURRENT header + data header + rows + spacer;
+        # the existing archives come after the new archive section
+        archive_offset = 2 + len(rows_data) + 2
+        if archive_source == "existing_archives" and new_archive_section:
+            archive_offset += len(new_archive_section)
+        for trainer_id in members_left:
+            actual_row = archive_offset + archive_member_rows[trainer_id] + 1  # 1-indexed
+            ranges_to_format.append(f"A{actual_row}:B{actual_row}")
+
+    if members_joined:
+        # Current data starts at row 3 (after CURRENT header + data header)
+        for row_idx, row in enumerate(rows_data):
+            if row and str(row[0]) in members_joined:
+                actual_row = 3 + row_idx
+                ranges_to_format.append(f"A{actual_row}:B{actual_row}")
+
+    return ranges_to_format
+
+
+# ============================================================================
+# RECORDED INPUTS (offline profiling / benchmarks)
+# ============================================================================
+
+
+def record_plan_inputs(directory: str, club_config: dict, api_data: dict, sheet_values: List[list],
+                       today: datetime.date, archived_ids: Optional[set] = None,
+                       archive_cumulative: Optional[dict] = None) -> str:
+    """Save the inputs of one plan_club_sync call as JSON
+
+    Args:
+        directory: Output directory (created if missing)
+        club_config, api_data, sheet_values, today, archived_ids, archive_cumulative:
+            plan_club_sync arguments
+
+    Returns:
+        Path of the written file
+    """
+    os.makedirs(directory, exist_ok=True)
+    club_name = str(club_config.get('Club_Name', '')) or 'club'
+    safe_name = re.sub(r'[^\w.-]+', '_', club_name)
+    path = os.path.join(directory, f"{safe_name}_{today.isoformat()}.json")
+    record = {
+        'club_config': club_config,
+        'api_data': api_data,
+        'sheet_values': sheet_values,
+        'today': today.isoformat(),
+        'archived_ids': sorted(archived_ids) if archived_ids is not None else None,
+        'archive_cumulative': archive_cumulative,
+    }
+    temp_file = f"{path}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(record, f, ensure_ascii=False, default=str)
+    os.replace(temp_file, path)
+    return path
+
+
+def load_plan_inputs(path: str) -> tuple:
+    """Load recorded inputs as plan_club_sync positional arguments"""
+    with open(path, 'r', encoding='utf-8') as f:
+        record = json.load(f)
+    archived_ids = record.get('archived_ids')
+    return (
+        record['club_config'],
+        record['api_data'],
+        record['sheet_values'],
+        datetime.date.fromisoformat(record['today']),
+        set(archived_ids) if archived_ids is not None else None,
+        record.get('archive_cumulative'),
+    )
@@ -0,0 +1,109 @@
+"""Tests for utils/club_index.py (club autocomplete index)
+
+Run: python -m pytest -q test_club_index.py
+"""
+
+import random
+
+import pytest
+
+from utils.club_index import ClubIndex
+
+GUILD_A = 111
+GUILD_B = 222
+
+CONFIGS = {
+    'Team Alpha': {'Server_ID': str(GUILD_A)},
+    'Alpine Club': {'Server_ID': GUILD_A},  # Server_ID may be an int in the cache
+    'beta squad': {'Server_ID': f' {GUILD_A} '},
+    'Gamma Alpha Team': {'Server_ID': str(GUILD_B)},
+    'Unassigned': {'Server_ID': ''},
+}
+
+
+@pytest.fixture
+def index():
+    index = ClubIndex()
+    index.build(CONFIGS)
+    return index
+
+
+# ============================================================================
+# SEARCH
+# ============================================================================
+
+
+def test_empty_query_lists_guild_clubs_a_to_z(index):
+    assert index.search(GUILD_A) == ['Alpine Club', 'beta squad', 'Team Alpha']
+    assert index.search(GUILD_A, limit=2) == ['Alpine Club', 'beta squad']
+    assert index.search(GUILD_B) == ['Gamma Alpha Team']
+
+
+def test_dm_and_unknown_guild_see_all_clubs(index):
+    everything = ['Alpine Club', 'beta squad', 'Gamma Alpha Team', 'Team Alpha', 'Unassigned']
+    assert index.search(None) == everything
+    assert index.search(999) == everything
+
+
+def test_any_word_prefix_matches_case_insensitively(index):
+    assert index.search(GUILD_A, 'SQU') == ['beta squad']
+    assert index.search(GUILD_A, 'team') == ['Team Alpha']
+    assert index.search(GUILD_A, 'team al') == ['Team Alpha']
+    assert index.search(GUILD_A, 'pha') == []  # Mid-word substrings don't match
+
+
+def test_matches_are_a_to_z_and_limited_in_that_order(index):
+    # Key order would put 'Team Alpha' ("alpha") before 'Alpine Club' ("alpine")
+    assert index.search(GUILD_A, 'al') == ['Alpine Club', 'Team Alpha']
+    assert index.search(GUILD_A, 'al', limit=1) == ['Alpine Club']
+    # Two word starts of one club match once
+    assert index.search(None, 'a') == ['Alpine Club', 'Gamma Alpha Team', 'Team Alpha']
+
+
+def test_search_matches_brute_force():
+    rng = random.Random(11)
+    words = ['alpha', 'alps', 'beta', 'bet', 'club', 'team', 'Team', 'zeta']
+    configs = {
+        ' '.join(rng.choice(words) for _ in range(rng.randint(1, 3))) + f" {n}": {'Server_ID': str(rng.randint(1, 5))}
+        for n in range(200)
+    }
+    index = ClubIndex()
+    index.build(configs)
+
+    for _ in range(300):
+        guild = rng.randint(1, 5)
+        query = rng.choice(words)[:rng.randint(1, 4)] + rng.choice(['', ' ', ' a', ' b'])
+        expected = sorted(
+            (name for name, cfg in configs.items()
+             if cfg['Server_ID'] == str(guild)
+             and any(name.casefold()[i:].startswith(query.casefold())
+                     for i in range(len(name)) if i == 0 or name[i - 1] == ' ')),
+            key=str.casefold,
+        )
+        assert index.search(guild, query, limit=10) == expected[:10]
+
+
+# ============================================================================
+# UPDATES
+# ============================================================================
+
+
+def test_update_club_moves_and_adds_clubs(index):
+    index.update_club('Team Alpha', {'Server_ID': str(GUILD_B)})
+    assert index.search(GUILD_A, 'al') == ['Alpine Club']
+    assert index.search(GUILD_B, 'al') == ['Gamma Alpha Team', 'Team Alpha']
+
+    index.update_club('Delta', {'Server_ID': GUILD_B})
+    assert index.search(GUILD_B) == ['Delta', 'Gamma Alpha Team', 'Team Alpha']
+    assert 'Delta' in index.search(None)
+    assert index.get_stats()['clubs'] == 6
+    assert index.builds == 1
+
+
+def test_remove_club_drops_empty_guild(index):
+    index.remove_club('Gamma Alpha Team')
+    assert 'Gamma Alpha Team' not in index.search(None)
+    # Guild B has no clubs left: falls back to all clubs
+    assert index.search(GUILD_B) == index.search(None)
+    assert index.get_stats()['guilds'] == 1
+    index.remove_club('Unknown')
@@ -0,0 +1,201 @@
+"""Tests for utils/fan_engine.py (vectorized club calculations)
+
+The batch results are compared with the per-member loop the club sync ran
+before the engine existed (copied below), on clubs whose members have
+different numbers of days.
+
+Run: python -m pytest -q test_fan_engine.py
+"""
+
+import random
+
+import pytest
+
+from utils.fan_engine import compute_club_batch, gain_lists, yui_results, data_sheet_rows
+
+TARGET = 1_000_000
+
+
+# ============================================================================
+# REFERENCE: per-member helpers of bot-github.py before the engine (verbatim logic)
+# ============================================================================
+
+
+def calculate_daily_gains_from_cumulative(cumulative_fans: list) -> list:
+    if not cumulative_fans or len(cumulative_fans) < 2:
+        return []
+    daily_gains = []
+    for i in range(len(cumulative_fans) - 1):  # Can't calculate last day
+        if cumulative_fans[i] == 0:
+            daily_gains.append(None)  # No baseline yet (member not joined)
+        elif cumulative_fans[i + 1] == 0:
+            daily_gains.append(None)  # Member left/inactive
+        else:
+            gain = cumulative_fans[i + 1] - cumulative_fans[i]
+            daily_gains.append(gain if gain >= 0 else None)  # Negative = invalid
+    return daily_gains
+
+
+def calculate_last_day_gain(cumulative_fans: list, expected_days: int):
+    if len(cumulative_fans) <= expected_days:
+        return None  # No new month data yet
+    last_day_cumulative = cumulative_fans[expected_days - 1]
+    new_month_day1_cumulative = cumulative_fans[expected_days]
+    if last_day_cumulative == 0 or new_month_day1_cumulative == 0:
+        return None
+    gain = new_month_day1_cumulative - last_day_cumulative
+    return gain if gain >= 0 else None
+
+
+def apply_yui_logic(daily_gains: list, target_per_day: int) -> tuple:
+    if not daily_gains:
+        return (1, target_per_day, False)
+    start_day = 1
+    for i, gain in enumerate(daily_gains):
+        if gain is not None and gain > 0:
+            start_day = i + 1
+            break
+    else:
+        return (1, target_per_day, False)
+    days_active = len(daily_gains) - start_day + 1
+    return (start_day, target_per_day * days_active, start_day > 1)
+
+
+def calculate_data_sheet_rows(trainer_name: str, daily_gains: list, cumulative_fans: list,
+                              target_per_day: int, max_days: int = None) -> list:
+    if not daily_gains or not cumulative_fans:
+        return []
+    rows = []
+    start_day = 1
+    for i, gain in enumerate(daily_gains):
+        if gain is not None and gain > 0:
+            start_day = i + 1
+            break
+    effective_day_counter = 0
+    days_to_process = min(len(daily_gains), max_days) if max_days else len(daily_gains)
+    for day_idx in range(days_to_process):
+        gain = daily_gains[day_idx] if day_idx < len(daily_gains) else None
+        day_num = day_idx + 1
+        total_fans = sum(g for g in daily_gains[:day_idx + 1] if g is not None and g >= 0)
+        daily = gain if gain is not None and gain >= 0 else 0
+        if day_num >= start_day:
+            effective_day_counter += 1
+            target = effective_day_counter * target_per_day
+        else:
+            target = 0  # Before member started, no target
+        rows.append([trainer_name, day_num, total_fans, daily, target, total_fans - target])
+    return rows
+
+
+def run_old_loop(members, target, max_days, expected_days_old_month):
+    """Per member (gains, yui, rows) as the old _sync_plan_club loop built them"""
+    results = []
+    for name, cumulative in members:
+        if not cumulative:
+            results.append(None)  # Skipped by the loop
+            continue
+        daily_gains = calculate_daily_gains_from_cumulative(cumulative)
+        if expected_days_old_month:
+            last_day_gain = calculate_last_day_gain(cumulative, expected_days_old_month)
+            if last_day_gain is not None:
+                daily_gains.append(last_day_gain)
+        yui = apply_yui_logic(daily_gains, target)
+        rows = calculate_data_sheet_rows(name, daily_gains, cumulative, target, max_days)
+        results.append((daily_gains, yui, rows))
+    return results
+
+
+def run_engine(members, target, max_days, expected_days_old_month):
+    batch = compute_club_batch([c for _, c in members], target, max_days, expected_days_old_month)
+    names = [name for name, _ in members]
+    return [
+        None if not cumulative else result
+        for (_, cumulative), result in zip(
+            members, zip(gain_lists(batch), yui_results(batch), data_sheet_rows(batch, names))
+        )
+    ]
+
+
+def random_member(rng: random.Random, days: int) -> list:
+    """Cumulative fans with late joins, leaves, zero / negative gains"""
+    if days == 0:
+        return []
+    fans = rng.randint(10_000_000, 900_000_000)
+    join = rng.choice([0, 0, 0, rng.randint(0, days - 1)])
+    leave = rng.choice([days, days, rng.randint(join + 1, days)])
+    cumulative = []
+    for day in range(days):
+        if day < join or day >= leave:
+            cumulative.append(0)
+            continue
+        roll = rng.random()
+        if roll < 0.05:
+            fans -= rng.randint(1, 1000)
+        elif roll > 0.1:
+            fans += rng.randint(0, 5_000_000)
+        cumulative.append(fans)
+    return cumulative
+
+
+# ============================================================================
+# EQUIVALENCE WITH THE OLD PER-MEMBER LOOP
+# ============================================================================
+
+
+@pytest.mark.parametrize('expected_days_old_month, max_days', [
+    (None, None), (None, 30), (None, 5), (31, None), (31, 31), (30, 30), (28, 10),
+])
+def test_matches_old_loop_with_mixed_day_counts(expected_days_old_month, max_days):
+    rng = random.Random(f"{expected_days_old_month}-{max_days}")
+    longest = (expected_days_old_month or 30) + 1
+    for _ in range(150):
+        # Every member has its own length: empty, 1 day, partial, full, new-month day
+        members = [
+            (f"M{i}", random_member(rng, rng.choice([0, 1, 2, rng.randint(0, longest), longest - 1, longest, longest + 1])))
+            for i in range(rng.randint(1, 12))
+        ]
+        expected = run_old_loop(members, TARGET, max_days, expected_days_old_month)
+        assert run_engine(members, TARGET, max_days, expected_days_old_month) == expected
+
+
+def test_uniform_day_counts_match_old_loop():
+    rng = random.Random(3)
+    members = [(f"M{i}", random_member(rng, 31)) for i in range(30)]
+    assert run_engine(members, TARGET, 30, None) == run_old_loop(members, TARGET, 30, None)
+
+
+def test_all_members_empty():
+    batch = compute_club_batch([[], []], TARGET)
+    assert gain_lists(batch) == [[], []]
+    assert yui_results(batch) == [(1, TARGET, False), (1, TARGET, False)]
+    assert data_sheet_rows(batch, ['A', 'B']) == [[], []]
+
+
+# ============================================================================
+# KNOWN VALUES
+# ============================================================================
+
+
+def test_late_joiner_with_shorter_history():
+    # A: full 4 days; B: joins on Day 2, API has only 3 days for B
+    batch = compute_club_batch([[100, 150, 150, 400], [0, 500, 700]], 10)
+    assert gain_lists(batch) == [[50, 0, 250], [None, 200]]
+    assert yui_results(batch) == [(1, 30, False), (2, 10, True)]
+    assert data_sheet_rows(batch, ['A', 'B']) == [
+        [['A', 1, 50, 50, 10, 40], ['A', 2, 50, 0, 20, 30], ['A', 3, 300, 250, 30, 270]],
+        [['B', 1, 0, 0, 0, 0], ['B', 2, 200, 200, 10, 190]],
+    ]
+
+
+def test_negative_gain_and_leaver_are_invalid_days():
+    batch = compute_club_batch([[100, 90, 120, 0]], 10)
+    assert gain_lists(batch) == [[None, 30, None]]
+    assert data_sheet_rows(batch, ['A']) == [
+        [['A', 1, 0, 0, 0, 0], ['A', 2, 30, 30, 10, 20], ['A', 3, 30, 0, 20, 10]],
+    ]
+
+
+def test_last_day_gain_only_for_members_with_new_month_data():
+    # Old month has 3 days; A has Day 1 of the new month, B does not
+    batch = compute_club_batch([[10, 20, 35, 50], [10, 20, 35]], 1, expected_days_old_month=3)
+    assert gain_lists(batch) == [[10, 15, 15, 15], [10, 15]]
@@ -0,0 +1,43 @@
+"""Tests for models/history_store.py (Arrow history partitions)
+
+Run: python -m pytest -q test_history_store.py
+"""
+
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from models.history_store import HistoryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(str(tmp_path / 'history'))
+
+
+def test_write_and_read_month(store):
+    rows = store.write_month('Club/A', '09/2026', [
+        {'viewer_id': 1, 'trainer_name': 'Teio', 'cumulative': [100, 150, 0], 'daily': [50, None, None]},
+        {'viewer_id': '2', 'trainer_name': 'Ryan', 'cumulative': [0, 300, 400], 'daily': [None, 100]},
+    ])
+    assert rows == 4
+    assert store.months('Club/A') == ['09/2026']
+    table = store.read_month('Club/A', '09/2026', columns=['viewer_id', 'day', 'daily_fans'])
+    assert table.to_pylist() == [
+        {'viewer_id': '1', 'day': 1, 'daily_fans': 50},
+        {'viewer_id': '1', 'day': 2, 'daily_fans': None},
+        {'viewer_id': '2', 'day': 2, 'daily_fans': 100},
+        {'viewer_id': '2', 'day': 3, 'daily_fans': None},
+    ]
+
+
+def test_last_day_cumulative_is_last_stored_day(store):
+    assert store.last_day_cumulative('Club', '09/2026') is None
+    store.write_month('Club', '09/2026', [
+        {'viewer_id': '2', 'cumulative': [0, 300, 400]},
+        {'viewer_id': '1', 'cumulative': [100, 150, 0]},  # Left on the last day
+    ])
+    assert store.last_day_cumulative('Club', '09/2026') == {'1': 150, '2': 400}
+
+    store.write_month('Club', '09/2026', [])
+    assert store.last_day_cumulative('Club', '09/2026') == {}
@@ -0,0 +1,147 @@
+"""Tests for utils/member_index.py (member name search)
+
+Run: python -m pytest -q test_member_index.py
+"""
+
+import random
+
+import pytest
+
+from utils.member_index import MemberIndex, normalize_name
+
+CLUBS = {
+    'Alpha': ['Kitasan', 'Kita Black', 'Mejiro McQueen', 'ゴールドシップ', 'Rice Shower', ''],
+    'Beta': ['Kitasan', 'Special Week', 'Silence Suzuka', 'Akita'],
+    'Gamma': ['Tokai Teio', 'Ｓｐｅｃｉａｌ　Ｗｅｅｋ', 'Mejiro Ryan'],
+}
+
+
+@pytest.fixture
+def index():
+    index = MemberIndex(fuzzy_cutoff=80)
+    index.build(CLUBS)
+    return index
+
+
+def test_normalize_name():
+    assert normalize_name('  Ｓｐｅｃｉａｌ　 Ｗｅｅｋ ') == 'special week'
+    assert normalize_name('STRASSE') == normalize_name('straße')
+    assert normalize_name(None) == ''
+
+
+# ============================================================================
+# PER-CLUB AUTOCOMPLETE
+# ============================================================================
+
+
+def test_empty_query_is_default_order(index):
+    # Non-ASCII first, then A-Z; empty names dropped
+    assert index.search_club('Alpha') == ['ゴールドシップ', 'Kita Black', 'Kitasan', 'Mejiro McQueen', 'Rice Shower']
+    assert index.search_club('Alpha', limit=2) == ['ゴールドシップ', 'Kita Black']
+
+
+def test_club_name_is_case_insensitive(index):
+    assert index.search_club('beta', 'week') == ['Special Week']
+    assert index.resolve_club('GAMMA') == 'Gamma'
+    assert index.search_club('Delta', 'kita') == []
+
+
+def test_ranking_exact_prefix_word_prefix_substring(index):
+    index.build({'Club': ['Xkitasan', 'Kita', 'Mr Kitasan', 'Kitasan', 'Kitasan Black']})
+    assert index.search_club('Club', 'kitasan') == ['Kitasan', 'Kitasan Black', 'Mr Kitasan', 'Xkitasan']
+    assert index.search_club('Club', 'kita') == ['Kita', 'Kitasan', 'Kitasan Black', 'Mr Kitasan', 'Xkitasan']
+
+
+def test_fuzzy_fill_for_typos(index):
+    assert index.search_club('Alpha', 'mejro') == ['Mejiro McQueen']
+    assert index.search_club('Alpha', 'zzz') == []
+    # Fuzzy matches only fill up to the limit after real matches
+    assert index.search_club('Beta', 'silense', limit=1) == ['Silence Suzuka']
+
+
+def test_duplicate_names_in_a_club_listed_once():
+    index = MemberIndex()
+    index.build({'Club': ['Teio', 'Teio', 'Ryan']})
+    assert index.search_club('Club') == ['Ryan', 'Teio']
+
+
+# ============================================================================
+# CROSS-CLUB SEARCH
+# ============================================================================
+
+
+def test_search_all_returns_club_of_each_match(index):
+    assert index.search_all('kitasan') == [('Kitasan', 'Alpha'), ('Kitasan', 'Beta')]
+    # Full-width name matches too (and sorts first as non-ASCII)
+    assert index.search_all('special week') == [('Ｓｐｅｃｉａｌ　Ｗｅｅｋ', 'Gamma'), ('Special Week', 'Beta')]
+
+
+def test_search_all_short_and_substring_queries(index):
+    assert index.search_all('ki') == [
+        ('Kita Black', 'Alpha'), ('Kitasan', 'Alpha'), ('Kitasan', 'Beta'), ('Akita', 'Beta'),
+    ]
+    # Substring matches: earlier position first
+    assert index.search_all('ita') == [
+        ('Kita Black', 'Alpha'), ('Kitasan', 'Alpha'), ('Kitasan', 'Beta'), ('Akita', 'Beta'),
+    ]
+
+
+def test_search_all_empty_query_is_global_default_order(index):
+    assert index.search_all('', limit=4) == [
+        ('ゴールドシップ', 'Alpha'), ('Ｓｐｅｃｉａｌ　Ｗｅｅｋ', 'Gamma'), ('Akita', 'Beta'), ('Kita Black', 'Alpha'),
+    ]
+
+
+def test_search_all_matches_brute_force():
+    rng = random.Random(5)
+    clubs = {
+        f"Club {c}": [
+            ' '.join(''.join(rng.choice('abcde') for _ in range(rng.randint(1, 6))) for _ in range(rng.randint(1, 3)))
+            for _ in range(rng.randint(0, 20))
+        ]
+        for c in range(30)
+    }
+    index = MemberIndex(fuzzy_cutoff=100)  # Typo matches only if they are exact partial matches
+    index.build(clubs)
+    entries = [(name, club) for club, names in clubs.items() for name in dict.fromkeys(names)]
+
+    for _ in range(300):
+        query = ''.join(rng.choice('abcde ') for _ in range(rng.randint(1, 5)))
+        if not query.strip():
+            continue
+        expected = {(name, club) for name, club in entries if normalize_name(query) in normalize_name(name)}
+        assert set(index.search_all(query, limit=10_000)) == expected
+        assert len(index.search_all(query, limit=3)) == min(3, len(expected))
+
+
+# ============================================================================
+# UPDATES
+# ============================================================================
+
+
+def test_update_club_rebuilds_once_on_next_search(index):
+    builds = index.builds
+    index.update_club('Alpha', ['Oguri Cap'])
+    index.update_club('Delta', ['Gold City'])
+    index.update_club('Beta', CLUBS['Beta'])  # Unchanged
+    assert index.builds == builds
+
+    assert index.search_club('Alpha') == ['Oguri Cap']
+    assert index.search_all('gold') == [('Gold City', 'Delta')]
+    assert index.builds == builds + 1
+    assert index.get_stats()['clubs'] == 4
+
+
+def test_update_club_does_not_change_built_input(index):
+    names = ['Oguri Cap']
+    index.update_club('Alpha', names)
+    names.append('Tamamo Cross')
+    assert index.search_club('Alpha') == ['Oguri Cap']
+
+
+def test_stats_count_members_and_searches(index):
+    index.search_all('kita')
+    stats = index.get_stats()
+    assert stats['members'] == sum(len(set(filter(None, names))) for names in CLUBS.values())
+    assert stats['searches'] == 1
+    assert stats['trigrams'] > 0
@@ -0,0 +1,168 @@
+"""Tests for utils/sheet_diff.py and models/sheet_grid_store.py
+
+Run: python -m pytest -q test_sheet_diff.py
+"""
+
+import os
+import random
+
+from gspread.utils import a1_range_to_grid_range
+
+from utils.sheet_diff import normalize_cell, normalize_grid, grid_hash, diff_grid
+from models.sheet_grid_store import SheetGridStore
+
+
+def apply(previous, ranges):
+    """Sheet contents after writing `ranges` over `previous` (normalized)"""
+    sheet = [list(row) for row in previous]
+    for a1, values in ranges:
+        bounds = a1_range_to_grid_range(a1)
+        for dr, row in enumerate(values):
+            r = bounds['startRowIndex'] + dr
+            while len(sheet) <= r:
+                sheet.append([])
+            for dc, value in enumerate(row):
+                c = bounds['startColumnIndex'] + dc
+                while len(sheet[r]) <= c:
+                    sheet[r].append('')
+                sheet[r][c] = value
+    return normalize_grid(sheet)
+
+
+# ============================================================================
+# NORMALIZATION
+# ============================================================================
+
+
+def test_normalize_cell():
+    assert normalize_cell(None) == ''
+    assert normalize_cell(True) == 'TRUE'
+    assert normalize_cell(False) == 'FALSE'
+    assert normalize_cell(12.0) == '12'
+    assert normalize_cell(12.5) == '12.5'
+    assert normalize_cell(7) == '7'
+    assert normalize_cell('Name') == 'Name'
+
+
+def test_normalize_grid_trims_trailing_cells_and_rows():
+    grid = [['a', None, ''], [1.0, 2, ''], ['', None], []]
+    assert normalize_grid(grid) == [['a'], ['1', '2']]
+
+
+def test_normalize_grid_from_sheet_drops_thousands_separators():
+    grid = [['1,234,567', '-12,000.5', 'Smith, John', '1,23']]
+    assert normalize_grid(grid, from_sheet=True) == [['1234567', '-12000.5', 'Smith, John', '1,23']]
+    assert normalize_grid(grid) == [['1,234,567', '-12,000.5', 'Smith, John', '1,23']]
+
+
+def test_grid_hash_is_stable_and_content_based():
+    grid = normalize_grid([['Name', 1000.0], ['x', None]])
+    assert grid_hash(grid) == grid_hash(normalize_grid([['Name', '1000'], ['x']]))
+    assert grid_hash(grid) != grid_hash(normalize_grid([['Name', 1001]]))
+    assert len(grid_hash(grid)) == 32
+
+
+# ============================================================================
+# DIFF
+# ============================================================================
+
+
+def test_identical_grid_has_no_ranges():
+    grid = [['Name', 'Fans'], ['A', 100], ['B', 200.0]]
+    assert diff_grid(normalize_grid(grid), grid) == []
+
+
+def test_single_changed_cell():
+    previous = normalize_grid([['Name', 'Fans'], ['A', 100], ['B', 200]])
+    grid = [['Name', 'Fans'], ['A', 150], ['B', 200]]
+    assert diff_grid(previous, grid) == [('B2:B2', [[150]])]
+
+
+def test_consecutive_rows_merge_and_gaps_split():
+    previous = normalize_grid([['a', 'b', 'c']] * 5)
+    grid = [['a', 'b', 'c'], ['x', 'b', 'c'], ['a', 'b', 'y'], ['a', 'b', 'c'], ['a', 'z', 'c']]
+    assert diff_grid(previous, grid) == [
+        ('A2:C3', [['x', 'b', 'c'], ['a', 'b', 'y']]),
+        ('B5:B5', [['z']]),
+    ]
+
+
+def test_removed_cells_are_blanked():
+    previous = normalize_grid([['a', 'b', 'c'], ['d', 'e'], ['f']])
+    grid = [['a'], ['d', 'e']]
+    ranges = diff_grid(previous, grid)
+    assert ranges == [('B1:C1', [['', '']]), ('A3:A3', [['']])]
+    assert apply(previous, ranges) == normalize_grid(grid)
+
+
+def test_planned_values_are_sent_raw():
+    previous = normalize_grid([['a', '']])
+    ranges = diff_grid(previous, [['a', 5.0, None, True]])
+    assert ranges == [('B1:D1', [[5.0, '', True]])]
+
+
+def test_number_formatted_sheet_matches_plan():
+    previous = normalize_grid([['Fans', '1,234,567']], from_sheet=True)
+    assert diff_grid(previous, [['Fans', 1234567]]) == []
+
+
+def test_diff_reproduces_plan_on_random_grids():
+    rng = random.Random(7)
+    for _ in range(200):
+        def grid():
+            return [
+                [rng.choice(['', 'a', 'b', 1, 2.0, None]) for _ in range(rng.randint(0, 6))]
+                for _ in range(rng.randint(0, 8))
+            ]
+
+        previous, planned = normalize_grid(grid()), grid()
+        assert apply(previous, diff_grid(previous, planned)) == normalize_grid(planned)
+
+
+# ============================================================================
+# SHEET GRID STORE
+# ============================================================================
+
+
+def test_store_put_get_and_reload(tmp_path):
+    store = SheetGridStore(str(tmp_path))
+    assert store.get('Club A_Data') is None
+    store.put('Club A_Data', [['Name', 1.0, None]])
+    assert store.get('Club A_Data') == [['Name', '1']]
+    assert store.get_hash('Club A_Data') == grid_hash([['Name', '1']])
+
+    reloaded = SheetGridStore(str(tmp_path))
+    assert reloaded.get('Club A_Data') == [['Name', '1']]
+
+
+def test_store_shares_identical_grids_and_removes_unused(tmp_path):
+    store = SheetGridStore(str(tmp_path))
+    store.put('A', [['x']])
+    store.put('B', [['x']])
+    shared = tmp_path / f"{store.get_hash('A')}.json"
+    assert store.get_hash('A') == store.get_hash('B')
+
+    store.put('A', [['y']])
+    assert shared.exists()  # still used by B
+    store.forget('B')
+    assert not shared.exists()
+    assert sorted(os.listdir(tmp_path)) == sorted(['index.json', f"{store.get_hash('A')}.json"])
+
+
+def test_store_forgets_unreadable_grid(tmp_path):
+    store = SheetGridStore(str(tmp_path))
+    store.put('A', [['x']])
+    (tmp_path / f"{store.get_hash('A')}.json").write_text('{not json')
+    assert store.get('A') is None
+    assert store.get_hash('A') is None
+    assert SheetGridStore(str(tmp_path)).get_hash('A') is None
+
+
+def test_store_counts_writes(tmp_path):
+    store = SheetGridStore(str(tmp_path))
+    store.count_write('unchanged', 0)
+    store.count_write('diff', 3)
+    store.count_write('full', 40)
+    assert store.get_stats() == {
+        'sheets': 0, 'unchanged': 1, 'diffed': 1, 'full_writes': 1, 'cells_written': 43,
+    }
@@ -0,0 +1,39 @@
+"""Tests for models/sheets_limiter.py (event loop thread detection)
+
+Run: python -m pytest -q test_sheets_limiter.py
+"""
+
+import asyncio
+
+import pytest
+
+from models.sheets_limiter import SheetsRateLimiter, to_sheets_thread
+
+
+@pytest.fixture
+def limiter():
+    return SheetsRateLimiter(requests_per_minute=6000, burst=10, interactive_reserve=0)
+
+
+def test_worker_thread_requests_are_not_reported(limiter, capsys):
+    async def main():
+        await to_sheets_thread(limiter.acquire)
+        await asyncio.to_thread(limiter.acquire)
+
+    asyncio.run(main())
+    limiter.acquire()  # No loop running at all
+    assert limiter.get_stats()['loop_thread_requests'] == 0
+    assert capsys.readouterr().out == ''
+
+
+def test_loop_thread_requests_warn_once_per_call_site(limiter, capsys):
+    async def main():
+        for _ in range(3):
+            limiter.acquire()
+        limiter.acquire()
+
+    asyncio.run(main())
+    assert limiter.get_stats()['loop_thread_requests'] == 4
+    warnings = capsys.readouterr().out.splitlines()
+    assert len(warnings) == 2
+    assert all('event loop thread' in line and 'test_sheets_limiter.py' in line for line in warnings)
@@ -0,0 +1,143 @@
+"""Tests for utils/single_flight.py (request coalescing)
+
+Run: python -m pytest -q test_single_flight.py
+"""
+
+import asyncio
+
+import pytest
+
+from utils.single_flight import SingleFlight
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class Upstream:
+    """Fake upstream call that blocks until released"""
+
+    def __init__(self, result='value', error: Exception = None):
+        self.calls = 0
+        self.result = result
+        self.error = error
+        self.release = None
+
+    async def fetch(self):
+        self.calls += 1
+        call = self.calls
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return f"{self.result}-{call}"
+
+
+def test_concurrent_calls_share_one_execution():
+    async def main():
+        flight, upstream = SingleFlight(), Upstream()
+        upstream.release = asyncio.Event()
+        waiters = [asyncio.ensure_future(flight.do('club_data', 'A', upstream.fetch)) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert flight.in_flight('club_data', 'A')
+        upstream.release.set()
+        results = await asyncio.gather(*waiters)
+        return flight, upstream, results
+
+    flight, upstream, results = run(main())
+    assert upstream.calls == 1
+    assert results == ['value-1'] * 5
+    assert flight.get_stats()['resources']['club_data'] == {'calls': 5, 'executions': 1, 'coalesced': 4, 'errors': 0}
+    assert flight.get_stats()['in_flight'] == 0
+
+
+def test_different_keys_and_resources_run_separately():
+    async def main():
+        flight, upstream = SingleFlight(), Upstream()
+        upstream.release = asyncio.Event()
+        upstream.release.set()
+        return await asyncio.gather(
+            flight.do('club_data', 'A', upstream.fetch),
+            flight.do('club_data', 'B', upstream.fetch),
+            flight.do('circle', 'A', upstream.fetch),
+        ), upstream
+
+    results, upstream = run(main())
+    assert upstream.calls == 3
+    assert len(set(results)) == 3
+
+
+def test_finished_call_is_not_reused():
+    async def main():
+        flight, upstream = SingleFlight(), Upstream()
+        upstream.release = asyncio.Event()
+        upstream.release.set()
+        first = await flight.do('club_data', 'A', upstream.fetch)
+        second = await flight.do('club_data', 'A', upstream.fetch)
+        return first, second
+
+    assert run(main()) == ('value-1', 'value-2')
+
+
+def test_exception_reaches_every_waiter_and_is_counted():
+    async def main():
+        flight, upstream = SingleFlight(), Upstream(error=RuntimeError('upstream down'))
+        upstream.release = asyncio.Event()
+        waiters = [asyncio.ensure_future(flight.do('circle', 1, upstream.fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        upstream.release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        return flight, upstream, results
+
+    flight, upstream, results = run(main())
+    assert upstream.calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.get_stats()['resources']['circle']['errors'] == 1
+
+
+def test_cancelled_waiter_does_not_cancel_shared_call():
+    async def main():
+        flight, upstream = SingleFlight(), Upstream()
+        upstream.release = asyncio.Event()
+        impatient = asyncio.ensure_future(
+            asyncio.wait_for(flight.do('club_data', 'A', upstream.fetch), timeout=0.01)
+        )
+        patient = asyncio.ensure_future(flight.do('club_data', 'A', upstream.fetch))
+        with pytest.raises(asyncio.TimeoutError):
+            await impatient
+        upstream.release.set()
+        return await patient, upstream
+
+    result, upstream = run(main())
+    assert result == 'value-1'
+    assert upstream.calls == 1
+
+
+def test_forget_starts_a_fresh_call_for_new_callers():
+    async def main():
+        flight, upstream = SingleFlight(), Upstream()
+        upstream.release = asyncio.Event()
+        old = asyncio.ensure_future(flight.do('club_data', 'A', upstream.fetch))
+        await asyncio.sleep(0)
+        flight.forget('club_data', 'A')
+        new = asyncio.ensure_future(flight.do('club_data', 'A', upstream.fetch))
+        await asyncio.sleep(0)
+        upstream.release.set()
+        return await old, await new, upstream
+
+    old, new, upstream = run(main())
+    assert upstream.calls == 2
+    assert (old, new) == ('value-1', 'value-2')
+
+
+def test_start_runs_fire_and_forget_failures_without_unhandled_errors():
+    async def main():
+        flight, upstream = SingleFlight(), Upstream(error=ValueError('bad'))
+        upstream.release = asyncio.Event()
+        upstream.release.set()
+        task = flight.start('refresh', 'A', upstream.fetch)
+        await asyncio.sleep(0.01)
+        return flight, task
+
+    flight, task = run(main())
+    assert task.done()
+    assert flight.get_stats()['resources']['refresh']['errors'] == 1
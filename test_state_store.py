@@ -0,0 +1,108 @@
+"""Tests for models/state_store.py (per-table change versions)
+
+Run: python -m pytest -q test_state_store.py
+"""
+
+import pytest
+
+import auto_backup
+from models.state_store import StateStore
+from utils.config_registry import ConfigRegistry
+
+
+@pytest.fixture
+def store(tmp_path, capsys):
+    store = StateStore(str(tmp_path / 'state.db'), import_legacy=False).open()
+    capsys.readouterr()
+    yield store
+    store.close()
+
+
+def test_writes_bump_only_their_table(store):
+    assert store.table_version('allowed_channels') == 0
+    store.add_allowed_channel({'channel_id': 1, 'server_id': 10})
+    store.save_profile_link(42, {'viewer_id': '123'})
+    store.save_tournament({'id': 't1', 'guild_id': 10, 'status': 'open'})
+    store.save_profile_link(43, {'viewer_id': '456'})
+    assert store.table_version('allowed_channels') == 1
+    assert store.table_version('profile_links') == 2
+    assert store.table_version('tournaments') == 1
+    assert store.table_version('admins') == 0
+    assert store.table_version('server_invites') == 0
+
+
+def test_no_op_writes_do_not_bump(store):
+    assert not store.remove_allowed_channel(99)
+    assert store.delete_server_invite('10') is None
+    assert store.table_version('allowed_channels') == 0
+    assert store.table_version('server_invites') == 0
+
+
+def test_versions_are_seen_by_other_connections(store):
+    other = StateStore(store.db_file, import_legacy=False).open()
+    try:
+        other.replace_admins([1, 2], updated_by=1)
+        assert store.table_version('admins') == 1
+        assert store.list_admins() == [1, 2]
+    finally:
+        other.close()
+
+
+def test_registry_entry_reloads_only_for_its_table(store):
+    registry = ConfigRegistry(check_interval=0)
+    registry.register(
+        'allowed_channels',
+        loader=store.list_allowed_channels,
+        signature=lambda: store.table_version('allowed_channels'),
+    )
+    assert registry.get('allowed_channels') == []
+
+    store.save_profile_link(42, {'viewer_id': '123'})
+    store.log_channel_change({'action': 'add', 'channel_id': 1})
+    registry.get('allowed_channels')
+    assert registry.get_stats()['allowed_channels']['loads'] == 1
+
+    store.add_allowed_channel({'channel_id': 1, 'server_id': 10})
+    assert registry.get('allowed_channels') == [{'channel_id': 1, 'server_id': 10}]
+    assert registry.get_stats()['allowed_channels']['loads'] == 2
+
+
+# ============================================================================
+# BACKUP / RESTORE
+# ============================================================================
+
+
+def test_backup_and_restore_round_trip(store, tmp_path):
+    store.add_allowed_channel({'channel_id': 1, 'server_id': 10})
+    snapshot = str(tmp_path / 'snapshot.db')
+    store.backup(snapshot)
+
+    store.add_allowed_channel({'channel_id': 2, 'server_id': 10})
+    versions_before = store.table_version('allowed_channels')
+    store.restore(snapshot)
+    assert [ch['channel_id'] for ch in store.list_allowed_channels()] == [1]
+    # Restored versions move forward, so caches of the table reload
+    assert store.table_version('allowed_channels') > versions_before
+
+
+def test_auto_backup_snapshots_configured_database(store, tmp_path, monkeypatch, capsys):
+    store.save_profile_link(42, {'viewer_id': '123'})
+    monkeypatch.setattr(auto_backup, 'BACKUP_DIR', str(tmp_path / 'backups'))
+    monkeypatch.setattr(auto_backup, 'SCRIPT_DIR', str(tmp_path))
+    monkeypatch.setattr(auto_backup, 'STATE_DB_FILE', store.db_file)
+    monkeypatch.setattr(auto_backup, 'state_store', store)
+
+    results = auto_backup.backup_all_critical_files('test')
+    assert auto_backup.STATE_DB_FILENAME in results['files']
+    snapshot = StateStore(str(tmp_path / 'backups' / results['folder'] / auto_backup.STATE_DB_FILENAME),
+                          import_legacy=False).open()
+    try:
+        assert snapshot.get_profile_link(42) == {'viewer_id': '123'}
+    finally:
+        snapshot.close()
+
+    monkeypatch.setattr(auto_backup, 'STATE_DB_FILE', str(tmp_path / 'missing.db'))
+    capsys.readouterr()
+    results = auto_backup.backup_all_critical_files('test')
+    assert auto_backup.STATE_DB_FILENAME not in results['files']
+    assert 'State database not found' in capsys.readouterr().out
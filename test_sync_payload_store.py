@@ -0,0 +1,185 @@
+"""Tests for models/sync_payload_store.py and when the club sync records a payload
+
+Run: python -m pytest -q test_sync_payload_store.py
+"""
+
+import asyncio
+import contextlib
+import importlib.util
+import io
+import json
+import types
+
+import pytest
+
+from models.sync_payload_store import SyncPayloadStore, payload_hash
+
+MEMBERS = [
+    {'viewer_id': 2, 'trainer_name': 'B', 'daily_fans': [0, 1500000]},
+    {'viewer_id': 1, 'trainer_name': 'A', 'daily_fans': [1000000, None]},
+]
+SETTINGS = (5000000, 'Club A', 'Club A_Data')
+
+
+# ============================================================================
+# PAYLOAD HASH
+# ============================================================================
+
+
+def test_payload_hash_is_stable_across_runs():
+    # Persisted between restarts: a changed digest would re-sync every club once
+    assert payload_hash(MEMBERS, *SETTINGS) == '8f5688e03040e3e6610b26009576f19c'
+
+
+def test_payload_hash_ignores_member_order_and_field_types():
+    same = [
+        {'viewer_id': '1', 'trainer_name': 'A', 'daily_fans': [1000000.0, 0], 'rank': 3},
+        {'viewer_id': '2', 'trainer_name': 'B', 'daily_fans': ['0', '1500000']},
+    ]
+    assert payload_hash(same, *SETTINGS) == payload_hash(MEMBERS, *SETTINGS)
+
+
+@pytest.mark.parametrize('members, settings', [
+    ([dict(MEMBERS[0], daily_fans=[0, 1500001]), MEMBERS[1]], SETTINGS),
+    ([dict(MEMBERS[0], daily_fans=[0, 1500000, 0]), MEMBERS[1]], SETTINGS),
+    ([dict(MEMBERS[0], trainer_name='B2'), MEMBERS[1]], SETTINGS),
+    (MEMBERS[:1], SETTINGS),
+    (MEMBERS, (6000000, 'Club A', 'Club A_Data')),
+    (MEMBERS, (5000000, 'Club A', 'Club A_Data2')),
+])
+def test_payload_hash_changes_with_sheet_inputs(members, settings):
+    assert payload_hash(members, *settings) != payload_hash(MEMBERS, *SETTINGS)
+
+
+# ============================================================================
+# SYNC PAYLOAD STORE
+# ============================================================================
+
+
+def test_unchanged_only_for_same_hash_and_month(tmp_path):
+    store = SyncPayloadStore(str(tmp_path / 'payloads.json'))
+    assert not store.is_unchanged('Club A', 'h1', '10/2026')
+    store.record('Club A', 'h1', '10/2026', ('Club A', 'Club A_Data'))
+    assert store.is_unchanged('Club A', 'h1', '10/2026')
+    assert not store.is_unchanged('Club A', 'h2', '10/2026')
+    assert not store.is_unchanged('Club A', 'h1', '11/2026')
+    assert store.get_stats() == {'clubs': 1, 'skipped': 1, 'changed': 3}
+
+
+def test_save_persists_only_when_dirty(tmp_path):
+    path = tmp_path / 'payloads.json'
+    store = SyncPayloadStore(str(path))
+    store.save()
+    assert not path.exists()
+
+    store.record('Club A', 'h1', '10/2026', ('Club A', ''))
+    store.save()
+    assert json.loads(path.read_text())['Club A']['sheets'] == ['Club A']
+    assert SyncPayloadStore(str(path)).is_unchanged('Club A', 'h1', '10/2026')
+
+
+def test_forget_sheet_drops_only_clubs_that_wrote_it(tmp_path):
+    path = tmp_path / 'payloads.json'
+    store = SyncPayloadStore(str(path))
+    store.record('Club A', 'h1', '10/2026', ('Club A', 'Shared_Data'))
+    store.record('Club B', 'h2', '10/2026', ('Club B', 'Shared_Data'))
+    store.record('Club C', 'h3', '10/2026', ('Club C', 'Club C_Data'))
+    store.save()
+
+    store.forget_sheet('Shared_Data')
+    assert sorted(store.clubs) == ['Club C']
+    # Saved immediately (the sheet was just re-created)
+    assert sorted(SyncPayloadStore(str(path)).clubs) == ['Club C']
+
+    store.forget_sheet('Unknown')
+    assert sorted(store.clubs) == ['Club C']
+
+
+# ============================================================================
+# RECORDED ONLY AFTER A SUCCESSFUL WRITE (bot-github.py _sync_write_club)
+# ============================================================================
+
+
+@pytest.fixture(scope='module')
+def bot():
+    spec = importlib.util.spec_from_file_location('bot_github', 'bot-github.py')
+    module = importlib.util.module_from_spec(spec)
+    with contextlib.redirect_stdout(io.StringIO()):
+        spec.loader.exec_module(module)
+    return module
+
+
+def _write_club(bot, monkeypatch, tmp_path, member_result, data_result):
+    """Run _sync_write_club with faked sheet writes
+
+    member_result / data_result: 'unchanged', 'ok' or an exception to fail with
+    """
+    store = SyncPayloadStore(str(tmp_path / 'payloads.json'))
+    worksheets = {'Club A': types.SimpleNamespace(title='Club A'),
+                  'Club A_Data': types.SimpleNamespace(title='Club A_Data')}
+    results = {'Club A': member_result, 'Club A_Data': data_result}
+
+    def queue_sheet_grid_write(worksheet, grid, current=None):
+        result = results[worksheet.title]
+        done = asyncio.get_running_loop().create_future()
+        if isinstance(result, Exception):
+            done.set_exception(result)
+        else:
+            done.set_result(None)
+        return {'mode': 'unchanged' if result == 'unchanged' else 'diff', 'cells': 1, 'done': done}
+
+    monkeypatch.setattr(bot, 'sync_payload_store', store)
+    monkeypatch.setattr(bot, 'queue_sheet_grid_write', queue_sheet_grid_write)
+    monkeypatch.setattr(bot, 'gs_manager', types.SimpleNamespace(get_worksheet=worksheets.__getitem__))
+    monkeypatch.setattr(bot, 'invalidate_cache_for_club', lambda *args: None)
+    monkeypatch.setattr(bot, 'client', types.SimpleNamespace(member_cache={}))
+    monkeypatch.setattr(bot, 'member_index', types.SimpleNamespace(update_club=lambda *args: None))
+    monkeypatch.setattr(bot, 'global_leaderboard', types.SimpleNamespace(update_club=lambda *args: None))
+
+    run = {
+        'pending_ranks': [], 'members_synced': 0, 'sheets_unchanged': 0,
+        'transfer_warnings_log': [], 'error_count': 0, 'failed_clubs': [],
+    }
+    job = {
+        'run': run, 'idx': 2, 'config': {'Club_Name': 'Club A'}, 'club_name': 'Club A',
+        'payload_hash': 'h1', 'current_month': '10/2026', 'payload_sheets': ('Club A', 'Club A_Data'),
+        'member_plan': {
+            'member_ws': worksheets['Club A'], 'member_sheet_values': [], 'full_data': [['x']],
+            'ranges_to_format': [], 'rows_count': 1, 'max_days': 1, 'current_month': '10/2026',
+            'new_archive_rows': 0, 'existing_archive_rows': 0,
+            'data_sheet_name': 'Club A_Data',
+            'data_sheet_grid': [['Club A'], ['Name', 'Day'], ['A', 1]],
+            'data_sheet_rows': 1, 'member_names': ['A'],
+        },
+    }
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(bot._sync_write_club(job))
+    return store, run
+
+
+@pytest.mark.parametrize('member_result, data_result', [
+    ('ok', 'ok'),
+    ('unchanged', 'unchanged'),
+    ('unchanged', 'ok'),
+    ('ok', 'unchanged'),
+])
+def test_payload_recorded_after_successful_writes(bot, monkeypatch, tmp_path, member_result, data_result):
+    store, run = _write_club(bot, monkeypatch, tmp_path, member_result, data_result)
+    assert store.is_unchanged('Club A', 'h1', '10/2026')
+    assert store.clubs['Club A']['sheets'] == ['Club A', 'Club A_Data']
+    assert run['failed_clubs'] == []
+    assert run['members_synced'] == 1
+
+
+@pytest.mark.parametrize('member_result, data_result, reason', [
+    (RuntimeError('member write rejected'), 'ok', 'exception'),
+    (RuntimeError('member write rejected'), RuntimeError('data write rejected'), 'exception'),
+    ('ok', RuntimeError('data write rejected'), 'data_sheet'),
+    ('unchanged', RuntimeError('data write rejected'), 'data_sheet'),
+])
+def test_payload_not_recorded_when_a_write_fails(bot, monkeypatch, tmp_path, member_result, data_result, reason):
+    store, run = _write_club(bot, monkeypatch, tmp_path, member_result, data_result)
+    assert 'Club A' not in store.clubs
+    assert not store.dirty
+    assert run['error_count'] == 1
+    assert [(failed['idx'], failed['reason']) for failed in run['failed_clubs']] == [(2, reason)]
@@ -0,0 +1,399 @@
+"""Tests for tasks/sync_planner.py (club sync planning)
+
+Scenario tests build a payload and a member sheet for a fixed date and check
+the planned grid. The stored cases (test_data/sync_planner_cases.jsonl) are
+randomized clubs whose expected plans were produced by the sync code before
+planning moved out of bot-github.py; plan_club_sync must still match them.
+
+Run: python -m pytest -q test_sync_planner.py
+"""
+
+import copy
+import datetime
+import json
+import os
+
+import pytest
+
+import tasks.sync_planner as sync_planner
+from tasks.sync_planner import (
+    MEMBER_HEADER_SUFFIX, get_days_in_month, month_context, plan_club_sync,
+    split_history_months,
+)
+
+CLUB = {
+    'Club_Name': 'Club',
+    'Members_Sheet_Name': 'Club_Members',
+    'Data_Sheet_Name': '',
+    'Target_Per_Day': '1000000',
+}
+GAIN = 100_000
+
+# Inputs + expected plans (one JSON case per line)
+CASES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_data', 'sync_planner_cases.jsonl')
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+
+def member(viewer_id: str, cumulative: list) -> dict:
+    return {'viewer_id': viewer_id, 'trainer_name': f"Trainer {viewer_id}", 'daily_fans': list(cumulative)}
+
+
+def steady(viewer_id: str, slots: int, base: int = 10_000_000, first_day: int = 1) -> dict:
+    """Member gaining GAIN fans per day from first_day (1-indexed) on"""
+    cumulative = [0 if day + 1 < first_day else base + GAIN * day for day in range(slots)]
+    return member(viewer_id, cumulative)
+
+
+def member_header(days: int) -> list:
+    return ['Trainer ID', 'Name'] + [f'Day {day}' for day in range(1, days + 1)] + MEMBER_HEADER_SUFFIX
+
+
+def member_row(viewer_id: str, days: int, day31_cumulative) -> list:
+    return [viewer_id, f"Trainer {viewer_id}"] + [GAIN] * days + [1, 1000000, 'No', day31_cumulative, '']
+
+
+def section(title: str, header: list, rows: list) -> list:
+    return [[title] + [''] * (len(header) - 1), header] + rows
+
+
+def rows_by_id(grid: list, title_prefix: str) -> dict:
+    """{trainer_id: row} of the section whose title starts with title_prefix"""
+    rows, inside = {}, False
+    for row in grid:
+        first = str(row[0]) if row else ''
+        if first.startswith('==='):
+            inside = first.startswith(title_prefix)
+            continue
+        if inside and first and first != 'Trainer ID':
+            rows[first] = row
+    return rows
+
+
+def section_header(grid: list, title_prefix: str) -> list:
+    for idx, row in enumerate(grid):
+        if row and str(row[0]).startswith(title_prefix):
+            return grid[idx + 1]
+    raise AssertionError(f"No section {title_prefix}")
+
+
+def highlighted_ids(plan: dict) -> set:
+    """Trainer IDs on the rows the highlight ranges point at (A{r}:B{r})"""
+    ids = set()
+    for cell_range in plan['ranges_to_format']:
+        start, end = cell_range.split(':')
+        assert start[1:] == end[1:], cell_range
+        ids.add(plan['member_grid'][int(start[1:]) - 1][0])
+    return ids
+
+
+# ============================================================================
+# SKIPS
+# ============================================================================
+
+
+def test_skip_reasons():
+    today = datetime.date(2026, 10, 17)
+    assert plan_club_sync(CLUB, {'members': []}, [], today)['reason'] == 'no_members'
+    assert plan_club_sync(CLUB, {'members': [steady('1', 1)]}, [], today)['reason'] == 'not_enough_data'
+
+    # Left the club: no data on the payload's last day (set by a row without a trainer ID)
+    left = member('2', [5_000_000, 5_100_000, 0])
+    unidentified = member('', [6_000_000, 6_100_000, 6_200_000])
+    plan = plan_club_sync(CLUB, {'members': [left, unidentified]}, [], today)
+    assert plan['reason'] == 'no_active_members'
+
+    # One day of data is enough to stay (new member)
+    newcomer = member('3', [0, 0, 7_000_000])
+    assert plan_club_sync(CLUB, {'members': [left, newcomer]}, [], today)['rows_count'] == 1
+
+
+# ============================================================================
+# MONTH ROLLOVER
+# ============================================================================
+
+
+def test_month_rollover_archives_previous_month_then_backfills_last_day():
+    days_sep = get_days_in_month('09/2026')  # 30
+    stayed = [steady(str(100 + i), days_sep + 1, base=10_000_000 * (i + 1)) for i in range(3)]
+    joined = steady('200', days_sep + 1, first_day=days_sep + 1)  # Only Day 1 of October
+
+    # Sheet written during September: 29 daily gains, _Day31_Cumulative = Sep 30 cumulative
+    sheet_rows = [member_row(m['viewer_id'], days_sep - 1, m['daily_fans'][days_sep - 1]) for m in stayed]
+    sheet_rows.append(member_row('300', days_sep - 1, 4_000_000))  # Left during the rollover
+    sheet = section('=== CURRENT: 09/2026 ===', member_header(days_sep - 1), sheet_rows)
+
+    # Oct 1: payload = September + Day 1 of October
+    plan = plan_club_sync(CLUB, {'members': stayed + [joined]}, sheet, datetime.date(2026, 10, 1))
+
+    assert plan['status'] == 'ok'
+    grid = plan['member_grid']
+    assert grid[0][0] == '=== CURRENT: 10/2026 ==='
+    assert plan['new_archive_rows'] > 0 and plan['existing_archive_rows'] == 0
+    assert section_header(grid, '=== ARCHIVE: 09/2026') == member_header(days_sep - 1)
+    assert rows_by_id(grid, '=== ARCHIVE: 09/2026') == {row[0]: row for row in sheet_rows}
+
+    # Left: highlighted in the new archive; joined: highlighted in CURRENT
+    assert highlighted_ids(plan) == {'300', '200'}
+
+    # Oct 2: payload = October; the archive gets Day 30 = Oct 1 - Sep 30 cumulative
+    october = [member(m['viewer_id'], m['daily_fans'][days_sep:] + [m['daily_fans'][days_sep] + GAIN])
+               for m in stayed + [joined]]
+    next_plan = plan_club_sync(CLUB, {'members': october}, grid, datetime.date(2026, 10, 2))
+
+    header = section_header(next_plan['member_grid'], '=== ARCHIVE: 09/2026')
+    day30 = header.index(f'Day {days_sep}')
+    assert header[day30 - 1] == f'Day {days_sep - 1}'
+    archived = rows_by_id(next_plan['member_grid'], '=== ARCHIVE: 09/2026')
+    for m in stayed:
+        assert archived[m['viewer_id']][day30] == GAIN
+    assert archived['300'][day30] == 'N/A'
+
+
+def test_month_rollover_splits_history_per_month():
+    today = datetime.date(2026, 10, 1)
+    members = [steady('1', 31)]
+    ctx = month_context(members, today)
+    history = [{'viewer_id': '1', 'trainer_name': 'T', 'cumulative': members[0]['daily_fans'], 'daily': [GAIN] * 31}]
+
+    months = split_history_months(history, ctx, today)
+
+    assert sorted(months) == ['09/2026', '10/2026']
+    assert len(months['09/2026'][0]['cumulative']) == 30
+    assert months['10/2026'][0]['cumulative'] == members[0]['daily_fans'][30:]
+    assert months['10/2026'][0]['daily'] == [None]
+
+
+# ============================================================================
+# ARCHIVE FALLBACKS (uma.moe skipped the last day)
+# ============================================================================
+
+
+def _previous_month_sheet(month: str, members: list, gain_days: int) -> list:
+    rows = [member_row(m['viewer_id'], gain_days, m['daily_fans'][gain_days]) for m in members]
+    return section(f'=== CURRENT: {month} ===', member_header(gain_days), rows)
+
+
+@pytest.mark.parametrize('day, archived', [(1, False), (2, True), (3, True)])
+def test_fallback_archive_from_day_2_with_one_day_missing(day, archived):
+    # Complete September cumulative (30 slots) but no October Day 1 yet
+    members = [steady('1', 30), steady('2', 30, base=20_000_000)]
+    sheet = _previous_month_sheet('09/2026', members, 28)
+
+    plan = plan_club_sync(CLUB, {'members': members}, sheet, datetime.date(2026, 10, day))
+
+    assert plan['status'] == 'ok'
+    assert (plan['new_archive_rows'] > 0) is archived
+    assert any(str(row[0]).startswith('=== ARCHIVE: 09/2026') for row in plan['member_grid']) is archived
+
+
+@pytest.mark.parametrize('day, archived', [(2, False), (3, True)])
+def test_force_archive_from_day_3_with_two_days_missing(day, archived):
+    members = [steady('1', 29), steady('2', 29, base=20_000_000)]
+    sheet = _previous_month_sheet('09/2026', members, 27)
+
+    plan = plan_club_sync(CLUB, {'members': members}, sheet, datetime.date(2026, 10, day))
+
+    assert (plan['new_archive_rows'] > 0) is archived
+
+
+# ============================================================================
+# DAY 31 BACKFILL OF EXISTING ARCHIVES
+# ============================================================================
+
+
+def _current_month_sheet_with_archive(archive_rows: list, archive_days: int) -> list:
+    current = section('=== CURRENT: 10/2026 ===', member_header(3),
+                      [member_row(row[0], 3, 0) for row in archive_rows])
+    archive = section('=== ARCHIVE: 09/2026 ===', member_header(archive_days), archive_rows)
+    return current + [[''] * 10] * 2 + archive
+
+
+def test_backfill_adds_missing_last_day_to_archive():
+    today = datetime.date(2026, 10, 5)
+    members = [steady('1', 4, base=10_000_000), steady('2', 4, base=20_000_000)]
+    archive_rows = [
+        member_row('1', 29, 9_900_000),
+        member_row('2', 29, 19_800_000),
+        member_row('3', 29, 5_000_000),  # Not in the payload any more
+    ]
+    sheet = _current_month_sheet_with_archive(archive_rows, 29)
+
+    plan = plan_club_sync(CLUB, {'members': members}, sheet, today)
+
+    assert plan['status'] == 'ok'
+    assert plan['new_archive_rows'] == 0
+    header = section_header(plan['member_grid'], '=== ARCHIVE: 09/2026')
+    day30 = header.index('Day 30')
+    assert header[day30 - 1] == 'Day 29'
+    archived = rows_by_id(plan['member_grid'], '=== ARCHIVE: 09/2026')
+    assert archived['1'][day30] == 10_000_000 - 9_900_000
+    assert archived['2'][day30] == 20_000_000 - 19_800_000
+    assert archived['3'][day30] == 'N/A'
+    assert sorted(plan['cross_club_updates']) == [
+        ('1', 'Club', 9_900_000, '09/2026'),
+        ('2', 'Club', 19_800_000, '09/2026'),
+    ]
+    # Left member is highlighted in the existing archive
+    assert highlighted_ids(plan) == {'3'}
+
+
+def test_backfill_recalculates_na_last_day():
+    today = datetime.date(2026, 10, 5)
+    members = [steady('1', 4, base=10_000_000)]
+    row = member_row('1', 30, 9_900_000)
+    row[2 + 29] = 'N/A'  # Day 30
+    sheet = _current_month_sheet_with_archive([row], 30)
+
+    plan = plan_club_sync(CLUB, {'members': members}, sheet, today)
+
+    header = section_header(plan['member_grid'], '=== ARCHIVE: 09/2026')
+    assert header.count('Day 30') == 1
+    assert rows_by_id(plan['member_grid'], '=== ARCHIVE: 09/2026')['1'][header.index('Day 30')] == 100_000
+
+
+def test_backfill_prefers_history_store_cumulative():
+    today = datetime.date(2026, 10, 5)
+    members = [steady('1', 4, base=10_000_000), steady('2', 4, base=20_000_000)]
+    archive_rows = [member_row('1', 29, ''), member_row('2', 29, 19_800_000)]
+    sheet = _current_month_sheet_with_archive(archive_rows, 29)
+
+    # '1' has an empty _Day31_Cumulative cell; '2' isn't in the store
+    plan = plan_club_sync(CLUB, {'members': members}, sheet, today, archive_cumulative={'1': 9_950_000})
+
+    header = section_header(plan['member_grid'], '=== ARCHIVE: 09/2026')
+    archived = rows_by_id(plan['member_grid'], '=== ARCHIVE: 09/2026')
+    assert archived['1'][header.index('Day 30')] == 10_000_000 - 9_950_000
+    assert archived['2'][header.index('Day 30')] == 20_000_000 - 19_800_000
+    assert sorted(plan['cross_club_updates']) == [
+        ('1', 'Club', 9_950_000, '09/2026'),
+        ('2', 'Club', 19_800_000, '09/2026'),
+    ]
+
+
+def test_complete_archive_is_left_unchanged():
+    today = datetime.date(2026, 10, 5)
+    members = [steady('1', 4)]
+    sheet = _current_month_sheet_with_archive([member_row('1', 30, 9_900_000)], 30)
+
+    plan = plan_club_sync(CLUB, {'members': members}, sheet, today)
+
+    archive_start = sheet.index(next(row for row in sheet if str(row[0]).startswith('=== ARCHIVE')))
+    assert plan['member_grid'][-len(sheet[archive_start:]):] == sheet[archive_start:]
+    assert plan['cross_club_updates'] == []
+
+
+# ============================================================================
+# LEGACY LAYOUT (no CURRENT header)
+# ============================================================================
+
+
+def test_legacy_sheet_with_full_month_is_archived():
+    today = datetime.date(2026, 10, 2)
+    members = [steady('1', 2), steady('2', 2, base=20_000_000)]
+    sheet = [member_header(29)] + [member_row('1', 29, 9_000_000), member_row('2', 29, 19_000_000)]
+
+    plan = plan_club_sync(CLUB, {'members': members}, sheet, today)
+
+    assert plan['status'] == 'ok'
+    assert plan['member_grid'][0][0] == '=== CURRENT: 10/2026 ==='
+    # Legacy data header is kept as the archive's header
+    assert section_header(plan['member_grid'], '=== ARCHIVE: 09/2026') == member_header(29)
+    assert set(rows_by_id(plan['member_grid'], '=== ARCHIVE: 09/2026')) == {'1', '2'}
+
+
+def test_legacy_sheet_with_partial_month_is_current():
+    today = datetime.date(2026, 10, 12)
+    members = [steady('1', 11)]
+    sheet = [member_header(9)] + [member_row('1', 9, 0)]
+
+    plan = plan_club_sync(CLUB, {'members': members}, sheet, today)
+
+    assert plan['status'] == 'ok'
+    assert plan['new_archive_rows'] == 0
+    assert not any('=== ARCHIVE' in str(row[0]) for row in plan['member_grid'] if row)
+
+
+# ============================================================================
+# SAFETY / TRANSFERS
+# ============================================================================
+
+
+def test_archive_not_preserved_stops_the_write(monkeypatch):
+    today = datetime.date(2026, 10, 5)
+    sheet = _current_month_sheet_with_archive([member_row('1', 29, 9_900_000)], 29)
+
+    def drop_archive_header(existing_archives, *args):
+        existing_archives[0] = [''] * len(existing_archives[0])
+        return []
+
+    monkeypatch.setattr(sync_planner, '_backfill_archive_last_day', drop_archive_header)
+    plan = plan_club_sync(CLUB, {'members': [steady('1', 4)]}, sheet, today)
+
+    assert plan['status'] == 'skipped'
+    assert plan['reason'] == 'archive_not_preserved'
+    assert 'member_grid' not in plan
+
+
+def test_transfer_warning_for_new_member_starting_day_2():
+    today = datetime.date(2026, 10, 10)
+    regular = steady('1', 9)
+    newcomer = steady('2', 9, first_day=2)
+
+    plan = plan_club_sync(CLUB, {'members': [regular, newcomer]}, [], today, archived_ids={'1'})
+
+    assert [w['trainer_id'] for w in plan['transfer_warnings']] == ['2']
+    rows = rows_by_id(plan['member_grid'], '=== CURRENT')
+    assert rows['2'][-1] == '⚠️ Possible Transfer'
+    assert rows['1'][-1] == ''
+
+
+# ============================================================================
+# STORED CASES (expected plans from the pre-port sync code)
+# ============================================================================
+
+
+def _load_cases() -> list:
+    with open(CASES_FILE, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _as_json(value):
+    """Tuples as lists, as in the stored expectations"""
+    return json.loads(json.dumps(value, ensure_ascii=False))
+
+
+@pytest.mark.parametrize('case', _load_cases(), ids=lambda case: case['name'])
+def test_plan_matches_stored_case(case):
+    inputs, expected = case['inputs'], case['expected']
+    archived_ids = inputs['archived_ids']
+    plan = plan_club_sync(
+        inputs['club_config'], copy.deepcopy(inputs['api_data']), copy.deepcopy(inputs['sheet_values']),
+        datetime.date.fromisoformat(inputs['today']),
+        set(archived_ids) if archived_ids is not None else None,
+    )
+
+    assert plan['status'] == expected['status'], plan.get('reason')
+    if expected['status'] != 'ok':
+        return
+    assert plan['member_grid'] == expected['member_grid']
+    assert sorted(plan['ranges_to_format']) == expected['ranges_to_format']
+    assert plan['data_sheet_name'] == expected['data_sheet_name']
+    assert plan['data_sheet_grid'] == expected['data_sheet_grid']
+    assert plan['member_names'] == expected['member_names']
+    for key in ('rows_count', 'max_days', 'new_archive_rows', 'existing_archive_rows', 'data_sheet_rows'):
+        assert plan[key] == expected[key], key
+    assert plan['transfer_warnings'] == expected['transfer_warnings']
+    assert sorted(_as_json(plan['cross_club_updates'])) == expected['cross_club_updates']
+
+
+def test_stored_cases_cover_the_sheet_layouts():
+    cases = _load_cases()
+    layouts = {case['name'].split('-')[3] for case in cases}
+    assert layouts == {'empty', 'legacy', 'current', 'previous', 'previous_archive', 'current_archive'}
+    assert any(case['expected'].get('transfer_warnings') for case in cases)
+    assert any(case['expected'].get('cross_club_updates') for case in cases)
+    assert any(case['expected'].get('new_archive_rows') for case in cases)
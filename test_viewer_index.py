@@ -0,0 +1,67 @@
+"""Tests for models/viewer_index.py (viewer_id → clubs index)
+
+Run: python -m pytest -q test_viewer_index.py
+"""
+
+import pytest
+
+import models.viewer_index as viewer_index_module
+from models.viewer_index import ViewerIndex
+
+MEMBERS = [
+    {'viewer_id': 1, 'trainer_name': 'Teio', 'daily_fans': [10, 20, 0]},
+    {'viewer_id': 2, 'trainer_name': 'Ryan', 'daily_fans': [5]},
+]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(viewer_index_module.time, 'time', clock.time)
+    return clock
+
+
+@pytest.fixture
+def index(tmp_path, clock):
+    return ViewerIndex(str(tmp_path / 'viewer_index.json'), max_age_seconds=100)
+
+
+def test_get_member_by_club_id(index, clock):
+    index.update_club('Alpha', 111, MEMBERS)
+    assert index.get_member_by_club_id('1', '111')['active_days'] == 2
+    assert index.get_member_by_club_id('3', '111') is None
+    assert index.get_member_by_club_id('1', '999') is None
+
+    clock.now += 101  # Stale
+    assert index.get_member_by_club_id('1', '111') is None
+
+
+def test_club_id_follows_renames_and_id_changes(index, clock):
+    index.update_club('Alpha', 111, MEMBERS)
+    clock.now += 1
+    index.update_club('Alpha Renamed', 111, MEMBERS[:1])
+    assert index.get_member_by_club_id('1', 111)['club_name'] == 'Alpha Renamed'
+    assert index.get_member_by_club_id('2', 111) is None
+
+    index.update_club('Alpha Renamed', 222, MEMBERS)
+    assert index.get_member_by_club_id('2', 222)['club_name'] == 'Alpha Renamed'
+    assert index.club_names_by_id == {'111': 'Alpha', '222': 'Alpha Renamed'}
+
+
+def test_club_ids_are_indexed_on_load(index, clock, capsys):
+    index.update_club('Alpha', 111, MEMBERS)
+    clock.now += 1
+    index.update_club('Alpha Renamed', 111, MEMBERS)
+    index.save()
+
+    loaded = ViewerIndex(index.index_file, max_age_seconds=100)
+    assert loaded.club_names_by_id == {'111': 'Alpha Renamed'}
+    assert loaded.get_member_by_club_id('2', '111')['club_name'] == 'Alpha Renamed'
@@ -1,7 +1,6 @@
 """
 Tournament Manager - Core logic và data models cho Tournament 1v1v1
 """
-import json
 import os
 import uuid
 import random
@@ -10,7 +9,10 @@ from typing import List, Dict, Optional
 from datetime import datetime
 import asyncio
 
+from models.state_store import state_store
+
 SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+# Legacy per-tournament JSON files (imported once into the state store)
 TOURNAMENTS_DIR = os.path.join(SCRIPT_DIR, "tournaments")
 os.makedirs(TOURNAMENTS_DIR, exist_ok=True)
 
@@ -320,21 +322,16 @@ class Tournament:
         
         return tournament
     
-    def save(self):
-        """Lưu tournament vào file"""
-        filepath = os.path.join(TOURNAMENTS_DIR, f"{self.id}.json")
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+    async def save(self):
+        """Lưu tournament vào state store (SQLite)"""
+        await state_store.aio.save_tournament(self.to_dict())
     
     @classmethod
-    def load(cls, tournament_id: str) -> Optional['Tournament']:
-        """Load tournament từ file"""
-        filepath = os.path.join(TOURNAMENTS_DIR, f"{tournament_id}.json")
-        if not os.path.exists(filepath):
+    async def load(cls, tournament_id: str) -> Optional['Tournament']:
+        """Load tournament từ state store"""
+        data = await state_store.aio.get_tournament(tournament_id)
+        if data is None:
             return None
-        
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
         return cls.from_dict(data)
 
 
@@ -352,7 +349,7 @@ def set_active_tournament(guild_id: int, tournament: Tournament):
     _active_tournaments[guild_id] = tournament
 
 
-def create_tournament(guild_id: int, name: str, created_by: int) -> Tournament:
+async def create_tournament(guild_id: int, name: str, created_by: int) -> Tournament:
     """Tạo tournament mới"""
     tournament_id = str(uuid.uuid4())[:8]
     
@@ -364,20 +361,14 @@ def create_tournament(guild_id: int, name: str, created_by: int) -> Tournament:
     )
     
     set_active_tournament(guild_id, tournament)
-    tournament.save()
+    await tournament.save()
     
     return tournament
 
 
-def load_active_tournaments():
-    """Load tất cả tournaments từ disk khi bot start"""
-    if not os.path.exists(TOURNAMENTS_DIR):
-        return
-    
-    for filename in os.listdir(TOURNAMENTS_DIR):
-        if filename.endswith('.json'):
-            tournament_id = filename[:-5]
-            tournament = Tournament.load(tournament_id)
-            if tournament and tournament.status not in ['completed']:
-                _active_tournaments[tournament.guild_id] = tournament
-                print(f"✅ Loaded tournament: {tournament.name} ({tournament.id})")
+async def load_active_tournaments():
+    """Load tất cả tournaments chưa kết thúc từ state store khi bot start"""
+    for data in await state_store.aio.list_tournaments(exclude_status='completed'):
+        tournament = Tournament.from_dict(data)
+        _active_tournaments[tournament.guild_id] = tournament
+        print(f"✅ Loaded tournament: {tournament.name} ({tournament.id})")
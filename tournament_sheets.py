@@ -9,6 +9,8 @@ from typing import Optional, List, Dict
 from datetime import datetime
 import os
 
+from models.sheets_limiter import install_sheets_limiter
+
 # Use same credentials as main bot
 SERVICE_ACCOUNT_FILE = 'credentials.json'
 GOOGLE_SHEET_ID = os.getenv('GOOGLE_SHEET_ID')
@@ -28,7 +30,8 @@ class TournamentSheets:
     def _connect(self):
         """Connect to Google Sheets"""
         try:
-            self.gc = gspread.service_account(filename=SERVICE_ACCOUNT_FILE)
+            # Shares the bot's Sheets quota, so use the same limiter
+            self.gc = install_sheets_limiter(gspread.service_account(filename=SERVICE_ACCOUNT_FILE))
             self.sh = self.gc.open_by_key(GOOGLE_SHEET_ID)
             
             # Get or create Tournament sheet
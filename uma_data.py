@@ -7,6 +7,8 @@ import os
 from typing import List, Dict, Optional
 from rapidfuzz import fuzz, process
 
+from models.http_client import http_client
+
 # URLs
 CHARACTER_URL = "https://raw.githubusercontent.com/JustWastingTime/TazunaDiscordBot/main/assets/character.json"
 
@@ -45,35 +47,34 @@ async def fetch_uma_list(force_refresh: bool = False) -> List[Dict]:
     
     # Fetch from GitHub
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(CHARACTER_URL, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                if response.status == 200:
-                    # GitHub raw returns text/plain, need to ignore content-type
-                    data = await response.json(content_type=None)
-                    
-                    # Extract relevant fields
-                    _uma_cache = []
-                    for uma in data:
-                        _uma_cache.append({
-                            'id': uma.get('id', ''),
-                            'character_name': uma.get('character_name', ''),
-                            'costume': uma.get('costume', ''),
-                            'thumbnail': uma.get('thumbnail', ''),
-                            'aliases': uma.get('aliases', [])
-                        })
-                    
-                    _uma_names = list(set(uma['character_name'] for uma in _uma_cache))
-                    
-                    # Save to disk cache
-                    os.makedirs(os.path.dirname(UMA_CACHE_FILE), exist_ok=True)
-                    with open(UMA_CACHE_FILE, 'w', encoding='utf-8') as f:
-                        json.dump(_uma_cache, f, indent=2)
-                    
-                    print(f"✅ Fetched {len(_uma_cache)} uma from GitHub")
-                    return _uma_cache
-                else:
-                    print(f"❌ Failed to fetch uma: HTTP {response.status}")
-                    return []
+        async with http_client.get(CHARACTER_URL, timeout=aiohttp.ClientTimeout(total=30)) as response:
+            if response.status == 200:
+                # GitHub raw returns text/plain, need to ignore content-type
+                data = await response.json(content_type=None)
+
+                # Extract relevant fields
+                _uma_cache = []
+                for uma in data:
+                    _uma_cache.append({
+                        'id': uma.get('id', ''),
+                        'character_name': uma.get('character_name', ''),
+                        'costume': uma.get('costume', ''),
+                        'thumbnail': uma.get('thumbnail', ''),
+                        'aliases': uma.get('aliases', [])
+                    })
+
+                _uma_names = list(set(uma['character_name'] for uma in _uma_cache))
+
+                # Save to disk cache
+                os.makedirs(os.path.dirname(UMA_CACHE_FILE), exist_ok=True)
+                with open(UMA_CACHE_FILE, 'w', encoding='utf-8') as f:
+                    json.dump(_uma_cache, f, indent=2)
+
+                print(f"✅ Fetched {len(_uma_cache)} uma from GitHub")
+                return _uma_cache
+            else:
+                print(f"❌ Failed to fetch uma: HTTP {response.status}")
+                return []
     except Exception as e:
         print(f"❌ Error fetching uma: {e}")
         return []
@@ -10,6 +10,16 @@ from .formatting import (
     format_stat_line_compact,
 )
 from .timestamp import get_last_update_timestamp, save_last_update_timestamp
+from .rate_limiter import AsyncRateLimiter
+from .single_flight import SingleFlight, single_flight
+from .fan_engine import compute_club_batch
+from .config_registry import ConfigRegistry, config_registry
+from .member_index import MemberIndex, member_index
+from .club_index import ClubIndex, club_index
+from .club_frame import compact_club_frame, select_member_rows, frame_memory_report
+from .member_stats import MemberStatsCache, member_stats
+from .render_cache import RenderCache, render_cache
+from .sheet_diff import normalize_grid, grid_hash, diff_grid
 
 __all__ = [
     'log_error',
@@ -22,4 +32,24 @@ __all__ = [
     'format_stat_line_compact',
     'get_last_update_timestamp',
     'save_last_update_timestamp',
+    'AsyncRateLimiter',
+    'SingleFlight',
+    'single_flight',
+    'compute_club_batch',
+    'ConfigRegistry',
+    'config_registry',
+    'MemberIndex',
+    'member_index',
+    'ClubIndex',
+    'club_index',
+    'compact_club_frame',
+    'select_member_rows',
+    'frame_memory_report',
+    'MemberStatsCache',
+    'member_stats',
+    'RenderCache',
+    'render_cache',
+    'normalize_grid',
+    'grid_hash',
+    'diff_grid',
 ]
@@ -0,0 +1,122 @@
+"""
+Canonical in-memory schema for club Data sheet frames.
+
+Cached club frames are shared by every command that reads them, so they are
+converted once at load time and treated as read-only afterwards:
+
+- Name: categorical (one string per member instead of one per row)
+- Day: int8 (int16 if a sheet ever has more than 127 days)
+- Total Fans / Daily / Target / CarryOver: int32 when the column's values
+  leave headroom for per-member arithmetic, otherwise int64
+- consecutive_slight_behind_days: smallest int that fits
+- is_slightly_behind / is_behind: bool (bit-packed by Arrow on disk)
+
+`select_member_rows` replaces the per-command `df['Name_stripped'] = ...`
+mutation of the cached frame.
+"""
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+# int32 only below this magnitude: a value times ~64 (days, weeks) still fits
+_INT32_SAFE_LIMIT = np.iinfo(np.int32).max // 64
+
+_FAN_COLUMNS = ('Total Fans', 'Daily', 'Target', 'CarryOver')
+
+# ============================================================================
+# SCHEMA
+# ============================================================================
+
+
+def _fan_dtype(values: pd.Series) -> str:
+    if values.empty:
+        return 'int32'
+    low, high = int(values.min()), int(values.max())
+    return 'int32' if -_INT32_SAFE_LIMIT <= low and high <= _INT32_SAFE_LIMIT else 'int64'
+
+
+def _small_int_dtype(values: pd.Series) -> str:
+    if values.empty:
+        return 'int8'
+    low, high = int(values.min()), int(values.max())
+    for dtype in ('int8', 'int16', 'int32'):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return 'int64'
+
+
+def is_compact(df: pd.DataFrame) -> bool:
+    """Check if a frame already uses the compact schema"""
+    return isinstance(df['Name'].dtype, pd.CategoricalDtype) and df['Day'].dtype.itemsize <= 2
+
+
+def compact_club_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert a processed club frame to the compact schema
+
+    Args:
+        df: Frame with Name, Day, fan columns and (optionally) behind flags
+
+    Returns:
+        New frame in the compact schema (row order and index reset kept as-is)
+    """
+    columns = {'Name': df['Name'].astype('category'), 'Day': df['Day'].astype(_small_int_dtype(df['Day']))}
+    for column in _FAN_COLUMNS:
+        if column in df.columns:
+            columns[column] = df[column].astype(_fan_dtype(df[column]))
+    if 'consecutive_slight_behind_days' in df.columns:
+        days = df['consecutive_slight_behind_days']
+        columns['consecutive_slight_behind_days'] = days.astype(_small_int_dtype(days))
+    for column in ('is_slightly_behind', 'is_behind'):
+        if column in df.columns:
+            columns[column] = df[column].astype(bool)
+
+    # Keep any other columns unchanged, in their original order
+    return pd.DataFrame(
+        {column: columns.get(column, df[column]) for column in df.columns},
+        index=df.index
+    )
+
+
+# ============================================================================
+# READ HELPERS
+# ============================================================================
+
+
+def select_member_rows(df: pd.DataFrame, member_name: str) -> pd.DataFrame:
+    """Rows of one member, matched on the whitespace-stripped name
+
+    Handles trailing spaces like "王牌 " vs "王牌"; falls back to a
+    case-insensitive match. The shared frame is not modified.
+
+    Args:
+        df: Club frame
+        member_name: Member name to find
+
+    Returns:
+        Copy of the member's rows (empty if not found)
+    """
+    target = member_name.strip()
+    # On a categorical column this strips each distinct name once
+    stripped = df['Name'].str.strip()
+    mask = stripped == target
+    if not mask.any():
+        mask = stripped.str.lower() == target.lower()
+    return df[mask].copy()
+
+
+def frame_memory_report(df: pd.DataFrame) -> Dict[str, object]:
+    """Memory used by a club frame
+
+    Returns:
+        {'rows', 'members', 'bytes', 'columns': {column: bytes}}
+    """
+    usage = df.memory_usage(deep=True, index=True)
+    return {
+        'rows': len(df),
+        'members': int(df['Name'].nunique()) if 'Name' in df.columns else 0,
+        'bytes': int(usage.sum()),
+        'columns': {column: int(size) for column, size in usage.items()},
+    }
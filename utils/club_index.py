@@ -0,0 +1,160 @@
+"""
+Per-guild club name index for autocomplete.
+
+`club_autocomplete` runs on every keystroke and must answer well inside
+Discord's 3-second deadline. Instead of scanning every club config and
+comparing Server_ID as str and int each time, the index keeps:
+
+- guild_id -> club names sorted A-Z (plus an all-clubs list for DMs and
+  for guilds without clubs yet)
+- per guild, a sorted list of (word key, club position) pairs, one per word
+  start of each club name, so "alp" finds "Team Alpha" with a binary search
+  and a prefix range scan
+
+It is rebuilt by `update_caches` and updated per club when a single club's
+config changes.
+"""
+
+import heapq
+import bisect
+from typing import Dict, List, Optional
+
+# ============================================================================
+# CLUB INDEX
+# ============================================================================
+
+
+def _guild_key(server_id) -> Optional[int]:
+    """Server_ID from the config sheet (str, int or empty) as an int"""
+    try:
+        return int(str(server_id).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _word_keys(club_name: str) -> List[str]:
+    """Prefix keys of a club: the full name and every later word start"""
+    key = club_name.casefold()
+    keys = [key]
+    for position, char in enumerate(key):
+        if position and char != ' ' and key[position - 1] == ' ':
+            keys.append(key[position:])
+    return keys
+
+
+class ClubIndex:
+    """guild_id -> sorted clubs with a prefix index per guild
+
+    Features:
+    - Autocomplete = one dict lookup + a bisect prefix range scan
+    - Word-start prefixes (typing any word of the name matches)
+    - Per-club updates without a full rebuild
+    """
+
+    def __init__(self):
+        self._guild_of: Dict[str, Optional[int]] = {}
+        self._guilds: Dict[Optional[int], dict] = {}
+        self._all = self._build_entry([])
+
+        # Metrics
+        self.builds = 0
+        self.lookups = 0
+
+    @staticmethod
+    def _build_entry(club_names: List[str]) -> dict:
+        names = sorted(club_names, key=str.casefold)
+        prefixes = sorted((key, position) for position, name in enumerate(names) for key in _word_keys(name))
+        return {
+            'names': names,
+            'keys': [key for key, _ in prefixes],
+            'positions': [position for _, position in prefixes],  # Index into names (A-Z)
+        }
+
+    def build(self, config_cache: Dict[str, dict]):
+        """Rebuild from {club name: club config}"""
+        guild_of = {name: _guild_key(cfg.get('Server_ID')) for name, cfg in config_cache.items()}
+        by_guild: Dict[Optional[int], List[str]] = {}
+        for name, guild_id in guild_of.items():
+            by_guild.setdefault(guild_id, []).append(name)
+
+        self._guilds = {guild_id: self._build_entry(names) for guild_id, names in by_guild.items()}
+        self._all = self._build_entry(list(guild_of))
+        self._guild_of = guild_of
+        self.builds += 1
+
+    def update_club(self, club_name: str, club_config: dict):
+        """Add a club or move it to its (new) Server_ID guild"""
+        guild_id = _guild_key(club_config.get('Server_ID'))
+        is_new = club_name not in self._guild_of
+        old_guild = self._guild_of.get(club_name)
+        if not is_new and old_guild == guild_id:
+            return
+
+        self._guild_of[club_name] = guild_id
+        if not is_new:
+            self._rebuild_guild(old_guild)
+        self._rebuild_guild(guild_id)
+        if is_new:
+            self._all = self._build_entry(list(self._guild_of))
+
+    def remove_club(self, club_name: str):
+        """Drop a club from the index"""
+        if club_name not in self._guild_of:
+            return
+        guild_id = self._guild_of.pop(club_name)
+        self._rebuild_guild(guild_id)
+        self._all = self._build_entry(list(self._guild_of))
+
+    def _rebuild_guild(self, guild_id: Optional[int]):
+        names = [name for name, gid in self._guild_of.items() if gid == guild_id]
+        if names:
+            self._guilds[guild_id] = self._build_entry(names)
+        else:
+            self._guilds.pop(guild_id, None)
+
+    def search(self, guild_id: Optional[int], current: str = "", limit: int = 25) -> List[str]:
+        """Club names for a guild starting with (a word starting with) `current`
+
+        Args:
+            guild_id: Guild of the interaction (None in DMs = all clubs)
+            current: Text typed so far
+            limit: Maximum results
+
+        Returns:
+            Club names, A-Z (all clubs if the guild has none yet)
+        """
+        self.lookups += 1
+        entry = self._guilds.get(guild_id) if guild_id else None
+        if entry is None:
+            entry = self._all
+
+        query = (current or "").casefold()
+        if not query:
+            return entry['names'][:limit]
+
+        # Prefix range of the sorted keys; matches come in key order, so they
+        # are collected as name positions and returned A-Z
+        keys, positions = entry['keys'], entry['positions']
+        matches = set()
+        index = bisect.bisect_left(keys, query)
+        while index < len(keys) and keys[index].startswith(query):
+            matches.add(positions[index])
+            index += 1
+        return [entry['names'][position] for position in heapq.nsmallest(limit, matches)]
+
+    def get_stats(self) -> dict:
+        """Get index statistics
+
+        Returns:
+            Dictionary with club / guild counts and counters
+        """
+        return {
+            'clubs': len(self._guild_of),
+            'guilds': len([g for g in self._guilds if g is not None]),
+            'builds': self.builds,
+            'lookups': self.lookups,
+        }
+
+
+# Process-wide index (built from client.config_cache)
+club_index = ClubIndex()
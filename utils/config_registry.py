@@ -0,0 +1,172 @@
+"""
+In-memory registry for config read on every interaction.
+
+Entries (allowed channels, lockdown state, admin list, server invites) are
+loaded once and served from memory. Each entry can derive lookup structures
+at load time (e.g. a frozenset of channel IDs) through its parser.
+
+An entry is backed either by a JSON file or by a loader function (e.g. a
+state store query) with its own change signature.
+
+Changes are picked up two ways:
+- Writers call `invalidate(name)` after saving (or `await reload(name)` from
+  async code, which re-runs the loader in a worker thread)
+- The signature (file mtime/size, or the entry's signature function) is
+  re-checked at most every `check_interval` seconds, so edits made outside
+  the bot (or by another process) are seen too
+"""
+
+import os
+import json
+import time
+import asyncio
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from config import CONFIG_REGISTRY_CHECK_INTERVAL
+
+# ============================================================================
+# CONFIG REGISTRY
+# ============================================================================
+
+
+class ConfigRegistry:
+    """Cache of parsed JSON config files with mtime-based invalidation
+
+    Features:
+    - One parse per change instead of one per lookup
+    - JSON file or loader-function backed entries
+    - Per-entry parser to precompute sets / dicts for hot-path lookups
+    - Explicit invalidation from writers + throttled mtime checks
+    - Hit / load counters per entry
+    """
+
+    def __init__(self, check_interval: float = CONFIG_REGISTRY_CHECK_INTERVAL):
+        """
+        Initialize ConfigRegistry
+
+        Args:
+            check_interval: Minimum seconds between mtime checks of a file
+        """
+        self.check_interval = check_interval
+        self._entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        path: str = None,
+        parser: Optional[Callable[[Any], Any]] = None,
+        loader: Optional[Callable[[], Any]] = None,
+        signature: Optional[Callable[[], Any]] = None,
+    ):
+        """Register a JSON file or a loader function
+
+        Args:
+            name: Registry key (e.g. 'allowed_channels')
+            path: JSON file path (file-backed entries)
+            parser: Builds the cached value from the file's JSON ({} if the file
+                    is missing or unreadable) or from the loader's result.
+                    Default: the data itself.
+            loader: Returns the data instead of reading `path`
+            signature: Change token for a loader entry (reload when it changes)
+        """
+        self._entries[name] = {
+            'path': path,
+            'parser': parser or (lambda data: data),
+            'loader': loader,
+            'signature_func': signature,
+            'value': None,
+            'loaded': False,
+            'signature': None,
+            'checked_at': 0.0,
+            'loads': 0,
+            'hits': 0,
+        }
+
+    @staticmethod
+    def _signature(entry: dict):
+        if entry['loader'] is not None:
+            return entry['signature_func']() if entry['signature_func'] else None
+        try:
+            stat = os.stat(entry['path'])
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def _load(self, name: str, entry: dict, signature):
+        data = {}
+        if entry['loader'] is not None:
+            try:
+                data = entry['loader']()
+            except Exception as e:
+                print(f"⚠️ Error loading {name} config: {e}")
+                if entry['loaded']:
+                    return
+        elif signature is not None:
+            try:
+                with open(entry['path'], 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"⚠️ Error loading {name} config: {e}")
+                if entry['loaded']:
+                    return  # Keep the last good value (e.g. file mid-write)
+
+        entry['value'] = entry['parser'](data)
+        entry['signature'] = signature
+        entry['loaded'] = True
+        entry['loads'] += 1
+
+    def get(self, name: str) -> Any:
+        """Get the parsed value of a registered entry
+
+        The returned object is shared: treat it as read-only.
+        """
+        entry = self._entries[name]
+        now = time.monotonic()
+        if not entry['loaded'] or now - entry['checked_at'] >= self.check_interval:
+            with self._lock:
+                if not entry['loaded'] or now - entry['checked_at'] >= self.check_interval:
+                    signature = self._signature(entry)
+                    if not entry['loaded'] or signature != entry['signature']:
+                        self._load(name, entry, signature)
+                    entry['checked_at'] = now
+        entry['hits'] += 1
+        return entry['value']
+
+    def invalidate(self, name: str = None):
+        """Force a reload on the next get (all entries if name is None)"""
+        with self._lock:
+            for entry_name, entry in self._entries.items():
+                if name is None or entry_name == name:
+                    entry['loaded'] = False
+
+    async def reload(self, name: str):
+        """Reload an entry now, in a worker thread
+
+        Async writers call this instead of invalidate(), so the next get() is
+        served from memory rather than running the loader on the event loop.
+        """
+        entry = self._entries[name]
+
+        def load():
+            with self._lock:
+                self._load(name, entry, self._signature(entry))
+                entry['checked_at'] = time.monotonic()
+
+        await asyncio.to_thread(load)
+
+    def get_stats(self) -> dict:
+        """Get registry statistics
+
+        Returns:
+            Dictionary of {name: {'loads', 'hits'}}
+        """
+        return {
+            name: {'loads': entry['loads'], 'hits': entry['hits']}
+            for name, entry in self._entries.items()
+        }
+
+
+# Process-wide registry (entries are registered by the modules owning the files)
+config_registry = ConfigRegistry()
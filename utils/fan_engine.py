@@ -0,0 +1,176 @@
+"""
+Vectorized fan calculations for a whole club at once.
+
+Batch (members × days) equivalent of the per-member helpers in bot-github.py:
+- calculate_daily_gains_from_cumulative
+- calculate_last_day_gain (month transition)
+- apply_yui_logic
+- calculate_data_sheet_rows
+
+Results match the per-member functions exactly (see benchmark_fan_engine.py).
+"""
+
+from typing import List, Optional
+
+import numpy as np
+
+# ============================================================================
+# VECTORIZED CLUB ENGINE
+# ============================================================================
+
+
+def _cumulative_matrix(cumulative_lists: List[list]):
+    """Pad cumulative lists into an int64 matrix
+
+    Returns:
+        (matrix [members, width], lengths [members])
+    """
+    lengths = np.array([len(c) if c else 0 for c in cumulative_lists], dtype=np.int64)
+    width = int(lengths.max()) if len(lengths) else 0
+    if len(lengths) and (lengths == width).all():
+        # Common case: API returns the same number of days for everyone
+        return np.array(cumulative_lists, dtype=np.int64).reshape(len(lengths), width), lengths
+
+    matrix = np.zeros((len(cumulative_lists), width), dtype=np.int64)
+    for i, cumulative in enumerate(cumulative_lists):
+        if cumulative:
+            matrix[i, :len(cumulative)] = cumulative
+    return matrix, lengths
+
+
+def compute_club_batch(
+    cumulative_lists: List[list],
+    target_per_day: int,
+    max_days: Optional[int] = None,
+    expected_days_old_month: Optional[int] = None,
+) -> dict:
+    """Compute daily gains, Yui logic and Data sheet values for all members
+
+    Args:
+        cumulative_lists: One list of cumulative fans per member (API 'daily_fans')
+        target_per_day: Club's KPI per day
+        max_days: Limit Data sheet rows to this many days (None/0 = all gain days)
+        expected_days_old_month: Days of the previous month when the API already
+            has new-month data; appends the last-day gain like calculate_last_day_gain
+
+    Returns:
+        Dictionary of arrays (one row per member):
+        - gains / gain_valid / gain_lengths: daily gains (invalid = None in the list version)
+        - start_day / adjusted_target / is_new: apply_yui_logic results
+        - total_fans / daily / target / carryover: Data sheet columns per day
+        - row_counts: number of Data sheet rows per member
+    """
+    cumulative, lengths = _cumulative_matrix(cumulative_lists)
+    member_count, width = cumulative.shape
+    gain_width = max(width - 1, 0)
+
+    # ===== DAILY GAINS (fetch-back formula) =====
+    today = cumulative[:, :-1] if width else cumulative
+    tomorrow = cumulative[:, 1:] if width else cumulative
+    diff = tomorrow - today
+    gain_lengths = np.maximum(lengths - 1, 0)
+    in_range = np.arange(gain_width)[None, :] < gain_lengths[:, None]
+    gain_valid = in_range & (today != 0) & (tomorrow != 0) & (diff >= 0)
+    gains = np.where(gain_valid, diff, 0)
+
+    # ===== MONTH TRANSITION: append last-day gain of the old month =====
+    if expected_days_old_month and gain_width >= expected_days_old_month:
+        e = expected_days_old_month
+        has_extra = (lengths > e) & (cumulative[:, e - 1] != 0) & (cumulative[:, e] != 0)
+        extra = cumulative[:, e] - cumulative[:, e - 1]
+        has_extra &= extra >= 0
+
+        gains = np.concatenate([gains, np.zeros((member_count, 1), dtype=np.int64)], axis=1)
+        gain_valid = np.concatenate([gain_valid, np.zeros((member_count, 1), dtype=bool)], axis=1)
+        rows = np.nonzero(has_extra)[0]
+        cols = gain_lengths[rows]
+        gains[rows, cols] = extra[rows]
+        gain_valid[rows, cols] = True
+        gain_lengths = gain_lengths + has_extra
+        gain_width += 1
+
+    # ===== YUI LOGIC =====
+    positive = gain_valid & (gains > 0)
+    has_start = positive.any(axis=1)
+    first_positive = positive.argmax(axis=1) if gain_width else np.zeros(member_count, dtype=np.int64)
+    start_day = np.where(has_start, first_positive + 1, 1)
+    days_active = gain_lengths - start_day + 1
+    adjusted_target = np.where(has_start, target_per_day * days_active, target_per_day)
+    is_new = has_start & (start_day > 1)
+
+    # ===== DATA SHEET COLUMNS =====
+    daily = np.where(gain_valid & (gains >= 0), gains, 0)
+    total_fans = np.cumsum(daily, axis=1)
+    day_numbers = np.arange(1, gain_width + 1)[None, :]
+    target = np.maximum(day_numbers - start_day[:, None] + 1, 0) * target_per_day
+    carryover = total_fans - target
+
+    row_counts = np.minimum(gain_lengths, max_days) if max_days else gain_lengths.copy()
+    # calculate_data_sheet_rows returns nothing without gains or cumulative data
+    row_counts = np.where(lengths > 0, row_counts, 0)
+
+    return {
+        'lengths': lengths,
+        'gains': gains,
+        'gain_valid': gain_valid,
+        'gain_lengths': gain_lengths,
+        'start_day': start_day,
+        'adjusted_target': adjusted_target,
+        'is_new': is_new,
+        'total_fans': total_fans,
+        'daily': daily,
+        'target': target,
+        'carryover': carryover,
+        'row_counts': row_counts,
+    }
+
+
+def gain_lists(batch: dict) -> List[list]:
+    """Daily gains as per-member lists with None for invalid days
+
+    Same values as calculate_daily_gains_from_cumulative (+ last-day gain).
+    """
+    return [
+        [gain if ok else None for gain, ok in zip(gains[:length], valid[:length])]
+        for gains, valid, length in zip(
+            batch['gains'].tolist(), batch['gain_valid'].tolist(), batch['gain_lengths'].tolist()
+        )
+    ]
+
+
+def yui_results(batch: dict) -> List[tuple]:
+    """apply_yui_logic results as (start_day, adjusted_target, is_new_member) per member"""
+    return list(zip(
+        batch['start_day'].tolist(),
+        batch['adjusted_target'].tolist(),
+        batch['is_new'].tolist(),
+    ))
+
+
+def data_sheet_rows(batch: dict, trainer_names: List[str]) -> List[list]:
+    """Data sheet rows per member: [[name, day, total_fans, daily, target, carryover], ...]
+
+    Args:
+        batch: Result of compute_club_batch
+        trainer_names: Member names (same order as the batch)
+
+    Returns:
+        One list of rows per member (same as calculate_data_sheet_rows)
+    """
+    gain_width = batch['total_fans'].shape[1]
+    mask = np.arange(gain_width)[None, :] < batch['row_counts'][:, None]
+    member_idx, day_idx = np.nonzero(mask)  # Row-major: member by member, day ascending
+
+    columns = zip(
+        member_idx.tolist(),
+        (day_idx + 1).tolist(),
+        batch['total_fans'][mask].tolist(),
+        batch['daily'][mask].tolist(),
+        batch['target'][mask].tolist(),
+        batch['carryover'][mask].tolist(),
+    )
+
+    per_member = [[] for _ in trainer_names]
+    for m, day, total, daily, target, carryover in columns:
+        per_member[m].append([trainer_names[m], day, total, daily, target, carryover])
+    return per_member
@@ -0,0 +1,270 @@
+"""
+Member name search index (per club and across all clubs).
+
+Built from `client.member_cache` ({club: [member names]}) and updated per
+club by the sync. Everything a lookup needs is precomputed at build time:
+
+- Normalised keys (NFKC + casefold, whitespace collapsed)
+- Default order per club and globally (non-ASCII names first, then A-Z),
+  so an empty query is a slice
+- Trigram postings for substring search across all clubs
+
+Matches are ranked exact > prefix > word prefix > substring; when there are
+fewer than `limit` of them, rapidfuzz fills the rest with typo-tolerant
+matches.
+
+Rebuilds create new structures and swap them in, so lookups never see a
+half-built index. Per-club updates only mark the index stale; it is rebuilt
+once on the next lookup.
+"""
+
+import re
+import heapq
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+from rapidfuzz import fuzz, process
+
+from config import MEMBER_SEARCH_FUZZY_CUTOFF
+
+_WHITESPACE = re.compile(r'\s+')
+
+# Match classes (lower ranks first)
+EXACT, PREFIX, WORD_PREFIX, SUBSTRING = range(4)
+
+
+def normalize_name(name: str) -> str:
+    """Search key for a name: NFKC, casefolded, whitespace collapsed"""
+    return _WHITESPACE.sub(' ', unicodedata.normalize('NFKC', name or '')).strip().casefold()
+
+
+def _default_sort_key(name: str):
+    # Non-ASCII names (Chinese/Japanese) first, so they show without typing
+    has_non_ascii = any(ord(c) > 127 for c in name)
+    return (0 if has_non_ascii else 1, name.lower())
+
+
+def _trigrams(key: str) -> set:
+    return {key[i:i + 3] for i in range(len(key) - 2)}
+
+
+# ============================================================================
+# MEMBER INDEX
+# ============================================================================
+
+
+class MemberIndex:
+    """Searchable index of member names across clubs
+
+    Features:
+    - Per-club autocomplete and cross-club lookup from the same index
+    - Precomputed default sort orders (empty query = slice)
+    - Trigram postings for cross-club substring search
+    - rapidfuzz fallback for typos
+    - Per-club updates from the sync (one lazy rebuild for many updates)
+    """
+
+    def __init__(self, fuzzy_cutoff: float = MEMBER_SEARCH_FUZZY_CUTOFF):
+        """
+        Initialize MemberIndex
+
+        Args:
+            fuzzy_cutoff: Minimum rapidfuzz partial ratio (0-100) for typo matches
+        """
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._clubs: Dict[str, List[str]] = {}
+        self._state = self._build({})
+        self._dirty = False
+
+        # Metrics
+        self.builds = 0
+        self.searches = 0
+
+    # ========================================================================
+    # BUILD
+    # ========================================================================
+
+    @staticmethod
+    def _build(clubs: Dict[str, List[str]]) -> dict:
+        names, club_names, keys = [], [], []
+        club_ids: Dict[str, List[int]] = {}
+        club_lookup: Dict[str, str] = {}
+
+        for club, members in clubs.items():
+            club_lookup[club.casefold()] = club
+            ids = []
+            for name in dict.fromkeys(m for m in members if m):
+                ids.append(len(names))
+                names.append(name)
+                club_names.append(club)
+                keys.append(normalize_name(name))
+            # Default order within the club
+            ids.sort(key=lambda i: _default_sort_key(names[i]))
+            club_ids[club] = ids
+
+        global_order = sorted(range(len(names)), key=lambda i: (_default_sort_key(names[i]), club_names[i].lower()))
+        rank = [0] * len(names)
+        for position, entry_id in enumerate(global_order):
+            rank[entry_id] = position
+
+        postings: Dict[str, List[int]] = {}
+        for entry_id in global_order:
+            for gram in _trigrams(keys[entry_id]):
+                postings.setdefault(gram, []).append(entry_id)
+
+        return {
+            'names': names,
+            'clubs': club_names,
+            'keys': keys,
+            'rank': rank,
+            'club_ids': club_ids,
+            'club_lookup': club_lookup,
+            'global_order': global_order,
+            'postings': {gram: frozenset(ids) for gram, ids in postings.items()},
+        }
+
+    def build(self, member_cache: Dict[str, List[str]]):
+        """Rebuild the index from {club: [member names]}"""
+        self._clubs = {club: list(members) for club, members in member_cache.items()}
+        self._state = self._build(self._clubs)
+        self._dirty = False
+        self.builds += 1
+
+    def update_club(self, club_name: str, member_names: List[str]):
+        """Replace one club's members (e.g. after the sync rewrote its Data sheet)
+
+        The index is rebuilt on the next search, so a sync updating hundreds
+        of clubs costs one rebuild instead of one per club.
+        """
+        if self._clubs.get(club_name) == list(member_names):
+            return
+        clubs = dict(self._clubs)
+        clubs[club_name] = list(member_names)
+        self._clubs = clubs
+        self._dirty = True
+
+    def _current(self) -> dict:
+        if self._dirty:
+            self._dirty = False
+            self._state = self._build(self._clubs)
+            self.builds += 1
+        return self._state
+
+    # ========================================================================
+    # SEARCH
+    # ========================================================================
+
+    def resolve_club(self, club_name: str) -> Optional[str]:
+        """Indexed club name for a case-insensitive club name"""
+        state = self._current()
+        if club_name in state['club_ids']:
+            return club_name
+        return state['club_lookup'].get((club_name or '').casefold())
+
+    @staticmethod
+    def _match_class(query: str, key: str) -> Optional[Tuple[int, int]]:
+        position = key.find(query)
+        if position < 0:
+            return None
+        if key == query:
+            return (EXACT, 0)
+        if position == 0:
+            return (PREFIX, 0)
+        if key[position - 1] == ' ':
+            return (WORD_PREFIX, position)
+        return (SUBSTRING, position)
+
+    def _candidates(self, state: dict, query: str) -> List[int]:
+        """Entry IDs that may contain the query (all entries for short queries)"""
+        grams = _trigrams(query)
+        if not grams:
+            return state['global_order']
+        postings = state['postings']
+        lists = sorted((postings.get(gram, frozenset()) for gram in grams), key=len)
+        if not lists[0]:
+            return []
+        return list(lists[0].intersection(*lists[1:]))
+
+    def _search(self, state: dict, ids: List[int], query: str, limit: int, fuzzy_pool: List[int]) -> List[int]:
+        keys, rank = state['keys'], state['rank']
+        matches = []
+        for entry_id in ids:
+            match = self._match_class(query, keys[entry_id])
+            if match:
+                matches.append((match, rank[entry_id], entry_id))
+        result = [entry_id for _, _, entry_id in heapq.nsmallest(limit, matches)]
+
+        # Typo-tolerant fill: names at least as long as the query whose best
+        # aligned part is close to it (partial ratio, so typing can stop early)
+        if len(result) < limit and len(query) >= 3 and fuzzy_pool:
+            found = set(result)
+            choices = {
+                entry_id: keys[entry_id] for entry_id in fuzzy_pool
+                if entry_id not in found and len(keys[entry_id]) >= len(query)
+            }
+            for _, _, entry_id in process.extract(
+                query, choices, scorer=fuzz.partial_ratio,
+                score_cutoff=self.fuzzy_cutoff, limit=limit - len(result)
+            ):
+                result.append(entry_id)
+        return result
+
+    def search_club(self, club_name: str, query: str = "", limit: int = 25) -> List[str]:
+        """Member names of one club matching a query (autocomplete)
+
+        Args:
+            club_name: Club name (case-insensitive)
+            query: Text typed so far ('' = default order)
+            limit: Maximum results
+
+        Returns:
+            Member names, best matches first
+        """
+        self.searches += 1
+        state = self._current()
+        club = self.resolve_club(club_name)
+        if club is None:
+            return []
+        ids = state['club_ids'][club]
+        query = normalize_name(query)
+        if not query:
+            return [state['names'][i] for i in ids[:limit]]
+        return [state['names'][i] for i in self._search(state, ids, query, limit, ids)]
+
+    def search_all(self, query: str, limit: int = 25) -> List[Tuple[str, str]]:
+        """Members across all clubs matching a query
+
+        Args:
+            query: Member name (or part of it)
+            limit: Maximum results
+
+        Returns:
+            [(member name, club name)], best matches first
+        """
+        self.searches += 1
+        state = self._current()
+        query = normalize_name(query)
+        if not query:
+            ids = state['global_order'][:limit]
+        else:
+            ids = self._search(state, self._candidates(state, query), query, limit, state['global_order'])
+        return [(state['names'][i], state['clubs'][i]) for i in ids]
+
+    def get_stats(self) -> dict:
+        """Get index statistics
+
+        Returns:
+            Dictionary with club / member / trigram counts and counters
+        """
+        state = self._current()
+        return {
+            'clubs': len(state['club_ids']),
+            'members': len(state['names']),
+            'trigrams': len(state['postings']),
+            'builds': self.builds,
+            'searches': self.searches,
+        }
+
+
+# Process-wide index (built from client.member_cache)
+member_index = MemberIndex()
@@ -0,0 +1,225 @@
+"""
+Per-member stats snapshots for /stats, /profile and StatsView.
+
+Everything StatsView shows (latest row, last-7-day window, averages, best /
+worst days, target tracking, weekly averages, daily history) is computed for
+all members of a club at once with groupby over the club frame, right after
+the frame is loaded from Sheets. Commands look a member up in a dict and the
+view's buttons / pagination only format stored values.
+
+Snapshots are tied to the cached frame object they were computed from (weak
+reference): when the cache refreshes a club, the new frame gets new snapshots
+and the old ones are dropped.
+"""
+
+import weakref
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Same window and split as the StatsView overview
+RECENT_DAYS = 7
+TREND_HEAD_DAYS = 3
+TREND_TAIL_DAYS = 4
+WEEKS = 4
+
+# ============================================================================
+# BULK COMPUTATION
+# ============================================================================
+
+
+def _day_value_pairs(rows: pd.DataFrame, index) -> Dict[str, tuple]:
+    """{name: (day, daily)} for the rows at `index` (from idxmax / idxmin)"""
+    picked = rows.loc[index.to_numpy()]
+    return dict(zip(index.index, zip(picked['day'].tolist(), picked['daily'].tolist())))
+
+
+def compute_member_snapshots(df: pd.DataFrame) -> Dict[str, dict]:
+    """Stats snapshot of every member of a club
+
+    Members are keyed by their whitespace-stripped name (the /stats match).
+
+    Args:
+        df: Club frame (Name, Day, Total Fans, Daily, CarryOver)
+
+    Returns:
+        {name: snapshot}; see the keys below. All numbers are Python
+        int / float; history is [(day, daily, carry_over)], latest first.
+    """
+    if df is None or df.empty:
+        return {}
+
+    frame = pd.DataFrame({
+        'name': df['Name'].astype(str).str.strip().to_numpy(),
+        'day': df['Day'].to_numpy(dtype=np.int64),
+        'fans': df['Total Fans'].to_numpy(dtype=np.int64),
+        'daily': df['Daily'].to_numpy(dtype=np.int64),
+        'carry': df['CarryOver'].to_numpy(dtype=np.int64),
+    }).sort_values(['name', 'day'], kind='stable').reset_index(drop=True)
+
+    groups = frame.groupby('name', sort=False)
+    from_end = groups.cumcount(ascending=False).to_numpy()  # 0 = latest day
+    count = groups['day'].transform('size').to_numpy()
+
+    latest = frame[from_end == 0].set_index('name')
+    size = groups.size()
+    join_day = groups['day'].min()
+
+    # Last 7 days and the 3 / 4 day halves used for the trend
+    recent = frame[from_end < RECENT_DAYS]
+    recent_groups = recent.groupby('name', sort=False)
+    recent_position = (count - from_end - 1) - np.maximum(count - RECENT_DAYS, 0)
+    head = frame[(from_end < RECENT_DAYS) & (recent_position < TREND_HEAD_DAYS)]
+    tail = frame[from_end < TREND_TAIL_DAYS]
+
+    avg_daily_7 = recent_groups['daily'].mean()
+    behind_days_7 = (recent['carry'] < 0).groupby(recent['name'], sort=False).sum()
+    first_half_7 = head.groupby('name', sort=False)['daily'].mean()
+    second_half_7 = tail.groupby('name', sort=False)['daily'].mean()
+    best_7 = _day_value_pairs(recent, recent_groups['daily'].idxmax())
+    worst_7 = _day_value_pairs(recent, recent_groups['daily'].idxmin())
+
+    # Whole month
+    best = _day_value_pairs(frame, groups['daily'].idxmax())
+    worst = _day_value_pairs(frame, groups['daily'].idxmin())
+    daily_std = groups['daily'].std()
+    daily_max = groups['daily'].max()
+    daily_min = groups['daily'].min()
+    avg_daily = latest['fans'] / size
+    days_above_avg = (frame['daily'].to_numpy() >= avg_daily.reindex(frame['name']).to_numpy())
+    days_above_avg = pd.Series(days_above_avg).groupby(frame['name'], sort=False).sum()
+    days_above_target = (frame['carry'] >= 0).groupby(frame['name'], sort=False).sum()
+
+    # Weekly averages (Days 1-7, 8-14, ...)
+    week = (frame['day'] - 1) // 7 + 1
+    in_weeks = (frame['day'] >= 1) & (week <= WEEKS)
+    weekly = frame[in_weeks].groupby([frame['name'][in_weeks], week[in_weeks]], sort=True)['daily'].mean()
+    weekly_avg: Dict[str, list] = {}
+    for (name, week_num), value in weekly.items():
+        weekly_avg.setdefault(name, []).append((int(week_num), float(value)))
+
+    # Daily history, latest first (rows are sorted by name, day)
+    values = frame[['day', 'daily', 'carry']].to_numpy().tolist()
+    starts = np.flatnonzero(np.r_[True, frame['name'].to_numpy()[1:] != frame['name'].to_numpy()[:-1]])
+    ends = np.r_[starts[1:], len(frame)]
+
+    snapshots = {}
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        name = frame.at[start, 'name']
+        row = latest.loc[name]
+        snapshots[name] = {
+            'name': name,
+            'max_day': int(row['day']),
+            'join_day': int(join_day[name]),
+            'total_days': int(size[name]),
+            'total_fans': int(row['fans']),
+            'daily': int(row['daily']),
+            'carry_over': int(row['carry']),
+            'recent_days': min(int(size[name]), RECENT_DAYS),
+            'avg_daily_7': float(avg_daily_7[name]),
+            'best_day_7': best_7[name],
+            'worst_day_7': worst_7[name],
+            'first_half_7': float(first_half_7.get(name, np.nan)),
+            'second_half_7': float(second_half_7[name]),
+            'behind_days_7': int(behind_days_7[name]),
+            'best_day': best[name],
+            'worst_day': worst[name],
+            'daily_std': float(daily_std[name]),
+            'daily_max': int(daily_max[name]),
+            'daily_min': int(daily_min[name]),
+            'days_above_avg': int(days_above_avg[name]),
+            'days_above_target': int(days_above_target[name]),
+            'weekly_avg': weekly_avg.get(name, []),
+            'history': [tuple(v) for v in reversed(values[start:end])],
+        }
+    return snapshots
+
+
+# ============================================================================
+# SNAPSHOT CACHE
+# ============================================================================
+
+
+class MemberStatsCache:
+    """Per-club member snapshots, tied to the cached frame they came from
+
+    Features:
+    - Bulk computation per club (one pass over the frame)
+    - Recomputed only when the club's cached frame object changes
+    - Exact (stripped) and case-insensitive member lookup
+    """
+
+    def __init__(self):
+        self._clubs: Dict[str, dict] = {}
+
+        # Metrics
+        self.builds = 0
+        self.lookups = 0
+
+    def update_club(self, club_name: str, df: pd.DataFrame) -> dict:
+        """Compute snapshots for a club's (new) frame
+
+        Args:
+            club_name: Club name
+            df: The club frame as stored in the cache
+
+        Returns:
+            {name: snapshot}
+        """
+        snapshots = compute_member_snapshots(df)
+        self._clubs[club_name] = {
+            'frame': weakref.ref(df),
+            'members': snapshots,
+            'folded': {name.lower(): name for name in snapshots},
+        }
+        self.builds += 1
+
+        # Drop clubs whose frame left the cache (evicted / refreshed)
+        for name in [name for name, entry in self._clubs.items() if entry['frame']() is None]:
+            del self._clubs[name]
+        return snapshots
+
+    def _entry(self, club_name: str, df: pd.DataFrame) -> dict:
+        entry = self._clubs.get(club_name)
+        if entry is None or entry['frame']() is not df:
+            self.update_club(club_name, df)
+            entry = self._clubs[club_name]
+        return entry
+
+    def find(self, club_name: str, df: pd.DataFrame, member_name: str) -> Optional[dict]:
+        """Snapshot of one member (computes the club's snapshots if needed)
+
+        Args:
+            club_name: Club name
+            df: The club frame from _load_data_for_command
+            member_name: Member name (stripped match, then case-insensitive)
+
+        Returns:
+            Snapshot dict, or None if the member has no rows
+        """
+        self.lookups += 1
+        entry = self._entry(club_name, df)
+        name = member_name.strip()
+        snapshot = entry['members'].get(name)
+        if snapshot is None:
+            folded = entry['folded'].get(name.lower())
+            snapshot = entry['members'].get(folded) if folded else None
+        return snapshot
+
+    def get_stats(self) -> dict:
+        """Get cache statistics
+
+        Returns:
+            Dictionary with club / member counts and counters
+        """
+        return {
+            'clubs': len(self._clubs),
+            'members': sum(len(entry['members']) for entry in self._clubs.values()),
+            'builds': self.builds,
+            'lookups': self.lookups,
+        }
+
+
+# Process-wide snapshot cache
+member_stats = MemberStatsCache()
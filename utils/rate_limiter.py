@@ -0,0 +1,110 @@
+"""
+Async token-bucket rate limiter.
+
+Used to pace calls against external quotas (uma.moe API, Google Sheets API)
+without hard-coded sleeps between requests.
+"""
+
+import time
+import asyncio
+from typing import Optional
+
+
+class AsyncRateLimiter:
+    """Token-bucket rate limiter for asyncio code
+
+    Features:
+    - Refills `rate` tokens every `per` seconds, up to `burst` tokens
+    - Waiters are served in FIFO order
+    - Can be used as `await limiter.acquire()` or `async with limiter:`
+    - Tracks basic metrics (acquisitions, total wait time)
+    """
+
+    def __init__(self, rate: float, per: float = 1.0, burst: Optional[float] = None, name: str = "limiter"):
+        """
+        Initialize AsyncRateLimiter
+
+        Args:
+            rate: Number of tokens added every `per` seconds
+            per: Refill period in seconds (default: 1 second)
+            burst: Bucket capacity (default: `rate`)
+            name: Label used in logs and metrics
+        """
+        if rate <= 0 or per <= 0:
+            raise ValueError("rate and per must be positive")
+
+        self.name = name
+        self.rate = float(rate)
+        self.per = float(per)
+        self.capacity = float(burst) if burst else float(rate)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+        # Metrics
+        self.acquired = 0
+        self.total_wait = 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.rate / self.per
+
+    def _refill(self):
+        """Add tokens accumulated since the last refill"""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.tokens_per_second)
+            self._last_refill = now
+
+    async def acquire(self, tokens: float = 1) -> float:
+        """Wait until `tokens` tokens are available and consume them
+
+        Args:
+            tokens: Number of tokens to consume (requests larger than the
+                    bucket capacity are clamped to the capacity)
+
+        Returns:
+            Seconds spent waiting
+        """
+        tokens = min(float(tokens), self.capacity)
+        waited = 0.0
+
+        # Lock keeps waiters FIFO: the head waiter sleeps until it can be served
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    break
+
+                wait_time = (tokens - self._tokens) / self.tokens_per_second
+                waited += wait_time
+                await asyncio.sleep(wait_time)
+
+        self.acquired += 1
+        self.total_wait += waited
+        return waited
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    def get_stats(self) -> dict:
+        """Get limiter statistics
+
+        Returns:
+            Dictionary with rate, available tokens and wait metrics
+        """
+        self._refill()
+        return {
+            "name": self.name,
+            "rate_per_second": round(self.tokens_per_second, 3),
+            "capacity": self.capacity,
+            "available_tokens": round(self._tokens, 2),
+            "acquired": self.acquired,
+            "total_wait_seconds": round(self.total_wait, 2),
+        }
@@ -0,0 +1,94 @@
+"""
+Rendered embed cache for club views (leaderboard, summary dashboard).
+
+Club data changes a few times a day, but the leaderboard table and the
+summary dashboard were rebuilt (iterrows + format_fans per cell) on every
+command and button press. Rendered embeds are kept per club and reused while
+the inputs are the same:
+
+- the cached club frame object (a refresh creates a new one)
+- a render key from the caller: club type, quota, rank, update timestamp
+
+`invalidate_club` drops a club's embeds when its Data sheet is written or its
+config changes. Callers get a copy of the embed, so stored ones are never
+modified.
+"""
+
+import weakref
+from typing import Dict, Hashable, Optional
+
+# ============================================================================
+# RENDER CACHE
+# ============================================================================
+
+
+class RenderCache:
+    """Rendered embeds per (club, view kind), tied to the club frame
+
+    Features:
+    - Constant-time repeat views while club data and config are unchanged
+    - Keyed by frame identity + caller-supplied render key
+    - Explicit per-club invalidation (data write, config update)
+    """
+
+    def __init__(self):
+        self._clubs: Dict[str, dict] = {}
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, club_name: str, kind: str, df, render_key: Hashable):
+        """Cached embed for a club view
+
+        Args:
+            club_name: Club name
+            kind: View kind ('leaderboard', 'summary')
+            df: Club frame the embed would be rendered from
+            render_key: Other render inputs (club type, quota, ...)
+
+        Returns:
+            Copy of the stored discord.Embed, or None
+        """
+        entry = self._clubs.get(club_name, {}).get(kind)
+        if entry is None or entry['frame']() is not df or entry['key'] != render_key:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry['embed'].copy()
+
+    def put(self, club_name: str, kind: str, df, render_key: Hashable, embed):
+        """Store a rendered embed (replaces the club's previous one of this kind)"""
+        self._clubs.setdefault(club_name, {})[kind] = {
+            'frame': weakref.ref(df),
+            'key': render_key,
+            'embed': embed.copy(),
+        }
+
+    def invalidate_club(self, club_name: Optional[str] = None):
+        """Drop a club's rendered embeds (all clubs if None)"""
+        if club_name is None:
+            self._clubs.clear()
+        else:
+            self._clubs.pop(club_name, None)
+        self.invalidations += 1
+
+    def get_stats(self) -> dict:
+        """Get cache statistics
+
+        Returns:
+            Dictionary with entry count and counters
+        """
+        lookups = self.hits + self.misses
+        return {
+            'entries': sum(len(kinds) for kinds in self._clubs.values()),
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'hit_rate': round(self.hits / lookups * 100, 1) if lookups else 0.0,
+        }
+
+
+# Process-wide render cache
+render_cache = RenderCache()
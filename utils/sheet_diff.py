@@ -0,0 +1,121 @@
+"""
+Cell-level diff between two sheet grids.
+
+The sync used to clear each member / Data sheet and rewrite it in full, even
+when only a few cells changed (or none). Instead, the planned grid is compared
+with the grid known to be on the sheet and only the changed cells are sent:
+
+- consecutive changed rows form one block, spanning the leftmost to the
+  rightmost changed column of those rows
+- cells that exist on the sheet but not in the plan are written as '' (RAW
+  empty string clears the cell), so no separate clear is needed
+
+Grids are compared as displayed strings: None -> '', bools as TRUE/FALSE,
+integral floats without '.0', and sheet values with thousands separators
+("1,234,567") as plain digits. Trailing empty cells and rows are ignored.
+"""
+
+import re
+import json
+import hashlib
+from typing import List, Tuple
+
+from gspread.utils import rowcol_to_a1
+
+# "1,234,567" / "-12,000.5" as shown for number-formatted cells
+_THOUSANDS = re.compile(r'-?\d{1,3}(,\d{3})+(\.\d+)?')
+
+# ============================================================================
+# NORMALIZATION
+# ============================================================================
+
+
+def normalize_cell(value) -> str:
+    """Displayed string of a planned cell value"""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def normalize_grid(grid: List[list], from_sheet: bool = False) -> List[List[str]]:
+    """Grid as comparable strings, without trailing empty cells / rows
+
+    Args:
+        grid: 2D list (planned values, or get_all_values output)
+        from_sheet: Values were read from the sheet (drop thousands separators)
+
+    Returns:
+        New 2D list of strings
+    """
+    rows = []
+    for row in grid or []:
+        cells = [normalize_cell(value) for value in row]
+        if from_sheet:
+            cells = [cell.replace(',', '') if _THOUSANDS.fullmatch(cell) else cell for cell in cells]
+        while cells and cells[-1] == '':
+            cells.pop()
+        rows.append(cells)
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+
+def grid_hash(normalized: List[List[str]]) -> str:
+    """Content hash of a normalized grid"""
+    payload = json.dumps(normalized, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+# ============================================================================
+# DIFF
+# ============================================================================
+
+
+def diff_grid(previous: List[List[str]], grid: List[list]) -> List[Tuple[str, List[list]]]:
+    """A1 ranges and values that turn `previous` into `grid`
+
+    Args:
+        previous: Normalized grid currently on the sheet
+        grid: Planned grid (raw values, written as-is)
+
+    Returns:
+        [(a1_range, values)] - empty if nothing changed
+    """
+    planned = normalize_grid(grid)
+    blocks = []  # [first_row, last_row, first_col, last_col] (0-based)
+
+    for r in range(max(len(previous), len(planned))):
+        old = previous[r] if r < len(previous) else []
+        new = planned[r] if r < len(planned) else []
+        changed = [
+            c for c in range(max(len(old), len(new)))
+            if (old[c] if c < len(old) else '') != (new[c] if c < len(new) else '')
+        ]
+        if not changed:
+            continue
+        if blocks and blocks[-1][1] == r - 1:
+            block = blocks[-1]
+            block[1] = r
+            block[2] = min(block[2], changed[0])
+            block[3] = max(block[3], changed[-1])
+        else:
+            blocks.append([r, r, changed[0], changed[-1]])
+
+    def cell(r, c):
+        if r < len(grid) and c < len(grid[r]) and grid[r][c] is not None:
+            return grid[r][c]
+        return ''
+
+    ranges = []
+    for first_row, last_row, first_col, last_col in blocks:
+        values = [
+            [cell(r, c) for c in range(first_col, last_col + 1)]
+            for r in range(first_row, last_row + 1)
+        ]
+        a1 = f"{rowcol_to_a1(first_row + 1, first_col + 1)}:{rowcol_to_a1(last_row + 1, last_col + 1)}"
+        ranges.append((a1, values))
+    return ranges
@@ -0,0 +1,109 @@
+"""
+Single-flight request coalescing.
+
+Concurrent calls for the same (resource, id) share one in-flight upstream
+call: the first caller starts it, everyone else awaits the same task and
+gets the same result (or exception). Used by the Google Sheets loaders and
+the uma.moe fetchers so a burst of identical commands costs one request.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """Coalesce concurrent calls keyed by (resource, id)
+
+    Features:
+    - One in-flight task per key, shared by all waiters
+    - Waiters cancelling (e.g. wait_for timeout) don't cancel the shared call
+    - `start()` for fire-and-forget refreshes, `do()` to await the result
+    - `forget()` so the next caller starts a fresh call (e.g. after a write)
+    - Per-resource call / execution counters
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Tuple[str, Hashable], asyncio.Task] = {}
+        self._stats: Dict[str, dict] = {}
+
+    def _resource_stats(self, resource: str) -> dict:
+        stats = self._stats.get(resource)
+        if stats is None:
+            stats = {"calls": 0, "executions": 0, "coalesced": 0, "errors": 0}
+            self._stats[resource] = stats
+        return stats
+
+    def start(self, resource: str, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Start the call for (resource, key), or join the one in flight
+
+        Args:
+            resource: Resource type (e.g. "club_data", "circle")
+            key: Resource id (e.g. club name, circle id)
+            factory: Zero-arg function returning the coroutine to run
+
+        Returns:
+            Task resolving to the shared result
+        """
+        flight_key = (resource, key)
+        stats = self._resource_stats(resource)
+        stats["calls"] += 1
+
+        task = self._inflight.get(flight_key)
+        if task is not None and not task.done():
+            stats["coalesced"] += 1
+            return task
+
+        stats["executions"] += 1
+        task = asyncio.ensure_future(factory())
+        self._inflight[flight_key] = task
+
+        def _done(t: asyncio.Task):
+            if self._inflight.get(flight_key) is t:
+                del self._inflight[flight_key]
+            # Retrieve the exception so fire-and-forget failures aren't reported as unhandled
+            if not t.cancelled() and t.exception() is not None:
+                stats["errors"] += 1
+
+        task.add_done_callback(_done)
+        return task
+
+    async def do(self, resource: str, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Run (or join) the call for (resource, key) and wait for its result
+
+        Args:
+            resource: Resource type
+            key: Resource id
+            factory: Zero-arg function returning the coroutine to run
+
+        Returns:
+            Result of the shared call (exceptions are re-raised to every waiter)
+        """
+        return await asyncio.shield(self.start(resource, key, factory))
+
+    def forget(self, resource: str, key: Hashable):
+        """Detach the in-flight call for (resource, key)
+
+        The running call still completes for its current waiters, but new
+        callers start a fresh one.
+        """
+        self._inflight.pop((resource, key), None)
+
+    def in_flight(self, resource: str, key: Hashable) -> bool:
+        """Check if a call for (resource, key) is running"""
+        task = self._inflight.get((resource, key))
+        return task is not None and not task.done()
+
+    def get_stats(self) -> dict:
+        """Get coalescing statistics
+
+        Returns:
+            Dictionary with in-flight count and per-resource counters
+        """
+        return {
+            "in_flight": sum(1 for t in self._inflight.values() if not t.done()),
+            "resources": {name: dict(stats) for name, stats in self._stats.items()},
+        }
+
+
+# Process-wide instance shared by Sheets loaders and uma.moe fetchers
+single_flight = SingleFlight()